@@ -18,6 +18,18 @@ import yaml
 import re
 
 from helpers.http_responses import error_response
+from helpers.json_provider import FastJSONProvider
+from helpers.compression import response_compressor
+from helpers.db_routing import replica_router
+from helpers.db_pools import pool_bulkheads
+from services.quotes import quote_cache
+from services.pricing_rules import pricing_rules
+from managers.discipline_manager import discipline_registry
+from services.request_search import request_search
+from services.map_clusters import map_clusters
+from services.scheduler import scheduler
+from services.retention import retention
+import cron_jobs.tasks  # noqa: F401  registriert die Wartungs-Jobs am Scheduler
 from urllib.parse import urlparse
 
 
@@ -25,6 +37,8 @@ from urllib.parse import urlparse
 # --- Flask app & config ---
 app = Flask(__name__)
 app.config.from_object(Config)
+# orjson-basierter JSON-Provider (Fallback: stdlib), serialisiert date/datetime nativ als ISO-String
+app.json = FastJSONProvider(app)
 # Ensure robust DB connections (survive restarts/plan changes)
 app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {
     'pool_pre_ping': True,     # validates connections before using them
@@ -48,6 +62,50 @@ app.logger.info("DB URI: %s | TESTING=%s | ENV=%s",
 logging.getLogger().info(f"Using DB URI: {mask_db_uri(app.config.get('SQLALCHEMY_DATABASE_URI',''))}")
 db.init_app(app)
 migrate = Migrate(app, db)
+# Optionale Read-Replicas für @read_replica-Endpunkte (Round-Robin, Fallback auf Primary)
+replica_router.init_app(app)
+# Bulkheads: Admin-Traffic bekommt einen eigenen Pool, damit der Buchungspfad nicht verhungert
+with app.app_context():
+    pool_bulkheads.init_app(app, db.engine)
+
+# Opt-in: langsame Statements mit Endpoint-Tag und EXPLAIN-Plan protokollieren
+if app.config.get('SLOW_QUERY_LOG_ENABLED'):
+    from helpers.slow_query_log import slow_query_recorder
+    slow_query_recorder.configure(
+        threshold_ms=app.config.get('SLOW_QUERY_THRESHOLD_MS', 200),
+        explain=app.config.get('SLOW_QUERY_EXPLAIN', True),
+    )
+    with app.app_context():
+        # auch Admin-/Background-Pools und Replicas, sonst fehlen gerade die Reporting-Queries
+        slow_query_recorder.install_all(db.engine)
+
+# Memo für Preis-Quotes (kurze TTL, damit neue Verfügbarkeiten/Preise schnell greifen)
+quote_cache.configure(
+    ttl_seconds=app.config.get('QUOTE_CACHE_TTL_SECONDS', 60),
+    max_entries=app.config.get('QUOTE_CACHE_MAX_ENTRIES', 2048),
+)
+# Versionierte Preisregeln; jeder Worker prüft alle PRICING_RULES_REFRESH_SECONDS auf eine neue Version
+pricing_rules.init_app(app)
+# Disziplin-Cache je Worker; prüft alle DISCIPLINE_REGISTRY_REFRESH_SECONDS auf neue Disziplinen
+discipline_registry.init_app(app)
+# Admin-Anfragesuche: Gesamtzahl je Filter für REQUEST_SEARCH_COUNT_TTL_SECONDS gecacht
+request_search.init_app(app)
+# Admin-Karte: Grid-Cluster je Zoomstufe, einzelne Punkte erst ab MAP_POINTS_MIN_ZOOM
+map_clusters.init_app(app)
+# Aufbewahrung: alte Verfügbarkeiten löschen, abgeschlossene Anfragen archivieren (gedrosselte Blöcke)
+retention.init_app(app)
+# Wartungs-Jobs (Cron, DB-Sperre je Lauf); den Thread startet erst wsgi.py (nicht CLI/Migrationen)
+scheduler.init_app(app)
+
+# gzip/brotli je nach Accept-Encoding (ab Mindestgröße), inkl. Content-ETag und 304
+if app.config.get('COMPRESSION_ENABLED', True):
+    response_compressor.configure(
+        min_size=app.config.get('COMPRESSION_MIN_BYTES', 1024),
+        gzip_level=app.config.get('COMPRESSION_GZIP_LEVEL', 6),
+        brotli_quality=app.config.get('COMPRESSION_BROTLI_QUALITY', 5),
+        cache_max_bytes=app.config.get('COMPRESSION_CACHE_MAX_BYTES', 8 * 1024 * 1024),
+    )
+    response_compressor.init_app(app)
 
 app.register_blueprint(auth_bp,  url_prefix='/auth')
 app.register_blueprint(api_bp,   url_prefix='/api')
@@ -209,4 +267,7 @@ def healthz():
 
 
 if __name__=="__main__":
+    # Entwicklungsserver: Scheduler nur im Reloader-Kindprozess, der die Requests bedient
+    if app.config.get("SCHEDULER_ENABLED") and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        scheduler.start(app)
     app.run(debug=True)
\ No newline at end of file
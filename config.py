@@ -21,7 +21,61 @@ class Config:
         SQLALCHEMY_DATABASE_URI = "sqlite:///pepe.db"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # --- Read-Replicas (optional, kommagetrennt) ---
+    SQLALCHEMY_REPLICA_URLS = [
+        normalize_db_url(u.strip()) for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()
+    ]
+    REPLICA_HEALTH_INTERVAL_SECONDS = float(os.getenv("REPLICA_HEALTH_INTERVAL_SECONDS", "10"))
+    REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+    # --- Bulkheads: getrennte Connection-Pools je Traffic-Klasse ---
+    # "public" nutzt die Default-Engine (SQLALCHEMY_ENGINE_OPTIONS); hier nur das Statement-Timeout.
+    # "background": alles außerhalb eines Requests (Worker, Scheduler, Retention, CLI); 0 = kein Timeout.
+    DB_POOL_CLASSES = {
+        "public": {
+            "statement_timeout_ms": int(os.getenv("PUBLIC_DB_STATEMENT_TIMEOUT_MS", "5000")),
+        },
+        "admin": {
+            "pool_size": int(os.getenv("ADMIN_DB_POOL_SIZE", "2")),
+            "max_overflow": int(os.getenv("ADMIN_DB_MAX_OVERFLOW", "1")),
+            "pool_timeout": float(os.getenv("ADMIN_DB_POOL_TIMEOUT", "10")),
+            "statement_timeout_ms": int(os.getenv("ADMIN_DB_STATEMENT_TIMEOUT_MS", "30000")),
+        },
+        "background": {
+            "pool_size": int(os.getenv("BACKGROUND_DB_POOL_SIZE", "4")),
+            "max_overflow": int(os.getenv("BACKGROUND_DB_MAX_OVERFLOW", "4")),
+            "pool_timeout": float(os.getenv("BACKGROUND_DB_POOL_TIMEOUT", "30")),
+            "statement_timeout_ms": int(os.getenv("BACKGROUND_DB_STATEMENT_TIMEOUT_MS", "0")),
+        },
+    }
+    DB_TRAFFIC_CLASS_BY_BLUEPRINT = {"admin": "admin"}
+
+    # --- Preis-Quotes (Live-Preis im Buchungsformular) ---
+    QUOTE_CACHE_TTL_SECONDS = float(os.getenv("QUOTE_CACHE_TTL_SECONDS", "60"))
+    QUOTE_CACHE_MAX_ENTRIES = int(os.getenv("QUOTE_CACHE_MAX_ENTRIES", "2048"))
+    # Cache-Misses je IP: Token-Bucket (Nachfüllrate pro Minute, maximaler Vorrat)
+    QUOTE_RATE_LIMIT_PER_MINUTE = float(os.getenv("QUOTE_RATE_LIMIT_PER_MINUTE", "60"))
+    QUOTE_RATE_LIMIT_BURST = int(os.getenv("QUOTE_RATE_LIMIT_BURST", "30"))
+    GEOCODE_CACHE_TTL_SECONDS = float(os.getenv("GEOCODE_CACHE_TTL_SECONDS", "86400"))
+    # Alternativtermine, wenn am Wunschtermin zu wenige Artists frei sind
+    ALTERNATIVE_DATES_WINDOW_DAYS = int(os.getenv("ALTERNATIVE_DATES_WINDOW_DAYS", "30"))
+    ALTERNATIVE_DATES_LIMIT = int(os.getenv("ALTERNATIVE_DATES_LIMIT", "3"))
+
     AGENCY_FEE_PERCENT = int(os.getenv("AGENCY_FEE_PERCENT", "20"))
+    # Preisregeln (pricing_rule_sets): Intervall, in dem jeder Worker die aktive Version prüft
+    PRICING_RULES_REFRESH_SECONDS = float(os.getenv("PRICING_RULES_REFRESH_SECONDS", "30"))
+    # Disziplin-Cache: Intervall, in dem jeder Worker auf neu angelegte Disziplinen prüft
+    DISCIPLINE_REGISTRY_REFRESH_SECONDS = float(os.getenv("DISCIPLINE_REGISTRY_REFRESH_SECONDS", "60"))
+    # Admin-Anfragesuche: wie lange die Gesamtzahl je Filterkombination gecacht wird
+    REQUEST_SEARCH_COUNT_TTL_SECONDS = float(os.getenv("REQUEST_SEARCH_COUNT_TTL_SECONDS", "30"))
+    # Admin-Karte: Cluster-Zellen je 256px-Kachel, ab welchem Zoom einzelne Punkte, max. Punkte je Antwort
+    MAP_CLUSTER_CELLS_PER_TILE = int(os.getenv("MAP_CLUSTER_CELLS_PER_TILE", "4"))
+    MAP_POINTS_MIN_ZOOM = int(os.getenv("MAP_POINTS_MIN_ZOOM", "14"))
+    MAP_MAX_POINTS = int(os.getenv("MAP_MAX_POINTS", "2000"))
+    # Obergrenze für IDs je Admin-Sammelaktion (z. B. POST /admin/artists/bulk-delete)
+    ADMIN_BULK_MAX_IDS = int(os.getenv("ADMIN_BULK_MAX_IDS", "500"))
+    # Obergrenze für Zellen einer Admin-Preissimulation (x-Werte × y-Werte)
+    PRICING_SIMULATION_MAX_CELLS = int(os.getenv("PRICING_SIMULATION_MAX_CELLS", "250000"))
     RATE_PER_KM = 0.5
 
     # --- SMTP / App Settings ---
@@ -32,6 +86,61 @@ class Config:
     SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
     SMTP_FROM = os.getenv("SMTP_FROM") or SMTP_USER
 
+    # --- Slow-Query-Log (opt-in) ---
+    SLOW_QUERY_LOG_ENABLED = os.getenv("SLOW_QUERY_LOG_ENABLED", "false").lower() in ("1", "true", "yes")
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() in ("1", "true", "yes")
+
+    # --- Booking-Ingest (sync | async) ---
+    BOOKING_INGEST_MODE = os.getenv("BOOKING_INGEST_MODE", "sync").lower()
+    BOOKING_INGEST_WORKERS = int(os.getenv("BOOKING_INGEST_WORKERS", "4"))
+    BOOKING_INGEST_EAGER = os.getenv("BOOKING_INGEST_EAGER", "false").lower() in ("1", "true", "yes")
+    # Anfragen in 'processing' gelten danach als verwaist (Worker abgestürzt) und werden neu übernommen
+    BOOKING_INGEST_PROCESSING_TIMEOUT_SECONDS = float(os.getenv("BOOKING_INGEST_PROCESSING_TIMEOUT_SECONDS", "600"))
+
+    # --- Hintergrund-Jobs (z. B. Verfügbarkeiten nach Sammel-Freigabe) ---
+    BACKGROUND_JOBS_WORKERS = int(os.getenv("BACKGROUND_JOBS_WORKERS", "2"))
+    BACKGROUND_JOBS_EAGER = os.getenv("BACKGROUND_JOBS_EAGER", "false").lower() in ("1", "true", "yes")
+    # Laufende Jobs ohne eigenes Timeout (job_queue.register(..., timeout_seconds)) gelten danach als verloren
+    BACKGROUND_JOBS_TIMEOUT_SECONDS = float(os.getenv("BACKGROUND_JOBS_TIMEOUT_SECONDS", "3600"))
+
+    # --- Wartungs-Jobs (services/scheduler.py, Jobs in cron_jobs/tasks.py) ---
+    # Thread je Webserver-Prozess (nur über wsgi.py); alternativ cron_jobs/run_scheduler.py minütlich per System-Crontab
+    SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "false").lower() in ("1", "true", "yes")
+    SCHEDULER_TICK_SECONDS = float(os.getenv("SCHEDULER_TICK_SECONDS", "30"))
+    SCHEDULER_HISTORY_DAYS = int(os.getenv("SCHEDULER_HISTORY_DAYS", "14"))
+    # Geocoding-Nachtrag: Datensätze je Lauf und Pause zwischen Nominatim-Aufrufen (max. 1/s)
+    GEOCODE_BACKFILL_BATCH = int(os.getenv("GEOCODE_BACKFILL_BATCH", "20"))
+    GEOCODE_BACKFILL_SLEEP_SECONDS = float(os.getenv("GEOCODE_BACKFILL_SLEEP_SECONDS", "1.0"))
+
+    # --- Aufbewahrung (services/retention.py) ---
+    # Blockgrößen, Pause zwischen Blöcken und max. Blöcke je Lauf (kurze Sperren auf den Live-Tabellen)
+    RETENTION_AVAILABILITY_BATCH = int(os.getenv("RETENTION_AVAILABILITY_BATCH", "5000"))
+    RETENTION_REQUEST_BATCH = int(os.getenv("RETENTION_REQUEST_BATCH", "200"))
+    RETENTION_PAUSE_SECONDS = float(os.getenv("RETENTION_PAUSE_SECONDS", "0.5"))
+    RETENTION_MAX_BATCHES = int(os.getenv("RETENTION_MAX_BATCHES", "200"))
+    # Archivieren, so viele Tage nach dem Eventdatum: abgelehnt/storniert bzw. akzeptiert
+    RETENTION_CLOSED_AFTER_DAYS = int(os.getenv("RETENTION_CLOSED_AFTER_DAYS", "90"))
+    RETENTION_ACCEPTED_AFTER_DAYS = int(os.getenv("RETENTION_ACCEPTED_AFTER_DAYS", "365"))
+    # Änderungsprotokoll der Verfügbarkeiten (Delta-Sync): ältere Versionen -> Reset-Snapshot
+    RETENTION_AVAILABILITY_CHANGES_DAYS = int(os.getenv("RETENTION_AVAILABILITY_CHANGES_DAYS", "30"))
+
+    # --- SSE-Stream für Artist-Anfragen ---
+    REQUEST_EVENTS_STREAM_SECONDS = float(os.getenv("REQUEST_EVENTS_STREAM_SECONDS", "55"))
+    REQUEST_EVENTS_POLL_SECONDS = float(os.getenv("REQUEST_EVENTS_POLL_SECONDS", "5"))
+    REQUEST_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("REQUEST_EVENTS_HEARTBEAT_SECONDS", "15"))
+    # Gültigkeit des Stream-Tokens (POST .../stream/token); EventSource-Reconnects innerhalb dieser Zeit nutzen es weiter
+    REQUEST_EVENTS_STREAM_TOKEN_SECONDS = int(os.getenv("REQUEST_EVENTS_STREAM_TOKEN_SECONDS", "300"))
+    # Ältere Events löscht der Job request_events.prune; Reconnects dahinter laden komplett neu
+    REQUEST_EVENTS_RETENTION_HOURS = float(os.getenv("REQUEST_EVENTS_RETENTION_HOURS", "48"))
+
+    # --- Response-Kompression (gzip/brotli) ---
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    COMPRESSION_CACHE_MAX_BYTES = int(os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+
 
     # --- Swagger / OpenAPI Settings ---
     SWAGGER = {
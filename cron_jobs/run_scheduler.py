@@ -0,0 +1,71 @@
+"""
+Wartungs-Jobs ohne Scheduler-Thread ausführen (z. B. minütlich per System-Crontab):
+
+    * * * * *  cd /app && python cron_jobs/run_scheduler.py            # fällige Jobs einmal ausführen
+    python cron_jobs/run_scheduler.py --job availability.roll_forward   # einen Job sofort
+    python cron_jobs/run_scheduler.py --loop                            # eigener Scheduler-Prozess
+    python cron_jobs/run_scheduler.py --list
+
+Die DB-Sperre je Job sorgt dafür, dass parallel laufende Instanzen einen Lauf nicht doppelt ausführen.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402  (registriert auch die Jobs aus cron_jobs/tasks.py)
+from models import db, ScheduledJobRun  # noqa: E402
+from services.scheduler import scheduler  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="PepeBooking Wartungs-Jobs")
+    parser.add_argument("--job", help="diesen Job sofort ausführen (unabhängig vom Zeitplan)")
+    parser.add_argument("--loop", action="store_true", help="dauerhaft alle SCHEDULER_TICK_SECONDS prüfen")
+    parser.add_argument("--list", action="store_true", help="registrierte Jobs mit nächstem Termin anzeigen")
+    args = parser.parse_args(argv)
+
+    with app.app_context():
+        if args.list:
+            for job in scheduler.overview():
+                print(f"{job['name']:<34} {job['cron']:<14} next={job['next_run_at']}")
+            return 0
+        if args.job:
+            try:
+                run_id = scheduler.run(args.job)
+            except KeyError:
+                logger.error("Unbekannter Job: %s", args.job)
+                return 2
+            if run_id is None:
+                logger.warning("Job %s läuft gerade auf einem anderen Host", args.job)
+                return 1
+            run = db.session.get(ScheduledJobRun, run_id)
+            logger.info("Job %s: %s", args.job, scheduler.serialize_run(run))
+            return 0 if run.status == "done" else 1
+        if not args.loop:
+            scheduler.run_pending(one_shot=True)
+            return 0
+
+    logger.info("Scheduler läuft (Tick alle %ss)", scheduler.tick_seconds)
+    while True:
+        with app.app_context():
+            try:
+                scheduler.run_pending()
+            except Exception:
+                logger.exception("Scheduler-Tick fehlgeschlagen")
+            finally:
+                db.session.remove()
+        time.sleep(scheduler.tick_seconds)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
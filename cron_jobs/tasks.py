@@ -0,0 +1,164 @@
+"""Maintenance jobs of PepeBooking, registered on the scheduler (services/scheduler.py).
+
+Imported by app.py, so every process knows the jobs (admin overview, in-process
+scheduler thread, cron_jobs/run_scheduler.py). Each handler gets the job's
+persisted `state` dict and returns row counts for the run history.
+
+Schedules (UTC):
+- availability.roll_forward      02:15  approved artists stay bookable 365 days ahead
+- availability.purge_past        02:30  delete availability days before today (throttled batches)
+- availability.prune_changes     02:40  change-log versions older than RETENTION_AVAILABILITY_CHANGES_DAYS
+- requests.expire_stale          02:45  open requests whose event date has passed -> storniert
+- requests.archive               03:15  move long-closed requests into the archive tables
+- requests.requeue_pending       */5    async booking requests left pending after a crash/redeploy
+- geocode.backfill               */10   coordinates for artists/requests without lat/lon
+- background_jobs.requeue_stale  */15   re-submit queued admin jobs lost in a restart, fail timed-out running ones
+- scheduler.purge_history        04:00  drop run history older than SCHEDULER_HISTORY_DAYS
+- request_events.prune           :20    SSE change events older than REQUEST_EVENTS_RETENTION_HOURS
+- requests.purge_request_state   */10   per process: expired idempotency keys / rate-limit entries
+- caches.warm                    */5    per process: pricing rules and discipline registry
+"""
+from __future__ import annotations
+
+import time
+from datetime import date, timedelta
+
+from flask import current_app
+from sqlalchemy import or_, select
+
+from managers.availability_manager import AvailabilityManager
+from managers.booking_requests_manager import BookingRequestManager
+from managers.discipline_manager import discipline_registry
+from models import db, Artist, BookingRequest
+from services.background_jobs import job_queue
+from services.booking_ingest import ingest_queue
+from services.geo import geocode_address
+from services.pricing_rules import pricing_rules
+from services.request_events import request_events
+from services.retention import retention
+from services.scheduler import scheduler
+
+
+def roll_forward_availability(state: dict) -> dict:
+    artist_ids = list(db.session.execute(
+        select(Artist.id).where(Artist.approval_status == 'approved').order_by(Artist.id)
+    ).scalars())
+    return AvailabilityManager().ensure_auto_availability_for_artists(artist_ids, days_ahead=365)
+
+
+def purge_past_availability(state: dict) -> dict:
+    return retention.purge_availability(date.today())
+
+
+def prune_availability_changes(state: dict) -> dict:
+    return retention.prune_availability_changes()
+
+
+def expire_stale_requests(state: dict) -> dict:
+    return BookingRequestManager().expire_stale_requests(date.today())
+
+
+def archive_closed_requests(state: dict) -> dict:
+    return retention.archive_requests(date.today())
+
+
+def requeue_pending_requests(state: dict) -> dict:
+    # erst hier importieren: der Worker lebt in routes.request_routes
+    from routes.request_routes import process_booking_request
+    timeout = timedelta(seconds=float(current_app.config.get("BOOKING_INGEST_PROCESSING_TIMEOUT_SECONDS", 600)))
+    return {"requeued": ingest_queue.requeue_pending(process_booking_request, older_than=timedelta(minutes=5),
+                                                     processing_timeout=timeout)}
+
+
+def _missing_coordinates(model, id_col, address_col, lat_col, lon_col, after_id: int, limit: int):
+    return db.session.execute(
+        select(model)
+        .where(id_col > after_id, address_col.isnot(None), address_col != '',
+               or_(lat_col.is_(None), lon_col.is_(None)))
+        .order_by(id_col)
+        .limit(limit)
+    ).scalars().all()
+
+
+def backfill_coordinates(state: dict) -> dict:
+    """
+    Geocodes up to GEOCODE_BACKFILL_BATCH artists and requests per run (Nominatim: one lookup
+    per GEOCODE_BACKFILL_SLEEP_SECONDS). Addresses that cannot be resolved are skipped via the
+    cursor in `state` and retried after a full pass.
+    """
+    limit = int(current_app.config.get("GEOCODE_BACKFILL_BATCH", 20))
+    pause = float(current_app.config.get("GEOCODE_BACKFILL_SLEEP_SECONDS", 1.0))
+    counts = {"geocoded": 0, "failed": 0}
+    targets = (
+        ("artist_id", Artist, Artist.id, Artist.address, Artist.lat, Artist.lon, ("lat", "lon"), "address"),
+        ("request_id", BookingRequest, BookingRequest.id, BookingRequest.event_address,
+         BookingRequest.event_lat, BookingRequest.event_lon, ("event_lat", "event_lon"), "event_address"),
+    )
+    for key, model, id_col, address_col, lat_col, lon_col, fields, address_attr in targets:
+        rows = _missing_coordinates(model, id_col, address_col, lat_col, lon_col, state.get(key, 0), limit)
+        # kompletter Durchlauf: beim nächsten Mal wieder von vorn (Fehlschläge erneut versuchen)
+        state[key] = rows[-1].id if len(rows) == limit else 0
+        for row in rows:
+            coord = geocode_address(str(getattr(row, address_attr)).strip())
+            if coord:
+                setattr(row, fields[0], coord[0])
+                setattr(row, fields[1], coord[1])
+                counts["geocoded"] += 1
+            else:
+                counts["failed"] += 1
+            if pause:
+                time.sleep(pause)
+        db.session.commit()
+    return counts
+
+
+def requeue_stale_background_jobs(state: dict) -> dict:
+    return job_queue.requeue_stale(older_than=timedelta(minutes=30))
+
+
+def purge_scheduler_history(state: dict) -> dict:
+    return {"deleted": scheduler.purge_history()}
+
+
+def prune_request_events(state: dict) -> dict:
+    hours = float(current_app.config.get("REQUEST_EVENTS_RETENTION_HOURS", 48))
+    return {"deleted": request_events.prune(older_than=timedelta(hours=hours))}
+
+
+def purge_request_state(state: dict) -> dict:
+    # erst hier importieren: routes.request_routes zieht die Blueprints und Manager nach
+    from routes.request_routes import purge_expired_request_state
+    return purge_expired_request_state()
+
+
+def warm_caches(state: dict) -> dict:
+    return {
+        "pricing_version": pricing_rules.refresh(),
+        "disciplines": discipline_registry.refresh(),
+    }
+
+
+scheduler.register("availability.roll_forward", "15 2 * * *", roll_forward_availability,
+                   description="Verfügbarkeiten freigegebener Artists 365 Tage im Voraus auffüllen")
+scheduler.register("availability.purge_past", "30 2 * * *", purge_past_availability,
+                   description="Vergangene Verfügbarkeitstage blockweise löschen")
+scheduler.register("availability.prune_changes", "40 2 * * *", prune_availability_changes,
+                   description="Alte Versionen des Verfügbarkeits-Änderungsprotokolls löschen")
+scheduler.register("requests.expire_stale", "45 2 * * *", expire_stale_requests,
+                   description="Offene Anfragen mit vergangenem Eventdatum stornieren")
+scheduler.register("requests.archive", "15 3 * * *", archive_closed_requests, timeout_seconds=7200,
+                   description="Abgeschlossene Anfragen mit Artists/Admin-Angeboten ins Archiv verschieben")
+scheduler.register("requests.requeue_pending", "*/5 * * * *", requeue_pending_requests, timeout_seconds=600,
+                   description="Asynchron angelegte Anfragen, die nach Absturz/Deploy hängen, neu verarbeiten")
+scheduler.register("geocode.backfill", "*/10 * * * *", backfill_coordinates, timeout_seconds=900,
+                   description="Koordinaten für Artists/Anfragen ohne lat/lon nachtragen")
+scheduler.register("background_jobs.requeue_stale", "*/15 * * * *", requeue_stale_background_jobs,
+                   timeout_seconds=300, description="Liegengebliebene Admin-Hintergrund-Jobs neu starten, abgelaufene als fehlgeschlagen markieren")
+scheduler.register("scheduler.purge_history", "0 4 * * *", purge_scheduler_history,
+                   description="Alte Einträge der Job-Historie löschen")
+scheduler.register("request_events.prune", "20 * * * *", prune_request_events,
+                   description="Alte SSE-Änderungs-Events der Anfragen löschen")
+scheduler.register("requests.purge_request_state", "*/10 * * * *", purge_request_state, exclusive=False,
+                   description="Abgelaufene Idempotency-Keys und Rate-Limit-Einträge (je Prozess)")
+scheduler.register("caches.warm", "*/5 * * * *", warm_caches, exclusive=False,
+                   description="Preisregeln und Disziplin-Cache vorladen (je Prozess)")
@@ -0,0 +1,214 @@
+"""Compact wire formats for availability calendars.
+
+Formats (GET via `?format=` or `Accept: application/vnd.pepe.availability.<format>+json`):
+- `days`   (default): `[{"id", "artist_id", "date"}, ...]`, one object per day
+- `ranges`: `{"ranges": [{"from": "2025-01-01", "to": "2025-03-31"}, ...]}`, inclusive runs
+- `bitmap`: `{"start": "2025-01-01", "days": 365, "bitmap": "<base64>"}`, bit i = start + i days
+  (LSB first within each byte)
+
+Writes (POST/PUT) accept the same shapes plus weekday recurrence rules:
+    {"recurrence": {"from": "2025-01-01", "to": "2025-12-31", "weekdays": ["sat", "sun"],
+                    "except": ["2025-12-27"]}}
+Several keys may be combined in one body; the resulting date sets are merged.
+"""
+from __future__ import annotations
+
+import base64
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Set, Tuple
+
+FORMATS = ("days", "ranges", "bitmap")
+MEDIA_TYPE_PREFIX = "application/vnd.pepe.availability."
+
+# Schutz gegen versehentlich riesige Expansionen (z. B. from=1900)
+MAX_SPAN_DAYS = 3 * 366
+
+WEEKDAYS = {
+    "mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6,
+    "mo": 0, "di": 1, "mi": 2, "do": 3, "fr": 4, "sa": 5, "so": 6,
+}
+
+
+def _to_date(value, field: str) -> date:
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date in '{field}': {value!r}")
+
+
+def _check_span(start: date, end: date, field: str) -> None:
+    if end < start:
+        raise ValueError(f"'{field}': 'to' must not be before 'from'")
+    if (end - start).days + 1 > MAX_SPAN_DAYS:
+        raise ValueError(f"'{field}' spans more than {MAX_SPAN_DAYS} days")
+
+
+# --- Encoding -------------------------------------------------------------------
+def dates_to_ranges(dates: Iterable[date]) -> List[dict]:
+    """Collapse dates into sorted, inclusive `{from, to}` runs."""
+    ranges: List[dict] = []
+    start = prev = None
+    for d in sorted(set(dates)):
+        if prev is not None and d == prev + timedelta(days=1):
+            prev = d
+            continue
+        if start is not None:
+            ranges.append({"from": start.isoformat(), "to": prev.isoformat()})
+        start = prev = d
+    if start is not None:
+        ranges.append({"from": start.isoformat(), "to": prev.isoformat()})
+    return ranges
+
+
+def dates_to_bitmap(dates: Iterable[date], start: Optional[date] = None) -> dict:
+    """Encode dates as a base64 bitmap anchored at `start` (default: earliest date)."""
+    ordered = sorted(set(dates))
+    if not ordered:
+        anchor = start or date.today()
+        return {"start": anchor.isoformat(), "days": 0, "bitmap": ""}
+    anchor = start or ordered[0]
+    ordered = [d for d in ordered if d >= anchor]
+    days = (ordered[-1] - anchor).days + 1 if ordered else 0
+    bits = bytearray((days + 7) // 8)
+    for d in ordered:
+        offset = (d - anchor).days
+        bits[offset // 8] |= 1 << (offset % 8)
+    return {"start": anchor.isoformat(), "days": days, "bitmap": base64.b64encode(bytes(bits)).decode("ascii")}
+
+
+# --- Decoding -------------------------------------------------------------------
+def ranges_to_dates(ranges) -> Set[date]:
+    if not isinstance(ranges, list):
+        raise ValueError("'ranges' must be a list")
+    result: Set[date] = set()
+    for item in ranges:
+        if not isinstance(item, dict):
+            raise ValueError("'ranges' items must be objects with 'from' and 'to'")
+        start = _to_date(item.get("from"), "ranges")
+        end = _to_date(item.get("to", item.get("from")), "ranges")
+        _check_span(start, end, "ranges")
+        result.update(start + timedelta(days=i) for i in range((end - start).days + 1))
+    return result
+
+
+def decode_bitmap(bitmap, days=None) -> Tuple[bytes, int]:
+    """Check `bitmap` (base64 string) and `days` (0 … bits in the bitmap); returns (raw bytes, day count)."""
+    if not isinstance(bitmap, str):
+        raise ValueError("'bitmap' must be a base64 string")
+    try:
+        raw = base64.b64decode(bitmap, validate=True)
+    except ValueError:
+        raise ValueError("'bitmap' must be base64")
+    if days is None:
+        limit = len(raw) * 8
+    elif isinstance(days, bool) or not isinstance(days, int) or days < 0:
+        raise ValueError("'days' must be a non-negative integer")
+    elif days > len(raw) * 8:
+        raise ValueError(f"'days' ({days}) exceeds the {len(raw) * 8} days encoded in 'bitmap'")
+    else:
+        limit = days
+    if limit > MAX_SPAN_DAYS:
+        raise ValueError(f"'bitmap' spans more than {MAX_SPAN_DAYS} days")
+    return raw, limit
+
+
+def bitmap_to_dates(start, bitmap: str, days: Optional[int] = None) -> Set[date]:
+    anchor = _to_date(start, "start")
+    raw, limit = decode_bitmap(bitmap, days)
+    return {
+        anchor + timedelta(days=i)
+        for i in range(limit)
+        if raw[i // 8] & (1 << (i % 8))
+    }
+
+
+def _weekday(value) -> int:
+    """0=Monday … 6=Sunday; accepts ints and English/German names ("sat", "Samstag")."""
+    if isinstance(value, int) and 0 <= value <= 6:
+        return value
+    if isinstance(value, str):
+        key = value.strip().lower()
+        for prefix in (key[:3], key[:2]):
+            if prefix in WEEKDAYS:
+                return WEEKDAYS[prefix]
+    raise ValueError(f"Invalid weekday in 'recurrence': {value!r}")
+
+
+def expand_recurrence(rule) -> Set[date]:
+    """Expand `{from, to, weekdays, except}` into concrete dates."""
+    if not isinstance(rule, dict):
+        raise ValueError("'recurrence' must be an object")
+    start = _to_date(rule.get("from"), "recurrence")
+    end = _to_date(rule.get("to"), "recurrence")
+    _check_span(start, end, "recurrence")
+
+    weekdays = {_weekday(wd) for wd in rule.get("weekdays") or []}
+    if not weekdays:
+        raise ValueError("'recurrence.weekdays' must not be empty")
+    excluded = {_to_date(d, "recurrence.except") for d in rule.get("except") or []}
+
+    return {
+        d for d in (start + timedelta(days=i) for i in range((end - start).days + 1))
+        if d.weekday() in weekdays and d not in excluded
+    }
+
+
+def is_compact_payload(data) -> bool:
+    return isinstance(data, dict) and any(k in data for k in ("ranges", "bitmap", "recurrence"))
+
+
+def parse_dates_payload(data) -> Set[date]:
+    """Collect the date set from any supported write body (raises ValueError)."""
+    if isinstance(data, list):
+        return {_to_date(item.get("date") if isinstance(item, dict) else item, "date") for item in data}
+    if not isinstance(data, dict):
+        raise ValueError("Body must be a JSON object or list")
+    result: Set[date] = set()
+    found = False
+    if "date" in data:
+        found = True
+        result.add(_to_date(data["date"], "date"))
+    if "dates" in data:
+        found = True
+        if not isinstance(data["dates"], list):
+            raise ValueError("'dates' must be a list")
+        result.update(_to_date(d, "dates") for d in data["dates"])
+    if "ranges" in data:
+        found = True
+        result |= ranges_to_dates(data["ranges"])
+    if "bitmap" in data:
+        found = True
+        result |= bitmap_to_dates(data.get("start"), data["bitmap"], data.get("days"))
+    if "recurrence" in data:
+        found = True
+        rules = data["recurrence"] if isinstance(data["recurrence"], list) else [data["recurrence"]]
+        for rule in rules:
+            result |= expand_recurrence(rule)
+    if not found:
+        raise ValueError("Provide 'dates', 'ranges', 'bitmap' or 'recurrence'")
+    return result
+
+
+def negotiate_format(format_param: Optional[str], accept_header: Optional[str]) -> str:
+    """Pick the read format from `?format=` (wins) or the vendor media type in Accept."""
+    if format_param:
+        fmt = format_param.strip().lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        return fmt
+    for part in (accept_header or "").split(","):
+        media = part.split(";")[0].strip().lower()
+        if media.startswith(MEDIA_TYPE_PREFIX) and media.endswith("+json"):
+            fmt = media[len(MEDIA_TYPE_PREFIX):-len("+json")]
+            if fmt in FORMATS:
+                return fmt
+    return "days"
+
+
+__all__ = [
+    "FORMATS", "MAX_SPAN_DAYS",
+    "dates_to_ranges", "dates_to_bitmap", "ranges_to_dates", "bitmap_to_dates", "decode_bitmap",
+    "expand_recurrence", "is_compact_payload", "parse_dates_payload", "negotiate_format",
+]
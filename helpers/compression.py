@@ -0,0 +1,242 @@
+"""Negotiated gzip/brotli response compression as an `after_request` hook.
+
+Usage (see app.py):
+    from helpers.compression import response_compressor
+    response_compressor.configure(min_size=1024)
+    response_compressor.init_app(app)
+
+Notes:
+- The encoding is picked from `Accept-Encoding` (q-values honoured); brotli is
+  preferred when the optional `brotli` package is installed, gzip otherwise.
+- Buffered bodies below `min_size` bytes are sent as-is; compressed output is
+  only used when it is actually smaller.
+- Buffered GET responses get a strong content ETag (sha1 of the uncompressed
+  body) unless the view set one, and `If-None-Match` is answered with 304
+  before anything is compressed. The compressed bytes are cached per
+  (body digest, encoding) in a byte-bounded LRU, so repeated admin list/dashboard
+  calls only pay for hashing, not for recompression.
+- Streamed responses (generators, e.g. NDJSON exports) are compressed chunk by
+  chunk with a sync flush after every chunk, so each line reaches the client
+  without waiting for the end of the stream.
+- `text/event-stream` is not in the default mimetype list: proxies tend to
+  buffer compressed SSE and heartbeats would stop arriving.
+- A view can opt out by setting `Cache-Control: no-transform`.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional, Tuple
+
+from flask import request
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:  # optional dependency
+    brotli = None
+    HAS_BROTLI = False
+
+DEFAULT_MIMETYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/problem+json",
+    "application/javascript",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+)
+
+
+def parse_accept_encoding(header: Optional[str]) -> dict:
+    """`gzip;q=0.8, br` -> {"gzip": 0.8, "br": 1.0} (invalid q-values count as 0)."""
+    result = {}
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        result[token] = q
+    return result
+
+
+class _CompressedCache:
+    """Thread-safe LRU of compressed bodies, bounded by total byte size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes and self._items:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class ResponseCompressor:
+    """Compresses eligible responses according to the client's Accept-Encoding."""
+
+    def __init__(self, enabled: bool = True, min_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 5, mimetypes: Iterable[str] = DEFAULT_MIMETYPES,
+                 add_etag: bool = True, cache_max_bytes: int = 8 * 1024 * 1024):
+        self.enabled = enabled
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.mimetypes = tuple(mimetypes)
+        self.add_etag = add_etag
+        self.cache = _CompressedCache(cache_max_bytes)
+
+    def configure(self, **options) -> "ResponseCompressor":
+        for key, value in options.items():
+            if key == "cache_max_bytes":
+                self.cache.max_bytes = int(value)
+                continue
+            if not hasattr(self, key):
+                raise AttributeError(f"Unknown compression option: {key}")
+            setattr(self, key, tuple(value) if key == "mimetypes" else value)
+        return self
+
+    def init_app(self, app) -> None:
+        app.after_request(self.after_request)
+
+    # --- Negotiation -------------------------------------------------------------
+    def available_encodings(self) -> Tuple[str, ...]:
+        return ("br", "gzip") if HAS_BROTLI else ("gzip",)
+
+    def choose_encoding(self, accept_encoding: Optional[str]) -> Optional[str]:
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        best, best_q = None, 0.0
+        for encoding in self.available_encodings():
+            q = accepted.get(encoding, wildcard)
+            if q > best_q:  # bei Gleichstand gewinnt die erste (bevorzugte) Kodierung
+                best, best_q = encoding, q
+        return best
+
+    def _eligible(self, response) -> bool:
+        if not self.enabled or request.method == "HEAD":
+            return False
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if response.direct_passthrough or "Content-Encoding" in response.headers:
+            return False
+        if "no-transform" in (response.headers.get("Cache-Control") or ""):
+            return False
+        return response.mimetype in self.mimetypes
+
+    # --- Compression ---------------------------------------------------------------
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def compress_stream(self, chunks: Iterable, encoding: str) -> Iterator[bytes]:
+        """Compress an iterable chunk by chunk, flushing after each one."""
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            process, flush, finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+            process = compressor.compress
+            flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+            finish = compressor.flush
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                if not chunk:
+                    continue
+                out = process(chunk) + flush()
+                if out:
+                    yield out
+            yield finish()
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    def after_request(self, response):
+        if not self._eligible(response):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = self.choose_encoding(request.headers.get("Accept-Encoding"))
+
+        if response.is_streamed:
+            if encoding is not None:
+                response.response = self.compress_stream(response.response, encoding)
+                response.headers["Content-Encoding"] = encoding
+                response.headers.pop("Content-Length", None)
+            return response
+
+        body = response.get_data()
+        digest = None
+        if self.add_etag and request.method == "GET" and response.status_code == 200:
+            digest = hashlib.sha1(body).hexdigest()
+            if not response.get_etag()[0]:
+                response.set_etag(digest)
+            response.make_conditional(request)
+            if response.status_code == 304:
+                return response
+
+        if encoding is None or len(body) < self.min_size:
+            return response
+
+        digest = digest or hashlib.sha1(body).hexdigest()
+        key = (digest, encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self.compress(body, encoding)
+            self.cache.put(key, compressed)
+        if len(compressed) >= len(body):
+            return response
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        # Eigene Repräsentation je Kodierung: starke ETags werden schwach
+        tag, weak = response.get_etag()
+        if tag and not weak:
+            response.set_etag(tag, weak=True)
+        return response
+
+
+# Process-wide instance; installed by app.py unless COMPRESSION_ENABLED is off.
+response_compressor = ResponseCompressor()
+
+__all__ = ["ResponseCompressor", "response_compressor", "parse_accept_encoding", "HAS_BROTLI"]
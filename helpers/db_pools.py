@@ -0,0 +1,246 @@
+"""Bulkhead connection pools per traffic class.
+
+Usage (see app.py):
+    from helpers.db_pools import pool_bulkheads
+    with app.app_context():
+        pool_bulkheads.init_app(app, db.engine)
+
+Notes:
+- The default Flask-SQLAlchemy engine serves the `public` class (booking POST,
+  artist endpoints). Every other class configured in `DB_POOL_CLASSES` gets its
+  own engine on the same primary URL with its own `pool_size` / `max_overflow` /
+  `pool_timeout`, so a burst of admin or reporting queries can only exhaust its
+  own connections.
+- Requests are classified by blueprint (`DB_TRAFFIC_CLASS_BY_BLUEPRINT`, e.g.
+  `{"admin": "admin"}`); work outside a request (ingest/background workers,
+  scheduler, retention, CLI) uses the `background` class if configured, so the
+  short public statement timeout never aborts a maintenance batch.
+  `RoutingSession` asks `engine_for_request()` for the primary engine. Reads of
+  `@read_replica` views still go to a replica first.
+- Per-class statement timeouts: `SET statement_timeout` on PostgreSQL, a
+  progress-handler budget on SQLite (aborts with "interrupted"). The SQLite
+  budget is reset at every execute and commit and only counts time inside the
+  SQLite VM, so application work between fetches does not use it up.
+- Pool-wait metrics (checkouts, total/max wait, checkout timeouts) are kept
+  per class and exposed via GET /admin/db_pools.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from flask import has_request_context, request
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLASS = "public"
+BACKGROUND_CLASS = "background"
+# SQLite: Pausen zwischen zwei Progress-Aufrufen über diesem Wert sind Anwendungscode (z. B. zwischen fetch()-Aufrufen)
+_VM_IDLE_GAP_SECONDS = 0.005
+_POOL_KEYS = ("pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping")
+_QUEUEPOOL_ONLY_OPTIONS = ("pool_size", "max_overflow", "pool_timeout")
+
+
+class _PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            calls = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_ms_total, 2),
+                "wait_ms_avg": round(self.wait_ms_total / calls, 3) if calls else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 2),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = self.timeouts = 0
+            self.wait_ms_total = self.wait_ms_max = 0.0
+
+
+def _instrument_pool(pool, stats: _PoolStats) -> None:
+    """Time every checkout (including waits for a free slot) on this pool instance."""
+    already = hasattr(pool, "_bulkhead_stats")
+    pool._bulkhead_stats = stats
+    if already:
+        return
+    original = pool._do_get
+
+    def _do_get():
+        start = time.perf_counter()
+        try:
+            conn = original()
+        except PoolTimeoutError:
+            pool._bulkhead_stats.record((time.perf_counter() - start) * 1000.0, timed_out=True)
+            raise
+        pool._bulkhead_stats.record((time.perf_counter() - start) * 1000.0)
+        return conn
+
+    pool._do_get = _do_get
+
+
+def install_statement_timeout(engine, timeout_ms: Optional[float]) -> None:
+    """Abort statements on this engine after `timeout_ms` (PostgreSQL and SQLite)."""
+    if not timeout_ms:
+        return
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        @event.listens_for(engine, "connect")
+        def _set_timeout(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            cursor.execute(f"SET statement_timeout = {int(timeout_ms)}")
+            cursor.close()
+            dbapi_conn.commit()
+    elif dialect == "sqlite":
+        seconds = float(timeout_ms) / 1000.0
+
+        def _arm(info) -> None:
+            info["statement_budget"] = seconds
+            info["statement_progress_at"] = time.monotonic()
+
+        @event.listens_for(engine, "connect")
+        def _progress_handler(dbapi_conn, connection_record):
+            info = connection_record.info
+
+            def _check():
+                budget = info.get("statement_budget")
+                if budget is None:
+                    return 0
+                now = time.monotonic()
+                # nur Zeit in der VM zählt; längere Pausen (Python zwischen fetch-Aufrufen) höchstens anteilig
+                budget -= min(now - info["statement_progress_at"], _VM_IDLE_GAP_SECONDS)
+                info["statement_budget"], info["statement_progress_at"] = budget, now
+                # Rückgabe != 0 bricht das laufende Statement mit "interrupted" ab
+                return 1 if budget < 0 else 0
+
+            dbapi_conn.set_progress_handler(_check, 1000)
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _arm_execute(conn, cursor, statement, parameters, context, executemany):
+            _arm(conn.connection.info)
+
+        @event.listens_for(engine, "commit")
+        def _arm_commit(conn):
+            _arm(conn.connection.info)
+
+        @event.listens_for(engine, "checkin")
+        def _disarm(dbapi_conn, connection_record):
+            connection_record.info.pop("statement_budget", None)
+            connection_record.info.pop("statement_progress_at", None)
+    else:
+        logger.warning("Statement timeout not supported for dialect %s", dialect)
+
+
+class PoolBulkheads:
+    """Per-traffic-class engines sharing the primary URL but not its pool."""
+
+    def __init__(self):
+        self._engines: Dict[str, object] = {}
+        self._stats: Dict[str, _PoolStats] = {}
+        self._settings: Dict[str, dict] = {}
+        self._by_blueprint: Dict[str, str] = {}
+
+    def init_app(self, app, default_engine) -> None:
+        self.dispose()
+        classes = dict(app.config.get("DB_POOL_CLASSES") or {})
+        self._by_blueprint = dict(app.config.get("DB_TRAFFIC_CLASS_BY_BLUEPRINT") or {})
+        base_options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+
+        public = classes.pop(DEFAULT_CLASS, {})
+        self._register(DEFAULT_CLASS, default_engine, public, owned=False)
+        for name, settings in classes.items():
+            self._register(name, self._create_engine(default_engine.url, base_options, settings), settings)
+
+    def _create_engine(self, url, base_options: dict, settings: dict):
+        options = dict(base_options)
+        options.update({k: v for k, v in settings.items() if k in _POOL_KEYS})
+        in_memory = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+        if in_memory or options.get("poolclass") not in (None, QueuePool):
+            # NullPool/StaticPool kennen keine Größenbegrenzung – create_engine würde sie ablehnen
+            for key in _QUEUEPOOL_ONLY_OPTIONS:
+                options.pop(key, None)
+        return create_engine(url, **options)
+
+    def _register(self, name: str, engine, settings: dict, owned: bool = True) -> None:
+        stats = self._stats[name] = _PoolStats()
+        _instrument_pool(engine.pool, stats)
+        install_statement_timeout(engine, settings.get("statement_timeout_ms"))
+        self._engines[name] = engine
+        self._settings[name] = dict(settings, owned=owned)
+
+    def dispose(self) -> None:
+        for name, engine in self._engines.items():
+            if self._settings.get(name, {}).get("owned"):
+                engine.dispose()
+        self._engines.clear()
+        self._stats.clear()
+        self._settings.clear()
+
+    # --- Routing -----------------------------------------------------------------
+    def traffic_class(self) -> str:
+        if not has_request_context():
+            # Worker-Threads, Scheduler, Retention, CLI: eigener Pool ohne das kurze Public-Timeout
+            return BACKGROUND_CLASS if BACKGROUND_CLASS in self._engines else DEFAULT_CLASS
+        return self._by_blueprint.get(request.blueprint or "", DEFAULT_CLASS)
+
+    def engines(self) -> list:
+        """All engines incl. the default one (e.g. to attach instrumentation)."""
+        return list(self._engines.values())
+
+    def engine_for(self, traffic_class: str):
+        return self._engines.get(traffic_class)
+
+    def engine_for_request(self):
+        """Primary engine of the current request's class (outside requests: background), or None for the default engine."""
+        name = self.traffic_class()
+        if name == DEFAULT_CLASS:
+            return None
+        return self._engines.get(name)
+
+    # --- Metrics -----------------------------------------------------------------
+    def snapshot(self) -> dict:
+        result = {}
+        for name, engine in self._engines.items():
+            pool = engine.pool
+            entry = {
+                "pool": type(pool).__name__,
+                "size": pool.size() if hasattr(pool, "size") else None,
+                "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+                "statement_timeout_ms": self._settings[name].get("statement_timeout_ms"),
+            }
+            entry.update(self._stats[name].snapshot())
+            result[name] = entry
+        return result
+
+    def reset(self) -> None:
+        for stats in self._stats.values():
+            stats.reset()
+
+
+# Process-wide instance; installed by app.py.
+pool_bulkheads = PoolBulkheads()
+
+__all__ = ["PoolBulkheads", "pool_bulkheads", "install_statement_timeout", "DEFAULT_CLASS", "BACKGROUND_CLASS"]
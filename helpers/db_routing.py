@@ -0,0 +1,257 @@
+"""Read-replica routing for endpoints that only read.
+
+Usage (see app.py / models.py):
+    db = SQLAlchemy(session_options={"class_": RoutingSession})
+    replica_router.init_app(app)          # reads SQLALCHEMY_REPLICA_URLS
+
+    @api_bp.route('/artists')
+    @read_replica
+    def list_artists(): ...
+
+Notes:
+- Only requests whose view is decorated with `@read_replica` are routed; every
+  other request (and everything outside a request) uses the primary.
+- Within a routed request only SELECTs go to a replica. As soon as the session
+  flushes or executes a write, the rest of the request stays on the primary.
+- Read-after-write: clients that wrote through the API within the last
+  `sticky_seconds` (keyed by JWT identity, else remote address) keep reading
+  from the primary, so a GET right after a POST does not see replica lag.
+  The window is tracked per process.
+- Replicas are picked round-robin. A replica that fails a `SELECT 1` health
+  check (or raises a disconnect error) is skipped for `health_interval`
+  seconds; with no healthy replica the primary serves the read.
+- `with primary_reads(): ...` forces the primary for code that reads in
+  order to write (e.g. get-or-create lookups).
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.sql import Select
+
+from helpers.db_pools import pool_bulkheads
+
+logger = logging.getLogger(__name__)
+
+_QUEUEPOOL_ONLY_OPTIONS = ("pool_size", "max_overflow", "pool_timeout")
+
+
+def _engine_options(url: str, options: Optional[dict]) -> dict:
+    options = dict(options or {})
+    if url.startswith("sqlite"):
+        # SQLite nutzt keinen QueuePool – diese Optionen würde create_engine ablehnen
+        for key in _QUEUEPOOL_ONLY_OPTIONS:
+            options.pop(key, None)
+    return options
+
+
+class _Replica:
+    def __init__(self, url: str, engine):
+        self.url = url
+        self.engine = engine
+        self.healthy = True
+        self.checked_at = 0.0
+
+
+class ReplicaRouter:
+    """Holds replica engines and decides per statement where reads go."""
+
+    def __init__(self, health_interval: float = 10.0, sticky_seconds: float = 5.0):
+        self.health_interval = health_interval
+        self.sticky_seconds = sticky_seconds
+        self._replicas: List[_Replica] = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._recent_writers: Dict[str, float] = {}
+
+    # --- Setup -------------------------------------------------------------------
+    def configure(self, urls, engine_options: Optional[dict] = None, **options) -> "ReplicaRouter":
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise AttributeError(f"Unknown replica option: {key}")
+            setattr(self, key, value)
+        self.dispose()
+        for url in urls or []:
+            engine = create_engine(url, **_engine_options(url, engine_options))
+            replica = _Replica(url, engine)
+            event.listen(engine, "handle_error", functools.partial(self._on_error, replica))
+            self._replicas.append(replica)
+        return self
+
+    def init_app(self, app) -> None:
+        app.before_request(_reset_request_flags)
+        urls = app.config.get("SQLALCHEMY_REPLICA_URLS") or []
+        self.configure(
+            urls,
+            engine_options=app.config.get("SQLALCHEMY_ENGINE_OPTIONS"),
+            health_interval=app.config.get("REPLICA_HEALTH_INTERVAL_SECONDS", self.health_interval),
+            sticky_seconds=app.config.get("REPLICA_STICKY_SECONDS", self.sticky_seconds),
+        )
+        if self._replicas:
+            logger.info("Read replicas enabled: %d", len(self._replicas))
+
+    def dispose(self) -> None:
+        for replica in self._replicas:
+            replica.engine.dispose()
+        self._replicas = []
+        self._next = 0
+
+    def engines(self) -> list:
+        return [replica.engine for replica in self._replicas]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._replicas)
+
+    # --- Health --------------------------------------------------------------------
+    def _on_error(self, replica: _Replica, context) -> None:
+        if context.is_disconnect or context.connection is None:
+            self._mark(replica, healthy=False)
+
+    def _mark(self, replica: _Replica, healthy: bool) -> None:
+        if replica.healthy and not healthy:
+            logger.warning("Read replica marked unhealthy: %s", replica.engine.url.render_as_string(hide_password=True))
+        replica.healthy = healthy
+        replica.checked_at = time.monotonic()
+
+    def _is_healthy(self, replica: _Replica) -> bool:
+        if time.monotonic() - replica.checked_at < self.health_interval:
+            return replica.healthy
+        try:
+            with replica.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            self._mark(replica, healthy=True)
+        except Exception as e:
+            logger.debug("Replica health check failed: %s", e)
+            self._mark(replica, healthy=False)
+        return replica.healthy
+
+    def pick(self):
+        """Next healthy replica engine (round-robin), or None to fall back to the primary."""
+        with self._lock:
+            count = len(self._replicas)
+            start = self._next
+            self._next = (self._next + 1) % count if count else 0
+        for i in range(count):
+            replica = self._replicas[(start + i) % count]
+            if self._is_healthy(replica):
+                return replica.engine
+        return None
+
+    # --- Read-after-write ------------------------------------------------------------
+    def note_write(self) -> None:
+        client = _client_key()
+        if client is not None and self.sticky_seconds > 0:
+            with self._lock:
+                self._recent_writers[client] = time.monotonic() + self.sticky_seconds
+                if len(self._recent_writers) > 10_000:
+                    now = time.monotonic()
+                    self._recent_writers = {k: v for k, v in self._recent_writers.items() if v > now}
+
+    def _recently_wrote(self) -> bool:
+        client = _client_key()
+        if client is None:
+            return False
+        until = self._recent_writers.get(client)
+        return until is not None and until > time.monotonic()
+
+    # --- Routing ----------------------------------------------------------------------
+    def replica_for(self, session, clause):
+        """Replica engine for this statement, or None when it must run on the primary."""
+        if not self._replicas or not has_request_context():
+            return None
+        if not getattr(g, "db_read_replica", False) or getattr(g, "db_force_primary", 0) or getattr(g, "db_wrote", False):
+            return None
+        if session._flushing or session.new or session.dirty or session.deleted:
+            return None
+        if clause is not None and not isinstance(clause, Select):
+            return None
+        if self._recently_wrote():
+            return None
+        return self.pick()
+
+
+def _reset_request_flags() -> None:
+    # g kann bei verschachtelten App-Contexts (Tests, CLI) über Requests hinweg leben
+    for flag in ("db_read_replica", "db_force_primary", "db_wrote"):
+        g.pop(flag, None)
+
+
+def _client_key() -> Optional[str]:
+    if not has_request_context():
+        return None
+    try:
+        from flask_jwt_extended import get_jwt_identity
+        identity = get_jwt_identity()
+    except Exception:
+        identity = None
+    return f"jwt:{identity}" if identity else f"ip:{request.remote_addr}"
+
+
+class RoutingSession(FlaskSQLAlchemySession):
+    """Flask-SQLAlchemy session: `@read_replica` reads go to a replica, the rest to the request's bulkhead pool."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            engine = replica_router.replica_for(self, clause)
+            if engine is None and self.bind is None:
+                # Bulkhead: eigener Pool je Traffic-Klasse (z. B. Admin), sonst Default-Engine
+                engine = pool_bulkheads.engine_for_request()
+            if engine is not None:
+                return engine
+        # ein explizit gebundener Session-Bind (z. B. Test-Connection) ist der Primary
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind or self.bind, **kwargs)
+
+
+def _note_write() -> None:
+    # Nach einem Schreibzugriff bleibt der Request (und der Client kurzzeitig) auf dem Primary
+    if has_request_context():
+        g.db_wrote = True
+        replica_router.note_write()
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    _note_write()
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _on_orm_execute(orm_execute_state):
+    if not orm_execute_state.is_select:
+        _note_write()
+
+
+def read_replica(view):
+    """Mark a view as read-only so its SELECTs may be served by a replica."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_replica = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def primary_reads():
+    """Force the primary for reads inside the block (e.g. get-or-create lookups)."""
+    if not has_request_context():
+        yield
+        return
+    g.db_force_primary = getattr(g, "db_force_primary", 0) + 1
+    try:
+        yield
+    finally:
+        g.db_force_primary -= 1
+
+
+# Process-wide instance; configured by app.py from SQLALCHEMY_REPLICA_URLS.
+replica_router = ReplicaRouter()
+
+__all__ = ["ReplicaRouter", "RoutingSession", "replica_router", "read_replica", "primary_reads"]
@@ -0,0 +1,87 @@
+"""Fast JSON provider for Flask, backed by orjson when it is installed.
+
+Usage (see app.py):
+    from helpers.json_provider import FastJSONProvider
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+
+Notes:
+- `date`, `datetime` and `time` are emitted as ISO-8601 strings (the same output
+  as `.isoformat()` for naive values), so serializers can hand raw column values
+  to `jsonify` instead of formatting field by field.
+- Keys stay sorted like Flask's default provider, so responses are byte-stable
+  for ETags/caches.
+- Without orjson the provider falls back to the stdlib encoder with the same
+  date handling; behaviour is identical, only slower.
+"""
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, time
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:  # optional dependency
+    orjson = None
+    HAS_ORJSON = False
+
+
+def _default(o: Any) -> Any:
+    """Fallback for types neither encoder handles natively."""
+    if isinstance(o, (date, datetime, time)):
+        return o.isoformat()
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if hasattr(o, "_asdict"):  # SQLAlchemy Row / namedtuple
+        return o._asdict()
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson (with stdlib fallback) and native ISO dates."""
+
+    sort_keys = True
+    default = staticmethod(_default)
+
+    def _orjson_options(self, indent: bool = False) -> int:
+        opts = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        if indent:
+            opts |= orjson.OPT_INDENT_2
+        return opts
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if HAS_ORJSON and not kwargs:
+            return orjson.dumps(obj, default=_default, option=self._orjson_options()).decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if HAS_ORJSON and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        if HAS_ORJSON:
+            body = orjson.dumps(obj, default=_default, option=self._orjson_options(indent=pretty))
+            return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+        return super().response(*args, **kwargs)
+
+
+__all__ = ["FastJSONProvider", "HAS_ORJSON"]
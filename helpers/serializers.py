@@ -0,0 +1,37 @@
+"""Column-projection helpers for list endpoints.
+
+List endpoints select only the columns they return (as lightweight Row tuples,
+no ORM identity map / attribute instrumentation) and hand the plain dicts to
+`jsonify`; dates are serialized natively by `helpers.json_provider`.
+
+Usage:
+    rows = project(select(Artist.id, Artist.name).where(...))
+    names = group_values(db.session.execute(select(pivot.c.artist_id, Discipline.name)...))
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Sequence
+
+from models import db
+
+
+def columns_of(model, names: Sequence[str]) -> list:
+    """Model attributes for the given column names (keeps the response field names)."""
+    return [getattr(model, name) for name in names]
+
+
+def project(stmt) -> List[Dict[str, Any]]:
+    """Execute a Core/ORM select and return one plain dict per row."""
+    return [dict(row._mapping) for row in db.session.execute(stmt)]
+
+
+def group_values(pairs: Iterable[Sequence[Any]]) -> Dict[Any, list]:
+    """(key, value) rows -> {key: [values...]} preserving row order."""
+    grouped: Dict[Any, list] = defaultdict(list)
+    for key, value in pairs:
+        grouped[key].append(value)
+    return grouped
+
+
+__all__ = ["columns_of", "project", "group_values"]
@@ -0,0 +1,234 @@
+"""Opt-in slow-query recorder based on SQLAlchemy engine events.
+
+Usage (see app.py):
+    from helpers.slow_query_log import slow_query_recorder
+    slow_query_recorder.configure(threshold_ms=200)
+    slow_query_recorder.install_all(db.engine)    # + bulkhead pools and read replicas
+
+Notes:
+- Every statement issued inside a Flask request is prefixed with
+  `/* endpoint=<blueprint.view> */` so it can be attributed in pg_stat_statements.
+  Only the matched Flask endpoint is used (never the raw path), reduced to
+  `[A-Za-z0-9_.-]`, so the comment cannot carry `%` or `*/` into the statement.
+- Statements slower than the threshold are logged with their bound-parameter
+  shape (types only, never values) and an EXPLAIN plan captured on a separate
+  DBAPI cursor (`EXPLAIN QUERY PLAN` on SQLite). The EXPLAIN runs inside a
+  SAVEPOINT of the caller's transaction; a failing EXPLAIN is rolled back to it
+  and never aborts the caller's transaction (PostgreSQL).
+- Aggregates are kept in-process per statement fingerprint (bounded) and exposed
+  via GET /admin/slow_queries.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_COMMENT_PREFIX_RE = re.compile(r"^/\* endpoint=[^*]* \*/ ")
+_UNSAFE_TAG_RE = re.compile(r"[^A-Za-z0-9_.\-]")
+_EXPLAIN_SAVEPOINT = "slow_query_explain"
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+|\?")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so that calls differing only in literals/params group together."""
+    sql = _COMMENT_PREFIX_RE.sub("", statement)
+    sql = _STRING_LITERAL_RE.sub("?", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_LITERAL_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(?+)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Describe bound parameters by type name only (no values end up in logs)."""
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            # executemany: shape of the first row + row count
+            return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(v).__name__ for v in parameters]
+    return type(parameters).__name__ if parameters is not None else None
+
+
+def current_endpoint() -> Optional[str]:
+    """Flask endpoint of the active request, or None outside of requests."""
+    if not has_request_context():
+        return None
+    return request.endpoint or request.path
+
+
+def _endpoint_tag() -> Optional[str]:
+    """Endpoint for the SQL comment: matched Flask endpoint only, without characters the driver could interpret."""
+    if not has_request_context() or not request.endpoint:
+        return None
+    return _UNSAFE_TAG_RE.sub("_", request.endpoint)
+
+
+class SlowQueryRecorder:
+    """Records statements above a duration threshold and aggregates them per fingerprint."""
+
+    def __init__(self, threshold_ms: float = 200.0, explain: bool = True,
+                 tag_endpoints: bool = True, max_fingerprints: int = 500):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.tag_endpoints = tag_endpoints
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._engines: List[Any] = []
+
+    def configure(self, **options) -> "SlowQueryRecorder":
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise AttributeError(f"Unknown slow query option: {key}")
+            setattr(self, key, value)
+        return self
+
+    # --- Engine wiring ---------------------------------------------------------
+    def install(self, engine) -> None:
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_execute, retval=True)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        self._engines.append(engine)
+
+    def install_all(self, default_engine) -> None:
+        """Instrument the default engine plus every engine of pool_bulkheads (admin, background) and replica_router."""
+        from helpers.db_pools import pool_bulkheads
+        from helpers.db_routing import replica_router
+        for engine in (default_engine, *pool_bulkheads.engines(), *replica_router.engines()):
+            self.install(engine)
+
+    def uninstall_all(self) -> None:
+        for engine in list(self._engines):
+            self.uninstall(engine)
+
+    def uninstall(self, engine) -> None:
+        if engine not in self._engines:
+            return
+        event.remove(engine, "before_cursor_execute", self._before_execute)
+        event.remove(engine, "after_cursor_execute", self._after_execute)
+        self._engines.remove(engine)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Startzeit am ExecutionContext: endet mit dem Statement, auch wenn es fehlschlägt (kein Rest auf der Pool-Connection)
+        if context is not None:
+            context._slow_query_start = time.perf_counter()
+        if self.tag_endpoints:
+            tag = _endpoint_tag()
+            if tag:
+                statement = f"/* endpoint={tag} */ {statement}"
+        return statement, parameters
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_slow_query_start", None)
+        if start is None:
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if elapsed_ms < self.threshold_ms:
+            return
+        plan = None
+        if self.explain and not executemany:
+            plan = self._explain(conn, cursor, statement, parameters)
+        self.record(statement, parameters, elapsed_ms, endpoint=current_endpoint(),
+                    plan=plan, executemany=executemany)
+
+    def _explain(self, conn, cursor, statement, parameters) -> Optional[List[str]]:
+        """Capture the plan on a fresh DBAPI cursor so the original result set stays intact.
+        Runs inside a SAVEPOINT: if EXPLAIN fails, only the savepoint is rolled back, not the caller's transaction.
+        """
+        bare = _COMMENT_PREFIX_RE.sub("", statement).lstrip()
+        if not bare[:6].upper() == "SELECT" and not bare[:4].upper() == "WITH":
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        explain_cursor = None
+        try:
+            explain_cursor = cursor.connection.cursor()
+            explain_cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            try:
+                explain_cursor.execute(prefix + bare, parameters or ())
+                plan = [" | ".join(str(col) for col in row) for row in explain_cursor.fetchall()]
+            except Exception:
+                explain_cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+                raise
+            finally:
+                explain_cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            return plan
+        except Exception as e:
+            logger.debug("EXPLAIN failed for slow query: %s", e)
+            return None
+        finally:
+            if explain_cursor is not None:
+                try:
+                    explain_cursor.close()
+                except Exception:
+                    pass
+
+    # --- Aggregation -------------------------------------------------------------
+    def record(self, statement: str, parameters: Any, elapsed_ms: float, endpoint: Optional[str] = None,
+               plan: Optional[List[str]] = None, executemany: bool = False) -> None:
+        fp = fingerprint(statement)
+        shape = parameter_shape(parameters)
+        logger.warning("Slow query %.1fms endpoint=%s params=%s: %s%s",
+                       elapsed_ms, endpoint, shape, fp,
+                       ("\n  plan: " + "\n  plan: ".join(plan)) if plan else "")
+        with self._lock:
+            entry = self._stats.get(fp)
+            if entry is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    # kleinsten Eintrag verdrängen, damit der Speicher begrenzt bleibt
+                    victim = min(self._stats, key=lambda k: self._stats[k]["total_ms"])
+                    self._stats.pop(victim, None)
+                entry = self._stats[fp] = {
+                    "fingerprint": fp,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "endpoints": {},
+                    "param_shape": shape,
+                    "executemany": executemany,
+                    "plan": None,
+                    "last_seen": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            key = endpoint or "<no request>"
+            entry["endpoints"][key] = entry["endpoints"].get(key, 0) + 1
+            if plan:
+                entry["plan"] = plan
+            entry["last_seen"] = time.time()
+
+    def snapshot(self, limit: int = 50) -> List[dict]:
+        """Aggregated fingerprints, slowest (by total time) first."""
+        with self._lock:
+            items = [dict(e, endpoints=dict(e["endpoints"])) for e in self._stats.values()]
+        items.sort(key=lambda e: e["total_ms"], reverse=True)
+        for e in items:
+            e["avg_ms"] = round(e["total_ms"] / e["count"], 2) if e["count"] else 0.0
+            e["total_ms"] = round(e["total_ms"], 2)
+            e["max_ms"] = round(e["max_ms"], 2)
+        return items[:max(0, int(limit))]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+# Process-wide instance; installed by app.py when SLOW_QUERY_LOG_ENABLED is set.
+slow_query_recorder = SlowQueryRecorder()
+
+__all__ = ["SlowQueryRecorder", "slow_query_recorder", "fingerprint", "parameter_shape"]
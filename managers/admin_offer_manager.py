@@ -1,10 +1,25 @@
 from models import db, AdminOffer, Artist
 from datetime import datetime, timezone
 import logging
+from sqlalchemy import func, select, update
 from managers.availability_manager import AvailabilityManager
+from services.background_jobs import job_queue
 
 logger = logging.getLogger(__name__)
 
+# Job-Art für das Auffüllen der Verfügbarkeiten nach einer Sammel-Freigabe
+AVAILABILITY_FILL_JOB = 'availability.fill'
+
+
+def fill_availability_job(payload: dict) -> dict:
+    """Hintergrund-Job: Verfügbarkeiten für alle `artist_ids` mengenbasiert auffüllen."""
+    return AvailabilityManager().ensure_auto_availability_for_artists(
+        payload.get('artist_ids') or [], days_ahead=int(payload.get('days_ahead', 365))
+    )
+
+
+job_queue.register(AVAILABILITY_FILL_JOB, fill_availability_job)
+
 class AdminOfferManager:
     """
     Verwaltet alle Admin-Angebote für Buchungsanfragen.
@@ -137,6 +152,57 @@ class AdminOfferManager:
             db.session.rollback()
             return None
 
+    def bulk_set_approval(self, artist_ids, action: str, admin_id=None, reason: str | None = None) -> dict:
+        """
+        Sammel-Freigabe bzw. -Ablehnung mit einem UPDATE (plus ein SELECT zur Einordnung).
+        Artists, die schon im Zielzustand sind, bleiben unverändert (idempotent wie approve/reject_artist).
+        Rückgabe: {"updated": [ids], "unchanged": [ids], "not_found": [ids]}
+        """
+        if action not in ('approve', 'reject'):
+            raise ValueError(f"Unknown action: {action}")
+        ids = sorted({int(i) for i in artist_ids})
+        if action == 'approve':
+            already = Artist.approval_status == 'approved'
+            values = {
+                'approval_status': 'approved',
+                'rejection_reason': None,
+                'approved_by': admin_id if isinstance(admin_id, int) else None,
+                'approved_at': datetime.now(timezone.utc),
+            }
+        else:
+            already = (Artist.approval_status == 'rejected') & (
+                func.coalesce(Artist.rejection_reason, '') == (reason or '')
+            )
+            values = {
+                'approval_status': 'rejected',
+                'rejection_reason': reason,
+                'approved_by': None,
+                'approved_at': None,
+            }
+        try:
+            found = dict(self.db.session.execute(
+                select(Artist.id, already).where(Artist.id.in_(ids))
+            ).all())
+            updated = sorted(aid for aid, done in found.items() if not done)
+            if updated:
+                self.db.session.execute(
+                    update(Artist)
+                    .where(Artist.id.in_(updated), ~already)
+                    .values(**values)
+                    .execution_options(synchronize_session='fetch')
+                )
+            self.db.session.commit()
+        except Exception as e:
+            logger.exception("bulk_set_approval failed (action=%s, ids=%s): %s", action, ids, e)
+            self.db.session.rollback()
+            raise
+        logger.info("Artists %sd in bulk: %s by admin_id=%s", action, updated, admin_id)
+        return {
+            'updated': updated,
+            'unchanged': sorted(aid for aid, done in found.items() if done),
+            'not_found': sorted(set(ids) - set(found)),
+        }
+
     def serialize_artist(self, artist):
         return {
             'id': artist.id,
@@ -1,10 +1,13 @@
-from models import db, Artist
-from models import Discipline, Availability, Artist
+from models import db, Artist, artist_disciplines, booking_artists
+from models import Discipline, Availability, Artist, AvailabilityChange, AdminOffer, Invoice
 from datetime import date
 from managers.discipline_manager import DisciplineManager
 from datetime import date, timedelta
 from managers.availability_manager import AvailabilityManager
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import selectinload
+from helpers.serializers import columns_of, group_values, project
 import logging
 logger = logging.getLogger(__name__)
 
@@ -24,21 +27,42 @@ class ArtistManager:
         """Gibt eine Liste aller Artists zurück."""
         return Artist.query.all()
 
+    @staticmethod
+    def _with_disciplines(query):
+        """Lädt die Disziplinen gesammelt mit (eine Zusatz-Query statt N+1 in Listen-Endpunkten)."""
+        return query.options(selectinload(Artist.disciplines))
+
     def get_pending_artists(self):
         """Gibt alle Artists mit Status 'pending' zurück."""
-        return Artist.query.filter_by(approval_status='pending').all()
+        return self._with_disciplines(Artist.query.filter_by(approval_status='pending')).all()
 
     def get_approved_artists(self):
         """Gibt alle freigegebenen Artists zurück."""
-        return Artist.query.filter_by(approval_status='approved').all()
+        return self._with_disciplines(Artist.query.filter_by(approval_status='approved')).all()
+
+    def list_artists_projection(self, status: str, columns) -> list:
+        """
+        Artists eines Freigabe-Status als schlanke Dicts (nur `columns`, keine ORM-Objekte)
+        plus 'disciplines' als Namensliste. Zwei Queries, unabhängig von der Anzahl Artists.
+        """
+        rows = project(select(*columns_of(Artist, columns)).where(Artist.approval_status == status))
+        names = group_values(self.db.session.execute(
+            select(artist_disciplines.c.artist_id, Discipline.name)
+            .join(Discipline, Discipline.id == artist_disciplines.c.discipline_id)
+            .join(Artist, Artist.id == artist_disciplines.c.artist_id)
+            .where(Artist.approval_status == status)
+        ))
+        for row in rows:
+            row['disciplines'] = names.get(row['id'], [])
+        return rows
 
     def get_rejected_artists(self):
         """Gibt alle abgelehnten Artists zurück."""
-        return Artist.query.filter_by(approval_status='rejected').all()
+        return self._with_disciplines(Artist.query.filter_by(approval_status='rejected')).all()
 
     def get_unsubmitted_artists(self):
         """Gibt alle (noch) nicht eingereichten Artists zurück."""
-        return Artist.query.filter_by(approval_status='unsubmitted').all()
+        return self._with_disciplines(Artist.query.filter_by(approval_status='unsubmitted')).all()
 
     def get_artist(self, artist_id):
         """Gibt den Artist mit der angegebenen ID zurück oder None."""
@@ -72,10 +96,8 @@ class ArtistManager:
             # Passwort ist optional (z. B. Supabase-Login)
             if password:
                 artist.set_password(password)
-            # Disziplinen zuordnen
-            for disc_name in disciplines:
-                disc = self.discipline_mgr.get_or_create_discipline(disc_name)
-                artist.disciplines.append(disc)
+            # Disziplinen zuordnen (eine Query, fehlende mit einem INSERT)
+            artist.disciplines = self.discipline_mgr.resolve_disciplines(disciplines)
             self.db.session.add(artist)
             self.db.session.flush()
             # Standard-Verfügbarkeit: 365 Tage ab heute über AvailabilityManager anlegen
@@ -101,33 +123,28 @@ class ArtistManager:
         """Gibt den Artist zurück, der mit der Supabase user_id verknüpft ist."""
         return Artist.query.filter_by(supabase_user_id=supabase_user_id).first()
 
+    def _normalize_disciplines(self, disciplines):
+        """Offizielle Schreibweise der bekannten Disziplinen (unbekannte fallen weg)."""
+        return self.discipline_mgr.registry.known(disciplines)
+
     def get_artists_by_discipline(self, disciplines, event_date):
         """
-        Gibt Artists zurück, die am angegebenen Datum verfügbar sind und
-        mindestens eine der gegebenen Disziplinen beherrschen.
+        Gibt freigegebene Artists zurück, die am angegebenen Datum verfügbar sind und
+        mindestens eine der gegebenen Disziplinen beherrschen (wie available_artist_counts).
         """
-        if isinstance(disciplines, str):
-            disciplines = [disciplines]
-
-        # Normalisierung der Disziplinnamen
-        normalized = []
-        for name in disciplines:
-            name = name.strip()
-            for allowed in self.discipline_mgr.get_allowed_disciplines():
-                if allowed.lower() == name.lower():
-                    normalized.append(allowed)
-                    break
+        normalized = self._normalize_disciplines(disciplines)
 
         # Datum konvertieren
         if isinstance(event_date, str):
             event_date = date.fromisoformat(event_date)
 
-        # Query: join disciplines und availabilities
+        # Query: join disciplines und availabilities; Disziplinen gesammelt mitladen (Team-Optimierer)
         return (
-            Artist.query
+            self._with_disciplines(Artist.query)
             .join(Artist.disciplines)
             .join(Artist.availabilities)
             .filter(
+                Artist.approval_status == 'approved',
                 Discipline.name.in_(normalized),
                 Availability.date == event_date
             )
@@ -135,16 +152,93 @@ class ArtistManager:
         )
 
 
+    def available_artist_counts(self, disciplines, start: date, end: date) -> dict:
+        """
+        Anzahl freigegebener, verfügbarer Artists mit mindestens einer der Disziplinen je Tag
+        zwischen `start` und `end` (inkl.) – eine aggregierte Query über den ganzen Zeitraum.
+        """
+        normalized = self._normalize_disciplines(disciplines)
+        if not normalized:
+            return {}
+        rows = self.db.session.execute(
+            select(Availability.date, func.count(func.distinct(Availability.artist_id)))
+            .join(artist_disciplines, artist_disciplines.c.artist_id == Availability.artist_id)
+            .join(Discipline, Discipline.id == artist_disciplines.c.discipline_id)
+            .join(Artist, Artist.id == Availability.artist_id)
+            .where(
+                Discipline.name.in_(normalized),
+                Artist.approval_status == 'approved',
+                Availability.date.between(start, end),
+            )
+            .group_by(Availability.date)
+        )
+        return {day: count for day, count in rows}
+
+    def suggest_alternative_dates(self, disciplines, event_date, min_artists=1, window_days=30, limit=3):
+        """
+        Nächstgelegene Tage um `event_date` (± window_days, nicht in der Vergangenheit), an denen
+        mindestens `min_artists` passende Artists frei sind; bei gleichem Abstand der frühere Tag zuerst.
+        """
+        if isinstance(event_date, str):
+            event_date = date.fromisoformat(event_date)
+        start = max(event_date - timedelta(days=window_days), date.today())
+        end = event_date + timedelta(days=window_days)
+        if end < start:
+            return []
+        counts = self.available_artist_counts(disciplines, start, end)
+        candidates = sorted(
+            (abs((day - event_date).days), day, count)
+            for day, count in counts.items()
+            if day != event_date and count >= min_artists
+        )
+        return [
+            {'date': day.isoformat(), 'available_artists': count, 'days_from_requested': (day - event_date).days}
+            for _, day, count in candidates[:limit]
+        ]
+
     def delete_artist(self, artist_id):
         """
         Löscht einen Artist und alle zugehörigen Daten anhand der ID.
         """
-        artist = self.get_artist(artist_id)
-        if artist:
-            self.db.session.delete(artist)
+        return bool(self.delete_artists([artist_id]))
+
+    def delete_artists(self, artist_ids) -> list:
+        """
+        Löscht Artists samt abhängiger Zeilen mengenbasiert: ein DELETE je Kindtabelle
+        (Verfügbarkeiten, Änderungsprotokoll, Rechnungen, Admin-Angebote, Anfrage- und
+        Disziplin-Zuordnungen) in einer Transaktion, ohne Kindzeilen in die Session zu laden.
+        Freigaben durch gelöschte Admins (approved_by) werden auf NULL gesetzt.
+        Gibt die IDs der tatsächlich gelöschten Artists zurück.
+        """
+        ids = sorted({int(i) for i in artist_ids})
+        if not ids:
+            return []
+        existing = list(self.db.session.execute(select(Artist.id).where(Artist.id.in_(ids))).scalars())
+        if not existing:
+            return []
+        statements = (
+            delete(Availability).where(Availability.artist_id.in_(existing)),
+            delete(AvailabilityChange).where(AvailabilityChange.artist_id.in_(existing)),
+            delete(Invoice).where(Invoice.artist_id.in_(existing)),
+            delete(AdminOffer).where(AdminOffer.admin_id.in_(existing)),
+            delete(booking_artists).where(booking_artists.c.artist_id.in_(existing)),
+            delete(artist_disciplines).where(artist_disciplines.c.artist_id.in_(existing)),
+            update(Artist).where(Artist.approved_by.in_(existing)).values(approved_by=None),
+            delete(Artist).where(Artist.id.in_(existing)),
+        )
+        try:
+            for stmt in statements:
+                self.db.session.execute(stmt.execution_options(synchronize_session=False))
+            # bereits geladene Artist-Instanzen aus der Session nehmen (kein Refresh auf gelöschte Zeilen)
+            gone = set(existing)
+            for key, obj in list(self.db.session.identity_map.items()):
+                if key[0] is Artist and key[1][0] in gone:
+                    self.db.session.expunge(obj)
             self.db.session.commit()
-            return True
-        return False
+        except Exception:
+            self.db.session.rollback()
+            raise
+        return existing
 
     def ensure_artist_exists(self, *, email: str, supabase_user_id: str, name: str | None = None):
         """Sichert, dass ein Artist existiert: upsert nach E-Mail, UID verknüpfen, falls fehlend.
@@ -1,7 +1,11 @@
 import logging
-from models import db, Availability, Artist
-from datetime import timedelta, date as _date
+import time
+from typing import Optional
+from models import db, Availability, AvailabilityChange, Artist
+from datetime import datetime, timedelta, date as _date
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.exc import IntegrityError
+from helpers.serializers import project
 
 logger = logging.getLogger(__name__)
 
@@ -36,16 +40,11 @@ class AvailabilityManager:
     def get_all_availabilities(self):
         """Gibt alle Verfügbarkeitstage aller Artists zurück."""
         try:
-            slots = Availability.query.order_by(Availability.artist_id, Availability.date).all()
-            # Serialize slots to include artist_id
-            return [
-                {
-                    'id': slot.id,
-                    'date': slot.date.isoformat(),
-                    'artist_id': slot.artist_id,
-                }
-                for slot in slots
-            ]
+            # Spalten-Projektion statt ORM-Objekte; 'date' serialisiert der JSON-Provider als ISO-String
+            return project(
+                select(Availability.id, Availability.date, Availability.artist_id)
+                .order_by(Availability.artist_id, Availability.date)
+            )
         except Exception as e:
             logger.exception('Fehler beim Laden aller Availabilities')
             return []
@@ -66,6 +65,7 @@ class AvailabilityManager:
                 return existing
             slot = Availability(artist_id=artist_id, date=date_obj)
             self.db.session.add(slot)
+            self._bump_versions({artist_id: ([date_obj], [])})
             self.db.session.commit()
             return slot
         except IntegrityError:
@@ -87,6 +87,7 @@ class AvailabilityManager:
             slot = Availability.query.get(availability_id)
             if slot:
                 self.db.session.delete(slot)
+                self._bump_versions({slot.artist_id: ([], [slot.date])})
                 self.db.session.commit()
                 return slot
             return None
@@ -95,42 +96,164 @@ class AvailabilityManager:
             logger.exception('Fehler beim Entfernen der Availability id=%s', availability_id)
             return None
 
+    def add_availabilities(self, artist_id, dates) -> dict:
+        """
+        Fügt mehrere Verfügbarkeitstage in EINEM Schritt hinzu (ein SELECT + Bulk-Insert, ein Commit).
+        Idempotent – bestehende Tage werden übersprungen. Rückgabe: {"added": [ids], "skipped": int}
+        """
+        normalized = self._normalize_dates(dates)
+        if not normalized:
+            return {'added': [], 'skipped': 0}
+        try:
+            existing_dates = self._existing_dates(artist_id, min(normalized), max(normalized))
+            to_add = sorted(normalized - existing_dates)
+            added_ids = self._bulk_insert(artist_id, to_add)
+            if to_add:
+                self._bump_versions({artist_id: (to_add, [])})
+                self.db.session.commit()
+            return {'added': added_ids, 'skipped': len(normalized) - len(to_add)}
+        except Exception:
+            self.db.session.rollback()
+            logger.exception('Fehler bei add_availabilities artist_id=%s', artist_id)
+            raise
+
     def replace_availabilities_for_artist(self, artist_id, new_dates):
-        """Setzt die Verfügbarkeiten eines Artists auf genau die übergebenen new_dates (Liste von date oder ISO-Strings)."""
-        # Normalisiere alle Daten zu date-Objekten
-        normalized = set()
-        for d in new_dates:
-            if isinstance(d, str):
-                try:
-                    normalized.add(_date.fromisoformat(d))
-                except ValueError:
-                    logger.warning('Überspringe ungültiges Datum beim Ersetzen: %s', d)
-            elif isinstance(d, _date):
-                normalized.add(d)
-        # bestehende Slots
-        existing_slots = self.get_availabilities(artist_id)
-        existing_dates = {s.date for s in existing_slots}
+        """Setzt die Verfügbarkeiten eines Artists auf genau die übergebenen new_dates (Liste von date oder ISO-Strings).
+        Differenz wird mengenbasiert angewendet: ein Bulk-Insert, ein DELETE ... IN, ein Commit.
+        """
+        normalized = self._normalize_dates(new_dates, skip_invalid=True)
+        try:
+            existing = {
+                row.date: row.id
+                for row in Availability.query
+                .filter(Availability.artist_id == artist_id)
+                .with_entities(Availability.id, Availability.date)
+            }
+            to_add = sorted(normalized - existing.keys())
+            removed_ids = [existing[dt] for dt in sorted(existing.keys() - normalized)]
+
+            added_ids = self._bulk_insert(artist_id, to_add)
+            if removed_ids:
+                Availability.query.filter(Availability.id.in_(removed_ids)).delete(synchronize_session=False)
+            if to_add or removed_ids:
+                self._bump_versions({artist_id: (to_add, sorted(existing.keys() - normalized))})
+                self.db.session.commit()
+            return {
+                'added': added_ids,
+                'removed': removed_ids,
+            }
+        except Exception:
+            self.db.session.rollback()
+            logger.exception('Fehler beim Ersetzen der Availabilities für artist_id=%s', artist_id)
+            raise
+
+    def _bulk_insert(self, artist_id, dates) -> list:
+        """Ein executemany-INSERT (ohne RETURNING pro Zeile) + ein SELECT für die neuen IDs. `dates` aufsteigend sortiert, kein Commit."""
+        if not dates:
+            return []
+        self.db.session.execute(insert(Availability), [{'artist_id': artist_id, 'date': dt} for dt in dates])
+        wanted = set(dates)
+        rows = (
+            Availability.query
+            .filter(Availability.artist_id == artist_id)
+            .filter(Availability.date >= dates[0], Availability.date <= dates[-1])
+            .with_entities(Availability.id, Availability.date)
+            .order_by(Availability.date)
+            .all()
+        )
+        return [row.id for row in rows if row.date in wanted]
+
+    def _bump_versions(self, changes: dict) -> None:
+        """
+        Erhöht availability_version je betroffenem Artist um 1 und protokolliert die Tage
+        ({artist_id: (added_dates, removed_dates)}). Läuft in der Transaktion des Aufrufers, kein Commit.
+        """
+        changes = {aid: ch for aid, ch in changes.items() if ch[0] or ch[1]}
+        if not changes:
+            return
+        artist_ids = list(changes)
+        # atomar in der DB hochzählen (parallele Writes desselben Artists serialisieren über die Zeilensperre)
+        self.db.session.execute(
+            update(Artist)
+            .where(Artist.id.in_(artist_ids))
+            .values(availability_version=Artist.availability_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        versions = dict(
+            self.db.session.execute(
+                select(Artist.id, Artist.availability_version).where(Artist.id.in_(artist_ids))
+            ).all()
+        )
+        rows = [
+            {'artist_id': aid, 'version': versions[aid], 'date': dt, 'op': op}
+            for aid, (added, removed) in changes.items() if aid in versions
+            for op, dates in (('added', added), ('removed', removed))
+            for dt in dates
+        ]
+        if rows:
+            self.db.session.execute(insert(AvailabilityChange), rows)
 
-        to_add = normalized - existing_dates
-        to_remove = existing_dates - normalized
+    def get_version(self, artist_id: int) -> int:
+        """Aktuelle Kalender-Version eines Artists (0, wenn noch nie geändert)."""
+        version = self.db.session.execute(
+            select(Artist.availability_version).where(Artist.id == artist_id)
+        ).scalar()
+        return int(version or 0)
+
+    def get_changes_since(self, artist_id: int, since: int):
+        """
+        Netto-Änderungen seit Version `since`.
+        Rückgabe: (version, added_dates, removed_dates) oder (version, None, None), wenn das Protokoll
+        die Lücke nicht mehr abdeckt (z. B. nach prune_changes) oder `since` nicht von diesem Kalender
+        stammen kann (größer als die aktuelle Version, z. B. nach DB-Restore) – dann muss der Client voll neu laden.
+        """
+        version = self.get_version(artist_id)
+        if since == version:
+            return version, [], []
+        if since > version or since < 0:
+            return version, None, None
+        rows = self.db.session.execute(
+            select(AvailabilityChange.version, AvailabilityChange.date, AvailabilityChange.op)
+            .where(AvailabilityChange.artist_id == artist_id, AvailabilityChange.version > since)
+            .order_by(AvailabilityChange.version, AvailabilityChange.id)
+        ).all()
+        if not rows or rows[0].version != since + 1:
+            return version, None, None
+        # letzter Stand je Tag gewinnt; hinzugefügt+wieder entfernt (oder umgekehrt) hebt sich auf
+        first_op, last_op = {}, {}
+        for row in rows:
+            first_op.setdefault(row.date, row.op)
+            last_op[row.date] = row.op
+        added = sorted(d for d, op in last_op.items() if op == 'added' and first_op[d] == 'added')
+        removed = sorted(d for d, op in last_op.items() if op == 'removed' and first_op[d] == 'removed')
+        return version, added, removed
 
-        added = []
-        removed = []
-        for dt in to_add:
+    def _existing_dates(self, artist_id, start, end) -> set:
+        """Vorhandene Verfügbarkeitstage eines Artists im (inklusiven) Zeitraum."""
+        rows = (
+            Availability.query
+            .filter(Availability.artist_id == artist_id)
+            .filter(Availability.date >= start, Availability.date <= end)
+            .with_entities(Availability.date)
+            .all()
+        )
+        return {row[0] for row in rows}
+
+    @staticmethod
+    def _normalize_dates(dates, skip_invalid: bool = False) -> set:
+        """date-Objekte oder ISO-Strings -> Menge von date (ValueError bei ungültigen Werten, außer skip_invalid)."""
+        normalized = set()
+        for d in dates:
+            if isinstance(d, _date):
+                normalized.add(d)
+                continue
             try:
-                slot = self.add_availability(artist_id, dt)
-                added.append(slot)
-            except Exception:
-                logger.exception('Konnte Availability nicht hinzufügen: %s for artist %s', dt, artist_id)
-        for dt in to_remove:
-            slot = Availability.query.filter_by(artist_id=artist_id, date=dt).first()
-            if slot:
-                self.remove_availability(slot.id)
-                removed.append(slot)
-        return {
-            'added': [s.id for s in added],
-            'removed': [s.id for s in removed],
-        }
+                normalized.add(_date.fromisoformat(d))
+            except (TypeError, ValueError):
+                if not skip_invalid:
+                    raise ValueError(f'Invalid date: {d!r}')
+                logger.warning('Überspringe ungültiges Datum beim Ersetzen: %s', d)
+        return normalized
 
     def get_availabilities_for_user(self, supabase_user_id):
         """Shortcut: Verfügbarkeiten für den eingeloggten Artist über Supabase-ID laden."""
@@ -198,6 +321,7 @@ class AvailabilityManager:
 
             if to_create:
                 self.db.session.bulk_save_objects(to_create)
+                self._bump_versions({slot.artist_id: ([target], []) for slot in to_create})
                 self.db.session.commit()
                 created = len(to_create)
             else:
@@ -245,6 +369,7 @@ class AvailabilityManager:
             added = 0
             if to_create:
                 self.db.session.bulk_save_objects(to_create)
+                self._bump_versions({artist_id: ([slot.date for slot in to_create], [])})
                 self.db.session.commit()
                 added = len(to_create)
             else:
@@ -264,4 +389,111 @@ class AvailabilityManager:
         end = start + timedelta(days=days_ahead - 1)
         return self.ensure_availability_range_for_artist(artist_id, start, end)
 
-   
\ No newline at end of file
+    def ensure_availability_range_for_artists(self, artist_ids, start, end, chunk_size: int = 100) -> dict:
+        """
+        Mengenbasierte Variante für viele Artists: je Block von `chunk_size` Artists ein SELECT der
+        vorhandenen Tage, ein executemany-INSERT, ein Versions-Update und ein Commit. Idempotent.
+        Rückgabe: {"artists": int, "added": int, "skipped": int}
+        """
+        if isinstance(start, str):
+            start = _date.fromisoformat(start)
+        if isinstance(end, str):
+            end = _date.fromisoformat(end)
+        if end < start:
+            start, end = end, start
+        ids = sorted({int(i) for i in artist_ids})
+        days = list(_date_range_inclusive(start, end))
+        added = skipped = 0
+        for offset in range(0, len(ids), chunk_size):
+            chunk = ids[offset:offset + chunk_size]
+            try:
+                existing = {
+                    (row.artist_id, row.date)
+                    for row in self.db.session.execute(
+                        select(Availability.artist_id, Availability.date)
+                        .where(Availability.artist_id.in_(chunk))
+                        .where(Availability.date >= start, Availability.date <= end)
+                    )
+                }
+                changes = {}
+                for artist_id in chunk:
+                    new_days = [dt for dt in days if (artist_id, dt) not in existing]
+                    if new_days:
+                        changes[artist_id] = (new_days, [])
+                rows = [{'artist_id': aid, 'date': dt} for aid, (new_days, _) in changes.items() for dt in new_days]
+                if rows:
+                    self.db.session.execute(insert(Availability), rows)
+                    self._bump_versions(changes)
+                    self.db.session.commit()
+                added += len(rows)
+                skipped += len(existing)
+            except Exception:
+                self.db.session.rollback()
+                logger.exception('Fehler bei ensure_availability_range_for_artists (Block ab %s)', chunk[0])
+                raise
+        return {"artists": len(ids), "added": added, "skipped": skipped}
+
+    def ensure_auto_availability_for_artists(self, artist_ids, days_ahead: int = 365) -> dict:
+        """Wie ensure_auto_availability_for_artist, aber für viele Artists in Blöcken (Hintergrund-Job)."""
+        start = _date.today()
+        end = start + timedelta(days=days_ahead - 1)
+        return self.ensure_availability_range_for_artists(artist_ids, start, end)
+
+    def prune_changes(self, before: datetime, batch_size: int = 5000, pause_seconds: float = 0.0,
+                      max_batches: Optional[int] = None) -> int:
+        """
+        Löscht Protokollzeilen (availability_changes) mit created_at vor `before`, immer ganze Versionen:
+        je Artist alle Versionen bis zur jüngsten betroffenen, sonst hielte get_changes_since eine
+        angeschnittene Version für vollständig. Clients mit älterem `since` bekommen einen Reset-Snapshot.
+        Blöcke, Pause und `max_batches` wie purge_past. Rückgabe: Anzahl gelöschter Zeilen.
+        """
+        deleted = 0
+        batches = 0
+        while True:
+            # ids steigen mit created_at: die ältesten Zeilen liegen vorn, der Scan endet früh
+            rows = self.db.session.execute(
+                select(AvailabilityChange.artist_id, AvailabilityChange.version)
+                .where(AvailabilityChange.created_at < before)
+                .order_by(AvailabilityChange.id)
+                .limit(batch_size)
+            ).all()
+            upto = {}
+            for artist_id, version in rows:
+                upto[artist_id] = max(version, upto.get(artist_id, version))
+            for artist_id, version in upto.items():
+                deleted += self.db.session.execute(
+                    delete(AvailabilityChange)
+                    .where(AvailabilityChange.artist_id == artist_id, AvailabilityChange.version <= version)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+            self.db.session.commit()
+            batches += 1
+            if len(rows) < batch_size or (max_batches is not None and batches >= max_batches):
+                return deleted
+            if pause_seconds:
+                time.sleep(pause_seconds)
+
+    def purge_past(self, before, batch_size: int = 5000, pause_seconds: float = 0.0,
+                   max_batches: Optional[int] = None) -> int:
+        """
+        Löscht Verfügbarkeitstage vor `before` in Blöcken von `batch_size` (ein DELETE + Commit je Block,
+        kurze Sperren). Vergangene Tage sind nicht buchbar, Versionen werden daher nicht erhöht.
+        Gedrosselt: `pause_seconds` Pause zwischen den Blöcken, höchstens `max_batches` Blöcke je Aufruf
+        (der Rest folgt beim nächsten Lauf). Rückgabe: Anzahl gelöschter Zeilen.
+        """
+        before = next(iter(self._normalize_dates([before])))
+        deleted = 0
+        batches = 0
+        while True:
+            batch = select(Availability.id).where(Availability.date < before).limit(batch_size)
+            count = self.db.session.execute(
+                delete(Availability).where(Availability.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.db.session.commit()
+            deleted += count
+            batches += 1
+            if count < batch_size or (max_batches is not None and batches >= max_batches):
+                return deleted
+            if pause_seconds:
+                time.sleep(pause_seconds)
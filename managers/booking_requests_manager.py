@@ -1,10 +1,16 @@
-from models import db, BookingRequest, booking_artists, Artist
+from models import db, BookingRequest, booking_artists, booking_request_disciplines, Artist, Discipline
+from managers.discipline_manager import discipline_registry
 from services.calculate_price import calculate_price
+from services.pricing_rules import pricing_rules
 from flask import current_app
-from datetime import date, time, timedelta
+from datetime import date, datetime, time, timedelta
 from typing import Optional, List, Tuple
-from services.geo import geocode_address, haversine_km
-from sqlalchemy import func
+from services.geo import cached_coordinates, geocode_address, haversine_km
+from services.request_events import request_events
+from services.team_optimizer import TeamCandidate
+from helpers.serializers import columns_of, group_values, project
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import selectinload
 
 # Zulässige Statuswerte für Buchungsanfragen
 ALLOWED_STATUSES = ["angefragt", "angeboten", "akzeptiert", "abgelehnt", "storniert"]
@@ -30,6 +36,37 @@ def normalize_status(value: Optional[str]) -> Optional[str]:
         return raw
     return STATUS_ALIASES.get(raw)
 
+def _geocode(address, cached_only: bool = False) -> Optional[Tuple[float, float]]:
+    """Geocoding der Adresse; mit `cached_only` nur aus dem Memo (kein Nominatim-Aufruf)."""
+    if not address:
+        return None
+    return cached_coordinates(address) if cached_only else geocode_address(address)
+
+
+def _artist_coord(artist, cached_only: bool = False) -> Optional[Tuple[float, float]]:
+    """Gespeicherte Koordinaten des Artists, sonst Geocoding der Adresse (None, wenn beides fehlt)."""
+    if getattr(artist, 'lat', None) is not None and getattr(artist, 'lon', None) is not None:
+        return artist.lat, artist.lon
+    return _geocode(getattr(artist, 'address', None), cached_only)
+
+
+def split_disciplines(value) -> List[str]:
+    """Disziplinen aus Liste oder kommagetrenntem Text (show_discipline) als Namensliste."""
+    if not value:
+        return []
+    parts = value.split(',') if isinstance(value, str) else value
+    return [str(d).strip() for d in parts if str(d).strip()]
+
+def discipline_ids(names) -> List[int]:
+    """ids vorhandener Disziplinen zu `names` (Groß-/Kleinschreibung egal, Unbekanntes entfällt)."""
+    try:
+        return [d.id for d in discipline_registry.resolve(split_disciplines(names), create=False)]
+    except ValueError:
+        return []
+
+# Offene Statuswerte: Anfragen, die nach dem Eventdatum als abgelaufen gelten
+OPEN_STATUSES = ["angefragt", "angeboten"]
+
 # Zulässige Event-Typen für Buchungsanfragen
 ALLOWED_EVENT_TYPES = ['Private Feier', 'Firmenfeier', 'Incentive', 'Streetshow']
 
@@ -44,8 +81,22 @@ class BookingRequestManager:
         self.db = db
 
     def get_all_requests(self):
-        """Gibt alle Buchungsanfragen zurück."""
-        return BookingRequest.query.all()
+        """Gibt alle Buchungsanfragen zurück (Artists gesammelt vorgeladen, kein N+1 bei r.artists)."""
+        return BookingRequest.query.options(selectinload(BookingRequest.artists)).all()
+
+    def list_requests_projection(self, columns, with_artist_ids: bool = True) -> list:
+        """
+        Alle Anfragen als schlanke Dicts (nur `columns`, keine ORM-Objekte), optional mit 'artist_ids'
+        aus der Pivot-Tabelle. Höchstens zwei Queries.
+        """
+        rows = project(select(*columns_of(BookingRequest, columns)))
+        if with_artist_ids:
+            ids = group_values(self.db.session.execute(
+                select(booking_artists.c.booking_id, booking_artists.c.artist_id)
+            ))
+            for row in rows:
+                row['artist_ids'] = ids.get(row['id'], [])
+        return rows
 
     def get_request(self, request_id):
         """Gibt eine Buchungsanfrage anhand ihrer ID zurück oder None."""
@@ -60,6 +111,7 @@ class BookingRequestManager:
         obj = self.get_by_id(request_id)
         if not obj:
             return False
+        request_events.publish([a.id for a in obj.artists], obj.id, "request.deleted")
         self.db.session.delete(obj)
         self.db.session.commit()
         return True
@@ -74,9 +126,13 @@ class BookingRequestManager:
         sort: str = "created_desc",
         limit: int = 50,
         offset: int = 0,
+        columns=None,
+        disciplines=None,
     ) -> Tuple[List[BookingRequest], int]:
         """Listet Anfragen optional gefiltert nach Status und sortiert nach created_at.
         sort: 'created_desc' (default) | 'created_asc'
+        columns: optional Spaltennamen -> Row-Tupel statt ORM-Objekte
+        disciplines: optional Namen -> nur Anfragen mit mindestens einer dieser Disziplinen
         """
         q = BookingRequest.query
         if status:
@@ -86,14 +142,65 @@ class BookingRequestManager:
             else:
                 # wenn unbekannter Status-Filter: keine Ergebnisse
                 return [], 0
+        if disciplines:
+            ids = discipline_ids(disciplines)
+            if not ids:
+                return [], 0
+            # Index-Join über (discipline_id, booking_id) statt LIKE auf show_discipline
+            q = q.filter(BookingRequest.id.in_(
+                select(booking_request_disciplines.c.booking_id)
+                .where(booking_request_disciplines.c.discipline_id.in_(ids))
+            ))
         if sort == "created_asc":
             q = q.order_by(BookingRequest.created_at.asc())
         else:
             q = q.order_by(BookingRequest.created_at.desc())
         total = q.with_entities(func.count()).scalar() or 0
+        if columns:
+            q = q.with_entities(*columns_of(BookingRequest, columns))
         items = q.limit(max(0, int(limit))).offset(max(0, int(offset))).all()
         return items, int(total)
 
+    @staticmethod
+    def _set_disciplines(req: BookingRequest, show_discipline) -> None:
+        """Pflegt die normalisierten Disziplinen der Anfrage (nur erlaubte Namen, kein Commit)."""
+        req.disciplines = discipline_registry.resolve(discipline_registry.known(split_disciplines(show_discipline)))
+
+    def discipline_stats(
+        self,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[dict]:
+        """
+        Anzahl Anfragen je Disziplin (gesamt und je Status), optional gefiltert nach Status
+        und Eventdatum. Eine GROUP-BY-Query über booking_request_disciplines.
+        """
+        brd = booking_request_disciplines
+        stmt = (
+            select(Discipline.name, BookingRequest.status, func.count())
+            .select_from(brd)
+            .join(Discipline, Discipline.id == brd.c.discipline_id)
+            .join(BookingRequest, BookingRequest.id == brd.c.booking_id)
+            .group_by(Discipline.name, BookingRequest.status)
+        )
+        if status:
+            norm = normalize_status(status)
+            if not norm:
+                return []
+            stmt = stmt.where(BookingRequest.status == norm)
+        if date_from:
+            stmt = stmt.where(BookingRequest.event_date >= date_from)
+        if date_to:
+            stmt = stmt.where(BookingRequest.event_date <= date_to)
+
+        stats = {}
+        for name, req_status, count in self.db.session.execute(stmt):
+            entry = stats.setdefault(name, {'discipline': name, 'total': 0, 'by_status': {}})
+            entry['total'] += count
+            entry['by_status'][req_status] = count
+        return sorted(stats.values(), key=lambda e: (-e['total'], e['discipline']))
+
     def create_request(
         self,
         client_name,
@@ -118,13 +225,158 @@ class BookingRequestManager:
         """Erstellt eine neue Buchungsanfrage und verknüpft sie mit Artists."""
         current_app.logger.info(f"create_request called with client={client_name}, disciplines={show_discipline}, artists={[getattr(a, 'id', a) for a in artists]}")
 
-        # Datum und Zeit konvertieren
+        event_date, event_time, event_type = self._normalize_event_fields(event_date, event_time, event_type)
+
+        # --- Distanzberechnung Event <-> Artists (Backend, zuverlässig) ---
+        travel_distance = self._travel_distance(event_address, artists)
+
+        req = BookingRequest(
+            client_name=client_name,
+            client_email=client_email,
+            event_date=event_date,
+            event_time=event_time,
+            duration_minutes=duration_minutes,
+            event_type=event_type,
+            show_type=show_type,
+            show_discipline=",".join(show_discipline) if isinstance(show_discipline, list) else show_discipline,
+            team_size=team_size,
+            number_of_guests=number_of_guests,
+            event_address=event_address,
+            is_indoor=is_indoor,
+            special_requests=special_requests,
+            needs_light=needs_light,
+            needs_sound=needs_sound,
+            distance_km=travel_distance if travel_distance else (distance_km or 0.0),
+            newsletter_opt_in=newsletter_opt_in
+        )
+        self._set_disciplines(req, show_discipline)
+        # Verknüpfung mit Artists
+        for artist in artists:
+            req.artists.append(artist)
+
+        self.db.session.add(req)
+        self.db.session.flush()
+        request_events.publish([a.id for a in req.artists], req.id, "request.created", status=req.status)
+        self.db.session.commit()
+        return req
+
+    def create_pending_request(
+        self,
+        client_name,
+        client_email,
+        event_date,
+        duration_minutes,
+        event_type,
+        show_type,
+        show_discipline,
+        team_size,
+        number_of_guests,
+        event_address,
+        is_indoor,
+        special_requests,
+        needs_light,
+        needs_sound,
+        event_time="18:00",
+        distance_km=0.0,
+        newsletter_opt_in=False,
+        status_key_hash=None
+    ):
+        """Legt eine validierte Anfrage OHNE Matching/Geocoding an (processing_status='pending').
+        Matching, Distanz, Preis und Benachrichtigung übernimmt anschließend der Ingest-Worker.
+        `status_key_hash`: Hash des Schlüssels, mit dem der Client den Status abfragen darf.
+        """
+        event_date, event_time, event_type = self._normalize_event_fields(event_date, event_time, event_type)
+        req = BookingRequest(
+            client_name=client_name,
+            client_email=client_email,
+            event_date=event_date,
+            event_time=event_time,
+            duration_minutes=duration_minutes,
+            event_type=event_type,
+            show_type=show_type,
+            show_discipline=",".join(show_discipline) if isinstance(show_discipline, list) else show_discipline,
+            team_size=team_size,
+            number_of_guests=number_of_guests,
+            event_address=event_address,
+            is_indoor=is_indoor,
+            special_requests=special_requests,
+            needs_light=needs_light,
+            needs_sound=needs_sound,
+            distance_km=distance_km or 0.0,
+            newsletter_opt_in=newsletter_opt_in,
+            processing_status='pending',
+            status_key_hash=status_key_hash,
+        )
+        self._set_disciplines(req, show_discipline)
+        self.db.session.add(req)
+        self.db.session.commit()
+        return req
+
+    def assign_artists(self, req: BookingRequest, artists) -> BookingRequest:
+        """Verknüpft eine (pending) Anfrage mit den gematchten Artists und setzt die Reisedistanz.
+        Kein Commit – der Aufrufer schreibt zusammen mit den Preisen fest.
+        """
+        travel_distance = self._travel_distance(req.event_address, artists)
+        if travel_distance:
+            req.distance_km = travel_distance
+        req.artists = list(artists)
+        self.db.session.flush()
+        request_events.publish([a.id for a in req.artists], req.id, "request.created", status=req.status)
+        return req
+
+    def get_pending_requests(self, older_than: Optional[timedelta] = None,
+                             processing_older_than: Optional[timedelta] = None) -> List[BookingRequest]:
+        """
+        Gibt Anfragen zurück, die noch vom Ingest-Worker verarbeitet werden müssen.
+        Mit `processing_older_than` zählen Anfragen in 'processing' erst nach dieser Zeit (Worker-Timeout).
+        """
+        now = datetime.utcnow()
+        q = BookingRequest.query.filter(BookingRequest.processing_status.in_(('pending', 'processing')))
+        if older_than is not None:
+            q = q.filter(BookingRequest.updated_at <= now - older_than)
+        if processing_older_than is not None:
+            q = q.filter(or_(BookingRequest.processing_status == 'pending',
+                             BookingRequest.updated_at <= now - processing_older_than))
+        return q.order_by(BookingRequest.created_at.asc()).all()
+
+    def claim_for_processing(self, request_id: int, stale_after: timedelta) -> bool:
+        """
+        Beansprucht eine Anfrage atomar für den Ingest-Worker (bedingtes UPDATE pending -> processing).
+        Eine Anfrage in 'processing' wird erst nach `stale_after` erneut übernommen (abgestürzter Worker),
+        damit Requeue und ursprünglicher Worker sie nicht doppelt verarbeiten und mailen.
+        True, wenn genau dieser Aufruf die Anfrage bekommen hat.
+        """
+        now = datetime.utcnow()
+        claimed = self.db.session.execute(
+            update(BookingRequest)
+            .where(
+                BookingRequest.id == request_id,
+                or_(
+                    BookingRequest.processing_status == 'pending',
+                    and_(BookingRequest.processing_status == 'processing',
+                         BookingRequest.updated_at < now - stale_after),
+                ),
+            )
+            .values(processing_status='processing', processing_error=None, updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.session.commit()
+        return claimed == 1
+
+    def set_processing_status(self, req: BookingRequest, status: str, error: Optional[str] = None) -> None:
+        """Setzt den Verarbeitungsstatus der asynchronen Anlage (pending|processing|done|failed)."""
+        req.processing_status = status
+        req.processing_error = error
+        self.db.session.commit()
+
+    @staticmethod
+    def _normalize_event_fields(event_date, event_time, event_type):
+        """Konvertiert Datum/Zeit und validiert den Event-Typ (ValueError bei unbekanntem Typ)."""
         if isinstance(event_date, str):
             event_date = date.fromisoformat(event_date)
         if isinstance(event_time, str):
             event_time = time.fromisoformat(event_time)
 
-        # Event-Type validieren
         if isinstance(event_type, str):
             matched = next(
                 (e for e in ALLOWED_EVENT_TYPES if e.lower() == event_type.strip().lower()),
@@ -136,18 +388,21 @@ class BookingRequestManager:
                 raise ValueError(
                     f"Invalid event_type: {event_type}. Allowed: {ALLOWED_EVENT_TYPES}"
                 )
+        return event_date, event_time, event_type
 
-        # --- Distanzberechnung Event <-> Artists (Backend, zuverlässig) ---
+    @staticmethod
+    def _travel_distance(event_address, artists, cached_only: bool = False) -> float:
+        """Mittlere Luftlinien-Distanz (km) zwischen Event und den Artists mit Koordinaten/Adresse; 0.0 wenn unbekannt.
+        Gespeicherte Artist-Koordinaten (lat/lon) haben Vorrang, geocodiert wird nur, wenn sie fehlen
+        (mit `cached_only` nur aus dem Geocoding-Memo).
+        """
         travel_distance = 0.0
         try:
-            event_coord = geocode_address(event_address)
+            event_coord = _geocode(event_address, cached_only)
             distances = []
             if event_coord:
                 for a in artists:
-                    a_addr = getattr(a, 'address', None)
-                    if not a_addr:
-                        continue
-                    a_coord = geocode_address(a_addr)
+                    a_coord = _artist_coord(a, cached_only)
                     if not a_coord:
                         continue
                     distances.append(haversine_km(a_coord, event_coord))
@@ -156,33 +411,35 @@ class BookingRequestManager:
                 travel_distance = round(sum(distances) / len(distances), 1)
         except Exception as e:
             current_app.logger.warning(f"distance calculation failed: {e}")
+        return travel_distance
 
-        req = BookingRequest(
-            client_name=client_name,
-            client_email=client_email,
-            event_date=event_date,
-            event_time=event_time,
-            duration_minutes=duration_minutes,
-            event_type=event_type,
-            show_type=show_type,
-            show_discipline=",".join(show_discipline) if isinstance(show_discipline, list) else show_discipline,
-            team_size=team_size,
-            number_of_guests=number_of_guests,
-            event_address=event_address,
-            is_indoor=is_indoor,
-            special_requests=special_requests,
-            needs_light=needs_light,
-            needs_sound=needs_sound,
-            distance_km=travel_distance if travel_distance else (distance_km or 0.0),
-            newsletter_opt_in=newsletter_opt_in
-        )
-        # Verknüpfung mit Artists
-        for artist in artists:
-            req.artists.append(artist)
-
-        self.db.session.add(req)
-        self.db.session.commit()
-        return req
+    @staticmethod
+    def team_candidates(event_address, artists, rate_per_km, fallback_km=0.0,
+                        cached_only: bool = False) -> List[TeamCandidate]:
+        """Kandidaten für den Team-Optimierer: Gage-Mittelwert plus Fahrtkosten (Luftlinie × rate_per_km) je Artist.
+        Artists ohne bekannte Distanz werden mit `fallback_km` bewertet; `cached_only` wie bei `_travel_distance`.
+        """
+        event_coord = None
+        try:
+            event_coord = _geocode(event_address, cached_only)
+        except Exception as e:
+            current_app.logger.warning(f"team candidate geocoding failed: {e}")
+        candidates = []
+        for a in artists:
+            km = None
+            if event_coord:
+                coord = _artist_coord(a, cached_only)
+                if coord:
+                    km = haversine_km(coord, event_coord)
+            gage = ((a.price_min or 0) + (a.price_max or 0)) / 2
+            travel_km = km if km is not None else fallback_km
+            candidates.append(TeamCandidate(
+                artist=a,
+                cost=gage + travel_km * rate_per_km,
+                disciplines=frozenset(d.name.lower() for d in a.disciplines),
+                travel_km=km,
+            ))
+        return candidates
 
     def set_offer(self, request_id, artist_id, price_offered):
         """Speichert ein Angebot und aktualisiert den Status bei Solo oder nach vollständigen Angeboten."""
@@ -208,6 +465,8 @@ class BookingRequestManager:
                 )
             )
             current_app.logger.debug("set_offer pivot insert performed for missing association")
+        request_events.publish([artist_id], request_id, "request.artist_status",
+                               artist_status='angeboten', price_offered=price_offered)
         # Wichtig: Pivot-Update sofort festschreiben, damit nachfolgende Reads (z.B. Admin) die Gage sehen
         self.db.session.commit()
         # (Der Rest der bisherigen Logik zur Preisberechnung/Status kann nach Bedarf wieder ergänzt werden)
@@ -226,6 +485,8 @@ class BookingRequestManager:
             .where(booking_artists.c.artist_id == artist_id)
             .values(**update_values)
         )
+        if res.rowcount:
+            request_events.publish([artist_id], request_id, "request.artist_status", artist_status=status)
         self.db.session.commit()
         return res.rowcount > 0
 
@@ -242,6 +503,8 @@ class BookingRequestManager:
             .where(booking_artists.c.artist_id.in_(artist_ids))
             .values(**update_values)
         )
+        if res.rowcount:
+            request_events.publish(artist_ids, request_id, "request.artist_status", artist_status=status)
         self.db.session.commit()
         return res.rowcount
 
@@ -257,6 +520,9 @@ class BookingRequestManager:
             .where(booking_artists.c.booking_id == request_id)
             .values(**update_values)
         )
+        if res.rowcount:
+            request_events.publish(self._pivot_artist_ids(request_id), request_id,
+                                   "request.artist_status", artist_status=status)
         self.db.session.commit()
         return res.rowcount
 
@@ -283,9 +549,52 @@ class BookingRequestManager:
         if not req or not norm or norm not in ALLOWED_STATUSES:
             return None
         req.status = norm
+        request_events.publish([a.id for a in req.artists], req.id, "request.status", status=norm)
         self.db.session.commit()
         return req
 
+    def expire_stale_requests(self, before: date, batch_size: int = 500) -> dict:
+        """
+        Setzt offene Anfragen (angefragt/angeboten) mit Eventdatum vor `before` auf 'storniert',
+        ebenso deren offene Artist-Zuordnungen. Blockweise per UPDATE, ein Event je Artist und Anfrage.
+        Rückgabe: {"requests": n, "artist_links": n}
+        """
+        expired = {'requests': 0, 'artist_links': 0}
+        while True:
+            ids = list(self.db.session.execute(
+                select(BookingRequest.id)
+                .where(BookingRequest.status.in_(OPEN_STATUSES), BookingRequest.event_date < before)
+                .order_by(BookingRequest.id)
+                .limit(batch_size)
+            ).scalars())
+            if not ids:
+                return expired
+            artists = group_values(self.db.session.execute(
+                select(booking_artists.c.booking_id, booking_artists.c.artist_id)
+                .where(booking_artists.c.booking_id.in_(ids))
+            ))
+            expired['requests'] += self.db.session.execute(
+                update(BookingRequest).where(BookingRequest.id.in_(ids))
+                .values(status='storniert', updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            expired['artist_links'] += self.db.session.execute(
+                update(booking_artists)
+                .where(booking_artists.c.booking_id.in_(ids), booking_artists.c.status.in_(OPEN_STATUSES))
+                .values(status='storniert')
+            ).rowcount
+            for req_id in ids:
+                request_events.publish(artists.get(req_id, []), req_id, "request.status", status='storniert')
+            self.db.session.commit()
+
+    def _pivot_artist_ids(self, request_id: int) -> List[int]:
+        """Artist-IDs einer Anfrage direkt aus der Pivot-Tabelle (ohne Artist-Objekte zu laden)."""
+        return list(self.db.session.execute(
+            booking_artists.select()
+            .with_only_columns(booking_artists.c.artist_id)
+            .where(booking_artists.c.booking_id == request_id)
+        ).scalars())
+
     def get_all_offers(self):
         """
         Gibt alle Buchungsanfragen zurück, die bereits ein Angebot erhalten haben.
@@ -343,6 +652,28 @@ class BookingRequestManager:
         relevant = self.get_requests_for_artist(aid)
         current_app.logger.info(f"Relevant requests for artist {aid}: {[r.id for r in relevant]}")
 
+        # Pivot-Zeilen aller relevanten Anfragen in EINER Query laden:
+        # liefert die eigenen Status/Gagen und die Artist-IDs pro Anfrage (statt N+1 pro Request).
+        own_pivot = {}
+        artist_ids_by_request = {}
+        request_ids = [r.id for r in relevant]
+        if request_ids:
+            pivot_rows = self.db.session.execute(
+                booking_artists.select()
+                .with_only_columns(
+                    booking_artists.c.booking_id,
+                    booking_artists.c.artist_id,
+                    booking_artists.c.status,
+                    booking_artists.c.requested_gage,
+                    booking_artists.c.comment
+                )
+                .where(booking_artists.c.booking_id.in_(request_ids))
+            ).fetchall()
+            for booking_id, pivot_artist_id, p_status, p_gage, p_comment in pivot_rows:
+                artist_ids_by_request.setdefault(booking_id, []).append(pivot_artist_id)
+                if pivot_artist_id == aid:
+                    own_pivot[booking_id] = (p_status, p_gage, p_comment)
+
         result = []
         for r in relevant:
             rec_min, rec_max = calculate_price(
@@ -360,21 +691,13 @@ class BookingRequestManager:
                 show_discipline=r.show_discipline,
                 team_size=1,
                 duration=r.duration_minutes,
-                event_address=r.event_address
+                event_address=r.event_address,
+                rules=pricing_rules.get(r.pricing_version),
             )
             current_app.logger.info(f"Calculated recommendation for request {r.id}: min={rec_min}, max={rec_max}")
 
-            # Pivot-Daten (pro Artist) laden: Status & gesendete Gage
-            pivot_row = self.db.session.execute(
-                booking_artists.select()
-                .with_only_columns(
-                    booking_artists.c.status,
-                    booking_artists.c.requested_gage,
-                    booking_artists.c.comment
-                )
-                .where(booking_artists.c.booking_id == r.id)
-                .where(booking_artists.c.artist_id == aid)
-            ).fetchone()
+            # Pivot-Daten (pro Artist): Status & gesendete Gage
+            pivot_row = own_pivot.get(r.id)
             artist_status = pivot_row[0] if pivot_row else None
             requested_gage = pivot_row[1] if pivot_row else None
             artist_comment = pivot_row[2] if pivot_row else None
@@ -401,7 +724,7 @@ class BookingRequestManager:
                 'needs_sound': r.needs_sound,
                 'status': artist_status or r.status,
                 'artist_status': artist_status,
-                'artist_ids': [a.id for a in r.artists],
+                'artist_ids': artist_ids_by_request.get(r.id, []),
                 'recommended_price_min': rec_min,
                 'recommended_price_max': rec_max,
                 # Neu: tatsächliches Angebot und Datum
@@ -1,6 +1,16 @@
 import re
+import threading
+import time
+import logging
+
+from flask import has_app_context
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
 from models import db, Discipline
 
+logger = logging.getLogger(__name__)
+
 # Liste der erlaubten Disziplinen, die ein Artist ausüben kann
 ALLOWED_DISCIPLINES = [
     "Zauberer",
@@ -19,6 +29,182 @@ ALLOWED_DISCIPLINES = [
     "Pantomime"
 ]
 
+_NAME_RE = re.compile(r'^[A-Za-z0-9 äöüÄÖÜß/\-]+$')
+
+
+class DisciplineRegistry:
+    """
+    Prozessweiter Cache der Disziplinen: offizielle Schreibweisen und vorhandene Zeilen
+    (Name -> id) als casefold-Maps. Eine Liste von Namen wird mit einer Query aufgelöst,
+    fehlende Namen werden mit einem INSERT angelegt (ohne Commit, das macht der Aufrufer).
+
+    Andere Worker legen ebenfalls Disziplinen an: Bei einem Cache-Miss wird neu geladen,
+    zusätzlich prüft jeder Worker alle `refresh_seconds` eine Signatur (Anzahl, max. id).
+    """
+
+    def __init__(self, refresh_seconds: float = 60.0):
+        self.refresh_seconds = refresh_seconds
+        self._allowed = {name.casefold(): name for name in ALLOWED_DISCIPLINES}
+        self._ids = {}          # casefold(name) -> id
+        self._names = {}        # casefold(name) -> Schreibweise in der DB
+        self._signature = None  # (Anzahl, max. id) beim letzten Laden
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def configure(self, **options) -> "DisciplineRegistry":
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise AttributeError(f"Unknown discipline registry option: {key}")
+            setattr(self, key, value)
+        return self
+
+    def init_app(self, app) -> None:
+        self.configure(refresh_seconds=float(app.config.get("DISCIPLINE_REGISTRY_REFRESH_SECONDS", 60)))
+        self.reset()
+
+    def reset(self) -> None:
+        """Cache verwerfen (nächster Zugriff lädt neu)."""
+        with self._lock:
+            self._ids, self._names = {}, {}
+            self._signature = None
+            self._checked_at = float("-inf")
+
+    def refresh(self) -> int:
+        """Sofort auf neue/gelöschte Disziplinen prüfen (Cache-Warmup); Anzahl gecachter Namen."""
+        self._checked_at = float("-inf")
+        self._ensure_fresh()
+        return len(self._ids)
+
+    # --- Namen ---------------------------------------------------------------------
+    def canonical(self, name) -> str:
+        """
+        Offizielle bzw. bereits gespeicherte Schreibweise eines Namens.
+        ValueError bei leeren Namen oder unzulässigen Zeichen.
+        """
+        name = str(name).strip()
+        key = name.casefold()
+        if key in self._allowed:
+            return self._allowed[key]
+        if not name:
+            raise ValueError("Disziplinname darf nicht leer sein")
+        if not _NAME_RE.match(name):
+            raise ValueError(f"Ungültige Disziplin: {name}")
+        return self._names.get(key, name)
+
+    def known(self, names) -> list:
+        """Nur die erlaubten Disziplinen aus `names`, in offizieller Schreibweise (ohne Duplikate)."""
+        if isinstance(names, str):
+            names = [names]
+        out = []
+        for name in names:
+            allowed = self._allowed.get(str(name).strip().casefold())
+            if allowed and allowed not in out:
+                out.append(allowed)
+        return out
+
+    # --- Cache ---------------------------------------------------------------------
+    def _current_signature(self):
+        count, max_id = db.session.execute(select(func.count(Discipline.id), func.max(Discipline.id))).one()
+        return count, max_id
+
+    def _load(self) -> None:
+        rows = db.session.execute(select(Discipline.id, Discipline.name).order_by(Discipline.id)).all()
+        ids, names = {}, {}
+        for disc_id, name in rows:
+            key = name.casefold()
+            # bei Namen, die sich nur in der Schreibweise unterscheiden, gilt die älteste Zeile
+            if key not in ids:
+                ids[key], names[key] = disc_id, name
+        with self._lock:
+            self._ids, self._names = ids, names
+            self._signature = (len(rows), rows[-1][0] if rows else None)
+            self._checked_at = time.monotonic()
+
+    def _ensure_fresh(self) -> None:
+        if self._signature is None:
+            self._load()
+            return
+        if not has_app_context() or time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+        self._checked_at = time.monotonic()
+        try:
+            if self._current_signature() != self._signature:
+                self._load()
+        except SQLAlchemyError:
+            logger.warning("Discipline registry: refresh failed, keeping cached names", exc_info=True)
+
+    def _create(self, names) -> None:
+        """Fehlende Disziplinen mit einem INSERT anlegen; parallel angelegte werden nachgeladen."""
+        # ein mehrzeiliges INSERT ... RETURNING (ORM-add_all schreibt unter SQLite zeilenweise)
+        stmt = insert(Discipline.__table__).values([{'name': name} for name in names]).returning(
+            Discipline.__table__.c.id, Discipline.__table__.c.name
+        )
+        try:
+            with db.session.begin_nested():
+                created = db.session.execute(stmt).all()
+        except IntegrityError:
+            logger.info("Discipline registry: %s created concurrently, reloading", names)
+            self._load()
+            return
+        with self._lock:
+            for disc_id, name in created:
+                key = name.casefold()
+                self._ids[key], self._names[key] = disc_id, name
+
+    # --- Auflösen ------------------------------------------------------------------
+    def _fetch(self, wanted):
+        """Zeilen zu den gecachten ids; None, wenn eine id fehlt oder inzwischen anders heißt."""
+        keys = [name.casefold() for name in wanted if name.casefold() in self._ids]
+        rows = {
+            row.id: row
+            for row in db.session.execute(
+                select(Discipline).where(Discipline.id.in_([self._ids[key] for key in keys]))
+            ).scalars()
+        }
+        resolved = []
+        for key in keys:
+            row = rows.get(self._ids[key])
+            if row is None or row.name.casefold() != key:
+                return None
+            resolved.append(row)
+        return resolved
+
+    def resolve(self, names, create: bool = True) -> list:
+        """
+        Discipline-Zeilen zu `names` (Reihenfolge erhalten, Duplikate und leere Einträge entfernt).
+        Unbekannte Namen werden mit `create=True` angelegt, sonst übersprungen.
+        ValueError bei ungültigen Namen.
+        """
+        self._ensure_fresh()
+        wanted, seen = [], set()
+        for name in names or []:
+            if not str(name).strip():
+                continue
+            canonical = self.canonical(name)
+            if canonical.casefold() not in seen:
+                seen.add(canonical.casefold())
+                wanted.append(canonical)
+        if not wanted:
+            return []
+
+        if any(name.casefold() not in self._ids for name in wanted):
+            # evtl. inzwischen von einem anderen Worker angelegt
+            self._load()
+            missing = [name for name in wanted if name.casefold() not in self._ids]
+            if missing and create:
+                self._create(missing)
+
+        resolved = self._fetch(wanted)
+        if resolved is None:
+            # gelöschte oder neu vergebene ids: Cache veraltet
+            self._load()
+            resolved = self._fetch(wanted) or []
+        return resolved
+
+
+# Prozessweite Instanz; app.py konfiguriert das Prüfintervall (DISCIPLINE_REGISTRY_REFRESH_SECONDS).
+discipline_registry = DisciplineRegistry()
+
 
 class DisciplineManager:
     """
@@ -27,6 +213,7 @@ class DisciplineManager:
     def __init__(self):
         """Initialisiert den DisciplineManager mit der Datenbanksitzung."""
         self.db = db
+        self.registry = discipline_registry
 
     def get_allowed_disciplines(self):
         return ALLOWED_DISCIPLINES
@@ -35,24 +222,10 @@ class DisciplineManager:
         """
         Gibt eine vorhandene Disziplin anhand des Namens zurück oder legt sie an, falls sie nicht existiert.
         """
-        name = name.strip()
-        # Offizielle Schreibweise prüfen und normalisieren
-        for allowed in ALLOWED_DISCIPLINES:
-            if allowed.lower() == name.lower():
-                name = allowed
-                break
-
-        # Validierung für unbekannte Namen (leer oder mit unzulässigen Zeichen)
-        if name not in ALLOWED_DISCIPLINES:
-            if not name:
-                raise ValueError("Disziplinname darf nicht leer sein")
-            if not re.match(r'^[A-Za-z0-9 äöüÄÖÜß/\-]+$', name):
-                raise ValueError(f"Ungültige Disziplin: {name}")
-
-        # Existenz prüfen oder neu anlegen
-        disc = Discipline.query.filter_by(name=name).first()
-        if not disc:
-            disc = Discipline(name=name)
-            self.db.session.add(disc)
-            self.db.session.commit()
-        return disc
\ No newline at end of file
+        # Validierung (leer/unzulässige Zeichen) vor dem Auflösen
+        self.registry.canonical(name)
+        return self.registry.resolve([name])[0]
+
+    def resolve_disciplines(self, names):
+        """Disziplinen zu einer Namensliste: eine Query, fehlende mit einem INSERT (Commit beim Aufrufer)."""
+        return self.registry.resolve(names)
@@ -42,11 +42,22 @@ logger.info(f'Using DB URL for migrations: {db_url}')
 
 # Metadata aus den Modellen importieren
 try:
-    from models import db
+    from models import db, ARTIST_SEARCH_INDEXES, ARTIST_SEARCH_TABLES
     target_metadata = db.metadata
 except ImportError:
     logger.error('Konnte models.db nicht importieren; Migrationen werden nicht funktionieren')
     target_metadata = None
+    ARTIST_SEARCH_TABLES = ARTIST_SEARCH_INDEXES = ()
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # Volltextsuche: FTS5-Tabelle samt Schattentabellen (SQLite) bzw. GIN-/Trigram-Indizes (PostgreSQL)
+    # entstehen per DDL, nicht aus der Metadata – Autogenerate soll sie nicht als entfernt melden
+    if type_ == 'table' and name in ARTIST_SEARCH_TABLES:
+        return False
+    if type_ == 'index' and name in ARTIST_SEARCH_INDEXES:
+        return False
+    return True
 
 
 def run_migrations_offline():
@@ -54,6 +65,7 @@ def run_migrations_offline():
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={'paramstyle': 'named'},
     )
@@ -74,6 +86,7 @@ def run_migrations_online():
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,46 @@
+"""add request_events table (SSE stream for artists)
+
+Revision ID: 4e8a1c6d2f57
+Revises: 9b3f5e21c7d4
+Create Date: 2026-10-19 13:41:05.227190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '4e8a1c6d2f57'
+down_revision = '9b3f5e21c7d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if 'request_events' not in inspector.get_table_names():
+        op.create_table(
+            'request_events',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('artist_id', sa.Integer(), nullable=False),
+            sa.Column('booking_id', sa.Integer(), nullable=False),
+            sa.Column('event_type', sa.String(length=40), nullable=False),
+            sa.Column('payload', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_request_events_artist_id_id', 'request_events', ['artist_id', 'id'], unique=False)
+        op.create_index('ix_request_events_created_at', 'request_events', ['created_at'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if 'request_events' in inspector.get_table_names():
+        op.drop_index('ix_request_events_created_at', table_name='request_events')
+        op.drop_index('ix_request_events_artist_id_id', table_name='request_events')
+        op.drop_table('request_events')
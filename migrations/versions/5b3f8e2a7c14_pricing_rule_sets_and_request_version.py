@@ -0,0 +1,53 @@
+"""pricing_rule_sets table and booking_requests.pricing_version
+
+Revision ID: 5b3f8e2a7c14
+Revises: 7d2c9e4b1a63
+Create Date: 2026-10-19 17:42:10.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '5b3f8e2a7c14'
+down_revision = '7d2c9e4b1a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if 'pricing_rule_sets' not in inspector.get_table_names():
+        op.create_table(
+            'pricing_rule_sets',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('rules', sa.JSON(), nullable=False),
+            sa.Column('note', sa.String(length=200), nullable=True),
+            sa.Column('created_by', sa.String(length=120), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('version'),
+        )
+
+    request_columns = [col['name'] for col in inspector.get_columns('booking_requests')]
+    if 'pricing_version' not in request_columns:
+        with op.batch_alter_table('booking_requests', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('pricing_version', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    request_columns = [col['name'] for col in inspector.get_columns('booking_requests')]
+    if 'pricing_version' in request_columns:
+        with op.batch_alter_table('booking_requests', schema=None) as batch_op:
+            batch_op.drop_column('pricing_version')
+
+    if 'pricing_rule_sets' in inspector.get_table_names():
+        op.drop_table('pricing_rule_sets')
@@ -0,0 +1,56 @@
+"""availability_version on artists and availability_changes log (delta sync)
+
+Revision ID: 7d2c9e4b1a63
+Revises: 4e8a1c6d2f57
+Create Date: 2026-10-19 15:20:48.913006
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2c9e4b1a63'
+down_revision = '4e8a1c6d2f57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    artist_columns = [col['name'] for col in inspector.get_columns('artists')]
+    if 'availability_version' not in artist_columns:
+        with op.batch_alter_table('artists', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('availability_version', sa.Integer(), nullable=False, server_default='0'))
+
+    if 'availability_changes' not in inspector.get_table_names():
+        op.create_table(
+            'availability_changes',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('artist_id', sa.Integer(), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('op', sa.String(length=7), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['artist_id'], ['artists.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_availability_changes_artist_version', 'availability_changes',
+                        ['artist_id', 'version'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if 'availability_changes' in inspector.get_table_names():
+        op.drop_index('ix_availability_changes_artist_version', table_name='availability_changes')
+        op.drop_table('availability_changes')
+
+    artist_columns = [col['name'] for col in inspector.get_columns('artists')]
+    if 'availability_version' in artist_columns:
+        with op.batch_alter_table('artists', schema=None) as batch_op:
+            batch_op.drop_column('availability_version')
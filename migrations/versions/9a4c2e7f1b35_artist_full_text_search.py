@@ -0,0 +1,100 @@
+"""artist full-text search: FTS5 table + triggers (SQLite), tsvector/trigram indexes (PostgreSQL),
+discipline -> artist index for the search facets
+
+Revision ID: 9a4c2e7f1b35
+Revises: 5b3f8e2a7c14
+Create Date: 2026-10-19 19:05:33.510927
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4c2e7f1b35'
+down_revision = '5b3f8e2a7c14'
+branch_labels = None
+depends_on = None
+
+DISCIPLINE_NAMES = (
+    "SELECT coalesce(group_concat(d.name, ' '), '') FROM artist_disciplines ad "
+    "JOIN disciplines d ON d.id = ad.discipline_id WHERE ad.artist_id = {artist_id}"
+)
+
+SQLITE_TRIGGERS = {
+    'artist_search_ai': (
+        "CREATE TRIGGER artist_search_ai AFTER INSERT ON artists BEGIN "
+        "INSERT INTO artist_search(rowid, name, bio, address, disciplines) "
+        "VALUES (new.id, new.name, coalesce(new.bio, ''), coalesce(new.address, ''), ''); END"
+    ),
+    'artist_search_au': (
+        "CREATE TRIGGER artist_search_au AFTER UPDATE OF name, bio, address ON artists BEGIN "
+        "UPDATE artist_search SET name = new.name, bio = coalesce(new.bio, ''), address = coalesce(new.address, '') "
+        "WHERE rowid = new.id; END"
+    ),
+    'artist_search_ad': (
+        "CREATE TRIGGER artist_search_ad AFTER DELETE ON artists BEGIN "
+        "DELETE FROM artist_search WHERE rowid = old.id; END"
+    ),
+    'artist_search_disc_ai': (
+        "CREATE TRIGGER artist_search_disc_ai AFTER INSERT ON artist_disciplines BEGIN "
+        "UPDATE artist_search SET disciplines = (" + DISCIPLINE_NAMES.format(artist_id="new.artist_id") + ") "
+        "WHERE rowid = new.artist_id; END"
+    ),
+    'artist_search_disc_ad': (
+        "CREATE TRIGGER artist_search_disc_ad AFTER DELETE ON artist_disciplines BEGIN "
+        "UPDATE artist_search SET disciplines = (" + DISCIPLINE_NAMES.format(artist_id="old.artist_id") + ") "
+        "WHERE rowid = old.artist_id; END"
+    ),
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if 'ix_artist_disciplines_discipline_artist' not in {ix['name'] for ix in inspector.get_indexes('artist_disciplines')}:
+        op.create_index('ix_artist_disciplines_discipline_artist', 'artist_disciplines', ['discipline_id', 'artist_id'], unique=False)
+
+    if bind.dialect.name == 'sqlite':
+        if 'artist_search' not in inspector.get_table_names():
+            op.execute(
+                "CREATE VIRTUAL TABLE artist_search USING fts5("
+                "name, bio, address, disciplines, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            op.execute(
+                "INSERT INTO artist_search(rowid, name, bio, address, disciplines) "
+                "SELECT a.id, a.name, coalesce(a.bio, ''), coalesce(a.address, ''), ("
+                + DISCIPLINE_NAMES.format(artist_id="a.id") + ") FROM artists a"
+            )
+        existing = {row[0] for row in bind.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        for name, ddl in SQLITE_TRIGGERS.items():
+            if name not in existing:
+                op.execute(ddl)
+    elif bind.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        indexes = {ix['name'] for ix in inspector.get_indexes('artists')}
+        if 'ix_artists_search_tsv' not in indexes:
+            op.execute(
+                "CREATE INDEX ix_artists_search_tsv ON artists USING gin ("
+                "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(bio, '') || ' ' || coalesce(address, '')))"
+            )
+        if 'ix_artists_name_trgm' not in indexes:
+            op.execute("CREATE INDEX ix_artists_name_trgm ON artists USING gin (name gin_trgm_ops)")
+        if 'ix_artists_address_trgm' not in indexes:
+            op.execute("CREATE INDEX ix_artists_address_trgm ON artists USING gin (address gin_trgm_ops)")
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS artist_search")
+    elif bind.dialect.name == 'postgresql':
+        for name in ('ix_artists_address_trgm', 'ix_artists_name_trgm', 'ix_artists_search_tsv'):
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    if 'ix_artist_disciplines_discipline_artist' in {ix['name'] for ix in inspect(bind).get_indexes('artist_disciplines')}:
+        op.drop_index('ix_artist_disciplines_discipline_artist', table_name='artist_disciplines')
@@ -0,0 +1,46 @@
+"""add processing_status/processing_error to booking_requests (async ingest)
+
+Revision ID: 9b3f5e21c7d4
+Revises: c41d7e2a9b10
+Create Date: 2026-10-19 11:02:17.540331
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3f5e21c7d4'
+down_revision = 'c41d7e2a9b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    columns = [col['name'] for col in inspector.get_columns('booking_requests')]
+    with op.batch_alter_table('booking_requests', schema=None) as batch_op:
+        if 'processing_status' not in columns:
+            # Bestandsdaten wurden synchron verarbeitet -> 'done'
+            batch_op.add_column(sa.Column('processing_status', sa.String(length=20), nullable=False, server_default='done'))
+            batch_op.create_index('ix_booking_requests_processing_status', ['processing_status'], unique=False)
+        if 'processing_error' not in columns:
+            batch_op.add_column(sa.Column('processing_error', sa.Text(), nullable=True))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    columns = [col['name'] for col in inspector.get_columns('booking_requests')]
+    indexes = {ix['name'] for ix in inspector.get_indexes('booking_requests')}
+    with op.batch_alter_table('booking_requests', schema=None) as batch_op:
+        if 'processing_error' in columns:
+            batch_op.drop_column('processing_error')
+        if 'processing_status' in columns:
+            if 'ix_booking_requests_processing_status' in indexes:
+                batch_op.drop_index('ix_booking_requests_processing_status')
+            batch_op.drop_column('processing_status')
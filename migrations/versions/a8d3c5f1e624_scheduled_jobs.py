@@ -0,0 +1,68 @@
+"""scheduled_jobs (lock/schedule per maintenance job) and scheduled_job_runs (run history)
+
+Revision ID: a8d3c5f1e624
+Revises: f2a6d0b7e359
+Create Date: 2026-10-19 23:04:18.552391
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d3c5f1e624'
+down_revision = 'f2a6d0b7e359'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'scheduled_jobs' not in tables:
+        op.create_table(
+            'scheduled_jobs',
+            sa.Column('name', sa.String(length=80), nullable=False),
+            sa.Column('cron', sa.String(length=60), nullable=False),
+            sa.Column('next_run_at', sa.DateTime(), nullable=False),
+            sa.Column('locked_by', sa.String(length=120), nullable=True),
+            sa.Column('locked_until', sa.DateTime(), nullable=True),
+            sa.Column('state', sa.JSON(), nullable=True),
+            sa.PrimaryKeyConstraint('name'),
+        )
+
+    if 'scheduled_job_runs' not in tables:
+        op.create_table(
+            'scheduled_job_runs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('job', sa.String(length=80), nullable=False),
+            sa.Column('host', sa.String(length=120), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('trigger', sa.String(length=20), nullable=False),
+            sa.Column('rows', sa.JSON(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=False),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.Column('duration_ms', sa.Integer(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+    indexes = {ix['name'] for ix in inspect(bind).get_indexes('scheduled_job_runs')}
+    if 'ix_scheduled_job_runs_job_id' not in indexes:
+        op.create_index('ix_scheduled_job_runs_job_id', 'scheduled_job_runs', ['job', 'id'], unique=False)
+    if 'ix_scheduled_job_runs_started_at' not in indexes:
+        op.create_index('ix_scheduled_job_runs_started_at', 'scheduled_job_runs', ['started_at'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'scheduled_job_runs' in tables:
+        op.drop_table('scheduled_job_runs')
+    if 'scheduled_jobs' in tables:
+        op.drop_table('scheduled_jobs')
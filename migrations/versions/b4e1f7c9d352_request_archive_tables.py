@@ -0,0 +1,102 @@
+"""archive tables for closed booking requests, their artist links and admin offers
+
+Revision ID: b4e1f7c9d352
+Revises: a8d3c5f1e624
+Create Date: 2026-10-19 23:41:07.204583
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e1f7c9d352'
+down_revision = 'a8d3c5f1e624'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'archived_booking_requests' not in tables:
+        op.create_table(
+            'archived_booking_requests',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('client_name', sa.String(length=100), nullable=False),
+            sa.Column('client_email', sa.String(length=120), nullable=False),
+            sa.Column('event_type', sa.String(length=50), nullable=False),
+            sa.Column('show_type', sa.String(length=50), nullable=False),
+            sa.Column('show_discipline', sa.Text(), nullable=False),
+            sa.Column('team_size', sa.String(length=10), nullable=False),
+            sa.Column('number_of_guests', sa.Integer(), nullable=True),
+            sa.Column('event_address', sa.String(length=200), nullable=True),
+            sa.Column('event_lat', sa.Float(), nullable=True),
+            sa.Column('event_lon', sa.Float(), nullable=True),
+            sa.Column('is_indoor', sa.Boolean(), nullable=True),
+            sa.Column('event_date', sa.Date(), nullable=False),
+            sa.Column('event_time', sa.Time(), nullable=True),
+            sa.Column('duration_minutes', sa.Integer(), nullable=False),
+            sa.Column('special_requests', sa.Text(), nullable=True),
+            sa.Column('needs_light', sa.Boolean(), nullable=True),
+            sa.Column('needs_sound', sa.Boolean(), nullable=True),
+            sa.Column('distance_km', sa.Float(), nullable=False),
+            sa.Column('newsletter_opt_in', sa.Boolean(), nullable=True),
+            sa.Column('price_min', sa.Integer(), nullable=True),
+            sa.Column('price_max', sa.Integer(), nullable=True),
+            sa.Column('price_offered', sa.Integer(), nullable=True),
+            sa.Column('artist_gage', sa.Integer(), nullable=True),
+            sa.Column('artist_offer_date', sa.DateTime(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('accepted_at', sa.DateTime(), nullable=True),
+            sa.Column('processing_status', sa.String(length=20), nullable=False),
+            sa.Column('processing_error', sa.Text(), nullable=True),
+            sa.Column('pricing_version', sa.Integer(), nullable=True),
+            sa.Column('archived_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_archived_booking_requests_event_date_id', 'archived_booking_requests',
+                        ['event_date', 'id'], unique=False)
+        op.create_index('ix_archived_booking_requests_status_id', 'archived_booking_requests',
+                        ['status', 'id'], unique=False)
+
+    if 'archived_booking_artists' not in tables:
+        op.create_table(
+            'archived_booking_artists',
+            sa.Column('booking_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('artist_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('requested_gage', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('comment', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('booking_id', 'artist_id'),
+        )
+        op.create_index('ix_archived_booking_artists_artist_booking', 'archived_booking_artists',
+                        ['artist_id', 'booking_id'], unique=False)
+
+    if 'archived_admin_offers' not in tables:
+        op.create_table(
+            'archived_admin_offers',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('request_id', sa.Integer(), nullable=False),
+            sa.Column('admin_id', sa.Integer(), nullable=False),
+            sa.Column('override_price', sa.Integer(), nullable=False),
+            sa.Column('notes', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_archived_admin_offers_request_id', 'archived_admin_offers', ['request_id'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    for name in ('archived_admin_offers', 'archived_booking_artists', 'archived_booking_requests'):
+        if name in tables:
+            op.drop_table(name)
@@ -0,0 +1,48 @@
+"""add background_jobs table (pollable admin background jobs)
+
+Revision ID: c3e7a1d94b26
+Revises: 9a4c2e7f1b35
+Create Date: 2026-10-19 20:12:44.091532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e7a1d94b26'
+down_revision = '9a4c2e7f1b35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if 'background_jobs' not in inspector.get_table_names():
+        op.create_table(
+            'background_jobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('kind', sa.String(length=60), nullable=False),
+            sa.Column('status', sa.String(length=20), server_default='queued', nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=True),
+            sa.Column('result', sa.JSON(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('created_by', sa.String(length=120), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_background_jobs_status_created', 'background_jobs', ['status', 'created_at'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if 'background_jobs' in inspector.get_table_names():
+        op.drop_index('ix_background_jobs_status_created', table_name='background_jobs')
+        op.drop_table('background_jobs')
@@ -0,0 +1,46 @@
+"""composite indexes for booking_artists, availabilities and artists hot lookups
+
+Revision ID: c41d7e2a9b10
+Revises: 7759e31194a7
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d7e2a9b10'
+down_revision = '7759e31194a7'
+branch_labels = None
+depends_on = None
+
+# (table, index name, columns)
+INDEXES = [
+    ('booking_artists', 'ix_booking_artists_artist_status', ['artist_id', 'status']),
+    ('availabilities', 'ix_availabilities_date_artist', ['date', 'artist_id']),
+    ('artists', 'ix_artists_approval_status', ['approval_status']),
+]
+
+
+def _existing_indexes(inspector, table):
+    return {ix['name'] for ix in inspector.get_indexes(table)}
+
+
+def upgrade():
+    """Covering indexes for lookups that don't match the leading PK/unique columns."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table, name, columns in INDEXES:
+        if name not in _existing_indexes(inspector, table):
+            op.create_index(name, table, columns, unique=False)
+    # supabase_user_id ist bereits über uq_artists_supabase_user_id indiziert – nichts zu tun.
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table, name, _columns in reversed(INDEXES):
+        if name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
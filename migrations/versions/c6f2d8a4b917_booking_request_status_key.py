@@ -0,0 +1,42 @@
+"""booking_requests.status_key_hash (key for the public ingest status endpoint)
+
+Revision ID: c6f2d8a4b917
+Revises: b4e1f7c9d352
+Create Date: 2026-10-20 09:12:44.318502
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f2d8a4b917'
+down_revision = 'b4e1f7c9d352'
+branch_labels = None
+depends_on = None
+
+# Das Archiv führt dieselben Spalten wie booking_requests
+TABLES = ('booking_requests', 'archived_booking_requests')
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table in TABLES:
+        if table not in inspector.get_table_names():
+            continue
+        if 'status_key_hash' not in [col['name'] for col in inspector.get_columns(table)]:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.add_column(sa.Column('status_key_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table in TABLES:
+        if table not in inspector.get_table_names():
+            continue
+        if 'status_key_hash' in [col['name'] for col in inspector.get_columns(table)]:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.drop_column('status_key_hash')
@@ -0,0 +1,119 @@
+"""normalize booking_requests.show_discipline into booking_request_disciplines
+
+Revision ID: d5b8f3a61c07
+Revises: c3e7a1d94b26
+Create Date: 2026-10-19 21:04:17.552310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5b8f3a61c07'
+down_revision = 'c3e7a1d94b26'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# Stand von managers.discipline_manager.ALLOWED_DISCIPLINES: neue Anfragen verknüpfen nur diese Namen
+# (discipline_registry.resolve(known(...))), die Migration behandelt alte Anfragen genauso
+ALLOWED_DISCIPLINES = [
+    "Zauberer", "Cyr-Wheel", "Bodenakrobatik", "Luftakrobatik", "Partnerakrobatik", "Chinese Pole",
+    "Hula Hoop", "Handstand", "Contemporary Dance", "Breakdance", "Teeterboard", "Jonglage",
+    "Moderation", "Pantomime",
+]
+
+booking_requests = sa.table(
+    'booking_requests',
+    sa.column('id', sa.Integer),
+    sa.column('show_discipline', sa.Text),
+)
+disciplines = sa.table(
+    'disciplines',
+    sa.column('id', sa.Integer),
+    sa.column('name', sa.String),
+)
+links = sa.table(
+    'booking_request_disciplines',
+    sa.column('booking_id', sa.Integer),
+    sa.column('discipline_id', sa.Integer),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if 'booking_request_disciplines' not in inspector.get_table_names():
+        op.create_table(
+            'booking_request_disciplines',
+            sa.Column('booking_id', sa.Integer(), nullable=False),
+            sa.Column('discipline_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['booking_id'], ['booking_requests.id']),
+            sa.ForeignKeyConstraint(['discipline_id'], ['disciplines.id']),
+            sa.PrimaryKeyConstraint('booking_id', 'discipline_id'),
+        )
+        op.create_index(
+            'ix_booking_request_disciplines_discipline_booking', 'booking_request_disciplines',
+            ['discipline_id', 'booking_id'], unique=False,
+        )
+
+    _backfill(bind)
+
+
+def _backfill(bind):
+    """
+    show_discipline (kommagetrennt) in Batches nach id parsen. Wie bei neuen Anfragen zählen nur erlaubte
+    Disziplinen (offizielle Schreibweise); fehlt eine davon in `disciplines`, wird sie angelegt.
+    """
+    allowed = {name.casefold(): name for name in ALLOWED_DISCIPLINES}
+    ids_by_name = {name.strip().casefold(): disc_id for disc_id, name in bind.execute(sa.select(disciplines.c.id, disciplines.c.name))}
+
+    def discipline_id(raw):
+        key = raw.strip().casefold()
+        if key not in allowed:
+            return None
+        if key not in ids_by_name:
+            bind.execute(sa.insert(disciplines).values(name=allowed[key]))
+            ids_by_name[key] = bind.execute(
+                sa.select(disciplines.c.id).where(disciplines.c.name == allowed[key])
+            ).scalar_one()
+        return ids_by_name[key]
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(booking_requests.c.id, booking_requests.c.show_discipline)
+            .where(booking_requests.c.id > last_id)
+            .order_by(booking_requests.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        # erneuter Lauf (z. B. nach Abbruch) legt keine doppelten Zeilen an
+        existing = set(bind.execute(
+            sa.select(links.c.booking_id, links.c.discipline_id)
+            .where(links.c.booking_id.in_([r.id for r in rows]))
+        ).all())
+        values = []
+        for row in rows:
+            for name in (row.show_discipline or '').split(','):
+                disc_id = discipline_id(name)
+                if disc_id is not None and (row.id, disc_id) not in existing:
+                    existing.add((row.id, disc_id))
+                    values.append({'booking_id': row.id, 'discipline_id': disc_id})
+        if values:
+            bind.execute(sa.insert(links), values)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if 'booking_request_disciplines' in inspector.get_table_names():
+        op.drop_index('ix_booking_request_disciplines_discipline_booking', table_name='booking_request_disciplines')
+        op.drop_table('booking_request_disciplines')
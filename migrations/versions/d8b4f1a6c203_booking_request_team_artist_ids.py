@@ -0,0 +1,42 @@
+"""booking_requests.team_artist_ids (team chosen when pricing duo/group requests)
+
+Revision ID: d8b4f1a6c203
+Revises: c6f2d8a4b917
+Create Date: 2026-10-20 11:03:27.905114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b4f1a6c203'
+down_revision = 'c6f2d8a4b917'
+branch_labels = None
+depends_on = None
+
+# Das Archiv führt dieselben Spalten wie booking_requests
+TABLES = ('booking_requests', 'archived_booking_requests')
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table in TABLES:
+        if table not in inspector.get_table_names():
+            continue
+        if 'team_artist_ids' not in [col['name'] for col in inspector.get_columns(table)]:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.add_column(sa.Column('team_artist_ids', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table in TABLES:
+        if table not in inspector.get_table_names():
+            continue
+        if 'team_artist_ids' in [col['name'] for col in inspector.get_columns(table)]:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.drop_column('team_artist_ids')
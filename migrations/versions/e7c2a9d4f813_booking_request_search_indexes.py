@@ -0,0 +1,43 @@
+"""indexes for the admin booking request search (date keyset, geo bounding box)
+
+Revision ID: e7c2a9d4f813
+Revises: d5b8f3a61c07
+Create Date: 2026-10-19 21:47:09.310584
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c2a9d4f813'
+down_revision = 'd5b8f3a61c07'
+branch_labels = None
+depends_on = None
+
+# (table, index name, columns)
+INDEXES = [
+    ('booking_requests', 'ix_booking_requests_event_date_id', ['event_date', 'id']),
+    ('booking_requests', 'ix_booking_requests_event_lat_lon', ['event_lat', 'event_lon']),
+]
+
+
+def _existing_indexes(inspector, table):
+    return {ix['name'] for ix in inspector.get_indexes(table)}
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table, name, columns in INDEXES:
+        if name not in _existing_indexes(inspector, table):
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    for table, name, _columns in reversed(INDEXES):
+        if name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,31 @@
+"""index on artists (lat, lon) for the admin map bounding box
+
+Revision ID: f2a6d0b7e359
+Revises: e7c2a9d4f813
+Create Date: 2026-10-19 22:31:52.640117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6d0b7e359'
+down_revision = 'e7c2a9d4f813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'ix_artists_lat_lon' not in {ix['name'] for ix in inspector.get_indexes('artists')}:
+        op.create_index('ix_artists_lat_lon', 'artists', ['lat', 'lon'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if 'ix_artists_lat_lon' in {ix['name'] for ix in inspector.get_indexes('artists')}:
+        op.drop_index('ix_artists_lat_lon', table_name='artists')
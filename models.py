@@ -2,8 +2,11 @@ from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin 
 from datetime import datetime
+from sqlalchemy import DDL, event
+from helpers.db_routing import RoutingSession
 
-db = SQLAlchemy()
+# RoutingSession: Lesezugriffe von @read_replica-Views dürfen auf ein Read-Replica gehen
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 # Association-Tabelle: Many-to-Many zwischen BookingRequest und Artist
 # mit zusätzlichem Feld 'requested_gage' für das angefragte Honorar.
@@ -13,7 +16,9 @@ booking_artists = db.Table(
     db.Column('artist_id',  db.Integer, db.ForeignKey('artists.id'), primary_key=True),
     db.Column('requested_gage', db.Integer, nullable=True),
     db.Column('status', db.String(20), nullable=False, server_default='angefragt'),
-    db.Column('comment', db.Text, nullable=True)
+    db.Column('comment', db.Text, nullable=True),
+    # Artist-Postfach: PK beginnt mit booking_id, Lookups laufen aber über artist_id (+status)
+    db.Index('ix_booking_artists_artist_status', 'artist_id', 'status'),
 )
 
 
@@ -21,7 +26,20 @@ booking_artists = db.Table(
 artist_disciplines = db.Table(
     'artist_disciplines',
     db.Column('artist_id', db.Integer, db.ForeignKey('artists.id'), primary_key=True),
-    db.Column('discipline_id', db.Integer, db.ForeignKey('disciplines.id'), primary_key=True)
+    db.Column('discipline_id', db.Integer, db.ForeignKey('disciplines.id'), primary_key=True),
+    # Disziplin -> Artists (Disziplin-Filter und Facetten der Artist-Suche)
+    db.Index('ix_artist_disciplines_discipline_artist', 'discipline_id', 'artist_id'),
+)
+
+
+# Association-Tabelle: Many-to-Many zwischen BookingRequest und Discipline
+# (normalisierte Form von booking_requests.show_discipline für Filter und Auswertungen).
+booking_request_disciplines = db.Table(
+    'booking_request_disciplines',
+    db.Column('booking_id', db.Integer, db.ForeignKey('booking_requests.id'), primary_key=True),
+    db.Column('discipline_id', db.Integer, db.ForeignKey('disciplines.id'), primary_key=True),
+    # Disziplin -> Anfragen (Admin-Filter und Auswertungen je Disziplin)
+    db.Index('ix_booking_request_disciplines_discipline_booking', 'discipline_id', 'booking_id'),
 )
 
 
@@ -35,6 +53,10 @@ class Discipline(db.Model):
 class Artist(UserMixin, db.Model):
     """Artist-Profil mit persönlichen Daten, Login-Info, öffentlichem Profil (Bild & Bio) und Beziehungen zu Disziplinen und Buchungsanfragen."""
     __tablename__ = 'artists'
+    __table_args__ = (
+        # Admin-Karte: Bounding-Box über die Koordinaten
+        db.Index('ix_artists_lat_lon', 'lat', 'lon'),
+    )
     id             = db.Column(db.Integer, primary_key=True)
     name           = db.Column(db.String(100), nullable=False)
     email          = db.Column(db.String(120), nullable=False, unique=True)
@@ -50,7 +72,7 @@ class Artist(UserMixin, db.Model):
     supabase_user_id = db.Column(db.String(255), unique=True, nullable=True)
 
     # Admin-Freigabe
-    approval_status  = db.Column(db.String(20), nullable=False, server_default='unsubmitted')  # unsubmitted | pending | approved | rejected
+    approval_status  = db.Column(db.String(20), nullable=False, server_default='unsubmitted', index=True)  # unsubmitted | pending | approved | rejected
     rejection_reason = db.Column(db.Text, nullable=True)
     approved_at      = db.Column(db.DateTime, nullable=True)
     approved_by      = db.Column(db.Integer, db.ForeignKey('artists.id'), nullable=True)
@@ -67,6 +89,8 @@ class Artist(UserMixin, db.Model):
     instagram = db.Column(db.String(255), nullable=True)
     gallery_urls = db.Column(db.JSON, nullable=True, default=list)
 
+    # Delta-Sync des Kalenders: steigt bei jeder Änderung der Verfügbarkeiten (siehe AvailabilityChange)
+    availability_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # Beziehung: Ein Artist kann mehrere Disziplinen haben, und jede Disziplin kann mehreren Artists zugeordnet sein.
     disciplines    = db.relationship(
@@ -92,13 +116,18 @@ class Artist(UserMixin, db.Model):
 class BookingRequest(db.Model):
     """Buchungsanfrage eines Clients mit Details wie Datum, Ort, Disziplinen und zugeordnete Artists."""
     __tablename__ = 'booking_requests'
+    __table_args__ = (
+        # Admin-Suche: Datumsbereich + Keyset (event_date, id) und Bounding-Box-Vorfilter für den Umkreis
+        db.Index('ix_booking_requests_event_date_id', 'event_date', 'id'),
+        db.Index('ix_booking_requests_event_lat_lon', 'event_lat', 'event_lon'),
+    )
     id                 = db.Column(db.Integer, primary_key=True)
     client_name        = db.Column(db.String(100), nullable=False)
     client_email       = db.Column(db.String(120), nullable=False)
 
     event_type         = db.Column(db.String(50), nullable=False)   # z.B. privat
     show_type          = db.Column(db.String(50), nullable=False)  # z.B. Walking Act oder Bühnen Show
-    show_discipline    = db.Column(db.Text, nullable=False)
+    show_discipline    = db.Column(db.Text, nullable=False)  # kommagetrennt (Anzeige), normalisiert in booking_request_disciplines
     team_size          = db.Column(db.String(10), nullable=False)   
     number_of_guests   = db.Column(db.Integer, nullable=True)       
     event_address      = db.Column(db.String(200), nullable=True)   
@@ -125,6 +154,15 @@ class BookingRequest(db.Model):
     created_at        = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at        = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     accepted_at       = db.Column(db.DateTime, nullable=True)
+    # Asynchrone Anlage (BOOKING_INGEST_MODE=async): pending | processing | done | failed
+    processing_status = db.Column(db.String(20), nullable=False, default='done', server_default='done', index=True)
+    processing_error  = db.Column(db.Text, nullable=True)
+    # SHA-256 des Status-Schlüssels aus der 202-Antwort; nur damit ist GET .../status lesbar
+    status_key_hash   = db.Column(db.String(64), nullable=True)
+    # Version der Preisregeln (pricing_rule_sets.version), mit der price_min/max berechnet wurden; NULL = eingebaute Standardregeln
+    pricing_version   = db.Column(db.Integer, nullable=True)
+    # Beim Bepreisen gewähltes Duo/Team (Artist-IDs); Status-Endpoint und Benachrichtigung lesen es statt neu zu optimieren
+    team_artist_ids   = db.Column(db.JSON, nullable=True)
 
     # Beziehung: Eine Buchungsanfrage kann mehrere Artists involvieren und vice versa.
     artists          = db.relationship(
@@ -132,12 +170,16 @@ class BookingRequest(db.Model):
         secondary=booking_artists,
         back_populates='bookings'
     )
+    # Normalisierte Disziplinen der Anfrage (gepflegt vom BookingRequestManager)
+    disciplines      = db.relationship('Discipline', secondary=booking_request_disciplines)
 
 class Availability(db.Model):
     """Verfügbarkeitstag eines Artists für (ganztägige) Buchungen."""
     __tablename__ = 'availabilities'
     __table_args__ = (
         db.UniqueConstraint('artist_id', 'date', name='uq_artist_date'),
+        # Matching & Cron filtern nur nach Datum – uq_artist_date beginnt mit artist_id
+        db.Index('ix_availabilities_date_artist', 'date', 'artist_id'),
     )
     id           = db.Column(db.Integer, primary_key=True)
     artist_id    = db.Column(db.Integer, db.ForeignKey('artists.id'), nullable=False)
@@ -150,6 +192,31 @@ class Availability(db.Model):
     )
 
 
+class AvailabilityChange(db.Model):
+    """Änderungsprotokoll der Verfügbarkeiten je Artist-Version (Grundlage für GET /api/availability?since=)."""
+    __tablename__ = 'availability_changes'
+    __table_args__ = (
+        db.Index('ix_availability_changes_artist_version', 'artist_id', 'version'),
+    )
+    id         = db.Column(db.Integer, primary_key=True)
+    artist_id  = db.Column(db.Integer, db.ForeignKey('artists.id', ondelete='CASCADE'), nullable=False)
+    version    = db.Column(db.Integer, nullable=False)
+    date       = db.Column(db.Date, nullable=False)
+    op         = db.Column(db.String(7), nullable=False)  # added | removed
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class PricingRuleSet(db.Model):
+    """Veröffentlichte Version der Preisregeln (JSON); die höchste Version ist aktiv."""
+    __tablename__ = 'pricing_rule_sets'
+    id         = db.Column(db.Integer, primary_key=True)
+    version    = db.Column(db.Integer, nullable=False, unique=True)
+    rules      = db.Column(db.JSON, nullable=False)
+    note       = db.Column(db.String(200), nullable=True)
+    created_by = db.Column(db.String(120), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
 class AdminOffer(db.Model):
     """Verwaltungs-Angebot eines Admin-Users für eine Buchungsanfrage."""
     __tablename__ = 'admin_offers'
@@ -197,4 +264,155 @@ class Invoice(db.Model):
     artist = db.relationship(
         'Artist',
         backref=db.backref('invoices', cascade='all, delete-orphan')
-    )
\ No newline at end of file
+    )
+
+class RequestEvent(db.Model):
+    """Änderungs-Event an einer Buchungsanfrage für genau einen Artist (SSE-Stream, Multi-Worker-Fallback)."""
+    __tablename__ = 'request_events'
+    __table_args__ = (
+        # Stream-Abfrage: WHERE artist_id = ? AND id > ? ORDER BY id
+        db.Index('ix_request_events_artist_id_id', 'artist_id', 'id'),
+    )
+
+    id         = db.Column(db.Integer, primary_key=True)
+    artist_id  = db.Column(db.Integer, nullable=False)   # bewusst ohne FK: Events überleben gelöschte Artists/Anfragen
+    booking_id = db.Column(db.Integer, nullable=False)
+    event_type = db.Column(db.String(40), nullable=False)  # request.created | request.artist_status | request.status | request.deleted
+    payload    = db.Column(db.Text, nullable=True)         # JSON
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+
+class BackgroundJob(db.Model):
+    """Hintergrund-Job (z. B. Verfügbarkeiten nach Sammel-Freigabe auffüllen); die UI pollt den Status per ID."""
+    __tablename__ = 'background_jobs'
+    __table_args__ = (
+        # Wiederaufnahme liegengebliebener Jobs: WHERE status = 'queued' AND created_at < ? (bzw. status = 'running')
+        db.Index('ix_background_jobs_status_created', 'status', 'created_at'),
+    )
+
+    id          = db.Column(db.Integer, primary_key=True)
+    kind        = db.Column(db.String(60), nullable=False)        # z. B. availability.fill
+    status      = db.Column(db.String(20), nullable=False, default='queued', server_default='queued')  # queued | running | done | failed
+    payload     = db.Column(db.JSON, nullable=True)
+    result      = db.Column(db.JSON, nullable=True)
+    error       = db.Column(db.Text, nullable=True)
+    created_by  = db.Column(db.String(120), nullable=True)
+    created_at  = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at  = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+
+class ScheduledJob(db.Model):
+    """Sperr- und Planungszeile je geplantem Wartungs-Job: nur der Host, der die Zeile per UPDATE beansprucht, führt den Lauf aus."""
+    __tablename__ = 'scheduled_jobs'
+
+    name         = db.Column(db.String(80), primary_key=True)   # z. B. availability.roll_forward
+    cron         = db.Column(db.String(60), nullable=False)     # Ausdruck, aus dem next_run_at berechnet wurde
+    next_run_at  = db.Column(db.DateTime, nullable=False)       # UTC
+    locked_by    = db.Column(db.String(120), nullable=True)     # host:pid:Token des Laufs, der die Sperre hält
+    locked_until = db.Column(db.DateTime, nullable=True)        # abgelaufene Sperren (Absturz) gelten als frei
+    state        = db.Column(db.JSON, nullable=True)            # Fortschritt zwischen Läufen (z. B. Cursor)
+
+
+class ScheduledJobRun(db.Model):
+    """Ein Lauf eines geplanten Jobs mit Dauer und Zeilenzahlen (Admin-Historie)."""
+    __tablename__ = 'scheduled_job_runs'
+    __table_args__ = (
+        # Historie je Job: WHERE job = ? ORDER BY id DESC
+        db.Index('ix_scheduled_job_runs_job_id', 'job', 'id'),
+    )
+
+    id          = db.Column(db.Integer, primary_key=True)
+    job         = db.Column(db.String(80), nullable=False)
+    host        = db.Column(db.String(120), nullable=True)
+    status      = db.Column(db.String(20), nullable=False, default='running')  # running | done | failed
+    trigger     = db.Column(db.String(20), nullable=False, default='schedule')  # schedule | manual
+    rows        = db.Column(db.JSON, nullable=True)          # z. B. {"deleted": 1200}
+    error       = db.Column(db.Text, nullable=True)
+    started_at  = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    duration_ms = db.Column(db.Integer, nullable=True)
+
+
+# -------------------------------------------------------------
+# Archiv abgeschlossener Anfragen (services/retention.py)
+# -------------------------------------------------------------
+# Gleiche Spalten wie die Quelltabelle (ohne FKs/Defaults), damit das Verschieben ein
+# INSERT ... SELECT je Tabelle ist; dazu archived_at. Normalisierte Disziplinen werden nicht
+# archiviert, show_discipline enthält die Namen.
+def _archive_columns(source: db.Table) -> list:
+    return [
+        db.Column(col.name, col.type, primary_key=col.primary_key, nullable=col.nullable, autoincrement=False)
+        for col in source.columns
+    ]
+
+
+archived_booking_requests = db.Table(
+    'archived_booking_requests',
+    *_archive_columns(BookingRequest.__table__),
+    db.Column('archived_at', db.DateTime, nullable=False),
+    # Archiv-Abfrage: Datumsbereich / Status, neueste zuerst
+    db.Index('ix_archived_booking_requests_event_date_id', 'event_date', 'id'),
+    db.Index('ix_archived_booking_requests_status_id', 'status', 'id'),
+)
+
+archived_booking_artists = db.Table(
+    'archived_booking_artists',
+    *_archive_columns(booking_artists),
+    # Archiv je Artist (frühere Auftritte)
+    db.Index('ix_archived_booking_artists_artist_booking', 'artist_id', 'booking_id'),
+)
+
+archived_admin_offers = db.Table(
+    'archived_admin_offers',
+    *_archive_columns(AdminOffer.__table__),
+    db.Index('ix_archived_admin_offers_request_id', 'request_id'),
+)
+
+# -------------------------------------------------------------
+# Volltextsuche über Artists (services/artist_search.py)
+# -------------------------------------------------------------
+# SQLite: FTS5-Tabelle, per Trigger synchron zu artists / artist_disciplines.
+# PostgreSQL: Ausdrucks-GIN-Index (tsvector) + Trigram-Indizes, die der Index selbst aktuell hält.
+# Bei create_all (Tests, lokale DB) hier angelegt; bestehende Datenbanken über die Migration 9a4c2e7f1b35.
+_ARTIST_DISCIPLINE_NAMES = (
+    "SELECT coalesce(group_concat(d.name, ' '), '') FROM artist_disciplines ad "
+    "JOIN disciplines d ON d.id = ad.discipline_id WHERE ad.artist_id = {artist_id}"
+)
+ARTIST_SEARCH_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS artist_search USING fts5("
+    "name, bio, address, disciplines, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS artist_search_ai AFTER INSERT ON artists BEGIN "
+    "INSERT INTO artist_search(rowid, name, bio, address, disciplines) "
+    "VALUES (new.id, new.name, coalesce(new.bio, ''), coalesce(new.address, ''), ''); END",
+    "CREATE TRIGGER IF NOT EXISTS artist_search_au AFTER UPDATE OF name, bio, address ON artists BEGIN "
+    "UPDATE artist_search SET name = new.name, bio = coalesce(new.bio, ''), address = coalesce(new.address, '') "
+    "WHERE rowid = new.id; END",
+    "CREATE TRIGGER IF NOT EXISTS artist_search_ad AFTER DELETE ON artists BEGIN "
+    "DELETE FROM artist_search WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS artist_search_disc_ai AFTER INSERT ON artist_disciplines BEGIN "
+    "UPDATE artist_search SET disciplines = (" + _ARTIST_DISCIPLINE_NAMES.format(artist_id="new.artist_id") + ") "
+    "WHERE rowid = new.artist_id; END",
+    "CREATE TRIGGER IF NOT EXISTS artist_search_disc_ad AFTER DELETE ON artist_disciplines BEGIN "
+    "UPDATE artist_search SET disciplines = (" + _ARTIST_DISCIPLINE_NAMES.format(artist_id="old.artist_id") + ") "
+    "WHERE rowid = old.artist_id; END",
+)
+ARTIST_SEARCH_POSTGRES_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_artists_search_tsv ON artists USING gin ("
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(bio, '') || ' ' || coalesce(address, '')))",
+    "CREATE INDEX IF NOT EXISTS ix_artists_name_trgm ON artists USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_artists_address_trgm ON artists USING gin (address gin_trgm_ops)",
+)
+# Nur per DDL angelegt, nicht Teil der Metadata: Autogenerate ignoriert sie (include_object in migrations/env.py)
+ARTIST_SEARCH_TABLES = (
+    "artist_search", "artist_search_data", "artist_search_idx", "artist_search_content",
+    "artist_search_docsize", "artist_search_config",
+)
+ARTIST_SEARCH_INDEXES = ("ix_artists_search_tsv", "ix_artists_name_trgm", "ix_artists_address_trgm")
+for _statement in ARTIST_SEARCH_SQLITE_DDL:
+    event.listen(db.Model.metadata, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+for _statement in ARTIST_SEARCH_POSTGRES_DDL:
+    event.listen(db.Model.metadata, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+event.listen(db.Model.metadata, 'before_drop', DDL("DROP TABLE IF EXISTS artist_search").execute_if(dialect='sqlite'))
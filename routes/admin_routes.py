@@ -1,18 +1,34 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from helpers.http_responses import error_response
 from flasgger import swag_from
-from managers.booking_requests_manager import BookingRequestManager
-from managers.admin_offer_manager import AdminOfferManager
+from managers.booking_requests_manager import BookingRequestManager, normalize_status
+from managers.admin_offer_manager import AdminOfferManager, AVAILABILITY_FILL_JOB
 from managers.availability_manager import AvailabilityManager
 from managers.artist_manager import ArtistManager
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from models import Artist
+from models import Artist, BookingRequest
 from models import db
 import os
 import logging
+from datetime import date
 import requests
 from urllib.parse import urljoin
 from helpers.authz import admin_required
+from helpers.slow_query_log import slow_query_recorder
+from helpers.db_routing import read_replica
+from helpers.db_pools import pool_bulkheads
+from helpers.serializers import columns_of, project
+from services.pricing_simulation import parse_axis, reference_params, simulate
+from services.pricing_rules import pricing_rules
+from services.artist_search import artist_search
+from services.request_search import request_search
+from services.map_clusters import map_clusters, parse_bbox
+from services.background_jobs import job_queue
+from services.scheduler import scheduler, SCHEDULER_RUN_JOB
+from services.retention import retention
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
+from flask import current_app
 
 
 logger = logging.getLogger(__name__)
@@ -28,6 +44,26 @@ Admin-Angeboten und Dashboard-Daten. Nur für Admin-User zugänglich.
 # Blueprint für alle Admin-Routen mit URL-Prefix /admin
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+# Spalten-Projektionen der Listen-Endpunkte (Feldnamen = Response-Keys)
+ALL_REQUESTS_COLUMNS = (
+    'id', 'client_name', 'client_email', 'event_date', 'event_time', 'duration_minutes',
+    'event_type', 'show_discipline', 'team_size', 'number_of_guests', 'event_address',
+    'is_indoor', 'special_requests', 'needs_light', 'needs_sound', 'status',
+    'price_min', 'price_max', 'price_offered',
+)
+DASHBOARD_OFFER_COLUMNS = (
+    'id', 'client_name', 'client_email', 'event_date', 'event_time', 'team_size',
+    'status', 'created_at', 'price_offered',
+)
+ADMIN_ARTIST_COLUMNS = (
+    'id', 'name', 'email', 'approval_status', 'rejection_reason', 'approved_at',
+    'approved_by', 'profile_image_url', 'gallery_urls', 'bio',
+)
+INVOICE_LIST_COLUMNS = (
+    'id', 'artist_id', 'storage_path', 'status', 'amount_cents', 'currency',
+    'invoice_date', 'created_at', 'updated_at',
+)
+
 # Manager-Instanzen
 request_mgr = BookingRequestManager()
 offer_mgr = AdminOfferManager()
@@ -47,6 +83,7 @@ except Exception:
 # Admin: Invoices – Liste & Patch (Status ändern)
 # -------------------------------------------------------------
 @admin_bp.route('/invoices', methods=['GET'])
+@read_replica
 @jwt_required()
 @admin_required
 @swag_from(SWAG('admin_invoices_get.yml'), validation=False)
@@ -58,23 +95,15 @@ def admin_list_invoices():
         return jsonify([]), 200
 
     try:
-        q = db.session.query(Invoice, Artist).join(Artist, Invoice.artist_id == Artist.id)
-        rows = q.order_by(Invoice.created_at.desc()).all()
-        out = []
-        for inv, artist in rows:
-            out.append({
-                'id': inv.id,
-                'artist_id': inv.artist_id,
-                'artist_name': getattr(artist, 'name', None),
-                'artist_email': getattr(artist, 'email', None),
-                'storage_path': inv.storage_path,
-                'status': getattr(inv, 'status', None),
-                'amount_cents': getattr(inv, 'amount_cents', None),
-                'currency': getattr(inv, 'currency', 'EUR'),
-                'invoice_date': inv.invoice_date.isoformat() if getattr(inv, 'invoice_date', None) else None,
-                'created_at': inv.created_at.isoformat() if getattr(inv, 'created_at', None) else None,
-                'updated_at': inv.updated_at.isoformat() if getattr(inv, 'updated_at', None) else None,
-            })
+        out = project(
+            select(
+                *columns_of(Invoice, INVOICE_LIST_COLUMNS),
+                Artist.name.label('artist_name'),
+                Artist.email.label('artist_email'),
+            )
+            .join(Artist, Invoice.artist_id == Artist.id)
+            .order_by(Invoice.created_at.desc())
+        )
         return jsonify(out), 200
     except Exception as e:
         logger.exception('[ADMIN] list invoices failed: %s', e)
@@ -232,32 +261,114 @@ def admin_invoice_signed_url(invoice_id: int):
 @admin_required
 @swag_from(SWAG('requests_all_get.yml'))
 def list_all_requests():
-    """Gibt alle Buchungsanfragen zurück (Admin-View)."""
-    all_requests = request_mgr.get_all_requests()
-    return jsonify([{
-        'id':                r.id,
-        'client_name':       r.client_name,
-        'client_email':      r.client_email,
-        'event_date':        r.event_date.isoformat(),
-        'event_time':        r.event_time.isoformat() if r.event_time else None,
-        'duration_minutes':  r.duration_minutes,
-        'event_type':        r.event_type,
-        'show_discipline':   r.show_discipline,
-        'team_size':         r.team_size,
-        'number_of_guests':  r.number_of_guests,
-        'event_address':     r.event_address,
-        'is_indoor':         r.is_indoor,
-        'special_requests':  r.special_requests,
-        'needs_light':       r.needs_light,
-        'needs_sound':       r.needs_sound,
-        'status':            r.status,
-        'price_min':         r.price_min,
-        'price_max':         r.price_max,
-        'recommended_price_min': r.price_min,
-        'recommended_price_max': r.price_max,
-        'price_offered':     r.price_offered,
-        'artist_ids': [a.id for a in r.artists]
-    } for r in all_requests])
+    """
+    Gibt alle Buchungsanfragen zurück (Admin-View).
+    Mit `?format=ndjson` bzw. `Accept: application/x-ndjson` wird eine Anfrage pro Zeile gestreamt.
+    """
+    rows = request_mgr.list_requests_projection(ALL_REQUESTS_COLUMNS)
+    for r in rows:
+        r['recommended_price_min'] = r['price_min']
+        r['recommended_price_max'] = r['price_max']
+    if _wants_ndjson():
+        return _ndjson_response(rows)
+    return jsonify(rows)
+
+
+@admin_bp.route('/requests/discipline-stats', methods=['GET'])
+@read_replica
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_requests_discipline_stats_get.yml'), validation=False)
+def request_discipline_stats():
+    """Anzahl Anfragen je Disziplin (gesamt und je Status), optional nach Status und Eventdatum gefiltert."""
+    args = request.args
+    try:
+        date_from = date.fromisoformat(args['date_from']) if args.get('date_from') else None
+        date_to = date.fromisoformat(args['date_to']) if args.get('date_to') else None
+    except ValueError:
+        return error_response('validation_error', 'date_from and date_to must be ISO dates (YYYY-MM-DD)', 400)
+    status = args.get('status') or None
+    if status and not normalize_status(status):
+        return error_response('validation_error', 'Invalid status parameter', 400)
+    items = request_mgr.discipline_stats(status=status, date_from=date_from, date_to=date_to)
+    return jsonify({'items': items}), 200
+
+
+@admin_bp.route('/requests/search', methods=['GET'])
+@read_replica
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_requests_search_get.yml'), validation=False)
+def search_requests():
+    """Gefilterte Anfrage-Suche (Datum, Status, Event-Typ, Disziplin, Teamgröße, Ort, Umkreis) mit Keyset-Paginierung."""
+    args = request.args
+
+    def _list(name):
+        return [v.strip() for value in args.getlist(name) for v in value.split(',') if v.strip()]
+
+    try:
+        date_from = date.fromisoformat(args['date_from']) if args.get('date_from') else None
+        date_to = date.fromisoformat(args['date_to']) if args.get('date_to') else None
+        team_size = int(args['team_size']) if args.get('team_size') else None
+        limit = int(args.get('limit', 50))
+        near, radius_km = None, None
+        if any(args.get(k) for k in ('lat', 'lon', 'radius_km')):
+            near = (float(args['lat']), float(args['lon']))
+            radius_km = float(args['radius_km'])
+    except (KeyError, ValueError):
+        return error_response(
+            'validation_error',
+            'date_from/date_to must be ISO dates, team_size/limit integers, lat/lon/radius_km numbers (all three)',
+            400,
+        )
+    try:
+        result = request_search.search(
+            date_from=date_from, date_to=date_to, status=_list('status'),
+            event_type=(args.get('event_type') or '').strip() or None,
+            disciplines=_list('discipline'), team_size=team_size, city=args.get('city'),
+            near=near, radius_km=radius_km, sort=args.get('sort') or 'created_desc',
+            cursor=args.get('cursor') or None, limit=limit,
+        )
+    except ValueError as ve:
+        return error_response('validation_error', str(ve), 400)
+    return jsonify(result), 200
+
+
+@admin_bp.route('/map/clusters', methods=['GET'])
+@read_replica
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_map_clusters_get.yml'), validation=False)
+def map_clusters_view():
+    """Anfragen und Artists im Kartenausschnitt: Cluster mit Anzahl je Status, einzelne Punkte erst bei hohem Zoom."""
+    args = request.args
+    layers = [v.strip() for value in args.getlist('layers') for v in value.split(',') if v.strip()]
+    try:
+        zoom = int(args['zoom'])
+    except (KeyError, ValueError):
+        return error_response('validation_error', 'zoom is required (integer)', 400)
+    try:
+        result = map_clusters.clusters(parse_bbox(args.get('bbox')), zoom, layers or ('requests', 'artists'))
+    except ValueError as ve:
+        return error_response('validation_error', str(ve), 400)
+    return jsonify(result), 200
+
+
+def _wants_ndjson() -> bool:
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best == 'application/x-ndjson'
+
+
+def _ndjson_response(rows) -> Response:
+    """Streamt Dicts zeilenweise als NDJSON (Kompression erfolgt chunkweise im after_request)."""
+    dumps = current_app.json.dumps
+
+    def generate():
+        for row in rows:
+            yield dumps(row) + '\n'
+
+    return Response(generate(), mimetype='application/x-ndjson')
 
 # AdminOffer CRUD
 @admin_bp.route('/requests/<int:req_id>/admin_offers', methods=['GET'])
@@ -353,41 +464,47 @@ def list_artists_by_status():
             return error_response('validation_error', 'Invalid status parameter', 400)
 
         try:
-            if status == 'pending':
-                artists = artist_mgr.get_pending_artists()
-            elif status == 'approved':
-                artists = artist_mgr.get_approved_artists()
-            elif status == 'rejected':
-                artists = artist_mgr.get_rejected_artists()
-            else:
-                artists = artist_mgr.get_unsubmitted_artists()
+            artists = artist_mgr.list_artists_projection(status, ADMIN_ARTIST_COLUMNS)
         except Exception as ex:
             logger.exception(f"[ADMIN] list_artists_by_status query failed for status={status}: {ex}")
             raise
 
         logger.debug(f"[ADMIN] list_artists_by_status result_count={len(artists)} for status={status}")
-
-        def _serialize(a: Artist):
-            return {
-                'id': a.id,
-                'name': getattr(a, 'name', None),
-                'email': getattr(a, 'email', None),
-                'approval_status': getattr(a, 'approval_status', None),
-                'rejection_reason': getattr(a, 'rejection_reason', None),
-                'approved_at': a.approved_at.isoformat() if getattr(a, 'approved_at', None) else None,
-                'approved_by': getattr(a, 'approved_by', None),
-                'profile_image_url': getattr(a, 'profile_image_url', None),
-                'gallery_urls': getattr(a, 'gallery_urls', []),
-                'disciplines': [d.name for d in getattr(a, 'disciplines', [])] if getattr(a, 'disciplines', None) else [],
-                'bio': getattr(a, 'bio', None),
-            }
-
-        return jsonify([_serialize(a) for a in artists]), 200
+        return jsonify(artists), 200
     except Exception as e:
         logger.exception(f"[ADMIN] list_artists_by_status failed: {e}")
         return error_response('internal_error', 'Unexpected server error', 500)
 
 
+@admin_bp.route('/artists/search', methods=['GET'])
+@read_replica
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_artists_search_get.yml'), validation=False)
+def search_artists():
+    """Volltextsuche über Artists mit Facetten (Disziplin, Status) – nur Admin."""
+    args = request.args
+    status = (args.get('status') or '').strip().lower() or None
+    if status and status not in {'pending', 'approved', 'rejected', 'unsubmitted'}:
+        return error_response('validation_error', 'Invalid status parameter', 400)
+    # ?discipline=A&discipline=B oder ?discipline=A,B
+    disciplines = [d for value in args.getlist('discipline') for d in value.split(',')]
+    try:
+        price_min = int(args['price_min']) if args.get('price_min') else None
+        price_max = int(args['price_max']) if args.get('price_max') else None
+        page = int(args.get('page', 1))
+        per_page = int(args.get('per_page', 25))
+    except ValueError:
+        return error_response('validation_error', 'price_min, price_max, page and per_page must be integers', 400)
+
+    result = artist_search.search(
+        q=args.get('q'), disciplines=disciplines, city=args.get('city'),
+        price_min=price_min, price_max=price_max, status=status,
+        page=page, per_page=per_page,
+    )
+    return jsonify(result), 200
+
+
 @admin_bp.route('/artists/<int:artist_id>/approve', methods=['POST'])
 @jwt_required()
 @admin_required
@@ -447,6 +564,153 @@ def reject_artist(artist_id):
         return error_response('internal_error', 'Unexpected server error', 500)
 
 
+@admin_bp.route('/artists/bulk-approval', methods=['POST'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_artists_bulk_approval_post.yml'), validation=False)
+def bulk_artist_approval():
+    """Sammel-Freigabe/-Ablehnung: ein UPDATE, Verfügbarkeiten als Hintergrund-Job (202 + Job-ID)."""
+    data = request.get_json(silent=True) or {}
+    action = (data.get('action') or '').strip().lower()
+    if action not in ('approve', 'reject'):
+        return error_response('validation_error', "action must be 'approve' or 'reject'", 400)
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        return error_response('validation_error', 'ids must be a non-empty list of artist ids', 400)
+    try:
+        ids = sorted({int(i) for i in ids})
+    except (TypeError, ValueError):
+        return error_response('validation_error', 'ids must be integers', 400)
+    limit = current_app.config.get('ADMIN_BULK_MAX_IDS', 500)
+    if len(ids) > limit:
+        return error_response('validation_error', f'At most {limit} ids per request', 400)
+    # leerer Grund wie kein Grund: NULL, nicht ''
+    reason = ((data.get('reason') or '').strip() or None) if action == 'reject' else None
+
+    admin_id = get_jwt_identity()
+    try:
+        outcome = offer_mgr.bulk_set_approval(ids, action, admin_id=admin_id, reason=reason)
+    except Exception as e:
+        logger.exception(f"[ADMIN] bulk_artist_approval failed: {e}")
+        return error_response('internal_error', 'Unexpected server error', 500)
+
+    job = None
+    if action == 'approve' and outcome['updated']:
+        # Verfügbarkeiten nicht im Request: ein mengenbasierter Job für alle frisch freigegebenen Artists
+        job = job_queue.enqueue(
+            AVAILABILITY_FILL_JOB,
+            {'artist_ids': outcome['updated'], 'days_ahead': 365},
+            created_by=str(admin_id) if admin_id is not None else None,
+        )
+    logger.info(f"[ADMIN] bulk {action}: updated={len(outcome['updated'])} job={job.id if job else None}")
+    body = dict(outcome, action=action, job_id=job.id if job else None)
+    if job is None:
+        return jsonify(body), 200
+    return jsonify(body), 202, {'Location': f'/admin/jobs/{job.id}'}
+
+
+@admin_bp.route('/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_jobs_get.yml'), validation=False)
+def get_background_job(job_id):
+    """Status eines Hintergrund-Jobs (zum Pollen durch die Admin-UI)."""
+    job = job_queue.get(job_id)
+    if not job:
+        return error_response('not_found', 'Job not found', 404)
+    return jsonify(job_queue.serialize(job)), 200
+
+
+@admin_bp.route('/scheduler/jobs', methods=['GET'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_scheduler_jobs_get.yml'), validation=False)
+def list_scheduled_jobs():
+    """Geplante Wartungs-Jobs mit Zeitplan, Sperre und letztem Lauf."""
+    return jsonify(scheduler.overview()), 200
+
+
+@admin_bp.route('/scheduler/runs', methods=['GET'])
+@read_replica
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_scheduler_runs_get.yml'), validation=False)
+def list_scheduled_job_runs():
+    """Lauf-Historie der Wartungs-Jobs, neueste zuerst (Paging über before_id)."""
+    args = request.args
+    try:
+        before_id = int(args['before_id']) if args.get('before_id') else None
+        limit = int(args.get('limit', 50))
+    except ValueError:
+        return error_response('validation_error', 'before_id/limit must be integers', 400)
+    status = args.get('status') or None
+    if status and status not in ('running', 'done', 'failed'):
+        return error_response('validation_error', "status must be 'running', 'done' or 'failed'", 400)
+    runs = scheduler.history(job=args.get('job') or None, status=status, before_id=before_id, limit=limit)
+    return jsonify({
+        'items': [scheduler.serialize_run(run) for run in runs],
+        'next_before_id': runs[-1].id if len(runs) == max(1, min(limit, 500)) else None,
+    }), 200
+
+
+@admin_bp.route('/scheduler/jobs/<name>/run', methods=['POST'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_scheduler_jobs_run_post.yml'), validation=False)
+def run_scheduled_job_now(name):
+    """Wartungs-Job sofort ausführen (als Hintergrund-Job, 202 + Job-ID zum Pollen)."""
+    try:
+        scheduler.get(name)
+    except KeyError:
+        return error_response('not_found', 'Scheduled job not found', 404)
+    admin_id = get_jwt_identity()
+    job = job_queue.enqueue(
+        SCHEDULER_RUN_JOB, {'job': name},
+        created_by=str(admin_id) if admin_id is not None else None,
+    )
+    logger.info(f"[ADMIN] scheduled job {name} triggered manually: job={job.id}")
+    return jsonify({'job': name, 'job_id': job.id}), 202, {'Location': f'/admin/jobs/{job.id}'}
+
+
+@admin_bp.route('/archive/requests', methods=['GET'])
+@read_replica
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_archive_requests_get.yml'), validation=False)
+def list_archived_requests():
+    """Archivierte (abgeschlossene) Anfragen, neueste zuerst, mit Filtern und Paging über before_id."""
+    args = request.args
+    try:
+        date_from = date.fromisoformat(args['date_from']) if args.get('date_from') else None
+        date_to = date.fromisoformat(args['date_to']) if args.get('date_to') else None
+        artist_id = int(args['artist_id']) if args.get('artist_id') else None
+        before_id = int(args['before_id']) if args.get('before_id') else None
+        limit = int(args.get('limit', 50))
+    except ValueError:
+        return error_response(
+            'validation_error', 'date_from/date_to must be ISO dates, artist_id/before_id/limit integers', 400,
+        )
+    status = [v.strip() for value in args.getlist('status') for v in value.split(',') if v.strip()]
+    result = retention.search_archive(
+        status=status, date_from=date_from, date_to=date_to, artist_id=artist_id,
+        client_email=args.get('client_email') or None, before_id=before_id, limit=limit,
+    )
+    return jsonify(result), 200
+
+
+@admin_bp.route('/archive/requests/<int:req_id>', methods=['GET'])
+@read_replica
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_archive_request_get.yml'), validation=False)
+def get_archived_request(req_id):
+    """Archivierte Anfrage mit Artist-Zuordnungen und Admin-Angeboten."""
+    archived = retention.get_archived(req_id)
+    if archived is None:
+        return error_response('not_found', 'Archived request not found', 404)
+    return jsonify(archived), 200
+
+
 # -------------------------------------------------------------
 # New: Delete artist by ID (admin only)
 @admin_bp.route('/artists/<int:artist_id>', methods=['DELETE'])
@@ -489,26 +753,51 @@ def delete_artist(artist_id: int):
     Hard delete; returns 409 if the artist is still referenced (FK constraints).
     """
     try:
-        artist = Artist.query.get(artist_id)
-        if not artist:
-            return error_response('not_found', 'Resource not found', 404)
+        # mengenbasiert: ein DELETE je Kindtabelle statt ORM-Cascade über alle Kindzeilen
+        deleted = artist_mgr.delete_artists([artist_id])
+    except IntegrityError as ex:
+        # If there are related bookings/requests, DB may raise FK errors
+        logger.warning(f"[ADMIN] delete_artist conflict for id={artist_id}: {ex}")
+        return error_response('conflict', 'Artist is referenced by other records', 409)
+    except Exception as e:
+        logger.exception(f"[ADMIN] delete_artist failed for id={artist_id}: {e}")
+        return error_response('internal_error', 'Unexpected server error', 500)
+    if not deleted:
+        return error_response('not_found', 'Resource not found', 404)
+    return jsonify({'deleted': artist_id}), 200
 
-        try:
-            db.session.delete(artist)
-            db.session.commit()
-            return jsonify({'deleted': artist_id}), 200
-        except Exception as ex:
-            from sqlalchemy.exc import IntegrityError
-            db.session.rollback()
-            # If there are related bookings/requests, DB may raise FK errors
-            if isinstance(ex, IntegrityError):
-                logger.warning(f"[ADMIN] delete_artist conflict for id={artist_id}: {ex}")
-                return error_response('conflict', 'Artist is referenced by other records', 409)
-            logger.exception(f"[ADMIN] delete_artist failed for id={artist_id}: {ex}")
-            return error_response('internal_error', 'Unexpected server error', 500)
+
+@admin_bp.route('/artists/bulk-delete', methods=['POST'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_artists_bulk_delete_post.yml'), validation=False)
+def bulk_delete_artists():
+    """Löscht mehrere Artists in einer Transaktion (nur Admin)."""
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        return error_response('validation_error', 'ids must be a non-empty list of artist ids', 400)
+    try:
+        ids = sorted({int(i) for i in ids})
+    except (TypeError, ValueError):
+        return error_response('validation_error', 'ids must be integers', 400)
+    limit = current_app.config.get('ADMIN_BULK_MAX_IDS', 500)
+    if len(ids) > limit:
+        return error_response('validation_error', f'At most {limit} ids per request', 400)
+
+    try:
+        deleted = artist_mgr.delete_artists(ids)
+    except IntegrityError as ex:
+        logger.warning(f"[ADMIN] bulk_delete_artists conflict for ids={ids}: {ex}")
+        return error_response('conflict', 'Artists are referenced by other records', 409)
     except Exception as e:
-        logger.exception(f"[ADMIN] delete_artist outer exception for id={artist_id}: {e}")
+        logger.exception(f"[ADMIN] bulk_delete_artists failed: {e}")
         return error_response('internal_error', 'Unexpected server error', 500)
+    logger.info(f"[ADMIN] bulk_delete_artists deleted={len(deleted)} of {len(ids)}")
+    return jsonify({
+        'deleted': deleted,
+        'not_found': sorted(set(ids) - set(deleted)),
+    }), 200
 
 # -------------------------------------------------------------
 # Per-Artist-Status einer Anfrage (Admin) 08.08.25
@@ -558,27 +847,190 @@ def admin_set_artists_status_bulk(req_id):
     return jsonify({'updated': updated, 'status': new_status, 'comment': comment}), 200
 
 @admin_bp.route('/dashboard')
+@read_replica
 @jwt_required()
 @admin_required
 @swag_from(SWAG('dashboard_get.yml'))
 def dashboard():
     """Return dashboard data with availabilities and requests (admin only)."""
     slots = avail_mgr.get_all_availabilities()
-    offers = request_mgr.get_all_requests()
+    offers = request_mgr.list_requests_projection(DASHBOARD_OFFER_COLUMNS, with_artist_ids=False)
+    return jsonify({
+        'slots': slots,
+        'offers': offers,
+    }), 200
+
+
+# -------------------------------------------------------------
+# Admin: Slow-Query-Log (Aggregat pro Statement-Fingerprint)
+# -------------------------------------------------------------
+@admin_bp.route('/slow_queries', methods=['GET'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_slow_queries_get.yml'), validation=False)
+def admin_slow_queries():
+    """Gibt die aggregierten langsamen Statements zurück (nur Admins)."""
+    try:
+        limit = int(request.args.get('limit') or 50)
+    except ValueError:
+        return error_response('validation_error', 'limit must be integer', 400)
     return jsonify({
-        'slots': slots,  
-        'offers': [
+        'enabled': bool(current_app.config.get('SLOW_QUERY_LOG_ENABLED')),
+        'threshold_ms': slow_query_recorder.threshold_ms,
+        'items': slow_query_recorder.snapshot(limit=limit),
+    }), 200
+
+
+@admin_bp.route('/slow_queries', methods=['DELETE'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_slow_queries_delete.yml'), validation=False)
+def admin_reset_slow_queries():
+    """Setzt die Slow-Query-Statistik zurück (nur Admins)."""
+    slow_query_recorder.reset()
+    return jsonify({'ok': True}), 200
+
+
+# -------------------------------------------------------------
+# Admin: Connection-Pools je Traffic-Klasse (Bulkheads)
+# -------------------------------------------------------------
+@admin_bp.route('/db_pools', methods=['GET'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_db_pools_get.yml'), validation=False)
+def admin_db_pools():
+    """Gibt Größe, Auslastung und Wartezeiten der Pools je Traffic-Klasse zurück (nur Admins)."""
+    return jsonify({
+        'classes': pool_bulkheads.snapshot(),
+        'by_blueprint': current_app.config.get('DB_TRAFFIC_CLASS_BY_BLUEPRINT') or {},
+    }), 200
+
+
+# -------------------------------------------------------------
+# Admin: Preis-Simulation (Parameter-Sweeps als Matrix)
+# -------------------------------------------------------------
+def _simulation_reference(data):
+    """Referenz-Parameter aus artist_id oder request_id, überschrieben durch `base` (ValueError bei Fehlern)."""
+    overrides = data.get('base') or {}
+    if not isinstance(overrides, dict):
+        raise ValueError('base must be an object')
+    params = {'fee_pct': float(current_app.config.get('AGENCY_FEE_PERCENT', 20))}
+
+    if data.get('artist_id') is not None:
+        artist = db.session.get(Artist, data['artist_id'])
+        if not artist:
+            raise LookupError('Artist not found')
+        params.update(base_min=artist.price_min, base_max=artist.price_max)
+    elif data.get('request_id') is not None:
+        req = db.session.get(BookingRequest, data['request_id'])
+        if not req:
+            raise LookupError('Request not found')
+        team = str(req.team_size or '').strip().lower()
+        artists = list(req.artists)
+        # Basis wie bei der Preisberechnung der Anfrage: Solo = Spanne über alle, Duo = erste zwei
+        if team in ('duo', '2') and len(artists) >= 2:
+            params.update(base_min=sum(a.price_min or 0 for a in artists[:2]),
+                          base_max=sum(a.price_max or 0 for a in artists[:2]), team_count=2)
+        elif team not in ('duo', '2'):
+            base_min = min((a.price_min for a in artists if a.price_min is not None), default=None)
+            base_max = max((a.price_max for a in artists if a.price_max is not None), default=None)
+            if (base_min is None or base_max is None) and not {'base_min', 'base_max'} <= set(overrides):
+                raise LookupError('No matching artist with a price range for this request '
+                                  '(set base.base_min/base.base_max)')
+            params.update(base_min=base_min, base_max=base_max)
+        params.update(
+            distance_km=req.distance_km or 0.0,
+            newsletter=bool(req.newsletter_opt_in),
+            event_type=req.event_type,
+            num_guests=req.number_of_guests or 0,
+            is_weekend=req.event_date.weekday() >= 5 if req.event_date else False,
+            is_indoor=bool(req.is_indoor),
+            needs_light=bool(req.needs_light),
+            needs_sound=bool(req.needs_sound),
+            duration=req.duration_minutes or 0,
+            event_address=req.event_address,
+        )
+    params.update(overrides)
+    return reference_params(**params)
+
+
+@admin_bp.route('/pricing/simulate', methods=['POST'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_pricing_simulate_post.yml'), validation=False)
+def admin_pricing_simulate():
+    """Preis-Matrix für ein bis zwei variierte Parameter (x, optional y) einer Referenz (nur Admins)."""
+    data = request.get_json(silent=True) or {}
+    try:
+        version = data.get('version')
+        rules = pricing_rules.get(version) if version is not None else pricing_rules.current()
+        reference = _simulation_reference(data)
+        x = parse_axis(data.get('x'), rules)
+        y = parse_axis(data.get('y'), rules)
+        if x is None:
+            raise ValueError('x axis is required')
+        cells = len(x['values']) * (len(y['values']) if y else 1)
+        max_cells = int(current_app.config.get('PRICING_SIMULATION_MAX_CELLS', 250000))
+        if cells > max_cells:
+            raise ValueError(f'grid has {cells} cells, maximum is {max_cells}')
+        result = simulate(reference, x, y, rules)
+    except LookupError as e:
+        return error_response('not_found', str(e), 404)
+    except ValueError as e:
+        return error_response('validation_error', str(e), 400)
+    result['reference'] = reference
+    return jsonify(result), 200
+
+
+# -------------------------------------------------------------
+# Admin: Preisregeln (versioniert, aktive Version = höchste)
+# -------------------------------------------------------------
+@admin_bp.route('/pricing/rules', methods=['GET'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_pricing_rules_get.yml'), validation=False)
+def admin_get_pricing_rules():
+    """Aktive (oder per ?version= gewählte) Preisregeln plus Versionsliste (nur Admins)."""
+    version = request.args.get('version', type=int)
+    try:
+        rules = pricing_rules.get(version) if version is not None else pricing_rules.current()
+    except LookupError as e:
+        return error_response('not_found', str(e), 404)
+    return jsonify({
+        'active_version': pricing_rules.current().version,
+        'version': rules.version,
+        'rules': rules.rules,
+        'versions': [
             {
-                'id': r.id,
-                'client_name': r.client_name,
-                'client_email': r.client_email,
-                'event_date': r.event_date.isoformat(),
-                'event_time': r.event_time.isoformat() if r.event_time else None,
-                'team_size': r.team_size,
-                'status': r.status,
-                'created_at': r.created_at.isoformat() if getattr(r, 'created_at', None) else None,
-                'price_offered': r.price_offered
+                'version': row.version,
+                'note': row.note,
+                'created_by': row.created_by,
+                'created_at': row.created_at.isoformat() if row.created_at else None,
             }
-            for r in offers
-        ]
-    }), 200
\ No newline at end of file
+            for row in pricing_rules.versions()
+        ],
+    }), 200
+
+
+@admin_bp.route('/pricing/rules', methods=['POST'])
+@jwt_required()
+@admin_required
+@swag_from(SWAG('admin_pricing_rules_post.yml'), validation=False)
+def admin_publish_pricing_rules():
+    """Neue Version veröffentlichen: Basis-Version (Standard: aktive) + geänderte Regeln (nur Admins)."""
+    data = request.get_json(silent=True) or {}
+    try:
+        row = pricing_rules.publish(
+            data.get('rules') or {},
+            note=data.get('note'),
+            created_by=get_jwt_identity(),
+            base_version=data.get('base_version'),
+        )
+    except LookupError as e:
+        return error_response('not_found', str(e), 404)
+    except ValueError as e:
+        return error_response('validation_error', str(e), 400)
+    except IntegrityError:
+        db.session.rollback()
+        return error_response('conflict', 'Another version was published concurrently, please retry', 409)
+    return jsonify({'version': row.version, 'rules': row.rules, 'note': row.note}), 201
@@ -1,20 +1,32 @@
-from flask import request, jsonify
-from flask import Blueprint
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask import request, jsonify, Response, stream_with_context
+from flask import Blueprint, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, verify_jwt_in_request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
 from services.calculate_price import calculate_price
 from flasgger import swag_from
 from managers.artist_manager import ArtistManager
 from managers.availability_manager import AvailabilityManager
 from managers.booking_requests_manager import BookingRequestManager
-from models import Availability, Discipline, db
+from models import Availability, db
 from sqlalchemy import func
 import logging
 from helpers.http_responses import error_response
+from helpers.db_routing import read_replica, primary_reads
+from services.request_events import request_events
+from helpers.availability_codec import (
+    dates_to_bitmap, dates_to_ranges, decode_bitmap, is_compact_payload, negotiate_format, parse_dates_payload,
+)
 
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Spalten-Projektion der öffentlichen Artist-Liste (Feldnamen = Response-Keys)
+PUBLIC_ARTIST_COLUMNS = (
+    'id', 'name', 'email', 'address', 'phone_number', 'price_min', 'price_max',
+    'profile_image_url', 'bio', 'instagram', 'gallery_urls',
+)
+
 # Manager-Instanzen
 artist_mgr = ArtistManager()
 avail_mgr = AvailabilityManager()
@@ -35,6 +47,12 @@ def get_current_user():
       2) Fallback per E-Mail aus JWT-Claims und ggf. UID verknüpfen
       3) Falls noch nichts gefunden, aber eine E-Mail vorhanden ist: Minimal-Artist automatisch anlegen (status='unsubmitted')
     """
+    # Lookup + ggf. Anlage: immer gegen den Primary (kein Replica-Lag bei get-or-create)
+    with primary_reads():
+        return _resolve_current_user()
+
+
+def _resolve_current_user():
     user_id = get_jwt_identity()
     artist = None
 
@@ -81,25 +99,15 @@ def get_current_user():
 
 # Artists
 @api_bp.route('/artists', methods=['GET'])
+@read_replica
 @swag_from('../resources/swagger/artists_get.yml')
 def list_artists():
     """Return all approved artists as JSON list."""
     # Nur freigegebene Artists öffentlich listen
-    artists = artist_mgr.get_approved_artists()
-    return jsonify([{
-        'id': a.id,
-        'name': a.name,
-        'email': a.email,
-        'address': getattr(a, 'address', None),
-        'phone_number': a.phone_number,
-        'disciplines': [d.name for d in a.disciplines],
-        'price_min': getattr(a, 'price_min', None),
-        'price_max': getattr(a, 'price_max', None),
-        'profile_image_url': getattr(a, 'profile_image_url', None),
-        'bio': getattr(a, 'bio', None),
-        'instagram': getattr(a, 'instagram', None),              
-        'gallery_urls': getattr(a, 'gallery_urls', []) or []
-    } for a in artists])
+    artists = artist_mgr.list_artists_projection('approved', PUBLIC_ARTIST_COLUMNS)
+    for a in artists:
+        a['gallery_urls'] = a['gallery_urls'] or []
+    return jsonify(artists)
 
 
 @api_bp.route('/artists', methods=['POST'])
@@ -290,14 +298,11 @@ def update_my_profile():
 
         # Disziplinen
         if disciplines is not None:
-            def get_or_create_discipline(name: str):
-                disc = Discipline.query.filter_by(name=name).first()
-                if not disc:
-                    disc = Discipline(name=name)
-                    db.session.add(disc)
-                    db.session.flush()
-                return disc
-            artist.disciplines = [get_or_create_discipline(str(d).strip()) for d in disciplines if str(d).strip()]
+            try:
+                artist.disciplines = artist_mgr.discipline_mgr.resolve_disciplines(disciplines)
+            except ValueError as ve:
+                db.session.rollback()
+                return error_response('validation_error', str(ve), 400)
 
         # Optional: Einreichen zur Prüfung – nur 'pending' ist vom Artist aus erlaubt
         if req_status is not None:
@@ -528,14 +533,11 @@ def update_artist(artist_id):
                     return error_response('validation_error', 'gallery_urls may contain at most 9 items', 400)
                 artist.gallery_urls = urls
         if 'disciplines' in data:
-            def get_or_create_discipline(name):
-                disc = Discipline.query.filter_by(name=name).first()
-                if not disc:
-                    disc = Discipline(name=name)
-                    db.session.add(disc)
-                    db.session.flush()
-                return disc
-            artist.disciplines = [get_or_create_discipline(d) for d in data['disciplines']]
+            try:
+                artist.disciplines = artist_mgr.discipline_mgr.resolve_disciplines(data['disciplines'] or [])
+            except ValueError as ve:
+                db.session.rollback()
+                return error_response('validation_error', str(ve), 400)
         db.session.commit()
         return jsonify({'id': artist.id}), 200
     except Exception as e:
@@ -546,6 +548,7 @@ def update_artist(artist_id):
 # Availability
 
 @api_bp.route('/availability', methods=['GET'])
+@read_replica
 @jwt_required()
 @swag_from('../resources/swagger/availability_get.yml')
 def get_availability():
@@ -576,6 +579,20 @@ def get_availability():
         except ValueError:
             logger.warning(f"Invalid artist_id parameter: {artist_id_param}, ignoring and using current artist")
     
+    try:
+        fmt = negotiate_format(request.args.get('format'), request.headers.get('Accept'))
+    except ValueError as e:
+        return error_response('validation_error', str(e), 400)
+
+    # Delta-Sync: nur Änderungen seit der übergebenen Kalender-Version
+    since_param = request.args.get('since')
+    if since_param is not None:
+        try:
+            since = int(since_param)
+        except ValueError:
+            return error_response('validation_error', 'since must be an integer version', 400)
+        return _availability_delta(target_artist.id, since, fmt)
+
     # fetch and return slots: if target is current artist use user-specific helper for better handling
     try:
         if target_artist.id == current_artist.id:
@@ -586,9 +603,72 @@ def get_availability():
         logger.exception(f"Failed to fetch availabilities for artist {target_artist.id}")
         return error_response('internal_error', f'Failed to fetch availabilities: {str(e)}', 500)
 
-    result = [{'id': s.id, 'artist_id': s.artist_id, 'date': s.date.isoformat()} for s in slots]
-    logger.debug(f"Returning {len(result)} availability slots for artist {target_artist.id}")
-    return jsonify(result)
+    version = avail_mgr.get_version(target_artist.id)
+    if fmt == 'ranges':
+        response = jsonify({'artist_id': target_artist.id, 'format': 'ranges', 'version': version,
+                            'ranges': dates_to_ranges(s.date for s in slots)})
+    elif fmt == 'bitmap':
+        response = jsonify(dict(dates_to_bitmap(s.date for s in slots),
+                                artist_id=target_artist.id, format='bitmap', version=version))
+    else:
+        result = [{'id': s.id, 'artist_id': s.artist_id, 'date': s.date.isoformat()} for s in slots]
+        logger.debug(f"Returning {len(result)} availability slots for artist {target_artist.id}")
+        response = jsonify(result)
+    # Purge-Horizont (frühester gespeicherter Tag) im Validator: purge_past ändert den Body ohne neue Version
+    horizon = slots[0].date.isoformat() if slots else 'empty'
+    return _with_availability_version(response, target_artist.id, version, f'{fmt}-{horizon}')
+
+
+def _bitmap_payload_error(data):
+    """Fehlermeldung für ein ungültiges 'bitmap'/'days' im Schreib-Body, sonst None."""
+    if not isinstance(data, dict) or 'bitmap' not in data:
+        return None
+    try:
+        decode_bitmap(data['bitmap'], data.get('days'))
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def _with_availability_version(response, artist_id: int, version: int, variant: str):
+    """
+    Kalender-Version als Header (Basis für den nächsten ?since=-Aufruf). `variant` unterscheidet
+    Bodies derselben Version (Format, Delta-Basis, Purge-Horizont) im ETag; das Format kann per
+    Accept verhandelt werden, daher Vary: Accept für Clients und geteilte Caches.
+    """
+    response.headers['X-Availability-Version'] = str(version)
+    response.headers['ETag'] = f'W/"availability-{artist_id}-{version}-{variant}"'
+    response.vary.add('Accept')
+    return response
+
+
+def _availability_delta(artist_id: int, since: int, fmt: str):
+    """Antwort für GET /api/availability?since=<version>: 304, Delta oder Reset-Snapshot."""
+    version, added, removed = avail_mgr.get_changes_since(artist_id, since)
+    delta_fmt = 'ranges' if fmt == 'ranges' else 'days'
+    variant = f'{delta_fmt}-since{since}'
+    if added is None:
+        # Protokoll deckt die Lücke nicht mehr ab -> vollständiger Stand, Client ersetzt seinen Kalender
+        added = [s.date for s in avail_mgr.get_availabilities(artist_id)]
+        removed = []
+        reset = True
+        variant += f"-reset-{added[0].isoformat() if added else 'empty'}"
+    elif not added and not removed:
+        return _with_availability_version(Response(status=304), artist_id, version, variant)
+    else:
+        reset = False
+
+    encode = dates_to_ranges if fmt == 'ranges' else (lambda dates: [d.isoformat() for d in dates])
+    payload = {
+        'artist_id': artist_id,
+        'since': since,
+        'version': version,
+        'reset': reset,
+        'format': delta_fmt,
+        'added': encode(added),
+        'removed': encode(removed),
+    }
+    return _with_availability_version(jsonify(payload), artist_id, version, variant)
 
 
 @api_bp.route('/availability', methods=['POST'])
@@ -620,6 +700,18 @@ def add_availability():
     if not data:
         return error_response('validation_error', 'Date must be provided', 400)
 
+    # Kompakte Formate (ranges/bitmap/recurrence): serverseitig expandieren, ein Bulk-Insert
+    if is_compact_payload(data):
+        bitmap_error = _bitmap_payload_error(data)
+        if bitmap_error:
+            return error_response('bad_request', bitmap_error, 400)
+        try:
+            dates = parse_dates_payload(data)
+        except ValueError as e:
+            return error_response('validation_error', str(e), 400)
+        result = avail_mgr.add_availabilities(artist_id, dates)
+        return jsonify({'added': len(result['added']), 'skipped': result['skipped']}), 201
+
     def create_slot(item):
         date_str = item.get('date')
         if not date_str:
@@ -676,12 +768,23 @@ def replace_availability():
         target_artist = candidate
 
     data = request.get_json()
-    if not data or 'dates' not in data:
+    if is_compact_payload(data):
+        # ranges/bitmap/recurrence (optional kombiniert mit 'dates') -> Zielmenge
+        bitmap_error = _bitmap_payload_error(data)
+        if bitmap_error:
+            return error_response('bad_request', bitmap_error, 400)
+        try:
+            dates = parse_dates_payload(data)
+        except ValueError as e:
+            return error_response('validation_error', str(e), 400)
+    elif not data or 'dates' not in data:
         return error_response('validation_error', 'dates list required', 400)
+    else:
+        dates = data['dates']
     if artist_id_param:
-        result = avail_mgr.replace_availabilities_for_artist(target_artist.id, data['dates'])
+        result = avail_mgr.replace_availabilities_for_artist(target_artist.id, dates)
     else:
-        result = avail_mgr.replace_availabilities_for_user(user_id, data['dates'])
+        result = avail_mgr.replace_availabilities_for_user(user_id, dates)
     return jsonify(result), 200
 
 
@@ -703,6 +806,7 @@ def remove_availability(slot_id):
     avail_mgr.remove_availability(slot_id)
     return jsonify({'deleted': slot_id})
 @api_bp.route('/requests/requests', methods=['GET'])
+@read_replica
 @jwt_required()
 @swag_from('../resources/swagger/booking_requests_get.yml')
 def list_my_booking_requests():
@@ -732,6 +836,76 @@ def list_my_booking_requests():
 
 
 
+# Stream-Token: signiert, kurzlebig und nur für den SSE-Stream gültig (kein JWT, an keinem anderen Endpoint nutzbar)
+_STREAM_TOKEN_SALT = 'request-events-stream'
+
+
+def _stream_token_serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=_STREAM_TOKEN_SALT)
+
+
+def _stream_token_ttl() -> int:
+    return int(current_app.config.get('REQUEST_EVENTS_STREAM_TOKEN_SECONDS', 300))
+
+
+def _approved_stream_artist(user_id):
+    """(artist, None) oder (None, Fehlerantwort) für den Stream-Zugang."""
+    artist = artist_mgr.get_artist_by_supabase_user_id(user_id)
+    if not artist:
+        return None, error_response('forbidden', 'Current user not linked to an artist', 403)
+    if getattr(artist, 'approval_status', '') != 'approved':
+        return None, error_response('forbidden', 'Artist not approved yet', 403)
+    return artist, None
+
+
+@api_bp.route('/requests/requests/stream/token', methods=['POST'])
+@jwt_required()
+@swag_from('../resources/swagger/booking_requests_stream_token_post.yml', validation=False)
+def create_booking_requests_stream_token():
+    """Kurzlebiges Stream-Token für EventSource (kann keine Header senden) statt des Access-JWT in der URL."""
+    user_id = get_jwt_identity()
+    _, error = _approved_stream_artist(user_id)
+    if error:
+        return error
+    ttl = _stream_token_ttl()
+    return jsonify({'stream_token': _stream_token_serializer().dumps({'sub': user_id}), 'expires_in': ttl}), 200
+
+
+@api_bp.route('/requests/requests/stream', methods=['GET'])
+@swag_from('../resources/swagger/booking_requests_stream_get.yml', validation=False)
+def stream_my_booking_requests():
+    """Server-Sent Events: push new/updated booking requests of the current artist (replaces polling)."""
+    stream_token = request.args.get('stream_token')
+    if stream_token:
+        try:
+            user_id = _stream_token_serializer().loads(stream_token, max_age=_stream_token_ttl())['sub']
+        except (BadSignature, KeyError, TypeError):
+            return error_response('unauthorized', 'Invalid or expired stream token', 401)
+    else:
+        # Nicht-Browser-Clients: Access-JWT nur im Authorization-Header, nie in der URL
+        verify_jwt_in_request(locations=['headers'])
+        user_id = get_jwt_identity()
+    artist, error = _approved_stream_artist(user_id)
+    if error:
+        return error
+
+    # EventSource sendet beim Reconnect automatisch Last-Event-ID; ?last_event_id= für manuelles Resume
+    raw_last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(raw_last_id) if raw_last_id not in (None, '') else None
+    except ValueError:
+        return error_response('validation_error', 'Last-Event-ID must be an integer', 400)
+
+    artist_id = artist.id
+    response = Response(
+        stream_with_context(request_events.stream(artist_id, last_event_id)),
+        mimetype='text/event-stream',
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx: nicht puffern
+    return response
+
+
 # Combined GET/PUT endpoint for artist offer
 @api_bp.route('/requests/requests/<int:req_id>/offer', methods=['GET', 'PUT'])
 @jwt_required()
@@ -850,6 +1024,7 @@ def create_invoice_entry():
 
 
 @api_bp.route('/invoices', methods=['GET'])
+@read_replica
 @jwt_required()
 @swag_from('../resources/swagger/invoices_get.yml', validation=False)
 def list_invoices():
@@ -1,3 +1,6 @@
+import hashlib
+import hmac
+import secrets
 import time
 from typing import Deque, Tuple, Dict, Any
 from collections import deque
@@ -7,6 +10,9 @@ _RATE_LIMIT_WINDOW_SECONDS = 3600  # 1 hour
 _RATE_LIMIT_MAX_REQUESTS = 5       # 5 requests/hour per IP
 _rate_limit_hits: Dict[str, Deque[float]] = {}
 
+# Live-Preis (Quotes): eigener Token-Bucket je IP -> (tokens, last_ts); Rate/Burst aus QUOTE_RATE_LIMIT_*
+_quote_buckets: Dict[str, Tuple[float, float]] = {}
+
 # In-memory idempotency cache: key -> (created_ts, payload_dict)
 _IDEMPOTENCY_TTL_SECONDS = 3600
 _idempotency_cache: Dict[str, Tuple[float, dict]] = {}
@@ -31,6 +37,19 @@ def _rate_limit_allow(ip: str) -> bool:
     dq.append(now)
     return True
 
+def _quote_rate_limit_allow(ip: str) -> bool:
+    """Token-Bucket für Quote-Berechnungen: QUOTE_RATE_LIMIT_PER_MINUTE nachfüllen, bis QUOTE_RATE_LIMIT_BURST ansparen."""
+    rate = float(current_app.config.get("QUOTE_RATE_LIMIT_PER_MINUTE", 60)) / 60.0
+    burst = float(current_app.config.get("QUOTE_RATE_LIMIT_BURST", 30))
+    now = time.time()
+    tokens, last = _quote_buckets.get(ip, (burst, now))
+    tokens = min(burst, tokens + (now - last) * rate)
+    if tokens < 1:
+        _quote_buckets[ip] = (tokens, now)
+        return False
+    _quote_buckets[ip] = (tokens - 1, now)
+    return True
+
 def _idempotency_lookup(key: str):
     """Return cached payload if key exists and not expired, else None."""
     if not key:
@@ -49,18 +68,43 @@ def _idempotency_store(key: str, payload: dict) -> None:
     if not key:
         return
     _idempotency_cache[key] = (time.time(), payload)
-from datetime import datetime
+
+def purge_expired_request_state() -> Dict[str, int]:
+    """Drop expired idempotency keys and rate-limit entries of idle IPs (scheduled per process)."""
+    now = time.time()
+    expired_keys = [k for k, (created, _) in list(_idempotency_cache.items()) if now - created > _IDEMPOTENCY_TTL_SECONDS]
+    for key in expired_keys:
+        _idempotency_cache.pop(key, None)
+    cutoff = now - _RATE_LIMIT_WINDOW_SECONDS
+    idle_ips = [ip for ip, dq in list(_rate_limit_hits.items()) if not dq or dq[-1] < cutoff]
+    for ip in idle_ips:
+        _rate_limit_hits.pop(ip, None)
+    # nach einer Stunde Ruhe ist jeder Quote-Bucket wieder voll: Eintrag entbehrlich
+    idle_quote_ips = [ip for ip, (_, last) in list(_quote_buckets.items()) if last < cutoff]
+    for ip in idle_quote_ips:
+        _quote_buckets.pop(ip, None)
+    return {"idempotency_keys": len(expired_keys), "rate_limit_ips": len(idle_ips) + len(idle_quote_ips)}
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.calculate_price import calculate_price
+from services.pricing_rules import pricing_rules
+from services.team_optimizer import Team, TeamCandidate, optimize_team
 from flask import current_app
 from models import db, Artist, BookingRequest
 from flasgger import swag_from
 
 from helpers.http_responses import error_response
+from helpers.db_routing import read_replica
 
-from managers.booking_requests_manager import BookingRequestManager
+from managers.booking_requests_manager import BookingRequestManager, split_disciplines
 from managers.artist_manager import ArtistManager
+from services.booking_ingest import ingest_queue
+from services.request_events import request_events
+from services.quotes import normalize_quote_input, quote_cache, quote_cache_key
+from services.geo import cached_coordinates
 
 from email.message import EmailMessage
 import smtplib
@@ -113,12 +157,16 @@ def validate_create_request_payload(data: dict) -> tuple[bool, str | None]:
         return False, "disciplines must be a list"
     return True, None
 
-def request_brief_json(r: BookingRequest) -> dict:
-    """Serialize booking request to a compact JSON structure for lists."""
+# Spalten für request_brief_json (Row-Projektion statt ORM-Objekt)
+REQUEST_BRIEF_COLUMNS = ("id", "status", "created_at", "event_address", "event_lat", "event_lon", "price_min", "price_max")
+
+
+def request_brief_json(r) -> dict:
+    """Serialize a booking request (ORM object or projected row) to a compact JSON structure for lists."""
     return {
         "id": r.id,
         "status": r.status,
-        "created_at": r.created_at.isoformat() if getattr(r, "created_at", None) else None,
+        "created_at": getattr(r, "created_at", None),
         "event_address": r.event_address,
         "event_lat": getattr(r, "event_lat", None),
         "event_lon": getattr(r, "event_lon", None),
@@ -133,6 +181,7 @@ booking_bp = Blueprint('booking', __name__, url_prefix='/api/requests')
 
 
 @booking_bp.route('/requests', methods=['GET'])
+@read_replica
 @jwt_required()
 @swag_from('../resources/swagger/requests_get.yml')
 def list_requests():
@@ -152,9 +201,11 @@ def list_requests_admin():
       - sort: created_desc (default) | created_asc
       - limit: number of results (default 50)
       - offset: pagination offset
+      - discipline: optional, repeatable or comma-separated (any of)
     """
     try:
         status = request.args.get('status') or None
+        disciplines = [d for raw in request.args.getlist('discipline') for d in split_disciplines(raw)]
         sort = request.args.get('sort') or 'created_desc'
         limit = int(request.args.get('limit') or 50)
         offset = int(request.args.get('offset') or 0)
@@ -162,7 +213,8 @@ def list_requests_admin():
         current_app.logger.warning(f"Invalid query params: {e}")
         return error_response("validation_error", "Invalid query parameters", 400)
 
-    items, total = request_mgr.list_requests(status=status, sort=sort, limit=limit, offset=offset)
+    items, total = request_mgr.list_requests(status=status, sort=sort, limit=limit, offset=offset,
+                                             columns=REQUEST_BRIEF_COLUMNS, disciplines=disciplines)
 
     return jsonify({
         "items": [request_brief_json(r) for r in items],
@@ -171,13 +223,305 @@ def list_requests_admin():
         "offset": offset,
         "sort": sort,
         "status": status,
+        "disciplines": disciplines,
     })
 
+def _normalize_team_size(raw_team_size):
+    """Team-Größe normalisieren: Zahlen oder Strings wie "solo"/"duo" akzeptieren (ValueError bei Unsinn)."""
+    if isinstance(raw_team_size, str):
+        ts_lower = raw_team_size.strip().lower()
+        if ts_lower == 'solo':
+            return 1
+        if ts_lower == 'duo':
+            return 2
+        if ts_lower in ('group', 'gruppe'):
+            return 3
+        return int(raw_team_size)
+    return raw_team_size
+
+
+def _match_artists(disciplines, event_date):
+    """Verfügbare, freigegebene Artists für Disziplinen & Datum."""
+    # Freigabe filtert die Query selbst (gleiche Bedingung wie available_artist_counts)
+    return artist_mgr.get_artists_by_discipline(disciplines, event_date) or []
+
+
+def _matched_payload(artist_objs):
+    """Für die UI: kompaktes Matched-Payload (max. MAX_MATCHED_ARTISTS Artists)."""
+    return [
+        {
+            "id": getattr(a, 'id', None),
+            "name": getattr(a, 'name', None),
+            "price_min": getattr(a, 'price_min', None),
+            "price_max": getattr(a, 'price_max', None),
+        }
+        for a in (artist_objs[:MAX_MATCHED_ARTISTS] if artist_objs else [])
+    ]
+
+
+def _select_team(req, artist_objs, team_size, rules, cached_only=False):
+    """Bestes Duo/Gruppe aus den gematchten Artists (Disziplinen abgedeckt, Gage + Fahrtkosten minimal) oder None.
+    `cached_only`: Distanzen nur aus gespeicherten/memoisierten Koordinaten (öffentliche Quote).
+    """
+    if not team_size or int(team_size) < 2 or len(artist_objs) < int(team_size):
+        return None
+    disciplines = split_disciplines(req.show_discipline)
+    candidates = request_mgr.team_candidates(
+        req.event_address, artist_objs, rules.rate_per_km, fallback_km=req.distance_km or 0.0,
+        cached_only=cached_only,
+    )
+    return optimize_team(candidates, int(team_size), disciplines)
+
+
+def _price_request(req, artist_objs, team_size, cached_only=False):
+    """Preisspanne berechnen basierend auf ausgewählten Artists und Parametern.
+    Rückgabe: (price_min, price_max, duo_min, duo_max, team); schreibt die Preise an `req` (ohne Commit).
+    Bereits bepreiste Anfragen behalten ihre Regel-Version, neue bekommen die aktive.
+    """
+    duo_min = duo_max = None
+    team = None
+    version = getattr(req, 'pricing_version', None)
+    rules = pricing_rules.get(version) if version is not None else pricing_rules.current()
+    req.pricing_version = rules.version
+    if not req.artists:
+        req.price_min = None
+        req.price_max = None
+        req.team_artist_ids = None
+        return None, None, None, None, None
+
+    fee_pct = _config_fee_pct()
+    event_city = (req.event_address or '').split(',')[-1].strip().lower()
+    external_artists = [
+        a for a in artist_objs
+        if a.address and event_city not in a.address.lower()
+    ]
+    travel_distance = req.distance_km if external_artists else 0.0
+
+    # Basis definieren je Teamgröße
+    if team_size == 1:
+        # Solo: min/max aus den verfügbaren Artists (bisheriges Verhalten)
+        base_min = min(a.price_min for a in artist_objs)
+        base_max = max(a.price_max for a in artist_objs)
+    else:
+        # Duo/Gruppe: optimal zusammengestelltes Team, Basis = Summe der Gagen
+        team = _select_team(req, artist_objs, team_size, rules, cached_only=cached_only)
+        if team:
+            base_min = sum(a.price_min or 0 for a in team.artists)
+            base_max = sum(a.price_max or 0 for a in team.artists)
+            if team_size == 2:
+                duo_min, duo_max = base_min, base_max
+            # Fahrtkosten nach der mittleren Distanz des Teams statt aller gematchten Artists
+            known = [m.travel_km for m in team.members if m.travel_km is not None]
+            team_external = [a for a in team.artists if a.address and event_city not in a.address.lower()]
+            if not team_external:
+                travel_distance = 0.0
+            elif known:
+                travel_distance = round(sum(known) / len(known), 1)
+            else:
+                travel_distance = req.distance_km
+        else:
+            base_min = base_max = None
+
+    # Wenn wir für das Team bereits die Summe der Gagen gebildet haben,
+    # soll die Preisfunktion NICHT erneut pro Person mitteln/skalieren.
+    team_size_for_calc = 1 if team is not None else team_size
+
+    try:
+        if base_min is not None:
+            args = {
+                'base_min': base_min,
+                'base_max': base_max,
+                'distance_km': travel_distance,
+                'fee_pct': fee_pct,
+                'newsletter': req.newsletter_opt_in,
+                'event_type': req.event_type,
+                'num_guests': req.number_of_guests,
+                'is_weekend': req.event_date.weekday() >= 5,
+                'is_indoor': req.is_indoor,
+                'needs_light': req.needs_light,
+                'needs_sound': req.needs_sound,
+                'show_discipline': req.show_discipline,
+                'team_size': team_size_for_calc,
+                'team_count': (2 if team_size == 2 else (team_size if team_size and int(team_size) >= 1 else 1)),
+                'duration': req.duration_minutes,
+                'event_address': req.event_address
+            }
+            pmin, pmax = calculate_price(**args, rules=rules)
+        else:
+            pmin = pmax = None
+    except Exception as e:
+        current_app.logger.exception("calculate_price failed: %s", e)
+        pmin = pmax = None
+
+    # In die DB schreiben
+    req.price_min = pmin
+    req.price_max = pmax
+    req.team_artist_ids = [a.id for a in team.artists] if team is not None else None
+    return pmin, pmax, duo_min, duo_max, team
+
+
+def _stored_team(req, artist_objs):
+    """Das beim Bepreisen gewählte Team aus `req.team_artist_ids` (kein erneutes Optimieren/Geocoding) oder None."""
+    by_id = {a.id: a for a in artist_objs}
+    artists = [by_id[i] for i in (req.team_artist_ids or []) if i in by_id]
+    if not artists:
+        return None
+    required = []
+    for name in split_disciplines(req.show_discipline):
+        if name.lower() not in required:
+            required.append(name.lower())
+    members = [
+        TeamCandidate(artist=a, cost=((a.price_min or 0) + (a.price_max or 0)) / 2,
+                      disciplines=frozenset(d.name.lower() for d in a.disciplines))
+        for a in artists
+    ]
+    offered = set().union(*(m.disciplines for m in members))
+    return Team(
+        members=members,
+        cost=sum(m.cost for m in members),
+        covered=[name for name in required if name in offered],
+        missing=[name for name in required if name not in offered],
+    )
+
+
+def _notify_matched_artists(req, artist_objs):
+    """Notify matched artists via email (first simple version). Never raises.
+    Duo/group requests with a priced team only notify the team members.
+    """
+    try:
+        team_ids = set(getattr(req, 'team_artist_ids', None) or [])
+        if team_ids:
+            artist_objs = [a for a in artist_objs if a.id in team_ids]
+        date_str = req.event_date.strftime('%d.%m.%Y') if isinstance(req.event_date, datetime) else str(req.event_date)
+        city = (req.event_address.split(',')[-1].strip() if req.event_address else '')
+        subject = f"Neue Booking-Anfrage – {date_str}{', ' + city if city else ''}"
+
+        for artist in artist_objs:
+            # Skip if no email available
+            if not getattr(artist, 'email', None):
+                current_app.logger.warning(f"Skipping email for artist {getattr(artist, 'id', '?')} – no email on record")
+                continue
+
+            html = build_artist_new_request_email(artist, req)
+            send_email(artist.email, subject, html)
+    except Exception as e:
+        # Do not fail the API if email sending has issues; just log it.
+        current_app.logger.exception(f"Error while sending artist notification emails: {e}")
+
+
+def _team_payload(team):
+    """Für die UI: gewähltes Team mit Gagen und Distanz je Artist."""
+    return [
+        {
+            "id": getattr(m.artist, 'id', None),
+            "name": getattr(m.artist, 'name', None),
+            "price_min": getattr(m.artist, 'price_min', None),
+            "price_max": getattr(m.artist, 'price_max', None),
+            "travel_km": round(m.travel_km, 1) if m.travel_km is not None else None,
+        }
+        for m in team.members
+    ]
+
+
+def _alternative_dates(req, needed):
+    """Alternativtermine mit mindestens `needed` passenden freien Artists (Fehler => leere Liste)."""
+    disciplines = split_disciplines(req.show_discipline)
+    try:
+        return artist_mgr.suggest_alternative_dates(
+            disciplines,
+            req.event_date,
+            min_artists=needed,
+            window_days=int(current_app.config.get('ALTERNATIVE_DATES_WINDOW_DAYS', 30)),
+            limit=int(current_app.config.get('ALTERNATIVE_DATES_LIMIT', 3)),
+        )
+    except Exception as e:
+        current_app.logger.warning("alternative date lookup failed: %s", e)
+        return []
+
+
+def _pricing_payload(req, artist_objs, team_size, pmin, pmax, duo_min, duo_max, team=None):
+    """Antwort-Felder zu Preis & Matching (gemeinsam für sync-Antwort und Status-Endpoint)."""
+    resp = {
+        'request_id': req.id,
+        'price_min': pmin,
+        'price_max': pmax,
+        'num_available_artists': len(artist_objs),
+        'matched_artists': _matched_payload(artist_objs),
+    }
+    # Duo-Zusatzpreise nur dann mitsenden, wenn tatsächlich >= 2 Artists vorhanden
+    if team_size == 2 and len(artist_objs) >= 2 and duo_min is not None and duo_max is not None:
+        resp['duo_price_min'] = duo_min
+        resp['duo_price_max'] = duo_max
+    # Zu wenige freie Artists: nächstgelegene Alternativtermine vorschlagen
+    needed = max(1, int(team_size or 1))
+    if len(artist_objs) < needed:
+        resp['alternative_dates'] = _alternative_dates(req, needed)
+    if team is not None:
+        resp['team'] = _team_payload(team)
+        resp['team_missing_disciplines'] = team.missing
+    # Gruppe ohne passendes Team (zu wenige Artists): Flag setzen, keine Preise
+    elif team_size and int(team_size) >= 3:
+        resp['group_pricing_pending'] = True
+    return resp
+
+
+def process_booking_request(req_id: int):
+    """Ingest-Worker: Matching, Distanz, Preis und Benachrichtigung für eine pending-Anfrage."""
+    stale_after = timedelta(seconds=float(current_app.config.get('BOOKING_INGEST_PROCESSING_TIMEOUT_SECONDS', 600)))
+    if not request_mgr.claim_for_processing(req_id, stale_after):
+        # schon erledigt oder gerade bei einem anderen Worker in Arbeit
+        return None
+    req = request_mgr.get_request(req_id)
+    try:
+        team_size = _normalize_team_size(req.team_size)
+        disciplines = split_disciplines(req.show_discipline)
+        artist_objs = _match_artists(disciplines, req.event_date)
+        request_mgr.assign_artists(req, artist_objs)
+        _price_request(req, artist_objs, team_size)
+        req.processing_status = 'done'
+        req.processing_error = None
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception("booking ingest failed for request_id=%s", req_id)
+        req = request_mgr.get_request(req_id)
+        if req:
+            request_mgr.set_processing_status(req, 'failed', error=str(e)[:500])
+        return None
+    _notify_matched_artists(req, artist_objs)
+    return req
+
+
+def _request_payload_args(data, team_size, disciplines):
+    """Gemeinsame Feld-Zuordnung Payload -> BookingRequestManager (sync & async)."""
+    return dict(
+        client_name       = data['client_name'],
+        client_email      = data['client_email'],
+        event_date        = data['event_date'],
+        event_time        = data['event_time'],
+        duration_minutes  = data['duration_minutes'],
+        event_type        = data['event_type'],
+        show_type         = data.get('show_type'),
+        show_discipline   = disciplines,
+        team_size         = team_size,
+        number_of_guests  = data['number_of_guests'],
+        event_address     = data['event_address'],
+        is_indoor         = data.get('is_indoor', False),
+        special_requests  = data.get('special_requests', ''),
+        needs_light       = data.get('needs_light', False),
+        needs_sound       = data.get('needs_sound', False),
+        distance_km       = data.get('distance_km', 0.0),
+        newsletter_opt_in = data.get('newsletter_opt_in', False),
+    )
+
+
 # kein Login erforderlich!
 @booking_bp.route('/requests', methods=['POST'])
 @swag_from('../resources/swagger/requests_post.yml')
 def create_request():
-    """Create a new booking request and calculate a price range."""
+    """Create a new booking request and calculate a price range.
+    With BOOKING_INGEST_MODE=async only validate + persist, then answer 202 with a status URL.
+    """
     try:
         data = request.get_json(force=True)
         current_app.logger.debug("create_request payload: %s", data)
@@ -192,7 +536,7 @@ def create_request():
         cached = _idempotency_lookup(idem_key) if idem_key else None
         if cached is not None:
             resp = jsonify(cached)
-            resp.status_code = 201
+            resp.status_code = cached.get("_status_code", 201)
             resp.headers["Location"] = cached.get("_location", "")
             resp.headers["Idempotent-Replay"] = "true"
             return resp
@@ -202,23 +546,10 @@ def create_request():
         if not ok:
             return error_response("validation_error", err, 400)
 
-        # Team-Größe normalisieren: Zahlen oder Strings wie "solo"/"duo" akzeptieren
-        raw_team_size = data.get('team_size')
-        if isinstance(raw_team_size, str):
-            ts_lower = raw_team_size.strip().lower()
-            if ts_lower == 'solo':
-                team_size = 1
-            elif ts_lower == 'duo':
-                team_size = 2
-            elif ts_lower in ('group', 'gruppe'):
-                team_size = 3
-            else:
-                try:
-                    team_size = int(raw_team_size)
-                except ValueError:
-                    return error_response("validation_error", "Invalid team_size", 400)
-        else:
-            team_size = raw_team_size
+        try:
+            team_size = _normalize_team_size(data.get('team_size'))
+        except ValueError:
+            return error_response("validation_error", "Invalid team_size", 400)
 
         # Disciplines normalization and validation
         raw_disc = data.get('disciplines')
@@ -229,144 +560,22 @@ def create_request():
         else:
             return error_response("validation_error", "disciplines must be a list", 400)
 
+        if (current_app.config.get('BOOKING_INGEST_MODE') or 'sync').lower() == 'async':
+            return _create_request_async(data, team_size, disciplines, idem_key)
+
         event_date = data['event_date']  # will raise KeyError if missing
-        artist_objs = artist_mgr.get_artists_by_discipline(disciplines, event_date) or []
-        # Filter only approved artists
-        artist_objs = [a for a in artist_objs if getattr(a, 'approval_status', '') == 'approved']
-        # Für die UI: kompaktes Matched-Payload (max. MAX_MATCHED_ARTISTS Artists)
-        matched_payload = [
-            {
-                "id": getattr(a, 'id', None),
-                "name": getattr(a, 'name', None),
-                "price_min": getattr(a, 'price_min', None),
-                "price_max": getattr(a, 'price_max', None),
-            }
-            for a in (artist_objs[:MAX_MATCHED_ARTISTS] if artist_objs else [])
-        ]
+        artist_objs = _match_artists(disciplines, event_date)
         req = request_mgr.create_request(
-            client_name       = data['client_name'],
-            client_email      = data['client_email'],
-            event_date        = data['event_date'],
-            event_time        = data['event_time'],
-            duration_minutes  = data['duration_minutes'],
-            event_type        = data['event_type'],
-            show_type         = data.get('show_type'),
-            show_discipline   = disciplines,
-            team_size         = team_size,
-            number_of_guests  = data['number_of_guests'],
-            event_address     = data['event_address'],
-            is_indoor         = data.get('is_indoor', False),
-            special_requests  = data.get('special_requests', ''),
-            needs_light       = data.get('needs_light', False),
-            needs_sound       = data.get('needs_sound', False),
-            artists           = artist_objs,
-            distance_km       = data.get('distance_km', 0.0),
-            newsletter_opt_in = data.get('newsletter_opt_in', False)
+            artists=artist_objs,
+            **_request_payload_args(data, team_size, disciplines)
         )
 
-        # Preisspanne berechnen basierend auf ausgewählten Artists und Parametern
-        duo_min = duo_max = None
-        if not req.artists:
-            req.price_min = None
-            req.price_max = None
-            pmin = None
-            pmax = None
-        else:
-            fee_pct = _config_fee_pct()
-            event_city = data.get('event_address', '').split(',')[-1].strip().lower()
-            external_artists = [
-                a for a in artist_objs
-                if a.address and event_city not in a.address.lower()
-            ]
-            travel_distance = req.distance_km if external_artists else 0.0
-
-            # Basis definieren je Teamgröße
-            if team_size == 1:
-                # Solo: min/max aus den verfügbaren Artists (bisheriges Verhalten)
-                base_min = min(a.price_min for a in artist_objs)
-                base_max = max(a.price_max for a in artist_objs)
-            elif team_size == 2:
-                # Duo: nur wenn mindestens 2 Artists verfügbar sind
-                if len(artist_objs) >= 2:
-                    pair = artist_objs[:2]  # exakt die ersten zwei aus der gematchten Liste
-                    duo_min = sum(getattr(a, 'price_min', 0) for a in pair)
-                    duo_max = sum(getattr(a, 'price_max', 0) for a in pair)
-                    base_min = duo_min
-                    base_max = duo_max
-                else:
-                    base_min = base_max = None
-            else:
-                # Gruppe (3+): keine Preisspanne
-                base_min = base_max = None
-
-            # Wenn wir für Duo bereits die Summe der beiden Artists gebildet haben,
-            # soll die Preisfunktion NICHT erneut pro Person mitteln/skalieren.
-            team_size_for_calc = 1 if (team_size == 2 and base_min is not None and duo_min is not None) else team_size
-
-            try:
-                if base_min is not None:
-                    args = {
-                        'base_min': base_min,
-                        'base_max': base_max,
-                        'distance_km': travel_distance,
-                        'fee_pct': fee_pct,
-                        'newsletter': req.newsletter_opt_in,
-                        'event_type': req.event_type,
-                        'num_guests': req.number_of_guests,
-                        'is_weekend': req.event_date.weekday() >= 5,
-                        'is_indoor': req.is_indoor,
-                        'needs_light': req.needs_light,
-                        'needs_sound': req.needs_sound,
-                        'show_discipline': req.show_discipline,
-                        'team_size': team_size_for_calc,
-                        'team_count': (2 if team_size == 2 else (team_size if team_size and int(team_size) >= 1 else 1)),
-                        'duration': req.duration_minutes,
-                        'event_address': req.event_address
-                    }
-                    pmin, pmax = calculate_price(**args)
-                else:
-                    pmin = pmax = None
-            except Exception as e:
-                current_app.logger.exception("calculate_price failed: %s", e)
-                pmin = pmax = None
-
-            # In die DB schreiben
-            req.price_min = pmin
-            req.price_max = pmax
+        pmin, pmax, duo_min, duo_max, team = _price_request(req, artist_objs, team_size)
         db.session.commit()
 
-        # --- Notify matched artists via email (first simple version) ---
-        try:
-            date_str = req.event_date.strftime('%d.%m.%Y') if isinstance(req.event_date, datetime) else str(req.event_date)
-            city = (req.event_address.split(',')[-1].strip() if req.event_address else '')
-            subject = f"Neue Booking-Anfrage – {date_str}{', ' + city if city else ''}"
-
-            for artist in artist_objs:
-                # Skip if no email available
-                if not getattr(artist, 'email', None):
-                    current_app.logger.warning(f"Skipping email for artist {getattr(artist, 'id', '?')} – no email on record")
-                    continue
-
-                html = build_artist_new_request_email(artist, req)
-                send_email(artist.email, subject, html)
-        except Exception as e:
-            # Do not fail the API if email sending has issues; just log it.
-            current_app.logger.exception(f"Error while sending artist notification emails: {e}")
-
-        resp = {
-            'request_id': req.id,
-            'price_min': pmin,
-            'price_max': pmax,
-            'num_available_artists': len(artist_objs),
-            'matched_artists': matched_payload,
-        }
-        # Duo-Zusatzpreise nur dann mitsenden, wenn tatsächlich >= 2 Artists vorhanden
-        if team_size == 2 and len(artist_objs) >= 2 and duo_min is not None and duo_max is not None:
-            resp['duo_price_min'] = duo_min
-            resp['duo_price_max'] = duo_max
-        # Gruppe: Flag setzen, keine Preise
-        if team_size and int(team_size) >= 3:
-            resp['group_pricing_pending'] = True
+        _notify_matched_artists(req, artist_objs)
+
+        resp = _pricing_payload(req, artist_objs, team_size, pmin, pmax, duo_min, duo_max, team)
 
         location_value = f"/api/requests/requests/{req.id}"
         resp["_location"] = location_value  # internal for idempotent replays
@@ -385,11 +594,156 @@ def create_request():
     except KeyError as ke:
         current_app.logger.warning("Missing field in create_request: %s", ke)
         return error_response("missing_field", f"Missing field: {str(ke)}", 400)
+    except ValueError as ve:
+        return error_response("validation_error", str(ve), 400)
     except Exception as e:
         current_app.logger.exception("Error in create_request")
         return error_response("internal_error", f"create_request failed: {str(e)}", 500)
 
 
+# kein Login erforderlich, keine Seiteneffekte (keine Anlage, kein Geocoding, keine Mails)
+@booking_bp.route('/quote', methods=['POST'])
+@read_replica
+@swag_from('../resources/swagger/requests_quote_post.yml')
+def quote_request():
+    """Return the price range the booking form would get, without creating a request.
+    Quotes are memoized per normalized price-relevant input for QUOTE_CACHE_TTL_SECONDS;
+    cache misses count against a per-IP token bucket (QUOTE_RATE_LIMIT_PER_MINUTE / QUOTE_RATE_LIMIT_BURST),
+    separate from and much higher than the create_request limit, so a live-updating form is not throttled.
+    """
+    try:
+        inputs = normalize_quote_input(request.get_json(silent=True))
+        team_size = _normalize_team_size(inputs['team_size'])
+        _, _, inputs['event_type'] = request_mgr._normalize_event_fields(inputs['event_date'], None, inputs['event_type'])
+    except ValueError as ve:
+        return error_response("validation_error", str(ve), 400)
+
+    # Regel-Version im Key: nach dem Veröffentlichen neuer Preisregeln keine alten Quotes mehr
+    key = quote_cache_key(inputs) + (pricing_rules.current().version,)
+    cached = quote_cache.get(key)
+    if cached is not None:
+        payload, ttl_left = cached
+        return _quote_response(payload, ttl_left, hit=True)
+
+    # Memo-Treffer kosten nichts, nur echte Berechnungen zählen
+    if not _quote_rate_limit_allow(_client_ip()):
+        return error_response("rate_limited", "Too many requests. Try again later.", 429)
+
+    try:
+        payload = _compute_quote(inputs, team_size)
+    except Exception as e:
+        current_app.logger.exception("Error in quote_request")
+        return error_response("internal_error", f"quote failed: {str(e)}", 500)
+    quote_cache.put(key, payload)
+    return _quote_response(payload, quote_cache.ttl_seconds, hit=False)
+
+
+def _compute_quote(inputs, team_size):
+    """Matching + Distanz + calculate_price wie bei create_request, aber auf einem transienten Objekt.
+    Kein Geocoding im Request: Distanzen nur aus gespeicherten/memoisierten Koordinaten; ist die Eventadresse
+    noch unbekannt, wird ohne Fahrtkosten gerechnet und `distance_estimated` gesetzt.
+    """
+    artist_objs = _match_artists(inputs['disciplines'], inputs['event_date'])
+    distance_estimated = cached_coordinates(inputs['event_address']) is None
+    distance_km = (request_mgr._travel_distance(inputs['event_address'], artist_objs, cached_only=True)
+                   if artist_objs else 0.0)
+    draft = SimpleNamespace(
+        id=None,
+        artists=artist_objs,
+        event_date=inputs['event_date'],
+        event_type=inputs['event_type'],
+        event_address=inputs['event_address'],
+        number_of_guests=inputs['number_of_guests'],
+        duration_minutes=inputs['duration_minutes'],
+        show_discipline=','.join(inputs['disciplines']),
+        is_indoor=inputs['is_indoor'],
+        needs_light=inputs['needs_light'],
+        needs_sound=inputs['needs_sound'],
+        newsletter_opt_in=inputs['newsletter_opt_in'],
+        distance_km=distance_km,
+        price_min=None,
+        price_max=None,
+    )
+    pmin, pmax, duo_min, duo_max, team = _price_request(draft, artist_objs, team_size, cached_only=True)
+    payload = _pricing_payload(draft, artist_objs, team_size, pmin, pmax, duo_min, duo_max, team)
+    payload.pop('request_id', None)
+    payload['distance_km'] = distance_km
+    payload['distance_estimated'] = distance_estimated
+    return payload
+
+
+def _quote_response(payload, ttl_left, hit):
+    response = jsonify(dict(payload, cached=hit))
+    response.headers['Cache-Control'] = f"private, max-age={max(0, int(ttl_left))}"
+    response.headers['X-Quote-Cache'] = 'hit' if hit else 'miss'
+    return response
+
+
+def _status_key_hash(key: str) -> str:
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _create_request_async(data, team_size, disciplines, idem_key):
+    """Async-Modus: pending-Anfrage speichern, Worker anstoßen, 202 + Status-URL zurückgeben.
+    Die Status-URL enthält einen zufälligen Schlüssel (nur der Hash liegt in der DB), IDs allein reichen nicht.
+    """
+    status_key = secrets.token_urlsafe(24)
+    req = request_mgr.create_pending_request(
+        status_key_hash=_status_key_hash(status_key),
+        **_request_payload_args(data, team_size, disciplines)
+    )
+    status_url = f"/api/requests/requests/{req.id}/status?key={status_key}"
+    resp = {
+        'request_id': req.id,
+        'processing_status': req.processing_status,
+        'status_url': status_url,
+        '_location': status_url,  # internal for idempotent replays
+        '_status_code': 202,
+    }
+    if idem_key:
+        _idempotency_store(idem_key, resp)
+
+    ingest_queue.submit(process_booking_request, req.id)
+
+    response = jsonify(resp)
+    response.status_code = 202
+    response.headers["Location"] = status_url
+    if idem_key:
+        response.headers["Idempotent-Replay"] = "false"
+    return response
+
+
+@booking_bp.route('/requests/<int:req_id>/status', methods=['GET'])
+@swag_from('../resources/swagger/requests_status_get.yml', validation=False)
+def request_processing_status(req_id: int):
+    """Return the ingestion status of a booking request (no login, but needs the key from the 202 Location)."""
+    key = request.args.get('key') or ''
+    req = request_mgr.get_request(req_id)
+    # ohne passenden Schlüssel wie nicht vorhanden: IDs sind fortlaufend und dürfen nichts verraten
+    if not req or not key or not req.status_key_hash or not hmac.compare_digest(_status_key_hash(key), req.status_key_hash):
+        return error_response("not_found", "Request not found", 404)
+    payload = {
+        'request_id': req.id,
+        'processing_status': req.processing_status,
+    }
+    if req.processing_status == 'done':
+        artist_objs = list(req.artists)
+        try:
+            team_size = _normalize_team_size(req.team_size)
+        except (TypeError, ValueError):
+            team_size = 1
+        duo_min = duo_max = None
+        # gespeichertes Team statt _select_team: gleiche Auswahl wie beim Bepreisen, kein Geocoding pro Poll
+        team = _stored_team(req, artist_objs)
+        if team is not None and team_size == 2:
+            duo_min = sum(a.price_min or 0 for a in team.artists)
+            duo_max = sum(a.price_max or 0 for a in team.artists)
+        payload.update(_pricing_payload(req, artist_objs, team_size, req.price_min, req.price_max, duo_min, duo_max, team))
+    elif req.processing_status == 'failed':
+        payload['error'] = req.processing_error
+    return jsonify(payload), 200
+
+
 @booking_bp.route('/requests/<int:req_id>/offer', methods=['PUT'])
 @jwt_required()
 @swag_from('../resources/swagger/requests_offer_put.yml')
@@ -439,7 +793,8 @@ def set_offer(req_id):
         show_discipline = req.show_discipline,
         team_size      = req.team_size,
         duration       = req.duration_minutes,
-        event_address  = req.event_address
+        event_address  = req.event_address,
+        rules          = pricing_rules.get(req.pricing_version),
     )
 
     # Speichere das neue Angebot direkt am BookingRequest
@@ -447,6 +802,7 @@ def set_offer(req_id):
     booking.artist_gage = artist_gage
     booking.artist_offer_date = datetime.utcnow()
     booking.status = 'angeboten'
+    request_events.publish([a.id for a in booking.artists], booking.id, "request.status", status=booking.status)
     db.session.commit()
     req = booking
 
@@ -517,7 +873,7 @@ def build_artist_new_request_email(artist, req):
           <strong>Datum:</strong> {date_str}<br/>
           <strong>Ort:</strong> {city or '—'}<br/>
           <strong>Event:</strong> {req.event_type or '—'}<br/>
-          <strong>Disziplin(en):</strong> {', '.join(req.show_discipline) if getattr(req, 'show_discipline', None) else '—'}<br/>
+          <strong>Disziplin(en):</strong> {', '.join(split_disciplines(getattr(req, 'show_discipline', None))) or '—'}<br/>
           <strong>Teamgröße:</strong> {req.team_size or '—'}<br/>
           <strong>Dauer:</strong> {req.duration_minutes or '—'} Minuten<br/>
           <strong>Preisrahmen:</strong> {price_range or 'wird noch abgestimmt'}
@@ -0,0 +1,120 @@
+"""
+Benchmark: CPU-Zeit für Listen-Serialisierung (ORM + stdlib-JSON vs. Spalten-Projektion + orjson).
+
+Aufruf (aus dem Projekt-Root):
+    python scripts/bench_serialization.py            # 10k Anfragen, 5 Durchläufe
+    python scripts/bench_serialization.py --rows 50000 --repeat 3
+
+Nutzt eine temporäre SQLite-Datei, misst process_time (CPU, ohne I/O-Wartezeit) für
+"Laden + Dicts bauen + JSON-Body erzeugen" am Beispiel von GET /admin/requests/all.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SUPABASE_JWT_SECRET", "bench-secret")
+_bench_db = Path(tempfile.mkdtemp()) / "bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_bench_db}"
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app import app  # noqa: E402
+from helpers.json_provider import HAS_ORJSON  # noqa: E402
+from managers.booking_requests_manager import BookingRequestManager  # noqa: E402
+from models import db, Artist, BookingRequest, booking_artists  # noqa: E402
+from routes.admin_routes import ALL_REQUESTS_COLUMNS  # noqa: E402
+
+
+def seed(n_rows: int) -> None:
+    db.create_all()
+    db.session.execute(insert(Artist), [
+        {"name": f"Bench {i}", "email": f"bench{i}@example.com", "approval_status": "approved"}
+        for i in range(20)
+    ])
+    base = date.today()
+    db.session.execute(insert(BookingRequest), [
+        {
+            "client_name": f"Client {i}", "client_email": f"client{i}@example.com",
+            "event_type": "Firmenfeier", "show_type": "Bühnen Show", "show_discipline": "Zauberer,Jonglage",
+            "team_size": "2", "number_of_guests": 120, "event_address": "Musterstr. 1, 80331 München",
+            "event_date": base + timedelta(days=i % 365), "event_time": dtime(19, 30),
+            "duration_minutes": 20, "special_requests": "", "price_min": 900, "price_max": 1400,
+        }
+        for i in range(n_rows)
+    ])
+    db.session.execute(insert(booking_artists), [
+        {"booking_id": i + 1, "artist_id": (i % 20) + 1} for i in range(n_rows)
+    ] + [
+        {"booking_id": i + 1, "artist_id": ((i + 7) % 20) + 1} for i in range(n_rows)
+    ])
+    db.session.commit()
+
+
+def legacy_body() -> bytes:
+    """Vorheriger Pfad: voll hydrierte ORM-Objekte, isoformat() pro Feld, stdlib json."""
+    reqs = BookingRequest.query.options(selectinload(BookingRequest.artists)).all()
+    out = [{
+        'id': r.id, 'client_name': r.client_name, 'client_email': r.client_email,
+        'event_date': r.event_date.isoformat(),
+        'event_time': r.event_time.isoformat() if r.event_time else None,
+        'duration_minutes': r.duration_minutes, 'event_type': r.event_type,
+        'show_discipline': r.show_discipline, 'team_size': r.team_size,
+        'number_of_guests': r.number_of_guests, 'event_address': r.event_address,
+        'is_indoor': r.is_indoor, 'special_requests': r.special_requests,
+        'needs_light': r.needs_light, 'needs_sound': r.needs_sound, 'status': r.status,
+        'price_min': r.price_min, 'price_max': r.price_max,
+        'recommended_price_min': r.price_min, 'recommended_price_max': r.price_max,
+        'price_offered': r.price_offered, 'artist_ids': [a.id for a in r.artists],
+    } for r in reqs]
+    return json.dumps(out, sort_keys=True, separators=(",", ":")).encode()
+
+
+def projected_body() -> bytes:
+    """Neuer Pfad: Spalten-Projektion + app.json (orjson)."""
+    rows = BookingRequestManager().list_requests_projection(ALL_REQUESTS_COLUMNS)
+    for r in rows:
+        r['recommended_price_min'] = r['price_min']
+        r['recommended_price_max'] = r['price_max']
+    return app.json.response(rows).get_data()
+
+
+def measure(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with app.app_context():
+        seed(args.rows)
+        assert json.loads(legacy_body()) == json.loads(projected_body()), "Ausgaben weichen ab"
+
+        legacy = measure(legacy_body, args.repeat)
+        projected = measure(projected_body, args.repeat)
+        per_10k = 10_000 / args.rows
+        print(f"rows={args.rows} orjson={'yes' if HAS_ORJSON else 'no (stdlib fallback)'}")
+        print(f"legacy    (ORM + json):       {legacy * 1000 * per_10k:8.1f} ms CPU / 10k rows")
+        print(f"projected (columns + orjson): {projected * 1000 * per_10k:8.1f} ms CPU / 10k rows")
+        print(f"speedup: {legacy / projected:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Full-text and faceted artist search for the admin UI.
+
+Usage (see routes/admin_routes.py, GET /admin/artists/search):
+    result = artist_search.search(q="feuer", disciplines=["Jonglage"], city="München",
+                                  price_min=500, price_max=1500, status="approved", page=1, per_page=25)
+    result["items"], result["total"], result["facets"]["disciplines"], result["facets"]["status"]
+
+Notes:
+- SQLite: FTS5 table `artist_search` (name, bio, address, disciplines), kept in
+  sync with artists / artist_disciplines by triggers (models.py, migration
+  9a4c2e7f1b35). Terms are prefix-matched and diacritics-insensitive, results
+  ranked by bm25.
+- PostgreSQL: expression GIN index over to_tsvector('simple', name/bio/address)
+  plus pg_trgm indexes on name and address; prefix tsquery ranked by ts_rank,
+  discipline names matched by prefix.
+- Without either (e.g. a dev database created before the migration) the search
+  falls back to substring ILIKE on name/bio/address/disciplines (not indexed).
+- Facets are counted over the filtered set without their own filter, so the UI
+  can show "Jonglage (12)" next to an active "Zauberer" filter.
+- Filters: any of the given disciplines, city words in the address, price range
+  overlap, approval status. Offset pagination, `per_page` capped at MAX_PER_PAGE.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, column, func, inspect, literal_column, or_, select, table
+
+from helpers.serializers import columns_of, group_values, project
+from models import db, Artist, Discipline, artist_disciplines
+
+MAX_PER_PAGE = 100
+DEFAULT_COLUMNS = (
+    'id', 'name', 'email', 'address', 'price_min', 'price_max',
+    'approval_status', 'profile_image_url',
+)
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+_FTS = table("artist_search", column("rowid"), column("rank"))
+_FTS_MATCH = literal_column("artist_search").op("MATCH")
+_PG_DOCUMENT = func.to_tsvector(
+    'simple',
+    func.coalesce(Artist.name, '') + ' ' + func.coalesce(Artist.bio, '') + ' ' + func.coalesce(Artist.address, ''),
+)
+
+
+def _terms(text: Optional[str]) -> List[str]:
+    return _TERM_RE.findall(text or "")
+
+
+def _with_discipline(*conditions):
+    """Artist ids having a discipline that matches any of `conditions`."""
+    return (
+        select(artist_disciplines.c.artist_id)
+        .join(Discipline, Discipline.id == artist_disciplines.c.discipline_id)
+        .where(or_(*conditions))
+    )
+
+
+def _like(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class ArtistSearch:
+    """Builds the search, facet and count queries for the backend of the current database."""
+
+    def __init__(self):
+        self._backends: Dict[str, str] = {}
+
+    def backend(self) -> str:
+        """'fts5', 'postgresql' or 'like' (cached per database URL)."""
+        bind = db.session.get_bind()
+        key = str(bind.engine.url)
+        backend = self._backends.get(key)
+        if backend is None:
+            dialect = bind.dialect.name
+            if dialect == 'postgresql':
+                backend = 'postgresql'
+            elif dialect == 'sqlite' and inspect(bind).has_table('artist_search'):
+                backend = 'fts5'
+            else:
+                backend = 'like'
+            self._backends[key] = backend
+        return backend
+
+    def reset(self) -> None:
+        self._backends.clear()
+
+    # --- Bedingungen ---------------------------------------------------------------
+    @staticmethod
+    def _fts_query(terms: Sequence[str], city_terms: Sequence[str]) -> Optional[str]:
+        # Terme stammen aus \w+ und werden gequotet: keine FTS5-Syntax aus der Eingabe
+        parts = [f'"{t}"*' for t in terms] + [f'address : "{t}"*' for t in city_terms]
+        return " AND ".join(parts) or None
+
+    def _text_condition(self, backend: str, terms: Sequence[str], city_terms: Sequence[str]):
+        if backend == 'fts5':
+            match = self._fts_query(terms, city_terms)
+            if not match:
+                return None
+            return Artist.id.in_(select(_FTS.c.rowid).where(_FTS_MATCH(match)))
+
+        conditions = []
+        if backend == 'postgresql':
+            if terms:
+                tsquery = func.to_tsquery('simple', " & ".join(f"{t}:*" for t in terms))
+                conditions.append(or_(
+                    _PG_DOCUMENT.op('@@')(tsquery),
+                    Artist.id.in_(_with_discipline(*(Discipline.name.ilike(f"{t}%") for t in terms))),
+                ))
+        else:
+            for t in terms:
+                pattern = _like(t)
+                conditions.append(or_(
+                    Artist.name.ilike(pattern, escape="\\"),
+                    Artist.bio.ilike(pattern, escape="\\"),
+                    Artist.address.ilike(pattern, escape="\\"),
+                    Artist.id.in_(_with_discipline(Discipline.name.ilike(pattern, escape="\\"))),
+                ))
+        conditions.extend(Artist.address.ilike(_like(t), escape="\\") for t in city_terms)
+        return and_(*conditions) if conditions else None
+
+    @staticmethod
+    def _discipline_condition(disciplines: Sequence[str]):
+        if not disciplines:
+            return None
+        return Artist.id.in_(_with_discipline(func.lower(Discipline.name).in_(disciplines)))
+
+    # --- Suche ---------------------------------------------------------------------
+    def search(self, q: Optional[str] = None, disciplines: Iterable[str] = (), city: Optional[str] = None,
+               price_min: Optional[int] = None, price_max: Optional[int] = None, status: Optional[str] = None,
+               page: int = 1, per_page: int = 25, columns: Sequence[str] = DEFAULT_COLUMNS) -> dict:
+        backend = self.backend()
+        terms, city_terms = _terms(q), _terms(city)
+        wanted = sorted({d.strip().lower() for d in disciplines if d and d.strip()})
+        page = max(1, int(page))
+        per_page = min(max(1, int(per_page)), MAX_PER_PAGE)
+
+        base = [c for c in (
+            self._text_condition(backend, terms, city_terms),
+            # Preisspannen überlappen sich
+            Artist.price_max >= price_min if price_min is not None else None,
+            Artist.price_min <= price_max if price_max is not None else None,
+        ) if c is not None]
+        discipline_cond = self._discipline_condition(wanted)
+        status_cond = Artist.approval_status == status if status else None
+        where = base + [c for c in (discipline_cond, status_cond) if c is not None]
+
+        stmt = select(*columns_of(Artist, columns)).where(*where)
+        if backend == 'fts5' and (terms or city_terms):
+            # Relevanz (bm25) über einen Join statt IN-Subquery
+            stmt = (
+                select(*columns_of(Artist, columns))
+                .join(_FTS, _FTS.c.rowid == Artist.id)
+                .where(_FTS_MATCH(self._fts_query(terms, city_terms)), *where[1:])
+                .order_by(_FTS.c.rank, Artist.id)
+            )
+        elif backend == 'postgresql' and terms:
+            tsquery = func.to_tsquery('simple', " & ".join(f"{t}:*" for t in terms))
+            stmt = stmt.order_by(func.ts_rank(_PG_DOCUMENT, tsquery).desc(), Artist.id)
+        else:
+            stmt = stmt.order_by(Artist.name, Artist.id)
+        items = project(stmt.limit(per_page).offset((page - 1) * per_page))
+
+        names = group_values(db.session.execute(
+            select(artist_disciplines.c.artist_id, Discipline.name)
+            .join(Discipline, Discipline.id == artist_disciplines.c.discipline_id)
+            .where(artist_disciplines.c.artist_id.in_([row['id'] for row in items]))
+            .order_by(Discipline.name)
+        )) if items else {}
+        for row in items:
+            row['disciplines'] = names.get(row['id'], [])
+
+        facets = self._facets(base, discipline_cond, status_cond)
+        # Status-Facette zählt ohne Status-Filter -> Gesamtzahl ohne eigenes COUNT
+        total = facets['status'].get(status, 0) if status else sum(facets['status'].values())
+        return {
+            'items': items,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'facets': facets,
+            'backend': backend,
+        }
+
+    @staticmethod
+    def _facets(base: list, discipline_cond, status_cond) -> dict:
+        """Counts per discipline (without the discipline filter) and per status (without the status filter)."""
+        discipline_where = base + ([status_cond] if status_cond is not None else [])
+        # (artist_id, discipline_id) ist eindeutig: COUNT(*) je Disziplin statt COUNT(DISTINCT)
+        counts = select(artist_disciplines.c.discipline_id, func.count().label('n')).group_by(
+            artist_disciplines.c.discipline_id
+        )
+        if discipline_where:
+            counts = counts.where(artist_disciplines.c.artist_id.in_(select(Artist.id).where(*discipline_where)))
+        counts = counts.subquery()
+        by_discipline = db.session.execute(
+            select(Discipline.name, counts.c.n)
+            .join(counts, counts.c.discipline_id == Discipline.id)
+            .order_by(counts.c.n.desc(), Discipline.name)
+        )
+        status_where = base + ([discipline_cond] if discipline_cond is not None else [])
+        by_status = db.session.execute(
+            select(Artist.approval_status, func.count(Artist.id))
+            .where(*status_where)
+            .group_by(Artist.approval_status)
+        )
+        return {
+            'disciplines': {name: n for name, n in by_discipline},
+            'status': {status: n for status, n in by_status},
+        }
+
+
+# Process-wide instance (backend detection is cached per database URL).
+artist_search = ArtistSearch()
+
+__all__ = ["ArtistSearch", "artist_search", "MAX_PER_PAGE", "DEFAULT_COLUMNS"]
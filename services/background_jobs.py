@@ -0,0 +1,191 @@
+"""Persistent, pollable background jobs for admin bulk actions.
+
+Usage:
+    from services.background_jobs import job_queue
+    job_queue.register("availability.fill", fill_handler)       # handler(payload) -> result dict
+    job_queue.register("scheduler.run", run_handler, timeout_seconds=3 * 3600)
+    job = job_queue.enqueue("availability.fill", {"artist_ids": [1, 2]}, created_by="admin-uid")
+    job.id                                                       # -> GET /admin/jobs/<id>
+
+Notes:
+- The job row (`background_jobs`) is committed before the work is scheduled, so
+  the caller can return its id immediately and a crashed worker never loses a
+  job. `requeue_stale` re-submits rows left in `queued`; rows in `running` whose
+  `started_at` is older than the kind's timeout (register(..., timeout_seconds),
+  default BACKGROUND_JOBS_TIMEOUT_SECONDS) are marked failed, not re-run, because
+  the handler may already have done part of its work.
+- A job is claimed with a conditional UPDATE (queued -> running), so a job that
+  is submitted twice still runs once.
+- Pool size via BACKGROUND_JOBS_WORKERS (default 2), per process.
+  BACKGROUND_JOBS_EAGER runs jobs inline (tests / debugging), like
+  BOOKING_INGEST_EAGER.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from flask import current_app
+from sqlalchemy import select, update
+
+from models import db, BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Optional[dict]]
+
+
+class JobQueue:
+    """Job registry plus a ThreadPoolExecutor that runs jobs inside an app context."""
+
+    def __init__(self):
+        self._handlers: Dict[str, Handler] = {}
+        self._timeouts: Dict[str, float] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def register(self, kind: str, handler: Handler, timeout_seconds: Optional[float] = None) -> Handler:
+        self._handlers[kind] = handler
+        if timeout_seconds is not None:
+            self._timeouts[kind] = float(timeout_seconds)
+        else:
+            self._timeouts.pop(kind, None)
+        return handler
+
+    def _pool(self, app) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                workers = int(app.config.get("BACKGROUND_JOBS_WORKERS", 2) or 2)
+                self._executor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                                    thread_name_prefix="background-job")
+            return self._executor
+
+    def enqueue(self, kind: str, payload: Optional[dict] = None, created_by: Optional[str] = None) -> BackgroundJob:
+        """Persist a queued job, schedule it and return the row (KeyError for unknown kinds)."""
+        if kind not in self._handlers:
+            raise KeyError(f"Unknown job kind: {kind}")
+        job = BackgroundJob(kind=kind, status="queued", payload=payload or {}, created_by=created_by)
+        db.session.add(job)
+        db.session.commit()
+        self.submit(job.id)
+        return job
+
+    def submit(self, job_id: int) -> None:
+        app = current_app._get_current_object()
+        if app.config.get("BACKGROUND_JOBS_EAGER"):
+            self.run(job_id)
+            return
+        self._pool(app).submit(self._run_in_app, app, job_id)
+
+    def _run_in_app(self, app, job_id: int) -> None:
+        with app.app_context():
+            try:
+                self.run(job_id)
+            finally:
+                db.session.remove()
+
+    def run(self, job_id: int) -> Optional[BackgroundJob]:
+        """Claim and execute one job; failures are stored on the row, never raised."""
+        claimed = db.session.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job_id, BackgroundJob.status == "queued")
+            .values(status="running", started_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        job = db.session.get(BackgroundJob, job_id)
+        if not claimed or job is None:
+            return job
+        db.session.refresh(job)
+
+        kind, payload = job.kind, dict(job.payload or {})
+        handler = self._handlers.get(kind)
+        try:
+            if handler is None:
+                raise KeyError(f"No handler registered for {kind}")
+            outcome = {"status": "done", "result": handler(payload)}
+        except Exception as e:
+            logger.exception("background job %s (%s) failed", job_id, kind)
+            db.session.rollback()
+            outcome = {"status": "failed", "error": str(e)[:2000]}
+        db.session.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job_id)
+            .values(finished_at=datetime.utcnow(), **outcome)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return db.session.get(BackgroundJob, job_id)
+
+    def get(self, job_id: int) -> Optional[BackgroundJob]:
+        return db.session.get(BackgroundJob, job_id)
+
+    def requeue_stale(self, older_than: timedelta = timedelta(minutes=10)) -> Dict[str, int]:
+        """Re-submit jobs still queued after `older_than` (e.g. lost in a worker restart) and fail running
+        jobs whose started_at exceeds their kind's timeout. Returns {"requeued": n, "timed_out": m}.
+        """
+        now = datetime.utcnow()
+        queued = list(db.session.execute(
+            select(BackgroundJob.id).where(
+                BackgroundJob.status == "queued",
+                BackgroundJob.created_at < now - older_than,
+            )
+        ).scalars())
+
+        default_timeout = float(current_app.config.get("BACKGROUND_JOBS_TIMEOUT_SECONDS", 3600))
+        timed_out = 0
+        running = db.session.execute(
+            select(BackgroundJob.id, BackgroundJob.kind, BackgroundJob.started_at)
+            .where(BackgroundJob.status == "running")
+        ).all()
+        for job_id, kind, started_at in running:
+            limit = timedelta(seconds=self._timeouts.get(kind, default_timeout))
+            if started_at is not None and started_at >= now - limit:
+                continue
+            # bedingt: ist der Job inzwischen fertig geworden, bleibt sein Ergebnis stehen
+            timed_out += db.session.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id, BackgroundJob.status == "running",
+                       BackgroundJob.started_at == started_at if started_at is not None
+                       else BackgroundJob.started_at.is_(None))
+                .values(status="failed", finished_at=now,
+                        error=f"timed out: still running after {int(limit.total_seconds())}s (worker lost?)")
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        db.session.commit()
+
+        for job_id in queued:
+            self.submit(job_id)
+        return {"requeued": len(queued), "timed_out": timed_out}
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    @staticmethod
+    def serialize(job: BackgroundJob) -> Dict[str, Any]:
+        def iso(value):
+            return value.isoformat() if value else None
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "payload": job.payload,
+            "result": job.result,
+            "error": job.error,
+            "created_by": job.created_by,
+            "created_at": iso(job.created_at),
+            "started_at": iso(job.started_at),
+            "finished_at": iso(job.finished_at),
+        }
+
+
+# Process-wide queue; handlers register themselves at import time (see managers/admin_offer_manager.py).
+job_queue = JobQueue()
+
+__all__ = ["JobQueue", "job_queue"]
@@ -0,0 +1,93 @@
+"""Background worker pool for asynchronous booking request ingestion.
+
+Usage:
+    from services.booking_ingest import ingest_queue
+    ingest_queue.submit(process_booking_request, req.id)
+
+Notes:
+- Active when Flask config BOOKING_INGEST_MODE == "async"; the route persists a
+  `pending` row first, so a crashed worker never loses a request. Rows left in
+  pending/processing are re-submitted by `requeue_pending` (scheduled job
+  requests.requeue_pending in cron_jobs/tasks.py); the worker claims each row
+  atomically, so a requeue never processes a request twice.
+- Pool size via BOOKING_INGEST_WORKERS (default 4). The pool is per process.
+- BOOKING_INGEST_EAGER runs jobs inline (tests / debugging), like Celery's eager mode.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Optional
+
+from flask import current_app
+
+from models import db
+
+logger = logging.getLogger(__name__)
+
+
+class BookingIngestQueue:
+    """Thin wrapper around a ThreadPoolExecutor that runs jobs inside an app context."""
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self, app) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                workers = int(app.config.get("BOOKING_INGEST_WORKERS", 4) or 4)
+                self._executor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                                    thread_name_prefix="booking-ingest")
+            return self._executor
+
+    def submit(self, fn: Callable[[int], object], request_id: int) -> Optional[Future]:
+        """Schedule `fn(request_id)`; returns the Future (None in eager mode)."""
+        app = current_app._get_current_object()
+        if app.config.get("BOOKING_INGEST_EAGER"):
+            self._run_inline(fn, request_id)
+            return None
+        return self._pool(app).submit(self._run_in_app, app, fn, request_id)
+
+    @staticmethod
+    def _run_inline(fn, request_id):
+        try:
+            fn(request_id)
+        except Exception:
+            logger.exception("booking ingest job failed (eager) for request_id=%s", request_id)
+
+    @staticmethod
+    def _run_in_app(app, fn, request_id):
+        with app.app_context():
+            try:
+                return fn(request_id)
+            except Exception:
+                logger.exception("booking ingest job failed for request_id=%s", request_id)
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    def requeue_pending(self, fn: Callable[[int], object], older_than: timedelta = timedelta(minutes=5),
+                        processing_timeout: Optional[timedelta] = None) -> int:
+        """Re-submit requests stuck in pending (or in processing past `processing_timeout`), e.g. after a restart."""
+        from managers.booking_requests_manager import BookingRequestManager
+        stale = BookingRequestManager().get_pending_requests(
+            older_than=older_than, processing_older_than=processing_timeout,
+        )
+        for req in stale:
+            self.submit(fn, req.id)
+        return len(stale)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+# Process-wide queue used by routes/request_routes.py
+ingest_queue = BookingIngestQueue()
+
+__all__ = ["BookingIngestQueue", "ingest_queue"]
@@ -3,17 +3,23 @@
 """Geolocation helpers (geocoding + distance) for PepeBooking.
 
 Usage:
-    from services.geo import geocode_address, haversine_km
+    from services.geo import geocode_address, cached_coordinates, haversine_km
 
 Notes:
 - Uses OpenStreetMap Nominatim for geocoding ("search" endpoint).
 - Provide a proper User-Agent via Flask config GEO_USER_AGENT to respect the API policy.
 - Returns (lat, lon) as floats or None if not found.
+- Results are memoized per normalized address (GEOCODE_CACHE_TTL_SECONDS, default 24h;
+  "not found" only for 5 minutes, request failures are never cached), so live price
+  quotes and repeated artist addresses do not hit Nominatim again.
+- cached_coordinates() only reads that memo and never calls Nominatim (public price quotes).
 """
 from __future__ import annotations
 
 import math
-from typing import Optional, Tuple
+import threading
+import time
+from typing import Dict, Optional, Tuple
 
 import requests
 from flask import current_app
@@ -29,14 +35,57 @@ def _user_agent() -> str:
     return ua
 
 
+_NOT_FOUND_TTL_SECONDS = 300
+_GEOCODE_CACHE_MAX_ENTRIES = 5000
+_geocode_cache: Dict[str, Tuple[float, Optional[Tuple[float, float]]]] = {}
+_geocode_lock = threading.Lock()
+
+
+def _cache_key(address: str) -> str:
+    return " ".join(address.lower().split())
+
+
+def _cached_geocode(key: str):
+    """(hit, value) for a memoized address."""
+    with _geocode_lock:
+        entry = _geocode_cache.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires <= time.monotonic():
+            _geocode_cache.pop(key, None)
+            return False, None
+        return True, value
+
+
+def _store_geocode(key: str, value: Optional[Tuple[float, float]]) -> None:
+    ttl = float(current_app.config.get("GEOCODE_CACHE_TTL_SECONDS", 86400)) if value else _NOT_FOUND_TTL_SECONDS
+    with _geocode_lock:
+        if len(_geocode_cache) >= _GEOCODE_CACHE_MAX_ENTRIES:
+            # älteste Hälfte verwerfen (dict behält Einfügereihenfolge)
+            for stale in list(_geocode_cache)[: _GEOCODE_CACHE_MAX_ENTRIES // 2]:
+                _geocode_cache.pop(stale, None)
+        _geocode_cache[key] = (time.monotonic() + ttl, value)
+
+
+def clear_geocode_cache() -> None:
+    with _geocode_lock:
+        _geocode_cache.clear()
+
+
 def geocode_address(address: str, *, timeout: float = 8.0) -> Optional[Tuple[float, float]]:
-    """Geocode a free-form address to (lat, lon) using Nominatim.
+    """Geocode a free-form address to (lat, lon) using Nominatim (memoized).
 
     Returns None if the address is empty, not found, or the request fails.
     """
     if not address:
         return None
 
+    key = _cache_key(address)
+    hit, value = _cached_geocode(key)
+    if hit:
+        return value
+
     try:
         resp = requests.get(
             "https://nominatim.openstreetmap.org/search",
@@ -53,15 +102,24 @@ def geocode_address(address: str, *, timeout: float = 8.0) -> Optional[Tuple[flo
         data = resp.json()
         if not data:
             current_app.logger.info(f"Geocode not found: {address}")
+            _store_geocode(key, None)
             return None
         lat = float(data[0]["lat"])  # type: ignore[index]
         lon = float(data[0]["lon"])  # type: ignore[index]
+        _store_geocode(key, (lat, lon))
         return (lat, lon)
     except Exception as e:
         current_app.logger.warning(f"Geocode failed for '{address}': {e}")
         return None
 
 
+def cached_coordinates(address: str) -> Optional[Tuple[float, float]]:
+    """(lat, lon) of an already geocoded address, or None; never sends a request."""
+    if not address:
+        return None
+    return _cached_geocode(_cache_key(address))[1]
+
+
 def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
     """Great-circle distance between two (lat, lon) points in kilometers."""
     lat1, lon1 = a
@@ -78,4 +136,4 @@ def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
     return 2 * R * math.atan2(math.sqrt(s), math.sqrt(1 - s))
 
 
-__all__ = ["geocode_address", "haversine_km"]
\ No newline at end of file
+__all__ = ["geocode_address", "cached_coordinates", "haversine_km"]
\ No newline at end of file
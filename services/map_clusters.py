@@ -0,0 +1,167 @@
+"""Server-side clustering of booking requests and artists for the admin map.
+
+Usage (see routes/admin_routes.py, GET /admin/map/clusters):
+    result = map_clusters.clusters(bbox=(5.8, 47.2, 15.1, 55.1), zoom=6, layers=("requests", "artists"))
+    result["layers"]["requests"]["clusters"]   # [{lat, lon, count, by_status, bounds}, ...]
+    result["layers"]["artists"]["points"]      # only from MAP_POINTS_MIN_ZOOM on
+
+Notes:
+- Clusters are a square grid in degrees, aggregated in SQL with one GROUP BY
+  (cell x, cell y, status) per layer; the bounding box is a range on
+  (event_lat, event_lon) / (lat, lon), both indexed. The cell size halves with
+  every zoom level (`cells_per_tile` cells across a 256px map tile), so a
+  cluster covers roughly the same screen area at every zoom.
+- A cluster position is the centroid of its points, `bounds` lets the UI zoom
+  to it. Cells are aligned to the global grid, not the bbox, so clusters stay
+  put while the map is panned.
+- From `points_min_zoom` on, individual points are returned instead, as long
+  as there are at most `max_points` in the bbox (otherwise clusters again).
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import Integer, cast, func, select
+
+from models import db, Artist, BookingRequest
+
+MAX_ZOOM = 22
+# layer -> (Modell, lat, lon, Status, Beschriftung)
+LAYERS = {
+    'requests': (BookingRequest, BookingRequest.event_lat, BookingRequest.event_lon,
+                 BookingRequest.status, BookingRequest.event_type),
+    'artists': (Artist, Artist.lat, Artist.lon, Artist.approval_status, Artist.name),
+}
+
+BBox = Tuple[float, float, float, float]
+
+
+def parse_bbox(raw: Optional[str]) -> BBox:
+    """'min_lon,min_lat,max_lon,max_lat' -> tuple; ValueError if malformed or out of range."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in (raw or '').split(','))
+    except ValueError:
+        raise ValueError("bbox must be 'min_lon,min_lat,max_lon,max_lat'")
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise ValueError("bbox out of range (min < max, lon within ±180, lat within ±90)")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+class MapClusterer:
+    """Grid clustering per zoom level, switching to raw points at high zoom."""
+
+    def __init__(self, cells_per_tile: int = 4, points_min_zoom: int = 14, max_points: int = 2000):
+        self.cells_per_tile = cells_per_tile
+        self.points_min_zoom = points_min_zoom
+        self.max_points = max_points
+
+    def configure(self, **options) -> "MapClusterer":
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise AttributeError(f"Unknown map cluster option: {key}")
+            setattr(self, key, value)
+        return self
+
+    def init_app(self, app) -> None:
+        self.configure(
+            cells_per_tile=int(app.config.get("MAP_CLUSTER_CELLS_PER_TILE", 4)),
+            points_min_zoom=int(app.config.get("MAP_POINTS_MIN_ZOOM", 14)),
+            max_points=int(app.config.get("MAP_MAX_POINTS", 2000)),
+        )
+
+    def cell_size(self, zoom: int) -> float:
+        """Grid cell edge in degrees for a zoom level."""
+        return 360.0 / ((2 ** zoom) * max(1, self.cells_per_tile))
+
+    def clusters(self, bbox: BBox, zoom: int, layers: Iterable[str] = tuple(LAYERS)) -> dict:
+        """ValueError for unknown layers or zoom levels outside 0..MAX_ZOOM."""
+        zoom = int(zoom)
+        if not 0 <= zoom <= MAX_ZOOM:
+            raise ValueError(f"zoom must be between 0 and {MAX_ZOOM}")
+        layers = list(dict.fromkeys(layers))
+        unknown = [name for name in layers if name not in LAYERS]
+        if unknown or not layers:
+            raise ValueError(f"layers must be any of {', '.join(LAYERS)}")
+
+        size = self.cell_size(zoom)
+        result = {}
+        for name in layers:
+            points = self._points(name, bbox) if zoom >= self.points_min_zoom else None
+            if points is not None:
+                result[name] = {'clusters': [], 'points': points, 'total': len(points)}
+            else:
+                clusters = self._clusters(name, bbox, size)
+                result[name] = {'clusters': clusters, 'points': [], 'total': sum(c['count'] for c in clusters)}
+        return {'zoom': zoom, 'bbox': list(bbox), 'cell_size_deg': size, 'layers': result}
+
+    @staticmethod
+    def _in_bbox(lat, lon, bbox: BBox) -> list:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        return [lat.between(min_lat, max_lat), lon.between(min_lon, max_lon)]
+
+    def _points(self, layer: str, bbox: BBox) -> Optional[list]:
+        """Raw points, or None if there are more than max_points in the bbox."""
+        model, lat, lon, status, label = LAYERS[layer]
+        rows = db.session.execute(
+            select(model.id, lat, lon, status, label)
+            .where(*self._in_bbox(lat, lon, bbox))
+            .order_by(model.id)
+            .limit(self.max_points + 1)
+        ).all()
+        if len(rows) > self.max_points:
+            return None
+        return [
+            {'id': row_id, 'lat': y, 'lon': x, 'status': st, 'label': text}
+            for row_id, y, x, st, text in rows
+        ]
+
+    def _clusters(self, layer: str, bbox: BBox, size: float) -> list:
+        _model, lat, lon, status, _label = LAYERS[layer]
+        cell_x = _cell(lon + 180.0, size).label('cell_x')
+        cell_y = _cell(lat + 90.0, size).label('cell_y')
+        rows = db.session.execute(
+            select(
+                cell_x, cell_y, status, func.count(),
+                func.sum(lat), func.sum(lon),
+                func.min(lat), func.min(lon), func.max(lat), func.max(lon),
+            )
+            .where(*self._in_bbox(lat, lon, bbox))
+            # über die Labels gruppieren: sonst stehen die Bind-Parameter in SELECT und GROUP BY doppelt (PostgreSQL)
+            .group_by(cell_x.name, cell_y.name, status)
+        ).all()
+
+        cells: Dict[Tuple[int, int], dict] = {}
+        for cx, cy, st, count, sum_lat, sum_lon, min_lat, min_lon, max_lat, max_lon in rows:
+            cell = cells.get((cx, cy))
+            if cell is None:
+                cell = cells[(cx, cy)] = {
+                    'count': 0, 'by_status': {}, '_sum': [0.0, 0.0],
+                    'bounds': [min_lon, min_lat, max_lon, max_lat],
+                }
+            cell['count'] += count
+            cell['by_status'][st] = cell['by_status'].get(st, 0) + count
+            cell['_sum'][0] += sum_lat
+            cell['_sum'][1] += sum_lon
+            b = cell['bounds']
+            cell['bounds'] = [min(b[0], min_lon), min(b[1], min_lat), max(b[2], max_lon), max(b[3], max_lat)]
+
+        out = []
+        for cell in cells.values():
+            sum_lat, sum_lon = cell.pop('_sum')
+            out.append({'lat': sum_lat / cell['count'], 'lon': sum_lon / cell['count'], **cell})
+        out.sort(key=lambda c: (-c['count'], c['lat'], c['lon']))
+        return out
+
+
+def _cell(offset_expr, size: float):
+    """Grid index of a non-negative coordinate offset (CAST truncates = floor on SQLite, which may lack floor())."""
+    scaled = offset_expr / size
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return cast(scaled, Integer)
+    return func.floor(scaled)
+
+
+# Process-wide instance; app.py configures zoom thresholds (MAP_POINTS_MIN_ZOOM, MAP_MAX_POINTS, ...).
+map_clusters = MapClusterer()
+
+__all__ = ["MapClusterer", "map_clusters", "parse_bbox", "LAYERS", "MAX_ZOOM"]
@@ -0,0 +1,391 @@
+"""Versioned pricing rules, compiled once into a lookup-table evaluator.
+
+Usage:
+    from services.pricing_rules import pricing_rules
+    rules = pricing_rules.current()                 # active version, hot-swapped
+    rules.price(base_min=800, base_max=1200, distance_km=120, fee_pct=20, event_type="Firmenfeier")
+    pricing_rules.get(req.pricing_version)          # version a request was priced with
+    pricing_rules.publish({"rate_per_km": 0.6}, note="Fahrtkosten 2027", created_by=uid)
+
+Notes:
+- Rule sets live in `pricing_rule_sets` (JSON, one row per version, never
+  updated); the highest version is active. Without any row the built-in
+  DEFAULT_RULES apply as version 0 (RATE_PER_KM from the environment, read once).
+- `PricingRules` turns a rule set into sorted bound/factor lists (bisect) and a
+  duration table, so `price()` does no dict construction, parsing or env lookups.
+- Every worker checks the active version at most every `refresh_seconds`
+  (PRICING_RULES_REFRESH_SECONDS, one indexed MAX() query) and swaps its compiled
+  evaluator when a new version was published elsewhere. Compiled versions are
+  kept, so re-pricing an old request with `get(version)` stays cheap.
+- `BookingRequest.pricing_version` records the version used; NULL means the
+  request was priced before rule sets existed (built-in defaults, version 0).
+"""
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+from flask import has_app_context
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import db, PricingRuleSet
+
+logger = logging.getLogger(__name__)
+
+BUILTIN_VERSION = 0
+DURATION_TABLE_MINUTES = 600
+
+
+def default_rules() -> dict:
+    """The pricing constants as they were hard-coded before rule sets (version 0)."""
+    return {
+        # Schritt 1: Event-Typ-Gewichte; unbekannte Typen zählen default_event_weight
+        "event_weights": {"Private Feier": 0.6, "Firmenfeier": 1.35, "Teamevent": 1.05, "Streetshow": 0.7},
+        "default_event_weight": 1.0,
+        # Schritt 2: [Obergrenze Gäste (inkl.), Faktor], darüber guest_factor_above
+        "guest_tiers": [[200, 0.9], [500, 1.1]],
+        "guest_factor_above": 1.25,
+        "weekend_factor": {"min": 1.05, "max": 1.15},
+        "newsletter_factor": 0.95,
+        "outdoor_factor": 1.2,
+        # Schritt 6: Dauer auf round_to Minuten aufgerundet; über der letzten Stufe + extra_per_step je round_to
+        "duration": {"round_to": 5, "steps": [[5, 1.0], [10, 1.2], [15, 1.3]], "extra_per_step": 0.1},
+        "tech_fees": {"light": 450, "sound": 450},
+        # Schritt 9: [ab km, Zuschlag €] – es gilt die höchste erreichte Stufe
+        "distance_surcharges": [[300, 200], [600, 300]],
+        "city_discounts": {"münchen": 100, "muenchen": 100, "munich": 100},
+        "rate_per_km": float(os.getenv("RATE_PER_KM", 0.5)),
+    }
+
+
+RULE_KEYS = tuple(default_rules())
+
+
+def merge_rules(base: dict, changes: dict) -> dict:
+    """Replace top-level keys of `base` with `changes` (ValueError on unknown keys)."""
+    if not isinstance(changes, dict):
+        raise ValueError("rules must be an object")
+    unknown = set(changes) - set(RULE_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown pricing rule(s): {', '.join(sorted(unknown))}")
+    merged = copy.deepcopy(base)
+    merged.update(copy.deepcopy(changes))
+    return merged
+
+
+def _number(value, field: str):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{field} must be a number")
+    return value
+
+
+def team_people(team_size='solo', team_count=None):
+    """Anzahl Artists für personenbezogene Kosten (team_count hat Vorrang vor team_size)."""
+    if team_count is not None:
+        try:
+            return max(1, int(team_count))
+        except Exception:
+            return 1
+    # fallback: infer from team_size if provided (e.g., 'solo'|'duo'|int)
+    try:
+        if isinstance(team_size, (int, float)):
+            return max(1, int(team_size))
+        ts = str(team_size).strip().lower()
+        if ts in ('duo', '2'):
+            return 2
+        if ts in ('trio', '3'):
+            return 3
+        if ts in ('quartet', '4'):
+            return 4
+        return 1
+    except Exception:
+        return 1
+
+
+def event_city(event_address):
+    """Stadt aus 'Straße, PLZ Stadt' (letztes Token nach dem letzten Komma), lower-case."""
+    if not event_address:
+        return None
+    # take substring after last comma, strip whitespace
+    raw_city = event_address.split(',')[-1].strip()
+    # assume format "PLZ Stadt"; split and use the last token as city name
+    return raw_city.split()[-1].lower()
+
+
+class PricingRules:
+    """One compiled rule set. Construction validates (ValueError); evaluation only does lookups."""
+
+    def __init__(self, rules: dict, version: int = BUILTIN_VERSION):
+        missing = set(RULE_KEYS) - set(rules or {})
+        if missing:
+            raise ValueError(f"Missing pricing rule(s): {', '.join(sorted(missing))}")
+        try:
+            self.event_weights = {str(k): _number(v, "event_weights") for k, v in rules["event_weights"].items()}
+            self.default_event_weight = _number(rules["default_event_weight"], "default_event_weight")
+
+            tiers = sorted((_number(b, "guest_tiers"), _number(f, "guest_tiers")) for b, f in rules["guest_tiers"])
+            self._guest_bounds = [b for b, _ in tiers]
+            self._guest_factors = [f for _, f in tiers] + [_number(rules["guest_factor_above"], "guest_factor_above")]
+
+            self.weekend_min = _number(rules["weekend_factor"]["min"], "weekend_factor.min")
+            self.weekend_max = _number(rules["weekend_factor"]["max"], "weekend_factor.max")
+            self.newsletter_factor = _number(rules["newsletter_factor"], "newsletter_factor")
+            self.outdoor_factor = _number(rules["outdoor_factor"], "outdoor_factor")
+
+            duration = rules["duration"]
+            self._round_to = int(_number(duration["round_to"], "duration.round_to"))
+            steps = sorted((_number(b, "duration.steps"), _number(f, "duration.steps")) for b, f in duration["steps"])
+            if self._round_to <= 0 or not steps:
+                raise ValueError("duration needs round_to > 0 and at least one step")
+            self._duration_bounds = [b for b, _ in steps]
+            self._duration_factors = [f for _, f in steps]
+            self._duration_extra = _number(duration["extra_per_step"], "duration.extra_per_step")
+
+            self.tech_light = _number(rules["tech_fees"]["light"], "tech_fees.light")
+            self.tech_sound = _number(rules["tech_fees"]["sound"], "tech_fees.sound")
+
+            surcharges = sorted(
+                (_number(km, "distance_surcharges"), _number(amount, "distance_surcharges"))
+                for km, amount in rules["distance_surcharges"]
+            )
+            self._surcharge_km = [km for km, _ in surcharges]
+            self._surcharge_amounts = [amount for _, amount in surcharges]
+            self.city_discounts = {
+                str(city).lower(): _number(amount, "city_discounts") for city, amount in rules["city_discounts"].items()
+            }
+            self.rate_per_km = float(_number(rules["rate_per_km"], "rate_per_km"))
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid pricing rules: {e!r}")
+
+        self.version = version
+        self.rules = copy.deepcopy(rules)
+        # Dauer-Faktoren aller gerundeten Werte bis DURATION_TABLE_MINUTES vorberechnen
+        self._duration_table = {
+            minutes: self._duration_formula(minutes)
+            for minutes in range(0, DURATION_TABLE_MINUTES + 1, self._round_to)
+        }
+
+    # --- Einzelschritte (auch von services/pricing_simulation.py genutzt) ------------
+    def event_weight(self, event_type, base_min, base_max, weight=None):
+        """Schritt 1: Event-Typ-Gewicht; `weight` überschreibt die Tabelle (Simulation)."""
+        w = self.event_weights.get(event_type, self.default_event_weight) if weight is None else weight
+        # Verhindere Untergewichtung bei Private Feier, wenn Gage manuell kommt
+        if base_min == base_max:
+            # Fixweight: Private Feier darf nicht abschwächen
+            return max(w, 1.0)
+        return w
+
+    def guest_multiplier(self, num_guests, base_min, base_max):
+        """Schritt 2: Gästezahl (keine Reduktion bei fester Gage)."""
+        if base_min == base_max:
+            # Artist hat festen Gagen-Wert vorgegeben, also nicht reduzieren
+            return 1.0
+        return self._guest_factors[bisect_left(self._guest_bounds, num_guests)]
+
+    def _duration_formula(self, rounded):
+        if rounded <= self._duration_bounds[0]:
+            return self._duration_factors[0]
+        last = self._duration_bounds[-1]
+        if rounded > last:
+            extra_intervals = (rounded - last) // self._round_to
+            return self._duration_factors[-1] + (extra_intervals * self._duration_extra)
+        # zwischen zwei Stufen: Faktor der nächsthöheren Stufe
+        return self._duration_factors[bisect_left(self._duration_bounds, rounded)]
+
+    def duration_factor(self, duration):
+        """Schritt 6: Dauer-Multiplikator (auf round_to Minuten aufgerundet)."""
+        rounded = ((duration + self._round_to - 1) // self._round_to) * self._round_to
+        factor = self._duration_table.get(rounded)
+        return factor if factor is not None else self._duration_formula(rounded)
+
+    def tech_fee(self, needs_light=False, needs_sound=False):
+        """Schritt 7: Technikpauschalen."""
+        fee = 0
+        if needs_light: fee += self.tech_light
+        if needs_sound: fee += self.tech_sound
+        return fee
+
+    def distance_surcharge(self, distance_km, city):
+        """Schritt 9: Distanzzuschläge inkl. Stadt-Rabatt (München)."""
+        surcharge = 0
+        tier = bisect_right(self._surcharge_km, distance_km) - 1
+        if tier >= 0:
+            surcharge += self._surcharge_amounts[tier]
+        discount = self.city_discounts.get(city)
+        if discount:
+            surcharge -= discount
+        return surcharge
+
+    def price(self, base_min, base_max,
+              distance_km, fee_pct, newsletter=False,
+              event_type='Private Feier', num_guests=0, show_discipline=False,
+              is_weekend=False, is_indoor=True,
+              needs_light=False, needs_sound=False,
+              team_size='solo',
+              duration=0, event_address=None, team_count=None):
+        """(min, max) wie `calculate_price`, mit den Konstanten dieser Version."""
+        people = team_people(team_size, team_count)
+
+        # 1. Event type
+        w_event = self.event_weight(event_type, base_min, base_max)
+        min_p = base_min * w_event
+        max_p = base_max * w_event
+
+        # 2. Guests
+        g_mult = self.guest_multiplier(num_guests, base_min, base_max)
+        min_p *= g_mult
+        max_p *= g_mult
+
+        # 3. Weekend
+        if is_weekend:
+            min_p *= self.weekend_min
+            max_p *= self.weekend_max
+
+        # 4. Newsletter discount
+        if newsletter:
+            min_p *= self.newsletter_factor
+            max_p *= self.newsletter_factor
+
+        # 5. Indoor/Outdoor
+        if not is_indoor:
+            min_p *= self.outdoor_factor
+            max_p *= self.outdoor_factor
+
+        # 6. Duration
+        d_factor = self.duration_factor(duration)
+        min_p *= d_factor
+        max_p *= d_factor
+
+        # 7. Tech fees
+        tech = self.tech_fee(needs_light, needs_sound)
+
+        # 8. Agency fee
+        min_p *= (1 + fee_pct/100)
+        max_p *= (1 + fee_pct/100)
+
+        # 9. Distance surcharges
+        surcharge = self.distance_surcharge(distance_km, event_city(event_address))
+
+        # 10. Travel fee
+        travel_fee = distance_km * self.rate_per_km * max(1, people)
+
+        min_total = min_p + travel_fee + tech + surcharge
+        max_total = max_p + travel_fee + tech + surcharge
+        return int(min_total), int(max_total)
+
+
+class PricingRuleRegistry:
+    """Process-wide cache of compiled rule sets plus the active version."""
+
+    def __init__(self, refresh_seconds: float = 30.0):
+        self.refresh_seconds = refresh_seconds
+        self._compiled: Dict[int, PricingRules] = {}
+        self._active = BUILTIN_VERSION
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def configure(self, **options) -> "PricingRuleRegistry":
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise AttributeError(f"Unknown pricing rules option: {key}")
+            setattr(self, key, value)
+        return self
+
+    def init_app(self, app) -> None:
+        self.configure(refresh_seconds=float(app.config.get("PRICING_RULES_REFRESH_SECONDS", 30)))
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget compiled versions (built-in defaults are recompiled on next use)."""
+        with self._lock:
+            self._compiled.clear()
+            self._active = BUILTIN_VERSION
+            self._checked_at = float("-inf")
+
+    def builtin(self) -> PricingRules:
+        compiled = self._compiled.get(BUILTIN_VERSION)
+        if compiled is None:
+            compiled = PricingRules(default_rules(), BUILTIN_VERSION)
+            with self._lock:
+                self._compiled[BUILTIN_VERSION] = compiled
+        return compiled
+
+    @property
+    def active_version(self) -> int:
+        return self._active
+
+    def current(self) -> PricingRules:
+        """Active rules; re-checks the database at most every `refresh_seconds`."""
+        if has_app_context() and time.monotonic() - self._checked_at >= self.refresh_seconds:
+            self.refresh()
+        return self._compiled.get(self._active) or self.builtin()
+
+    def refresh(self) -> int:
+        """Switch to the highest published version (no-op if unchanged)."""
+        self._checked_at = time.monotonic()
+        try:
+            latest = db.session.execute(select(func.max(PricingRuleSet.version))).scalar() or BUILTIN_VERSION
+            if latest != self._active:
+                self.get(latest)
+                logger.info("Pricing rules: switching from version %s to %s", self._active, latest)
+                self._active = latest
+        except (SQLAlchemyError, LookupError, ValueError):
+            logger.warning("Pricing rules: could not load active version, keeping %s", self._active, exc_info=True)
+        return self._active
+
+    def get(self, version: Optional[int]) -> PricingRules:
+        """Compiled rules of `version` (None/0 = built-in defaults); LookupError if unknown."""
+        if not version:
+            return self.builtin()
+        compiled = self._compiled.get(version)
+        if compiled is None:
+            row = db.session.execute(
+                select(PricingRuleSet).where(PricingRuleSet.version == version)
+            ).scalar_one_or_none()
+            if row is None:
+                raise LookupError(f"Pricing rules version {version} not found")
+            compiled = PricingRules(row.rules, row.version)
+            with self._lock:
+                self._compiled[version] = compiled
+        return compiled
+
+    def publish(self, changes: dict, note: Optional[str] = None, created_by: Optional[str] = None,
+                base_version: Optional[int] = None) -> PricingRuleSet:
+        """Store `base_version` (default: active) + `changes` as the next version, commit and activate it.
+
+        ValueError for invalid rules, LookupError for an unknown base version; a
+        concurrent publish of the same version number fails with IntegrityError.
+        """
+        base = self.current() if base_version is None else self.get(base_version)
+        rules = merge_rules(base.rules, changes)
+        latest = db.session.execute(select(func.max(PricingRuleSet.version))).scalar() or BUILTIN_VERSION
+        compiled = PricingRules(rules, latest + 1)
+
+        row = PricingRuleSet(version=compiled.version, rules=rules, note=note, created_by=created_by)
+        db.session.add(row)
+        db.session.commit()
+        with self._lock:
+            self._compiled[compiled.version] = compiled
+            self._active = compiled.version
+            self._checked_at = time.monotonic()
+        return row
+
+    def versions(self) -> List[PricingRuleSet]:
+        return list(db.session.execute(
+            select(PricingRuleSet).order_by(PricingRuleSet.version.desc())
+        ).scalars())
+
+
+# Process-wide instance; configured by app.py from PRICING_RULES_REFRESH_SECONDS.
+pricing_rules = PricingRuleRegistry()
+
+__all__ = [
+    "PricingRules", "PricingRuleRegistry", "pricing_rules", "default_rules", "merge_rules",
+    "team_people", "event_city", "BUILTIN_VERSION",
+]
@@ -0,0 +1,259 @@
+"""Batched what-if pricing: sweep one or two `calculate_price` inputs over a grid.
+
+Usage (see routes/admin_routes.py, POST /admin/pricing/simulate):
+    reference = reference_params(base_min=800, base_max=1200, fee_pct=20)
+    result = simulate(reference, parse_axis({"param": "fee_pct", "start": 10, "stop": 30, "step": 1}),
+                      parse_axis({"param": "distance_km", "start": 0, "stop": 800, "step": 10}))
+    result["price_min"][row][col]   # row = y value, col = x value
+    simulate(reference, x, y, rules=pricing_rules.get(3))   # against a specific rules version
+
+Notes:
+- Every cell equals `calculate_price(**params)` bit for bit: the multiplicative
+  steps are applied in the same order, but the product up to the first swept
+  step is computed once, the product up to the second swept step once per value
+  of the first axis, and only the remaining factors and the additive part
+  (travel, tech, surcharges) per cell. A 100k-cell grid needs no per-cell
+  function call, dict or branch.
+- Constants come from a compiled `PricingRules` version (default: the active one).
+- `event_weight` overrides the rule set's weight of the reference event type
+  (for tuning the weights); `rate_per_km` overrides the rule set's rate.
+- Two parameters acting on the same multiplicative step (`event_type` and
+  `event_weight`) cannot be combined.
+"""
+from __future__ import annotations
+
+from itertools import repeat
+from typing import Any, Dict, List, Optional
+
+from services.pricing_rules import PricingRules, event_city, pricing_rules, team_people
+
+ADDITIVE = 8
+# Parameter -> Schritt in calculate_price (1-7 multiplikativ, 8 = additiv)
+PARAM_STEPS = {
+    "event_type": 1,
+    "event_weight": 1,
+    "num_guests": 2,
+    "is_weekend": 3,
+    "newsletter": 4,
+    "is_indoor": 5,
+    "duration": 6,
+    "fee_pct": 7,
+    "distance_km": ADDITIVE,
+    "rate_per_km": ADDITIVE,
+    "team_count": ADDITIVE,
+    "needs_light": ADDITIVE,
+    "needs_sound": ADDITIVE,
+}
+BOOL_PARAMS = {"is_weekend", "newsletter", "is_indoor", "needs_light", "needs_sound"}
+INT_PARAMS = {"num_guests", "duration", "team_count"}
+MAX_AXIS_VALUES = 2000
+
+
+def reference_params(**overrides) -> dict:
+    """Complete parameter set with calculate_price defaults, then `overrides`."""
+    params = {
+        "base_min": None,
+        "base_max": None,
+        "distance_km": 0.0,
+        "fee_pct": 20.0,
+        "newsletter": False,
+        "event_type": "Private Feier",
+        "event_weight": None,
+        "num_guests": 0,
+        "is_weekend": False,
+        "is_indoor": True,
+        "needs_light": False,
+        "needs_sound": False,
+        "team_size": "solo",
+        "team_count": None,
+        "duration": 0,
+        "event_address": None,
+        "rate_per_km": None,
+    }
+    unknown = set(overrides) - set(params)
+    if unknown:
+        raise ValueError(f"Unknown reference parameter(s): {', '.join(sorted(unknown))}")
+    params.update({k: v for k, v in overrides.items() if v is not None or k in ("event_weight", "team_count")})
+    return params
+
+
+def _coerce(param: str, value: Any):
+    if param in BOOL_PARAMS:
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes")
+        return bool(value)
+    if param == "event_type":
+        return str(value)
+    try:
+        return int(value) if param in INT_PARAMS else float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid value for {param}: {value!r}")
+
+
+def parse_axis(spec: Any, rules: Optional[PricingRules] = None) -> Optional[dict]:
+    """`{"param", "values"}` or `{"param", "start", "stop", "step"}` (stop inclusive) -> {"param", "values"}."""
+    if spec is None:
+        return None
+    if not isinstance(spec, dict) or spec.get("param") not in PARAM_STEPS:
+        raise ValueError(f"axis.param must be one of {', '.join(sorted(PARAM_STEPS))}")
+    param = spec["param"]
+    if spec.get("values") is not None:
+        if not isinstance(spec["values"], list) or not spec["values"]:
+            raise ValueError(f"{param}: values must be a non-empty list")
+        values = [_coerce(param, v) for v in spec["values"]]
+    elif param in BOOL_PARAMS:
+        values = [False, True]
+    elif param == "event_type":
+        values = list((rules or pricing_rules.current()).event_weights)
+    else:
+        try:
+            start, stop, step = float(spec["start"]), float(spec["stop"]), float(spec.get("step", 1))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"{param}: provide 'values' or numeric 'start', 'stop' and 'step'")
+        if step <= 0 or stop < start:
+            raise ValueError(f"{param}: need step > 0 and stop >= start")
+        count = int(round((stop - start) / step)) + 1
+        if count > MAX_AXIS_VALUES:
+            raise ValueError(f"{param}: at most {MAX_AXIS_VALUES} values per axis")
+        # start + i*step statt Aufsummieren: keine Drift bei Schritten wie 0.1
+        values = [_coerce(param, round(start + i * step, 10)) for i in range(count)]
+    if len(values) > MAX_AXIS_VALUES:
+        raise ValueError(f"{param}: at most {MAX_AXIS_VALUES} values per axis")
+    return {"param": param, "values": values}
+
+
+def _step_factors(p: dict, rules: PricingRules) -> List[tuple]:
+    """(min_factor, max_factor) for the 7 multiplicative steps, in calculate_price order."""
+    w = rules.event_weight(p["event_type"], p["base_min"], p["base_max"], p["event_weight"])
+    g = rules.guest_multiplier(p["num_guests"], p["base_min"], p["base_max"])
+    d = rules.duration_factor(p["duration"])
+    fee = 1 + p["fee_pct"] / 100
+    return [
+        (w, w),
+        (g, g),
+        (rules.weekend_min, rules.weekend_max) if p["is_weekend"] else (1.0, 1.0),
+        (rules.newsletter_factor,) * 2 if p["newsletter"] else (1.0, 1.0),
+        (1.0, 1.0) if p["is_indoor"] else (rules.outdoor_factor,) * 2,
+        (d, d),
+        (fee, fee),
+    ]
+
+
+def _additive(p: dict, city, rules: PricingRules) -> dict:
+    return {
+        "distance": p["distance_km"],
+        "rate": rules.rate_per_km if p["rate_per_km"] is None else p["rate_per_km"],
+        "people": team_people(p["team_size"], p["team_count"]),
+        "light": rules.tech_fee(needs_light=p["needs_light"]),
+        "sound": rules.tech_fee(needs_sound=p["needs_sound"]),
+        "surcharge": rules.distance_surcharge(p["distance_km"], city),
+    }
+
+
+def _chain(value: tuple, factors) -> tuple:
+    """Multiply (min, max) by the given step factors in order (1.0 factors are exact no-ops)."""
+    m, M = value
+    for fm, fM in factors:
+        if fm != 1.0:
+            m *= fm
+        if fM != 1.0:
+            M *= fM
+    return m, M
+
+
+def simulate(reference: dict, x: dict, y: Optional[dict] = None, rules: Optional[PricingRules] = None) -> dict:
+    """Full min/max matrix (rows = y values, columns = x values) in one batched pass."""
+    rules = rules or pricing_rules.current()
+    if reference.get("base_min") is None or reference.get("base_max") is None:
+        raise ValueError("reference needs base_min and base_max")
+    y = y or {"param": None, "values": [None]}
+    if x["param"] == y["param"]:
+        raise ValueError("x and y must sweep different parameters")
+    sx = PARAM_STEPS[x["param"]]
+    sy = PARAM_STEPS[y["param"]] if y["param"] else ADDITIVE
+    if sx == sy != ADDITIVE:
+        raise ValueError(f"{x['param']} and {y['param']} act on the same pricing step")
+
+    city = event_city(reference["event_address"])
+
+    def variant(param, value):
+        return reference if param is None else dict(reference, **{param: value})
+
+    x_params = [variant(x["param"], v) for v in x["values"]]
+    y_params = [variant(y["param"], v) for v in y["values"]]
+    const = _step_factors(reference, rules)
+    nx = len(x_params)
+
+    # Achse mit dem früheren Schritt (P) wird vorab bis vor den Schritt der anderen Achse (Q) gerechnet
+    x_first = sx <= sy
+    s1, s2 = (sx, sy) if x_first else (sy, sx)
+    p_params, q_params = (x_params, y_params) if x_first else (y_params, x_params)
+
+    prefix = _chain((reference["base_min"], reference["base_max"]), const[:s1 - 1])
+    mid = const[s1:s2 - 1] if s1 <= 7 else []
+    post = [f for f in const[s2:7] if f != (1.0, 1.0)] if s2 <= 7 else []
+    partials = [
+        _chain(_chain(prefix, [_step_factors(p, rules)[s1 - 1]]), mid) if s1 <= 7 else prefix
+        for p in p_params
+    ]
+    q_factors = [_step_factors(p, rules)[s2 - 1] if s2 <= 7 else (1.0, 1.0) for p in q_params]
+
+    x_add = [_additive(p, city, rules) for p in x_params]
+    y_add = [_additive(p, city, rules) for p in y_params]
+    add_keys = ("distance", "rate", "people", "light", "sound", "surcharge")
+    x_cols = {k: [a[k] for a in x_add] for k in add_keys}
+
+    price_min: List[List[int]] = []
+    price_max: List[List[int]] = []
+    for j, ya in enumerate(y_add):
+        if x_first:
+            pm_row = [p[0] for p in partials]
+            pM_row = [p[1] for p in partials]
+            qm_row, qM_row = repeat(q_factors[j][0], nx), repeat(q_factors[j][1], nx)
+        else:
+            pm_row, pM_row = repeat(partials[j][0], nx), repeat(partials[j][1], nx)
+            qm_row = [q[0] for q in q_factors]
+            qM_row = [q[1] for q in q_factors]
+        cols = {
+            k: x_cols[k] if x["param"] in _ADDITIVE_SOURCES[k] else repeat(ya[k], nx)
+            for k in add_keys
+        }
+        row_min: List[int] = []
+        row_max: List[int] = []
+        for pm, pM, qm, qM, d, r, n, tl, ts, s in zip(
+            pm_row, pM_row, qm_row, qM_row,
+            cols["distance"], cols["rate"], cols["people"], cols["light"], cols["sound"], cols["surcharge"],
+        ):
+            m = pm * qm
+            M = pM * qM
+            for fm, fM in post:
+                m *= fm
+                M *= fM
+            travel = d * r * n
+            tech = tl + ts
+            row_min.append(int(m + travel + tech + s))
+            row_max.append(int(M + travel + tech + s))
+        price_min.append(row_min)
+        price_max.append(row_max)
+
+    return {
+        "x": x,
+        "y": y if y["param"] else None,
+        "price_min": price_min,
+        "price_max": price_max,
+        "cells": nx * len(y_params),
+        "pricing_version": rules.version,
+    }
+
+
+# Additive Größe -> Parameter, von denen sie abhängt
+_ADDITIVE_SOURCES: Dict[str, set] = {
+    "distance": {"distance_km"},
+    "rate": {"rate_per_km"},
+    "people": {"team_count"},
+    "light": {"needs_light"},
+    "sound": {"needs_sound"},
+    "surcharge": {"distance_km"},
+}
+
+__all__ = ["PARAM_STEPS", "reference_params", "parse_axis", "simulate"]
@@ -0,0 +1,140 @@
+"""Input normalization and short-lived memoization for price quotes.
+
+Usage (see routes/request_routes.py, POST /api/requests/quote):
+    inputs = normalize_quote_input(request.get_json())   # ValueError on bad input
+    cached = quote_cache.get(quote_cache_key(inputs))
+
+Notes:
+- Only fields that influence matching or pricing are part of the key; names,
+  e-mails and free text are ignored, so a booking form that re-quotes on every
+  change hits the cache until a price-relevant field actually changes.
+- Addresses are compared case- and whitespace-insensitively, disciplines as a
+  sorted, lower-cased set.
+- Entries expire after `ttl_seconds` (QUOTE_CACHE_TTL_SECONDS) so new availability
+  or price changes show up quickly; the cache is per process and bounded.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Optional
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+QUOTE_REQUIRED_FIELDS = ("event_date", "event_type", "number_of_guests", "duration_minutes")
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def _as_int(value: Any, field: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an integer")
+
+
+def normalize_quote_input(data: Any) -> dict:
+    """Validate a quote payload and reduce it to the price-relevant, normalized fields."""
+    if not isinstance(data, dict):
+        raise ValueError("payload must be a JSON object")
+    for field in QUOTE_REQUIRED_FIELDS:
+        if data.get(field) in (None, ""):
+            raise ValueError(f"missing field: {field}")
+
+    try:
+        event_date = date.fromisoformat(str(data["event_date"]))
+    except ValueError:
+        raise ValueError("event_date must be an ISO date (YYYY-MM-DD)")
+
+    disciplines = data.get("disciplines") or []
+    if not isinstance(disciplines, list):
+        raise ValueError("disciplines must be a list")
+
+    return {
+        "event_date": event_date,
+        "event_type": str(data["event_type"]).strip(),
+        "number_of_guests": _as_int(data["number_of_guests"], "number_of_guests"),
+        "duration_minutes": _as_int(data["duration_minutes"], "duration_minutes"),
+        "event_address": _WHITESPACE_RE.sub(" ", str(data.get("event_address") or "")).strip(),
+        "team_size": data.get("team_size") if data.get("team_size") not in (None, "") else 1,
+        "disciplines": sorted({str(d).strip().lower() for d in disciplines if str(d).strip()}),
+        "is_indoor": _as_bool(data.get("is_indoor", False)),
+        "needs_light": _as_bool(data.get("needs_light", False)),
+        "needs_sound": _as_bool(data.get("needs_sound", False)),
+        "newsletter_opt_in": _as_bool(data.get("newsletter_opt_in", False)),
+    }
+
+
+def quote_cache_key(inputs: dict) -> tuple:
+    """Hashable key of normalized inputs (address case-insensitive)."""
+    return (
+        inputs["event_date"].isoformat(),
+        inputs["event_type"].lower(),
+        inputs["number_of_guests"],
+        inputs["duration_minutes"],
+        inputs["event_address"].lower(),
+        str(inputs["team_size"]).strip().lower(),
+        tuple(inputs["disciplines"]),
+        inputs["is_indoor"],
+        inputs["needs_light"],
+        inputs["needs_sound"],
+        inputs["newsletter_opt_in"],
+    )
+
+
+class QuoteCache:
+    """Thread-safe TTL + LRU memo for computed quotes."""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 2048):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._items: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, **options) -> "QuoteCache":
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise AttributeError(f"Unknown quote cache option: {key}")
+            setattr(self, key, value)
+        return self
+
+    def get(self, key) -> Optional[tuple[dict, float]]:
+        """(payload, seconds_left) or None when missing/expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            expires, payload = entry
+            if expires <= now:
+                self._items.pop(key, None)
+                return None
+            self._items.move_to_end(key)
+            return payload, expires - now
+
+    def put(self, key, payload: dict) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl_seconds, payload)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+# Process-wide instance; configured by app.py from QUOTE_CACHE_TTL_SECONDS / QUOTE_CACHE_MAX_ENTRIES.
+quote_cache = QuoteCache()
+
+__all__ = ["normalize_quote_input", "quote_cache_key", "QuoteCache", "quote_cache", "QUOTE_REQUIRED_FIELDS"]
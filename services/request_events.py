@@ -0,0 +1,166 @@
+"""Per-artist change events for booking requests, streamed as Server-Sent Events.
+
+Usage:
+    from services.request_events import request_events
+    request_events.publish([artist.id], req.id, "request.artist_status", status="angeboten")
+    db.session.commit()   # events are persisted with the caller's transaction
+
+Notes:
+- `publish` only adds `RequestEvent` rows to the current session; subscribers in
+  this process are woken up after the session commits (rolled back changes
+  never produce events).
+- Other worker processes don't share the in-process wakeups; their streams fall
+  back to polling `request_events` every REQUEST_EVENTS_POLL_SECONDS (cheap,
+  indexed on artist_id + id). Event ids double as SSE ids, so reconnecting
+  clients resume via `Last-Event-ID` without gaps or duplicates.
+- Streams end after REQUEST_EVENTS_STREAM_SECONDS; EventSource reconnects
+  automatically (`retry:` hint). Each open stream holds a worker thread for that
+  long: run gunicorn with gthread or gevent workers (see wsgi.py), not sync.
+- Browsers authenticate with a short-lived, stream-only token
+  (POST /api/requests/requests/stream/token); the access JWT never goes into the URL.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import db, RequestEvent
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "request_events_pending"
+
+
+class RequestEventBus:
+    """Lightweight in-process pub/sub with the `request_events` table as durable backlog."""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[threading.Event]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    # --- Publishing -------------------------------------------------------------
+    def publish(self, artist_ids: Iterable[int], booking_id: int, event_type: str, **data) -> int:
+        """Queue one event per artist in the current session; returns the number of events."""
+        ids = sorted({int(a) for a in artist_ids if a is not None})
+        if not ids:
+            return 0
+        payload = json.dumps(dict(data, request_id=booking_id), default=str)
+        db.session.add_all([
+            RequestEvent(artist_id=artist_id, booking_id=booking_id, event_type=event_type, payload=payload)
+            for artist_id in ids
+        ])
+        db.session.info.setdefault(_PENDING_KEY, set()).update(ids)
+        return len(ids)
+
+    def notify(self, artist_ids: Iterable[int]) -> None:
+        """Wake up local streams of the given artists."""
+        with self._lock:
+            waiters = [w for a in artist_ids for w in self._subscribers.get(a, ())]
+        for waiter in waiters:
+            waiter.set()
+
+    # --- Subscribing ------------------------------------------------------------
+    def subscribe(self, artist_id: int) -> threading.Event:
+        waiter = threading.Event()
+        with self._lock:
+            self._subscribers[artist_id].add(waiter)
+        return waiter
+
+    def unsubscribe(self, artist_id: int, waiter: threading.Event) -> None:
+        with self._lock:
+            waiters = self._subscribers.get(artist_id)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    self._subscribers.pop(artist_id, None)
+
+    def events_since(self, artist_id: int, last_event_id: int = 0, limit: int = 100) -> List[RequestEvent]:
+        return (
+            RequestEvent.query
+            .filter(RequestEvent.artist_id == artist_id, RequestEvent.id > last_event_id)
+            .order_by(RequestEvent.id.asc())
+            .limit(limit)
+            .all()
+        )
+
+    def latest_event_id(self, artist_id: int) -> int:
+        row = (
+            db.session.query(db.func.max(RequestEvent.id))
+            .filter(RequestEvent.artist_id == artist_id)
+            .scalar()
+        )
+        return int(row or 0)
+
+    def stream(self, artist_id: int, last_event_id: Optional[int] = None) -> Iterator[str]:
+        """SSE generator: backlog since `last_event_id`, then live events until the stream deadline.
+        Without `last_event_id` only events after connecting are sent (the client loaded its list already).
+        """
+        cfg = current_app.config
+        max_seconds = float(cfg.get("REQUEST_EVENTS_STREAM_SECONDS", 55))
+        poll_seconds = max(0.1, float(cfg.get("REQUEST_EVENTS_POLL_SECONDS", 5)))
+        heartbeat_seconds = float(cfg.get("REQUEST_EVENTS_HEARTBEAT_SECONDS", 15))
+
+        if last_event_id is None:
+            last_event_id = self.latest_event_id(artist_id)
+        waiter = self.subscribe(artist_id)
+        try:
+            yield f"retry: {int(poll_seconds * 1000)}\n\n"
+            deadline = time.monotonic() + max_seconds
+            last_sent = time.monotonic()
+            while True:
+                waiter.clear()
+                for ev in self.events_since(artist_id, last_event_id):
+                    last_event_id = ev.id
+                    last_sent = time.monotonic()
+                    yield format_sse(ev)
+                # Lese-Transaktion beenden: neue Events anderer Worker werden sichtbar, keine Connection bleibt belegt
+                db.session.rollback()
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if not waiter.wait(min(poll_seconds, remaining)) and time.monotonic() - last_sent >= heartbeat_seconds:
+                    last_sent = time.monotonic()
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(artist_id, waiter)
+
+    def prune(self, older_than: timedelta = timedelta(days=2)) -> int:
+        """Delete delivered-or-stale events; reconnects older than this fall back to a full reload."""
+        cutoff = datetime.utcnow() - older_than
+        deleted = RequestEvent.query.filter(RequestEvent.created_at < cutoff).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+
+def format_sse(ev: RequestEvent) -> str:
+    """Serialize an event in text/event-stream framing."""
+    return f"id: {ev.id}\nevent: {ev.event_type}\ndata: {ev.payload or '{}'}\n\n"
+
+
+# Process-wide bus used by the managers and the stream endpoint
+request_events = RequestEventBus()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_subscribers(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        request_events.notify(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+__all__ = ["RequestEventBus", "request_events", "format_sse"]
@@ -0,0 +1,250 @@
+"""Filtered admin search over booking requests with keyset pagination.
+
+Usage (see routes/admin_routes.py, GET /admin/requests/search):
+    result = request_search.search(date_from=date(2026, 5, 1), status=["angefragt"],
+                                   disciplines=["Zauberer"], near=(48.137, 11.575), radius_km=25)
+    result["items"], result["next_cursor"], result["total"]
+    request_search.search(..., cursor=result["next_cursor"])   # next page
+
+Notes:
+- Keyset pagination on (sort column, id): every page is an index range scan,
+  no OFFSET that grows with the history. Cursors are opaque strings.
+- The total is counted once per filter set and cached for
+  REQUEST_SEARCH_COUNT_TTL_SECONDS (default 30), so paging through a result
+  does not repeat the COUNT. `total_cached` tells whether it came from the cache.
+- Radius: the SQL prefilter is a bounding box on event_lat/event_lon
+  (ix_booking_requests_event_lat_lon), the exact haversine distance is checked
+  in Python on the fetched rows. The total then counts the bounding box and is
+  flagged with `total_is_estimate`. Requests without coordinates are not found
+  by a radius search (see scripts/backfill_geo.py).
+- Disciplines are matched via booking_request_disciplines (any of). City is a
+  substring match on event_address (not indexed, combine with other filters).
+"""
+from __future__ import annotations
+
+import base64
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import func, literal, select, tuple_
+
+from helpers.serializers import columns_of
+from managers.booking_requests_manager import discipline_ids, normalize_status
+from models import db, BookingRequest, booking_request_disciplines
+from services.geo import haversine_km
+
+MAX_LIMIT = 200
+MAX_RADIUS_KM = 500.0
+KM_PER_DEGREE_LAT = 111.045
+DEFAULT_COLUMNS = (
+    'id', 'client_name', 'client_email', 'event_date', 'event_time', 'event_type',
+    'show_discipline', 'team_size', 'status', 'event_address', 'event_lat', 'event_lon',
+    'price_min', 'price_max', 'created_at',
+)
+# sort -> (Spalte, absteigend)
+SORTS = {
+    'created_desc': ('created_at', True),
+    'event_date_asc': ('event_date', False),
+    'event_date_desc': ('event_date', True),
+}
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) around a point; contains every point within radius_km."""
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(lat))
+    d_lon = 180.0 if cos_lat < 1e-6 else min(180.0, radius_km / (KM_PER_DEGREE_LAT * cos_lat))
+    return lat - d_lat, lat + d_lat, lon - d_lon, lon + d_lon
+
+
+def encode_cursor(value, row_id: int) -> str:
+    raw = json.dumps([value.isoformat() if value is not None else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, column: str) -> Tuple[object, int]:
+    """(sort value, id) from a cursor; ValueError for anything that is not one of ours."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        parse = datetime.fromisoformat if column == 'created_at' else date.fromisoformat
+        return parse(value), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class RequestSearch:
+    """Builds the filtered keyset query and keeps a short-lived cache of totals per filter set."""
+
+    def __init__(self, count_ttl_seconds: float = 30.0, max_cached_counts: int = 512):
+        self.count_ttl_seconds = count_ttl_seconds
+        self.max_cached_counts = max_cached_counts
+        self._counts: "OrderedDict[tuple, tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, **options) -> "RequestSearch":
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise AttributeError(f"Unknown request search option: {key}")
+            setattr(self, key, value)
+        return self
+
+    def init_app(self, app) -> None:
+        self.configure(count_ttl_seconds=float(app.config.get("REQUEST_SEARCH_COUNT_TTL_SECONDS", 30)))
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    # --- Gesamtzahl ----------------------------------------------------------------
+    def _cached_count(self, key) -> Optional[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None or entry[0] <= now:
+                self._counts.pop(key, None)
+                return None
+            return entry[1]
+
+    def _store_count(self, key, total: int) -> None:
+        with self._lock:
+            self._counts[key] = (time.monotonic() + self.count_ttl_seconds, total)
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_cached_counts:
+                self._counts.popitem(last=False)
+
+    # --- Suche ---------------------------------------------------------------------
+    def search(self, date_from: Optional[date] = None, date_to: Optional[date] = None,
+               status: Iterable[str] = (), event_type: Optional[str] = None,
+               disciplines: Iterable[str] = (), team_size: Optional[int] = None,
+               city: Optional[str] = None, near: Optional[Tuple[float, float]] = None,
+               radius_km: Optional[float] = None, sort: str = 'created_desc',
+               cursor: Optional[str] = None, limit: int = 50,
+               columns: Sequence[str] = DEFAULT_COLUMNS) -> dict:
+        """ValueError for unknown status/sort values, invalid cursors or coordinates."""
+        if sort not in SORTS:
+            raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+        statuses = []
+        for value in status or ():
+            norm = normalize_status(value)
+            if not norm:
+                raise ValueError(f"Invalid status: {value}")
+            if norm not in statuses:
+                statuses.append(norm)
+        if (near is None) != (radius_km is None):
+            raise ValueError("lat, lon and radius_km must be given together")
+        if near is not None:
+            lat, lon = near
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                raise ValueError("lat/lon out of range")
+            if not 0 < radius_km <= MAX_RADIUS_KM:
+                raise ValueError(f"radius_km must be between 0 and {MAX_RADIUS_KM:g}")
+        limit = min(max(1, int(limit)), MAX_LIMIT)
+        wanted = sorted({d.strip().casefold() for d in disciplines if d and d.strip()})
+        city = (city or '').strip()
+
+        where = []
+        if date_from:
+            where.append(BookingRequest.event_date >= date_from)
+        if date_to:
+            where.append(BookingRequest.event_date <= date_to)
+        if statuses:
+            where.append(BookingRequest.status.in_(statuses))
+        if event_type:
+            where.append(BookingRequest.event_type == event_type)
+        if team_size is not None:
+            where.append(BookingRequest.team_size == str(team_size))
+        if city:
+            escaped = city.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            where.append(BookingRequest.event_address.ilike(f"%{escaped}%", escape="\\"))
+        if wanted:
+            ids = discipline_ids(wanted)
+            if not ids:
+                return self._result([], None, 0, False, near is not None, limit, sort)
+            where.append(BookingRequest.id.in_(
+                select(booking_request_disciplines.c.booking_id)
+                .where(booking_request_disciplines.c.discipline_id.in_(ids))
+            ))
+        if near is not None:
+            min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+            where += [
+                BookingRequest.event_lat.between(min_lat, max_lat),
+                BookingRequest.event_lon.between(min_lon, max_lon),
+            ]
+
+        key = (date_from, date_to, tuple(statuses), event_type, tuple(wanted), team_size,
+               city.casefold(), near, radius_km)
+        total = self._cached_count(key)
+        cached = total is not None
+        if not cached:
+            total = db.session.execute(select(func.count(BookingRequest.id)).where(*where)).scalar() or 0
+            self._store_count(key, total)
+
+        column_name, descending = SORTS[sort]
+        sort_col = getattr(BookingRequest, column_name)
+        order = (sort_col.desc(), BookingRequest.id.desc()) if descending else (sort_col.asc(), BookingRequest.id.asc())
+        names = list(columns)
+        extra = [c for c in (column_name, 'id', 'event_lat', 'event_lon') if c not in names]
+        stmt = select(*columns_of(BookingRequest, names + extra)).where(*where).order_by(*order)
+
+        position = decode_cursor(cursor, column_name) if cursor else None
+        items, has_more = self._fetch(stmt, sort_col, descending, position, limit, near, radius_km)
+        next_cursor = None
+        if has_more:
+            last = items[-1]
+            next_cursor = encode_cursor(last[column_name], last['id'])
+        for row in items:
+            for name in extra:
+                row.pop(name, None)
+        return self._result(items, next_cursor, total, cached, near is not None, limit, sort)
+
+    @staticmethod
+    def _fetch(stmt, sort_col, descending, position, limit, near, radius_km):
+        """Up to `limit` rows after `position`; with a radius, bounding-box rows outside the circle are skipped."""
+        batch = limit + 1 if near is None else max(2 * (limit + 1), 50)
+        items = []
+        while True:
+            page = stmt
+            if position is not None:
+                keyset = tuple_(sort_col, BookingRequest.id)
+                # typisiert binden: DateTime-Vergleich im gespeicherten Format (SQLite vergleicht Strings)
+                after = tuple_(literal(position[0], sort_col.type), literal(position[1], BookingRequest.id.type))
+                page = page.where(keyset < after if descending else keyset > after)
+            rows = [dict(r._mapping) for r in db.session.execute(page.limit(batch))]
+            for row in rows:
+                if near is not None:
+                    distance = haversine_km(near, (row['event_lat'], row['event_lon']))
+                    if distance > radius_km:
+                        continue
+                    row['distance_to_center_km'] = round(distance, 2)
+                items.append(row)
+                if len(items) > limit:
+                    return items[:limit], True
+            if len(rows) < batch:
+                return items, False
+            last = rows[-1]
+            position = (last[sort_col.key], last['id'])
+
+    @staticmethod
+    def _result(items, next_cursor, total, cached, estimate, limit, sort) -> dict:
+        return {
+            'items': items,
+            'next_cursor': next_cursor,
+            'limit': limit,
+            'sort': sort,
+            'total': total,
+            'total_cached': cached,
+            'total_is_estimate': estimate,
+        }
+
+
+# Process-wide instance; app.py configures the count cache TTL (REQUEST_SEARCH_COUNT_TTL_SECONDS).
+request_search = RequestSearch()
+
+__all__ = ["RequestSearch", "request_search", "bounding_box", "MAX_LIMIT", "DEFAULT_COLUMNS"]
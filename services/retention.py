@@ -0,0 +1,215 @@
+"""Aufbewahrung: vergangene Verfügbarkeiten löschen, abgeschlossene Anfragen in Archivtabellen verschieben.
+
+Verwendung (geplant in cron_jobs/tasks.py, Admin-API in routes/admin_routes.py):
+    retention.purge_availability()          # {"deleted": 12000}
+    retention.prune_availability_changes()  # {"deleted": 36500}
+    retention.archive_requests()            # {"requests": 140, "artist_links": 310, "admin_offers": 12}
+    retention.search_archive(status=["storniert"], artist_id=7, limit=50)
+    retention.get_archived(4711)            # Anfrage + Pivot-Zeilen + Admin-Angebote, sonst None
+
+Hinweise:
+- Archiviert werden Anfragen im Endzustand, deren Event lange genug zurückliegt:
+  abgelehnt/storniert nach `closed_after_days`, akzeptiert nach `accepted_after_days`
+  Tagen ab Eventdatum (beides über die indizierten Spalten event_date / status).
+- Ein Block = bis zu `request_batch` Anfragen: INSERT ... SELECT in
+  archived_booking_requests / archived_booking_artists / archived_admin_offers,
+  danach DELETE der Originale (inkl. booking_request_disciplines), ein Commit.
+  Kurze Transaktionen halten Sperren auf den heißen Tabellen kurz; `pause_seconds`
+  zwischen den Blöcken und `max_batches` je Lauf drosseln den Job, der Rest
+  folgt im nächsten Lauf.
+- Hochwassermarke: das Archiv übernimmt die IDs. SQLite vergibt ohne AUTOINCREMENT
+  max(id) + 1, eine gelöschte höchste ID käme also erneut. Die Anfrage mit der höchsten
+  ID und die Anfrage mit dem jüngsten Admin-Angebot bleiben deshalb live, bis neuere
+  existieren; so liegen neue IDs immer über allen archivierten (ohne Tabellen-Rebuild).
+- Das Änderungsprotokoll der Verfügbarkeiten (Delta-Sync ?since=) wird nach
+  `availability_changes_days` Tagen versionsweise gekürzt; ältere `since` beantwortet
+  der Endpoint mit einem Reset-Snapshot.
+- Archivierte Anfragen erscheinen nicht mehr in den Live-Endpunkten (Listen, Suche,
+  Karte, Disziplin-Statistik); dafür gibt es die Archiv-Endpunkte.
+"""
+from __future__ import annotations
+
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+
+from managers.availability_manager import AvailabilityManager
+from models import (
+    db, AdminOffer, BookingRequest, booking_artists, booking_request_disciplines,
+    archived_admin_offers, archived_booking_artists, archived_booking_requests,
+)
+
+FINAL_STATUSES = ("abgelehnt", "storniert")
+ACCEPTED_STATUS = "akzeptiert"
+
+# Archivtabelle -> (Quelltabelle, Spalte mit der Anfrage-ID)
+_ARCHIVES = (
+    (archived_booking_requests, BookingRequest.__table__, "id"),
+    (archived_booking_artists, booking_artists, "booking_id"),
+    (archived_admin_offers, AdminOffer.__table__, "request_id"),
+)
+
+
+class Retention:
+    """Batched, throttled clean-up of history tables."""
+
+    def __init__(self, availability_batch: int = 5000, request_batch: int = 200, pause_seconds: float = 0.5,
+                 max_batches: int = 200, closed_after_days: int = 90, accepted_after_days: int = 365,
+                 availability_changes_days: int = 30):
+        self.availability_batch = availability_batch
+        self.request_batch = request_batch
+        self.pause_seconds = pause_seconds
+        self.max_batches = max_batches
+        self.closed_after_days = closed_after_days
+        self.accepted_after_days = accepted_after_days
+        self.availability_changes_days = availability_changes_days
+
+    def configure(self, **options) -> "Retention":
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise AttributeError(f"Unknown retention option: {key}")
+            setattr(self, key, value)
+        return self
+
+    def init_app(self, app) -> None:
+        self.configure(
+            availability_batch=int(app.config.get("RETENTION_AVAILABILITY_BATCH", 5000)),
+            request_batch=int(app.config.get("RETENTION_REQUEST_BATCH", 200)),
+            pause_seconds=float(app.config.get("RETENTION_PAUSE_SECONDS", 0.5)),
+            max_batches=int(app.config.get("RETENTION_MAX_BATCHES", 200)),
+            closed_after_days=int(app.config.get("RETENTION_CLOSED_AFTER_DAYS", 90)),
+            accepted_after_days=int(app.config.get("RETENTION_ACCEPTED_AFTER_DAYS", 365)),
+            availability_changes_days=int(app.config.get("RETENTION_AVAILABILITY_CHANGES_DAYS", 30)),
+        )
+
+    # --- Verfügbarkeiten -----------------------------------------------------------
+    def purge_availability(self, before: Optional[date] = None) -> Dict[str, int]:
+        """Delete availability days before `before` (default: today)."""
+        deleted = AvailabilityManager().purge_past(
+            before or date.today(), batch_size=self.availability_batch,
+            pause_seconds=self.pause_seconds, max_batches=self.max_batches,
+        )
+        return {"deleted": deleted}
+
+    def prune_availability_changes(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Drop availability change-log versions older than `availability_changes_days`."""
+        before = (now or datetime.utcnow()) - timedelta(days=self.availability_changes_days)
+        deleted = AvailabilityManager().prune_changes(
+            before, batch_size=self.availability_batch,
+            pause_seconds=self.pause_seconds, max_batches=self.max_batches,
+        )
+        return {"deleted": deleted}
+
+    # --- Anfragen archivieren ------------------------------------------------------
+    def _archivable_ids(self, today: date) -> List[int]:
+        closed_before = today - timedelta(days=self.closed_after_days)
+        accepted_before = today - timedelta(days=self.accepted_after_days)
+        # Hochwassermarke (s. Modul-Doku): Träger der höchsten IDs nicht löschen
+        keep = {
+            db.session.execute(select(func.max(BookingRequest.id))).scalar(),
+            db.session.execute(
+                select(AdminOffer.request_id).order_by(AdminOffer.id.desc()).limit(1)
+            ).scalar(),
+        }
+        keep.discard(None)
+        ids = []
+        # zwei Index-Bereiche (status, event_date) statt OR über beide Bedingungen
+        for statuses, before in ((FINAL_STATUSES, closed_before), ((ACCEPTED_STATUS,), accepted_before)):
+            ids += db.session.execute(
+                select(BookingRequest.id)
+                .where(BookingRequest.status.in_(statuses), BookingRequest.event_date < before,
+                       BookingRequest.id.notin_(keep))
+                .order_by(BookingRequest.id)
+                .limit(self.request_batch)
+            ).scalars()
+        return sorted(ids)[:self.request_batch]
+
+    def archive_requests(self, today: Optional[date] = None) -> Dict[str, int]:
+        """Move archivable requests with their artist links and admin offers; returns moved row counts."""
+        today = today or date.today()
+        moved = {"requests": 0, "artist_links": 0, "admin_offers": 0}
+        for batch in range(self.max_batches):
+            ids = self._archivable_ids(today)
+            if not ids:
+                break
+            if batch and self.pause_seconds:
+                time.sleep(self.pause_seconds)
+            counts = self._archive_batch(ids)
+            for key, count in zip(moved, counts):
+                moved[key] += count
+        return moved
+
+    def _archive_batch(self, ids: Sequence[int]) -> List[int]:
+        archived_at = literal(datetime.utcnow(), DateTime)
+        counts = []
+        try:
+            for archive, source, key in _ARCHIVES:
+                columns = [c.name for c in archive.columns if c.name in source.c]
+                values = [source.c[name] for name in columns]
+                if "archived_at" in archive.c:
+                    columns.append("archived_at")
+                    values.append(archived_at)
+                counts.append(db.session.execute(
+                    insert(archive).from_select(columns, select(*values).where(source.c[key].in_(ids)))
+                ).rowcount)
+            # Kindzeilen zuerst (FKs), dann die Anfragen selbst
+            for source, key in ((AdminOffer.__table__, "request_id"), (booking_artists, "booking_id"),
+                                (booking_request_disciplines, "booking_id"), (BookingRequest.__table__, "id")):
+                db.session.execute(delete(source).where(source.c[key].in_(ids)))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return counts
+
+    # --- Abfrage -------------------------------------------------------------------
+    def search_archive(self, status: Sequence[str] = (), date_from: Optional[date] = None,
+                       date_to: Optional[date] = None, artist_id: Optional[int] = None,
+                       client_email: Optional[str] = None, before_id: Optional[int] = None,
+                       limit: int = 50) -> Dict[str, Any]:
+        """Archived requests, newest id first; page with before_id = next_before_id."""
+        limit = max(1, min(int(limit), 500))
+        t = archived_booking_requests
+        stmt = select(t).order_by(t.c.id.desc()).limit(limit)
+        if status:
+            stmt = stmt.where(t.c.status.in_(list(status)))
+        if date_from:
+            stmt = stmt.where(t.c.event_date >= date_from)
+        if date_to:
+            stmt = stmt.where(t.c.event_date <= date_to)
+        if client_email:
+            stmt = stmt.where(t.c.client_email == client_email.strip())
+        if artist_id is not None:
+            stmt = stmt.where(t.c.id.in_(
+                select(archived_booking_artists.c.booking_id).where(archived_booking_artists.c.artist_id == artist_id)
+            ))
+        if before_id:
+            stmt = stmt.where(t.c.id < before_id)
+        items = [dict(row) for row in db.session.execute(stmt).mappings()]
+        return {"items": items, "next_before_id": items[-1]["id"] if len(items) == limit else None}
+
+    def get_archived(self, request_id: int) -> Optional[Dict[str, Any]]:
+        row = db.session.execute(
+            select(archived_booking_requests).where(archived_booking_requests.c.id == request_id)
+        ).mappings().first()
+        if row is None:
+            return None
+        artists = db.session.execute(
+            select(archived_booking_artists)
+            .where(archived_booking_artists.c.booking_id == request_id)
+            .order_by(archived_booking_artists.c.artist_id)
+        ).mappings()
+        offers = db.session.execute(
+            select(archived_admin_offers)
+            .where(archived_admin_offers.c.request_id == request_id)
+            .order_by(archived_admin_offers.c.id)
+        ).mappings()
+        return dict(row, artists=[dict(a) for a in artists], admin_offers=[dict(o) for o in offers])
+
+
+# Process-wide instance; app.py configures batch sizes, throttling and retention periods (RETENTION_*).
+retention = Retention()
+
+__all__ = ["Retention", "retention", "FINAL_STATUSES"]
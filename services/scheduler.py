@@ -0,0 +1,419 @@
+"""Periodic maintenance jobs: registry, cron expressions, one host per run, run history.
+
+Usage:
+    from services.scheduler import scheduler
+    scheduler.register("availability.purge_past", "30 2 * * *", purge)   # purge(state) -> {"deleted": 120}
+    scheduler.run_pending()                      # every tick: runs the jobs that are due
+    scheduler.run("availability.purge_past")     # now, regardless of the schedule (admin "run now")
+
+Notes:
+- Cron expressions have five fields (minute hour day-of-month month day-of-week,
+  evaluated in UTC like every timestamp in this app) with `*`, lists, ranges and
+  steps, or one of @hourly/@daily/@weekly/@monthly/@yearly.
+- Exclusive jobs (default) have a row in `scheduled_jobs`. A run is claimed with
+  a conditional UPDATE (due and not locked -> locked by this host, next_run_at
+  moved on), so with several workers or hosts exactly one of them runs it. The
+  lock owner is host:pid plus a token per claim, so two threads of one process
+  never release each other's lock. A lock whose locked_until has passed (crashed
+  host) is free again.
+- Process-local jobs (exclusive=False), e.g. for in-memory caches, run in every
+  scheduler process; the thread tracks their next run in memory. One-shot calls
+  (`run_pending(one_shot=True)`, system crontab) keep no memory between calls and
+  run them when the current minute matches their expression.
+- Every run is recorded in `scheduled_job_runs` with duration, the row counts the
+  handler returns and the error, if any. The `state` dict passed to the handler
+  is stored on the job row after a successful run (cursor for batched work).
+- The daemon thread (tick every SCHEDULER_TICK_SECONDS) is only started by an
+  explicit entrypoint: wsgi.py with SCHEDULER_ENABLED, or
+  `python cron_jobs/run_scheduler.py --loop`. Importing the app (flask CLI,
+  `flask db upgrade`, scripts, tests) never starts it. Without a thread, run
+  `python cron_jobs/run_scheduler.py` from the system crontab every minute.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from models import db, ScheduledJob, ScheduledJobRun
+from services.background_jobs import job_queue
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Optional[dict]]
+
+_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+# (min, max) je Feld; Wochentag 0-7, 0 und 7 = Sonntag
+_BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+_SEARCH_YEARS = 5
+
+
+def _parse_field(text: str, low: int, high: int) -> set:
+    values = set()
+    for part in text.split(","):
+        base, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if step < 1:
+            raise ValueError(f"Invalid step in cron field: {text}")
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start, end = (int(v) for v in base.split("-", 1))
+        else:
+            start = int(base)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field out of range ({low}-{high}): {text}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    """Five-field cron expression; `next_after` finds the next matching minute."""
+
+    def __init__(self, expr: str):
+        self.expr = " ".join(str(expr).split())
+        fields = _ALIASES.get(self.expr, self.expr).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expr!r}")
+        try:
+            parsed = [_parse_field(f, low, high) for f, (low, high) in zip(fields, _BOUNDS)]
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression {expr!r}: {e}")
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {d % 7 for d in weekdays}
+        # Standard-Cron: sind Tag und Wochentag beide eingeschränkt, reicht einer von beiden
+        self._either_day = fields[2] != "*" and fields[4] != "*"
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expr!r})"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        in_days = moment.day in self.days
+        in_weekdays = moment.isoweekday() % 7 in self.weekdays
+        return (in_days or in_weekdays) if self._either_day else (in_days and in_weekdays)
+
+    def matches(self, moment: datetime) -> bool:
+        return (moment.minute in self.minutes and moment.hour in self.hours
+                and moment.month in self.months and self._day_matches(moment))
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after `moment` (ValueError if there is none, e.g. 31 Feb)."""
+        t = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment.year + _SEARCH_YEARS
+        while t.year <= limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression never matches: {self.expr!r}")
+
+
+@dataclass
+class ScheduledTask:
+    name: str
+    cron: CronExpression
+    handler: Handler
+    exclusive: bool = True
+    timeout: timedelta = timedelta(hours=1)
+    description: str = ""
+
+
+class Scheduler:
+    """Job registry plus the due check, DB claim and run bookkeeping."""
+
+    def __init__(self, tick_seconds: float = 30.0, history_days: int = 14):
+        self.tick_seconds = tick_seconds
+        self.history_days = history_days
+        self.host = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: Dict[str, ScheduledTask] = {}
+        self._local_next: Dict[str, datetime] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def configure(self, **options) -> "Scheduler":
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise AttributeError(f"Unknown scheduler option: {key}")
+            setattr(self, key, value)
+        return self
+
+    def init_app(self, app) -> None:
+        self.configure(
+            tick_seconds=float(app.config.get("SCHEDULER_TICK_SECONDS", 30)),
+            history_days=int(app.config.get("SCHEDULER_HISTORY_DAYS", 14)),
+        )
+        # kein Thread-Start hier: app.py wird auch von CLI und Migrationen importiert (siehe wsgi.py)
+
+    # --- Registry ------------------------------------------------------------------
+    def register(self, name: str, cron: str, handler: Handler, exclusive: bool = True,
+                 timeout_seconds: float = 3600, description: str = "") -> Handler:
+        """Register (or replace) a job; ValueError for invalid cron expressions."""
+        self._tasks[name] = ScheduledTask(
+            name=name, cron=CronExpression(cron), handler=handler, exclusive=exclusive,
+            timeout=timedelta(seconds=timeout_seconds), description=description,
+        )
+        self._local_next.pop(name, None)
+        return handler
+
+    def tasks(self) -> List[ScheduledTask]:
+        return list(self._tasks.values())
+
+    def get(self, name: str) -> ScheduledTask:
+        """KeyError for unknown jobs."""
+        return self._tasks[name]
+
+    # --- Ausführung ----------------------------------------------------------------
+    def run_pending(self, now: Optional[datetime] = None, one_shot: bool = False) -> List[int]:
+        """Run every job that is due (and, if exclusive, claimed by this host). Returns the run ids.
+        `one_shot`: single call per minute (system crontab) instead of the thread's ticks.
+        """
+        now = now or datetime.utcnow()
+        rows = {
+            row.name: row
+            for row in db.session.execute(
+                select(ScheduledJob.name, ScheduledJob.cron, ScheduledJob.next_run_at, ScheduledJob.locked_until)
+            )
+        }
+        runs = []
+        for task in self.tasks():
+            if not task.exclusive and one_shot:
+                # kein Gedächtnis zwischen den Aufrufen: fällig, wenn die aktuelle Minute passt
+                if task.cron.matches(now):
+                    runs.append(self._execute(task, "schedule"))
+                continue
+            if not task.exclusive:
+                due = self._local_next.setdefault(task.name, task.cron.next_after(now))
+                if due <= now:
+                    self._local_next[task.name] = task.cron.next_after(now)
+                    runs.append(self._execute(task, "schedule"))
+                continue
+            row = rows.get(task.name)
+            if row is None or row.cron != task.cron.expr:
+                # neu oder Ausdruck geändert: nächsten Termin festlegen, erst dann ausführen
+                self._sync_row(task, now, exists=row is not None)
+                continue
+            if row.next_run_at > now or (row.locked_until is not None and row.locked_until >= now):
+                continue
+            owner = self._claim(task, now, scheduled=True)
+            if owner:
+                runs.append(self._execute(task, "schedule", owner))
+        return runs
+
+    def run(self, name: str, now: Optional[datetime] = None) -> Optional[int]:
+        """Run a job now (schedule unchanged). None if another host holds its lock; KeyError if unknown."""
+        task = self.get(name)
+        now = now or datetime.utcnow()
+        owner = None
+        if task.exclusive:
+            exists = db.session.execute(
+                select(ScheduledJob.name).where(ScheduledJob.name == name)
+            ).first() is not None
+            if not exists:
+                self._sync_row(task, now, exists=False)
+            owner = self._claim(task, now, scheduled=False)
+            if not owner:
+                return None
+        return self._execute(task, "manual", owner)
+
+    def _sync_row(self, task: ScheduledTask, now: datetime, exists: bool) -> None:
+        values = {"cron": task.cron.expr, "next_run_at": task.cron.next_after(now)}
+        if exists:
+            db.session.execute(update(ScheduledJob).where(ScheduledJob.name == task.name).values(**values))
+        else:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(ScheduledJob).values(name=task.name, state={}, **values))
+            except IntegrityError:
+                # gleichzeitig von einem anderen Host angelegt
+                pass
+        db.session.commit()
+
+    def _claim(self, task: ScheduledTask, now: datetime, scheduled: bool) -> Optional[str]:
+        """Lock owner (host:pid:token) if this call got the lock, else None."""
+        owner = f"{self.host}:{uuid.uuid4().hex[:12]}"
+        conditions = [
+            ScheduledJob.name == task.name,
+            or_(ScheduledJob.locked_until.is_(None), ScheduledJob.locked_until < now),
+        ]
+        values = {"locked_by": owner, "locked_until": now + task.timeout}
+        if scheduled:
+            conditions.append(ScheduledJob.next_run_at <= now)
+            values["next_run_at"] = task.cron.next_after(now)
+        claimed = db.session.execute(
+            update(ScheduledJob).where(*conditions).values(**values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return owner if claimed else None
+
+    def _execute(self, task: ScheduledTask, trigger: str, lock_owner: Optional[str] = None) -> int:
+        state = {}
+        if task.exclusive:
+            state = dict(db.session.execute(
+                select(ScheduledJob.state).where(ScheduledJob.name == task.name)
+            ).scalar() or {})
+        run_id = db.session.execute(
+            insert(ScheduledJobRun).values(
+                job=task.name, host=self.host, status="running", trigger=trigger, started_at=datetime.utcnow(),
+            ).returning(ScheduledJobRun.id)
+        ).scalar()
+        db.session.commit()
+
+        started = time.monotonic()
+        try:
+            outcome = {"status": "done", "rows": task.handler(state) or {}}
+        except Exception as e:
+            logger.exception("scheduled job %s failed", task.name)
+            db.session.rollback()
+            outcome = {"status": "failed", "error": str(e)[:2000]}
+        duration_ms = int((time.monotonic() - started) * 1000)
+
+        db.session.execute(
+            update(ScheduledJobRun).where(ScheduledJobRun.id == run_id)
+            .values(finished_at=datetime.utcnow(), duration_ms=duration_ms, **outcome)
+        )
+        if task.exclusive:
+            release = {"locked_by": None, "locked_until": None}
+            if outcome["status"] == "done":
+                release["state"] = state
+            db.session.execute(
+                update(ScheduledJob)
+                .where(ScheduledJob.name == task.name, ScheduledJob.locked_by == lock_owner)
+                .values(**release)
+            )
+        db.session.commit()
+        logger.info("scheduled job %s %s in %sms: %s", task.name, outcome["status"], duration_ms,
+                    outcome.get("rows") or outcome.get("error"))
+        return run_id
+
+    # --- Thread --------------------------------------------------------------------
+    def start(self, app) -> None:
+        """Tick in a daemon thread of this process (idempotent); called from wsgi.py / the dev server."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(app,), name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self, app) -> None:
+        while not self._stop.wait(self.tick_seconds):
+            with app.app_context():
+                try:
+                    self.run_pending()
+                except Exception:
+                    logger.exception("scheduler tick failed")
+                finally:
+                    db.session.remove()
+
+    # --- Historie ------------------------------------------------------------------
+    def overview(self) -> List[Dict[str, Any]]:
+        """Registered jobs with their schedule, lock and latest run."""
+        rows = {row.name: row for row in db.session.execute(select(ScheduledJob)).scalars()}
+        latest_ids = select(func.max(ScheduledJobRun.id)).group_by(ScheduledJobRun.job)
+        latest = {
+            run.job: run
+            for run in db.session.execute(select(ScheduledJobRun).where(ScheduledJobRun.id.in_(latest_ids))).scalars()
+        }
+        out = []
+        for task in sorted(self.tasks(), key=lambda t: t.name):
+            row = rows.get(task.name)
+            next_run = row.next_run_at if row is not None else self._local_next.get(task.name)
+            out.append({
+                "name": task.name,
+                "cron": task.cron.expr,
+                "exclusive": task.exclusive,
+                "description": task.description,
+                "next_run_at": _iso(next_run),
+                "locked_by": row.locked_by if row is not None else None,
+                "locked_until": _iso(row.locked_until) if row is not None else None,
+                "last_run": self.serialize_run(latest[task.name]) if task.name in latest else None,
+            })
+        return out
+
+    def history(self, job: Optional[str] = None, status: Optional[str] = None,
+                before_id: Optional[int] = None, limit: int = 50) -> List[ScheduledJobRun]:
+        """Runs, newest first; page with before_id = id of the last run of the previous page."""
+        stmt = select(ScheduledJobRun).order_by(ScheduledJobRun.id.desc()).limit(max(1, min(int(limit), 500)))
+        if job:
+            stmt = stmt.where(ScheduledJobRun.job == job)
+        if status:
+            stmt = stmt.where(ScheduledJobRun.status == status)
+        if before_id:
+            stmt = stmt.where(ScheduledJobRun.id < before_id)
+        return list(db.session.execute(stmt).scalars())
+
+    def purge_history(self, older_than: Optional[timedelta] = None) -> int:
+        cutoff = datetime.utcnow() - (older_than or timedelta(days=self.history_days))
+        deleted = db.session.execute(
+            delete(ScheduledJobRun).where(ScheduledJobRun.started_at < cutoff)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return deleted
+
+    @staticmethod
+    def serialize_run(run: ScheduledJobRun) -> Dict[str, Any]:
+        return {
+            "id": run.id,
+            "job": run.job,
+            "host": run.host,
+            "status": run.status,
+            "trigger": run.trigger,
+            "rows": run.rows,
+            "error": run.error,
+            "started_at": _iso(run.started_at),
+            "finished_at": _iso(run.finished_at),
+            "duration_ms": run.duration_ms,
+        }
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+# Process-wide scheduler; the maintenance jobs register themselves in cron_jobs/tasks.py.
+scheduler = Scheduler()
+
+# "Jetzt ausführen" aus dem Admin-Bereich läuft als pollbarer Hintergrund-Job
+SCHEDULER_RUN_JOB = "scheduler.run"
+
+
+def run_scheduled_job(payload: dict) -> dict:
+    run_id = scheduler.run(payload["job"])
+    return {"run_id": run_id, "skipped": run_id is None}
+
+
+# Timeout großzügig über dem längsten Wartungs-Job (requests.archive: 2 h)
+job_queue.register(SCHEDULER_RUN_JOB, run_scheduled_job, timeout_seconds=3 * 3600)
+
+__all__ = ["CronExpression", "Scheduler", "ScheduledTask", "scheduler", "SCHEDULER_RUN_JOB"]
@@ -0,0 +1,109 @@
+"""Pick the cheapest team of K artists that covers the requested disciplines.
+
+Usage (see routes/request_routes.py, `_select_team`):
+    candidates = request_mgr.team_candidates(event_address, artists, rules.rate_per_km)
+    team = optimize_team(candidates, k=3, required=["Zauberer", "Jonglage"])
+    team.members, team.cost, team.missing      # None if fewer than K candidates
+
+Notes:
+- Objective, in this order: cover as many requested disciplines as possible,
+  then minimize the sum of (gage + travel cost) over the team. Ties are broken
+  by candidate order, so results are deterministic.
+- Pruning: candidates are grouped by the subset of requested disciplines they
+  cover. A team never needs more than K artists from one group, so only the K
+  cheapest per group survive. That is at most K * 2^D candidates, however many
+  artists matched.
+- One DP pass over the survivors with state (team size, coverage bitmask):
+  O(n' * K * 2^D) instead of C(n, K) combinations. Only the first
+  MAX_DISCIPLINES requested disciplines count towards coverage.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+MAX_DISCIPLINES = 8
+
+
+@dataclass(frozen=True)
+class TeamCandidate:
+    artist: Any
+    cost: float
+    disciplines: FrozenSet[str]          # lower-cased names
+    travel_km: Optional[float] = None    # None = distance unknown
+
+
+@dataclass
+class Team:
+    members: List[TeamCandidate]
+    cost: float
+    covered: List[str]
+    missing: List[str]
+
+    @property
+    def artists(self) -> list:
+        return [m.artist for m in self.members]
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def optimize_team(candidates: Iterable[TeamCandidate], k: int, required: Iterable[str] = ()) -> Optional[Team]:
+    """Cheapest K-artist team with maximal discipline coverage, or None if fewer than K candidates."""
+    if k < 1:
+        raise ValueError("team size must be at least 1")
+    names: List[str] = []
+    for name in required:
+        key = str(name).strip().lower()
+        if key and key not in names:
+            names.append(key)
+    names = names[:MAX_DISCIPLINES]
+    bits = {name: 1 << i for i, name in enumerate(names)}
+
+    # Gruppieren nach abgedeckter Teilmenge; Duplikate (gleicher Artist) nur einmal
+    groups: Dict[int, List[Tuple[float, int, TeamCandidate]]] = {}
+    seen = set()
+    for order, cand in enumerate(candidates):
+        ident = getattr(cand.artist, "id", None) or id(cand.artist)
+        if ident in seen:
+            continue
+        seen.add(ident)
+        mask = 0
+        for name in cand.disciplines:
+            mask |= bits.get(name, 0)
+        groups.setdefault(mask, []).append((cand.cost, order, cand))
+    if len(seen) < k:
+        return None
+
+    survivors: List[Tuple[int, float, TeamCandidate]] = []
+    for mask, members in groups.items():
+        members.sort(key=lambda m: (m[0], m[1]))
+        survivors.extend((mask, cost, cand) for cost, _, cand in members[:k])
+
+    # dp[j][mask] = (Kosten, Indizes in survivors) der besten j-er-Auswahl mit Abdeckung mask
+    dp: List[Dict[int, Tuple[float, Tuple[int, ...]]]] = [{} for _ in range(k + 1)]
+    dp[0][0] = (0.0, ())
+    for idx, (cand_mask, cand_cost, _) in enumerate(survivors):
+        # absteigend, damit jeder Kandidat höchstens einmal pro Team vorkommt
+        for j in range(min(k, idx + 1), 0, -1):
+            current = dp[j]
+            for mask, (cost, members) in dp[j - 1].items():
+                entry = (cost + cand_cost, members + (idx,))
+                new_mask = mask | cand_mask
+                best = current.get(new_mask)
+                if best is None or entry < best:
+                    current[new_mask] = entry
+
+    if not dp[k]:
+        return None
+    mask, (cost, members) = min(dp[k].items(), key=lambda item: (-_popcount(item[0]), item[1]))
+    return Team(
+        members=[survivors[i][2] for i in members],
+        cost=cost,
+        covered=[name for name in names if mask & bits[name]],
+        missing=[name for name in names if not mask & bits[name]],
+    )
+
+
+__all__ = ["TeamCandidate", "Team", "optimize_team", "MAX_DISCIPLINES"]
@@ -17,6 +17,47 @@ def unique_email(prefix="user"):
     return f"{prefix}+{uuid.uuid4().hex[:8]}@example.com"
 
 
+class QueryCounter:
+    """Zählt alle SQL-Statements, die innerhalb des with-Blocks über die Engine laufen.
+
+    Mit `limit` wird beim Verlassen des Blocks geprüft, dass das Query-Budget eingehalten wurde:
+
+        with QueryCounter(db.engine, limit=5) as qc:
+            client.get("/api/artists")
+        assert qc.count <= 5  # implizit durch limit
+    """
+
+    # Transaktions-Steuerung der Test-Fixture (SAVEPOINTs) zählt nicht zum Budget
+    _IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+    def __init__(self, engine, limit: int | None = None):
+        self.engine = engine
+        self.limit = limit
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(self._IGNORED_PREFIXES):
+            return
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        if exc_type is None and self.limit is not None and self.count > self.limit:
+            listing = "\n".join(f"  {i + 1}. {s.strip()}" for i, s in enumerate(self.statements))
+            raise AssertionError(
+                f"Query-Budget überschritten: {self.count} > {self.limit} Statements\n{listing}"
+            )
+        return False
+
+
 @pytest.fixture(scope='session')
 def app():
     flask_app.config['TESTING'] = True
@@ -59,6 +100,13 @@ def client(app):
     """Flask test client."""
     return app.test_client()
 
+@pytest.fixture
+def count_queries(app):
+    """Factory für QueryCounter: `with count_queries(limit=5) as qc: ...`."""
+    def _factory(limit: int | None = None) -> QueryCounter:
+        return QueryCounter(db.engine, limit=limit)
+    return _factory
+
 @pytest.fixture
 def artist_manager(app):
     """ArtistManager instance."""
@@ -0,0 +1,96 @@
+# tests/integration/test_artist_delete.py
+"""Artist löschen: mengenbasiert (ein DELETE je Kindtabelle) statt ORM-Cascade über 365 Verfügbarkeiten."""
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from managers.artist_manager import ArtistManager
+from models import (
+    db, Artist, AdminOffer, Availability, AvailabilityChange, BookingRequest, Invoice,
+    artist_disciplines, booking_artists,
+)
+from tests.conftest import unique_email
+
+
+def _artist_with_children(approved_by=None):
+    """Artist mit 365 Verfügbarkeiten, Disziplinen, Rechnung, Anfrage-Zuordnung und Admin-Angebot."""
+    artist = ArtistManager().create_artist(
+        name="Delete Me", email=unique_email("delete"), disciplines=["Zauberer", "Jonglage"],
+        supabase_user_id="delete-" + uuid.uuid4().hex[:10],
+    )
+    req = BookingRequest(
+        client_name="Kunde", client_email=unique_email("client"), event_type="Firmenfeier",
+        show_type="Bühnenshow", show_discipline="Zauberer", team_size="1",
+        event_date=date.today() + timedelta(days=30), duration_minutes=20,
+    )
+    req.artists.append(artist)
+    db.session.add(req)
+    db.session.flush()
+    db.session.add(Invoice(artist_id=artist.id, storage_path=f"user/{artist.id}/r.pdf"))
+    db.session.add(AdminOffer(request_id=req.id, admin_id=artist.id, override_price=1000))
+    db.session.add(AvailabilityChange(artist_id=artist.id, version=1, date=date.today(), op="added"))
+    db.session.commit()
+    return artist.id, req.id
+
+
+def _remaining(artist_ids):
+    checks = (
+        (Artist.id, Artist.id),
+        (Availability.id, Availability.artist_id),
+        (AvailabilityChange.id, AvailabilityChange.artist_id),
+        (Invoice.id, Invoice.artist_id),
+        (AdminOffer.id, AdminOffer.admin_id),
+        (booking_artists.c.booking_id, booking_artists.c.artist_id),
+        (artist_disciplines.c.discipline_id, artist_disciplines.c.artist_id),
+    )
+    return sum(
+        db.session.execute(select(func.count(col)).where(fk.in_(artist_ids))).scalar()
+        for col, fk in checks
+    )
+
+
+def test_admin_delete_is_set_based(client, admin_headers, count_queries):
+    artist_id, req_id = _artist_with_children()
+    approved = Artist(
+        name="Freigegeben", email=unique_email("approved"), approval_status="approved",
+        approved_by=artist_id, supabase_user_id="del-" + uuid.uuid4().hex[:10],
+    )
+    db.session.add(approved)
+    db.session.commit()
+    assert db.session.execute(
+        select(func.count(Availability.id)).where(Availability.artist_id == artist_id)
+    ).scalar() == 365
+
+    with count_queries(limit=12) as qc:
+        resp = client.delete(f"/admin/artists/{artist_id}", headers=admin_headers)
+    assert resp.status_code == 200, resp.get_json()
+    assert resp.get_json() == {"deleted": artist_id}
+    # kein zeilenweises Löschen der Verfügbarkeiten
+    assert sum("availabilities" in s and s.lstrip().upper().startswith("DELETE") for s in qc.statements) == 1
+
+    assert _remaining([artist_id]) == 0
+    # Anfrage und freigegebener Artist bleiben bestehen, die Freigabe verliert nur den Admin-Verweis
+    assert db.session.get(BookingRequest, req_id) is not None
+    db.session.expire_all()
+    assert db.session.get(Artist, approved.id).approved_by is None
+
+    assert client.delete(f"/admin/artists/{artist_id}", headers=admin_headers).status_code == 404
+
+
+def test_bulk_delete_endpoint(client, admin_headers, user_headers):
+    first, _ = _artist_with_children()
+    second, _ = _artist_with_children()
+    missing = 10 ** 9
+
+    resp = client.post("/admin/artists/bulk-delete", headers=user_headers, json={"ids": [first]})
+    assert resp.status_code == 403
+
+    resp = client.post("/admin/artists/bulk-delete", headers=admin_headers, json={"ids": [first, second, missing, first]})
+    assert resp.status_code == 200, resp.get_json()
+    assert resp.get_json() == {"deleted": sorted([first, second]), "not_found": [missing]}
+    assert _remaining([first, second]) == 0
+
+    for body in ({}, {"ids": []}, {"ids": ["abc"]}, {"ids": list(range(1, 10_000))}):
+        resp = client.post("/admin/artists/bulk-delete", headers=admin_headers, json=body)
+        assert resp.status_code == 400
@@ -0,0 +1,113 @@
+# tests/integration/test_artist_search.py
+"""Admin-Artist-Suche: Volltext (FTS5), Filter, Facetten und Sync über Trigger."""
+import uuid
+
+import pytest
+
+from models import db, Artist, Discipline
+from services.artist_search import artist_search
+from tests.conftest import unique_email
+
+
+def _discipline(name):
+    return Discipline.query.filter_by(name=name).first() or Discipline(name=name)
+
+
+@pytest.fixture
+def seeded(app):
+    """Drei Artists mit gemeinsamem Zufalls-Token im Bio, damit andere Testdaten nicht stören."""
+    token = "tok" + uuid.uuid4().hex[:8]
+    specs = [
+        ("Feuerkünstler Max", f"{token} Feuershow und Jonglage", "Hauptstr. 1, 80331 München",
+         600, 900, "approved", ["Jonglage", "Feuershow"]),
+        ("Magic Mia", f"{token} Close-up Zauberei", "Ringstr. 5, 50667 Köln",
+         1200, 2000, "approved", ["Zauberer"]),
+        ("Jongleur Jan", f"{token} Bälle, Keulen, Ringe", "Leopoldstr. 9, 80802 München",
+         300, 500, "pending", ["Jonglage"]),
+    ]
+    ids = []
+    for name, bio, address, pmin, pmax, status, disciplines in specs:
+        artist = Artist(
+            name=name, email=unique_email("search"), bio=bio, address=address,
+            supabase_user_id="search-" + uuid.uuid4().hex[:10],
+            price_min=pmin, price_max=pmax, approval_status=status,
+        )
+        artist.disciplines = [_discipline(d) for d in disciplines]
+        db.session.add(artist)
+        db.session.flush()
+        ids.append(artist.id)
+    db.session.commit()
+    artist_search.reset()
+    return token, ids
+
+
+def _search(client, headers, **params):
+    resp = client.get("/admin/artists/search", headers=headers, query_string=params)
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()
+
+
+def test_search_uses_fts_and_counts_facets(client, admin_headers, seeded):
+    token, (max_id, mia_id, jan_id) = seeded
+    data = _search(client, admin_headers, q=token)
+    assert data["backend"] == "fts5"
+    assert data["total"] == 3
+    assert {a["id"] for a in data["items"]} == {max_id, mia_id, jan_id}
+    assert data["facets"]["disciplines"] == {"Jonglage": 2, "Feuershow": 1, "Zauberer": 1}
+    assert data["facets"]["status"] == {"approved": 2, "pending": 1}
+
+    # Präfix-Suche über Bio-Wörter, Umlaute ohne Diakritika
+    data = _search(client, admin_headers, q=f"{token} feuer")
+    assert [a["id"] for a in data["items"]] == [max_id]
+    assert data["items"][0]["disciplines"] == ["Feuershow", "Jonglage"]
+    assert _search(client, admin_headers, q=f"{token} zauber")["total"] == 1
+
+
+def test_filters_and_facets_exclude_their_own_filter(client, admin_headers, seeded):
+    token, (max_id, mia_id, jan_id) = seeded
+    data = _search(client, admin_headers, q=token, discipline="Jonglage", status="approved")
+    assert [a["id"] for a in data["items"]] == [max_id]
+    # Disziplin-Facette mit Status-Filter, Status-Facette mit Disziplin-Filter
+    assert data["facets"]["disciplines"] == {"Jonglage": 1, "Feuershow": 1, "Zauberer": 1}
+    assert data["facets"]["status"] == {"approved": 1, "pending": 1}
+
+    # mehrere Disziplinen = any-of (Komma oder wiederholt)
+    assert _search(client, admin_headers, q=token, discipline="zauberer,feuershow")["total"] == 2
+
+    data = _search(client, admin_headers, q=token, city="münchen")
+    assert {a["id"] for a in data["items"]} == {max_id, jan_id}
+
+    # Preisspanne überlappt: 800–1300 trifft Max (600–900) und Mia (1200–2000)
+    data = _search(client, admin_headers, q=token, price_min=800, price_max=1300)
+    assert {a["id"] for a in data["items"]} == {max_id, mia_id}
+
+
+def test_pagination_and_trigger_sync(client, admin_headers, seeded):
+    token, (max_id, mia_id, jan_id) = seeded
+    first = _search(client, admin_headers, q=token, per_page=2, page=1)
+    second = _search(client, admin_headers, q=token, per_page=2, page=2)
+    assert first["total"] == second["total"] == 3
+    assert len(first["items"]) == 2 and len(second["items"]) == 1
+    assert {a["id"] for a in first["items"] + second["items"]} == {max_id, mia_id, jan_id}
+
+    # Umbenennen und Disziplinwechsel landen über die Trigger im Index
+    mia = db.session.get(Artist, mia_id)
+    mia.name = "Illusionistin Mia"
+    mia.disciplines = [_discipline("Akrobatik")]
+    db.session.commit()
+    assert [a["id"] for a in _search(client, admin_headers, q=f"{token} illusion")["items"]] == [mia_id]
+    assert _search(client, admin_headers, q=f"{token} akrobatik")["total"] == 1
+    assert _search(client, admin_headers, q=f"{token} zauberer")["total"] == 0
+
+    db.session.delete(mia)
+    db.session.commit()
+    assert _search(client, admin_headers, q=token)["total"] == 2
+
+
+def test_search_validation_and_admin_only(client, admin_headers, user_headers):
+    resp = client.get("/admin/artists/search?status=unknown", headers=admin_headers)
+    assert resp.status_code == 400
+    resp = client.get("/admin/artists/search?price_min=abc", headers=admin_headers)
+    assert resp.status_code == 400
+    resp = client.get("/admin/artists/search?q=x", headers=user_headers)
+    assert resp.status_code == 403
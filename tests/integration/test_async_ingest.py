@@ -0,0 +1,173 @@
+# tests/integration/test_async_ingest.py
+"""Asynchrone Anlage von Buchungsanfragen: 202 + Status-URL, Worker übernimmt Matching & Preis."""
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from models import db, Artist, Availability, BookingRequest, Discipline
+from routes import request_routes
+from services.booking_ingest import ingest_queue
+from tests.conftest import unique_email
+
+
+@pytest.fixture
+def async_mode(app, monkeypatch):
+    monkeypatch.setitem(app.config, "BOOKING_INGEST_MODE", "async")
+    monkeypatch.setitem(app.config, "BOOKING_INGEST_EAGER", True)
+    # kein Nominatim im Test
+    monkeypatch.setattr("managers.booking_requests_manager.geocode_address", lambda addr: None)
+
+
+def _seed_available_artist(event_date):
+    disc = Discipline.query.filter_by(name="Zauberer").first() or Discipline(name="Zauberer")
+    artist = Artist(
+        name="Async Artist",
+        email=unique_email("async"),
+        supabase_user_id="async-" + uuid.uuid4().hex[:10],
+        approval_status="approved",
+        address="Musterstr. 2, 80331 München",
+        price_min=600,
+        price_max=800,
+    )
+    artist.disciplines = [disc]
+    db.session.add(artist)
+    db.session.flush()
+    db.session.add(Availability(artist_id=artist.id, date=event_date))
+    db.session.commit()
+    return artist
+
+
+def _payload(event_date):
+    return {
+        "client_name": "Async Client",
+        "client_email": unique_email("async-client"),
+        "event_date": event_date.isoformat(),
+        "event_time": "19:00",
+        "duration_minutes": 15,
+        "event_type": "Firmenfeier",
+        "number_of_guests": 80,
+        "event_address": "Marienplatz 1, München",
+        "show_type": "Bühnen Show",
+        "team_size": "solo",
+        "disciplines": ["Zauberer"],
+    }
+
+
+def _headers():
+    return {"X-Forwarded-For": f"10.29.{uuid.uuid4().int % 250}.{uuid.uuid4().int % 250}"}
+
+
+def test_async_create_returns_202_and_worker_prices(client, async_mode):
+    event_date = date.today() + timedelta(days=40)
+    artist = _seed_available_artist(event_date)
+
+    resp = client.post("/api/requests/requests", json=_payload(event_date), headers=_headers())
+    assert resp.status_code == 202
+    body = resp.get_json()
+    assert body["status_url"].startswith(f"/api/requests/requests/{body['request_id']}/status?key=")
+    assert resp.headers["Location"] == body["status_url"]
+
+    status = client.get(body["status_url"]).get_json()
+    assert status["processing_status"] == "done"
+    assert status["price_min"] is not None
+    assert artist.id in [a["id"] for a in status["matched_artists"]]
+
+
+def test_async_request_stays_pending_until_worker_runs(app, client, async_mode, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(ingest_queue, "submit", lambda fn, req_id: submitted.append(req_id))
+    event_date = date.today() + timedelta(days=41)
+    _seed_available_artist(event_date)
+
+    resp = client.post("/api/requests/requests", json=_payload(event_date), headers=_headers())
+    req_id = resp.get_json()["request_id"]
+    assert submitted == [req_id]
+    assert client.get(resp.headers["Location"]).get_json()["processing_status"] == "pending"
+
+    request_routes.process_booking_request(req_id)
+    req = db.session.get(BookingRequest, req_id)
+    assert req.processing_status == "done"
+    assert len(req.artists) == 1
+
+
+def test_status_unknown_request_returns_404(client):
+    assert client.get("/api/requests/requests/987654/status?key=abc").status_code == 404
+
+
+def test_status_needs_the_key_from_the_202(client, async_mode):
+    event_date = date.today() + timedelta(days=44)
+    _seed_available_artist(event_date)
+    resp = client.post("/api/requests/requests", json=_payload(event_date), headers=_headers())
+    req_id = resp.get_json()["request_id"]
+
+    # fortlaufende IDs durchprobieren bringt nichts: ohne/mit falschem Schlüssel wie nicht vorhanden
+    assert client.get(f"/api/requests/requests/{req_id}/status").status_code == 404
+    assert client.get(f"/api/requests/requests/{req_id}/status?key=geraten").status_code == 404
+    assert client.get(resp.headers["Location"]).status_code == 200
+    # in der DB liegt nur der Hash
+    key = resp.headers["Location"].split("key=", 1)[1]
+    assert key not in (db.session.get(BookingRequest, req_id).status_key_hash or "")
+
+
+def test_worker_claims_request_once(app, client, async_mode, monkeypatch):
+    submitted, mailed = [], []
+    monkeypatch.setattr(ingest_queue, "submit", lambda fn, req_id: submitted.append(req_id))
+    monkeypatch.setattr(request_routes, "_notify_matched_artists", lambda req, artists: mailed.append(req.id))
+    event_date = date.today() + timedelta(days=42)
+    _seed_available_artist(event_date)
+    req_id = client.post("/api/requests/requests", json=_payload(event_date), headers=_headers()).get_json()["request_id"]
+
+    # anderer Worker hat die Anfrage gerade beansprucht -> kein zweiter Lauf
+    assert request_routes.request_mgr.claim_for_processing(req_id, timedelta(minutes=10))
+    assert request_routes.process_booking_request(req_id) is None
+    assert mailed == []
+
+    # verwaist (Worker abgestürzt): nach dem Timeout wird neu übernommen, danach nie wieder
+    db.session.execute(update(BookingRequest).where(BookingRequest.id == req_id)
+                       .values(updated_at=datetime.utcnow() - timedelta(hours=1)))
+    db.session.commit()
+    assert request_routes.process_booking_request(req_id) is not None
+    assert request_routes.process_booking_request(req_id) is None
+    assert mailed == [req_id]
+
+
+def test_scheduled_requeue_processes_stale_pending_request(app, client, async_mode, monkeypatch):
+    from cron_jobs.tasks import requeue_pending_requests
+    event_date = date.today() + timedelta(days=43)
+    _seed_available_artist(event_date)
+    with monkeypatch.context() as m:
+        # Worker "abgestürzt": Anfrage bleibt pending
+        m.setattr(ingest_queue, "submit", lambda fn, req_id: None)
+        req_id = client.post("/api/requests/requests", json=_payload(event_date), headers=_headers()).get_json()["request_id"]
+    db.session.execute(update(BookingRequest).where(BookingRequest.id == req_id)
+                       .values(updated_at=datetime.utcnow() - timedelta(minutes=10)))
+    db.session.commit()
+
+    assert requeue_pending_requests({})["requeued"] >= 1
+    req = db.session.get(BookingRequest, req_id)
+    assert req.processing_status == "done" and req.price_min is not None
+
+
+def test_status_and_mails_use_the_team_chosen_at_pricing(app, client, async_mode, monkeypatch):
+    sent = []
+    monkeypatch.setattr(request_routes, "send_email", lambda to, *a, **kw: sent.append(to) or True)
+    event_date = date.today() + timedelta(days=4100 + uuid.uuid4().int % 300)
+    artists = [_seed_available_artist(event_date) for _ in range(3)]
+    for artist, gage in zip(artists, (900, 500, 700)):
+        artist.price_min = artist.price_max = gage
+    db.session.commit()
+
+    resp = client.post("/api/requests/requests", json=dict(_payload(event_date), team_size="duo"), headers=_headers())
+    req = db.session.get(BookingRequest, resp.get_json()["request_id"])
+    team_ids = sorted(a.id for a in artists[1:])
+    assert sorted(req.team_artist_ids) == team_ids
+    assert sorted(sent) == sorted(a.email for a in artists[1:])
+
+    # Polling optimiert/geocodiert nicht erneut, sondern liefert das gespeicherte Team
+    monkeypatch.setattr(request_routes, "_select_team", lambda *a, **kw: pytest.fail("status must not re-select"))
+    status = client.get(resp.headers["Location"]).get_json()
+    assert sorted(m["id"] for m in status["team"]) == team_ids
+    assert (status["duo_price_min"], status["duo_price_max"]) == (1200, 1200)
+    assert status["team_missing_disciplines"] == []
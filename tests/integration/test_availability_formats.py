@@ -0,0 +1,180 @@
+# tests/integration/test_availability_formats.py
+"""Kompakte Availability-Formate (ranges/bitmap/recurrence) für GET, POST und PUT."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from managers.availability_manager import AvailabilityManager
+from models import Artist, Availability, db
+
+
+@pytest.fixture
+def artist_headers(app, artist_approved):
+    uid = db.session.get(Artist, artist_approved).supabase_user_id
+    with app.app_context():
+        token = create_access_token(identity=uid)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _dates(artist_id):
+    return {a.date for a in Availability.query.filter_by(artist_id=artist_id)}
+
+
+def test_post_ranges_and_recurrence_bulk_insert(client, artist_headers, artist_approved, count_queries):
+    start = date.today() + timedelta(days=10)
+    body = {
+        "ranges": [{"from": start.isoformat(), "to": (start + timedelta(days=29)).isoformat()}],
+        "recurrence": {"from": start.isoformat(), "to": (start + timedelta(days=89)).isoformat(),
+                       "weekdays": ["sat", "sun"]},
+    }
+    with count_queries() as qc:
+        resp = client.post("/api/availability", json=body, headers=artist_headers)
+    assert resp.status_code == 201
+    added = resp.get_json()["added"]
+    assert added == len(_dates(artist_approved)) > 30
+    # Auth-Lookup + 1 SELECT vorhandener Tage + Bulk-Insert – unabhängig von der Anzahl Tage
+    assert qc.count < 10
+
+    again = client.post("/api/availability", json=body, headers=artist_headers).get_json()
+    assert again == {"added": 0, "skipped": added}
+
+
+def test_get_ranges_and_bitmap(client, artist_headers, artist_approved):
+    start = date.today() + timedelta(days=5)
+    client.post("/api/availability", headers=artist_headers, json={"ranges": [
+        {"from": start.isoformat(), "to": (start + timedelta(days=2)).isoformat()},
+        {"from": (start + timedelta(days=7)).isoformat(), "to": (start + timedelta(days=7)).isoformat()},
+    ]})
+
+    ranges = client.get("/api/availability?format=ranges", headers=artist_headers).get_json()
+    assert ranges["ranges"] == [
+        {"from": start.isoformat(), "to": (start + timedelta(days=2)).isoformat()},
+        {"from": (start + timedelta(days=7)).isoformat(), "to": (start + timedelta(days=7)).isoformat()},
+    ]
+
+    bitmap = client.get("/api/availability", headers=dict(
+        artist_headers, Accept="application/vnd.pepe.availability.bitmap+json")).get_json()
+    assert bitmap["format"] == "bitmap"
+    assert bitmap["start"] == start.isoformat() and bitmap["days"] == 8
+
+    assert client.get("/api/availability?format=xml", headers=artist_headers).status_code == 400
+
+
+def test_put_replaces_with_compact_target_set(client, artist_headers, artist_approved):
+    start = date.today() + timedelta(days=3)
+    client.post("/api/availability", headers=artist_headers,
+                json={"ranges": [{"from": start.isoformat(), "to": (start + timedelta(days=9)).isoformat()}]})
+
+    keep = {"from": (start + timedelta(days=5)).isoformat(), "to": (start + timedelta(days=14)).isoformat()}
+    resp = client.put("/api/availability", json={"ranges": [keep]}, headers=artist_headers)
+    assert resp.status_code == 200
+    result = resp.get_json()
+    assert len(result["added"]) == 5 and len(result["removed"]) == 5
+    assert _dates(artist_approved) == {start + timedelta(days=i) for i in range(5, 15)}
+
+
+@pytest.mark.parametrize("method", ["post", "put"])
+@pytest.mark.parametrize("body", [
+    {"bitmap": "/w==", "start": "2031-01-01", "days": "viele"},
+    {"bitmap": "/w==", "start": "2031-01-01", "days": -3},
+    {"bitmap": "/w==", "start": "2031-01-01", "days": 30},
+    {"bitmap": 255, "start": "2031-01-01"},
+])
+def test_write_rejects_bad_bitmap_or_days(client, artist_headers, artist_approved, method, body):
+    before = _dates(artist_approved)
+    resp = getattr(client, method)("/api/availability", json=body, headers=artist_headers)
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "bad_request"
+    assert _dates(artist_approved) == before
+
+
+def test_etag_distinguishes_format_and_purge_horizon(client, artist_headers, artist_approved):
+    db.session.add(Availability(artist_id=artist_approved, date=date.today() - timedelta(days=3)))
+    db.session.commit()
+    days = client.get("/api/availability", headers=artist_headers)
+    ranges = client.get("/api/availability?format=ranges", headers=artist_headers)
+    assert days.headers["ETag"] != ranges.headers["ETag"]
+    assert "Accept" in days.headers["Vary"] and "Accept" in ranges.headers["Vary"]
+
+    # ETag eines anderen Formats darf keinen 304 auslösen, das eigene schon
+    cross = client.get("/api/availability", headers=dict(artist_headers, **{"If-None-Match": ranges.headers["ETag"]}))
+    assert cross.status_code == 200 and isinstance(cross.get_json(), list)
+    same = client.get("/api/availability", headers=dict(artist_headers, **{"If-None-Match": days.headers["ETag"]}))
+    assert same.status_code == 304
+
+    # purge_past ändert den Body ohne neue Version -> neuer Validator
+    AvailabilityManager().purge_past(date.today())
+    purged = client.get("/api/availability", headers=dict(artist_headers, **{"If-None-Match": days.headers["ETag"]}))
+    assert purged.status_code == 200
+    assert purged.headers["X-Availability-Version"] == days.headers["X-Availability-Version"]
+    assert purged.headers["ETag"] != days.headers["ETag"]
+
+
+def test_delta_sync_since_version(client, artist_headers, artist_approved):
+    start = date.today() + timedelta(days=30)
+    base = client.get("/api/availability", headers=artist_headers)
+    v0 = int(base.headers["X-Availability-Version"])
+
+    assert client.get(f"/api/availability?since={v0}", headers=artist_headers).status_code == 304
+
+    client.post("/api/availability", json={"date": start.isoformat()}, headers=artist_headers)
+    client.put("/api/availability", headers=artist_headers, json={"dates": [
+        start.isoformat(), (start + timedelta(days=1)).isoformat(), (start + timedelta(days=2)).isoformat(),
+    ]})
+    slot_id = next(a.id for a in Availability.query.filter_by(artist_id=artist_approved, date=start + timedelta(days=2)))
+    client.delete(f"/api/availability/{slot_id}", headers=artist_headers)
+
+    delta = client.get(f"/api/availability?since={v0}", headers=artist_headers)
+    assert delta.status_code == 200
+    body = delta.get_json()
+    assert body["version"] == v0 + 3 and body["reset"] is False
+    # Tag +2 wurde hinzugefügt und wieder entfernt -> taucht nicht auf
+    assert body["added"] == [start.isoformat(), (start + timedelta(days=1)).isoformat()]
+    assert body["removed"] == []
+    assert delta.headers["X-Availability-Version"] == str(v0 + 3)
+
+    assert client.get(f"/api/availability?since={v0 + 3}", headers=artist_headers).status_code == 304
+    # Version aus der "Zukunft" (z. B. nach DB-Restore): kein 304, sondern vollständiger Stand
+    ahead = client.get(f"/api/availability?since={v0 + 10}", headers=artist_headers)
+    assert ahead.status_code == 200
+    assert ahead.get_json()["reset"] is True and start.isoformat() in ahead.get_json()["added"]
+
+
+def test_delta_sync_resets_when_log_gap(client, artist_headers, artist_approved):
+    from models import AvailabilityChange
+    client.post("/api/availability", json={"date": (date.today() + timedelta(days=60)).isoformat()},
+                headers=artist_headers)
+    AvailabilityChange.query.filter_by(artist_id=artist_approved).delete()
+    db.session.commit()
+
+    body = client.get("/api/availability?since=0", headers=artist_headers).get_json()
+    assert body["reset"] is True
+    assert (date.today() + timedelta(days=60)).isoformat() in body["added"]
+
+
+def test_prune_changes_drops_whole_old_versions(client, artist_headers, artist_approved):
+    from models import AvailabilityChange
+    from services.retention import retention
+    day = date.today() + timedelta(days=70)
+    v0 = int(client.get("/api/availability", headers=artist_headers).headers["X-Availability-Version"])
+    client.post("/api/availability", headers=artist_headers,
+                json={"ranges": [{"from": day.isoformat(), "to": (day + timedelta(days=2)).isoformat()}]})
+    v1 = v0 + 1
+    client.post("/api/availability", json={"date": (day + timedelta(days=5)).isoformat()}, headers=artist_headers)
+
+    # Version v1 liegt 40 Tage zurück, nur eine ihrer Zeilen knapp vor der Grenze
+    old = AvailabilityChange.query.filter_by(artist_id=artist_approved, version=v1).order_by(AvailabilityChange.id)
+    first = old.first()
+    first.created_at = datetime.utcnow() - timedelta(days=40)
+    db.session.commit()
+
+    assert retention.prune_availability_changes()["deleted"] >= 3
+    assert old.count() == 0
+    assert AvailabilityChange.query.filter_by(artist_id=artist_approved, version=v1 + 1).count() == 1
+
+    # since vor der Bereinigung -> Reset-Snapshot, danach weiter Delta
+    reset = client.get(f"/api/availability?since={v0}", headers=artist_headers).get_json()
+    assert reset["reset"] is True and day.isoformat() in reset["added"]
+    delta = client.get(f"/api/availability?since={v1}", headers=artist_headers).get_json()
+    assert delta["reset"] is False and delta["added"] == [(day + timedelta(days=5)).isoformat()]
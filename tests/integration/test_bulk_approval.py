@@ -0,0 +1,149 @@
+# tests/integration/test_bulk_approval.py
+"""Sammel-Freigabe: Status per UPDATE, Verfügbarkeiten als pollbarer Hintergrund-Job."""
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, inspect, select
+
+from models import db, Artist, Availability, BackgroundJob
+from services.background_jobs import job_queue
+from tests.conftest import unique_email
+
+
+@pytest.fixture
+def eager_jobs(app, monkeypatch):
+    monkeypatch.setitem(app.config, "BACKGROUND_JOBS_EAGER", True)
+
+
+def _pending(n):
+    artists = [
+        Artist(name=f"Bulk {i}", email=unique_email("bulk"), approval_status="pending",
+               supabase_user_id="bulk-" + uuid.uuid4().hex[:10])
+        for i in range(n)
+    ]
+    db.session.add_all(artists)
+    db.session.commit()
+    return [a.id for a in artists]
+
+
+def _slots(artist_ids):
+    return dict(db.session.execute(
+        select(Availability.artist_id, func.count(Availability.id))
+        .where(Availability.artist_id.in_(artist_ids))
+        .group_by(Availability.artist_id)
+    ).all())
+
+
+def test_bulk_approve_updates_once_and_fills_availability_in_job(client, admin_headers, eager_jobs, count_queries):
+    ids = _pending(3)
+    # ein Tag existiert bereits -> der Job füllt nur die Lücken
+    db.session.add(Availability(artist_id=ids[0], date=date.today() + timedelta(days=3)))
+    db.session.commit()
+    already = _pending(1)[0]
+    client.post("/admin/artists/bulk-approval", headers=admin_headers, json={"action": "approve", "ids": [already]})
+
+    with count_queries() as qc:
+        resp = client.post(
+            "/admin/artists/bulk-approval", headers=admin_headers,
+            json={"action": "approve", "ids": ids + [already, 10 ** 9]},
+        )
+    assert resp.status_code == 202, resp.get_json()
+    body = resp.get_json()
+    assert body["updated"] == ids
+    assert body["unchanged"] == [already]
+    assert body["not_found"] == [10 ** 9]
+    assert resp.headers["Location"] == f"/admin/jobs/{body['job_id']}"
+    updates = [s for s in qc.statements if s.lstrip().upper().startswith("UPDATE ARTISTS SET APPROVAL_STATUS")]
+    assert len(updates) == 1
+
+    db.session.expire_all()
+    assert {db.session.get(Artist, i).approval_status for i in ids} == {"approved"}
+    assert _slots(ids) == {i: 365 for i in ids}
+
+    job = client.get(f"/admin/jobs/{body['job_id']}", headers=admin_headers).get_json()
+    assert job["status"] == "done"
+    assert job["kind"] == "availability.fill"
+    assert job["result"] == {"artists": 3, "added": 3 * 365 - 1, "skipped": 1}
+    assert job["finished_at"] is not None
+
+
+def test_bulk_reject_and_validation(client, admin_headers, user_headers, eager_jobs):
+    ids = _pending(2)
+    resp = client.post("/admin/artists/bulk-approval", headers=admin_headers,
+                       json={"action": "reject", "ids": ids, "reason": "Profil unvollständig"})
+    assert resp.status_code == 200
+    assert resp.get_json()["job_id"] is None
+    db.session.expire_all()
+    rows = [db.session.get(Artist, i) for i in ids]
+    assert {(a.approval_status, a.rejection_reason) for a in rows} == {("rejected", "Profil unvollständig")}
+    assert _slots(ids) == {}
+
+    # gleiche Begründung -> unverändert; neue Begründung -> aktualisiert
+    again = client.post("/admin/artists/bulk-approval", headers=admin_headers,
+                        json={"action": "reject", "ids": ids, "reason": "Profil unvollständig"}).get_json()
+    assert again["updated"] == [] and again["unchanged"] == ids
+    other = client.post("/admin/artists/bulk-approval", headers=admin_headers,
+                        json={"action": "reject", "ids": ids[:1], "reason": "Fotos fehlen"}).get_json()
+    assert other["updated"] == ids[:1]
+    # leerer Grund wird NULL (wie ohne Grund), nicht ''
+    blank = client.post("/admin/artists/bulk-approval", headers=admin_headers,
+                        json={"action": "reject", "ids": ids[:1], "reason": "   "}).get_json()
+    assert blank["updated"] == ids[:1]
+    db.session.expire_all()
+    assert db.session.get(Artist, ids[0]).rejection_reason is None
+
+    for body in ({"action": "approve"}, {"action": "delete", "ids": ids}, {"action": "approve", "ids": ["x"]}):
+        assert client.post("/admin/artists/bulk-approval", headers=admin_headers, json=body).status_code == 400
+    assert client.post("/admin/artists/bulk-approval", headers=user_headers,
+                       json={"action": "approve", "ids": ids}).status_code == 403
+    assert client.get("/admin/jobs/999999999", headers=admin_headers).status_code == 404
+
+
+def test_failing_job_does_not_raise_and_runs_once(app, eager_jobs):
+    calls = []
+
+    def boom(payload):
+        calls.append(payload)
+        raise RuntimeError("kaputt")
+
+    job_queue.register("test.boom", boom)
+    # Fehler landen am Job (status=failed), nicht beim Aufrufer
+    job = job_queue.enqueue("test.boom", {"x": 1})
+    # bereits beanspruchte Jobs laufen nicht erneut (Identität ohne Refresh: der Test-Rollback verwirft die Zeile)
+    job_queue.run(inspect(job).identity[0])
+    assert calls == [{"x": 1}]
+
+    with pytest.raises(KeyError):
+        job_queue.enqueue("test.unknown")
+
+
+def test_requeue_stale_reruns_queued_and_fails_timed_out_running_jobs(app, eager_jobs):
+    calls = []
+    job_queue.register("test.quick", lambda payload: calls.append(payload) or {"ok": True}, timeout_seconds=60)
+    job_queue.register("test.default_timeout", lambda payload: {"ok": True})
+    now = datetime.utcnow()
+    jobs = {
+        # liegengeblieben (Worker-Neustart vor dem Start) -> neu einreihen
+        "lost": BackgroundJob(kind="test.quick", status="queued", payload={"n": 1}, created_at=now - timedelta(hours=1)),
+        # läuft länger als das Timeout seiner Art -> fehlgeschlagen, nicht erneut ausführen
+        "hung": BackgroundJob(kind="test.quick", status="running", payload={"n": 2},
+                              created_at=now - timedelta(minutes=11), started_at=now - timedelta(minutes=10)),
+        # alte Anlage, aber eben erst gestartet: created_at zählt nicht
+        "busy": BackgroundJob(kind="test.quick", status="running", payload={"n": 3},
+                              created_at=now - timedelta(hours=2), started_at=now - timedelta(seconds=10)),
+        # Standard-Timeout (BACKGROUND_JOBS_TIMEOUT_SECONDS) noch nicht erreicht
+        "long": BackgroundJob(kind="test.default_timeout", status="running",
+                              created_at=now - timedelta(hours=1), started_at=now - timedelta(minutes=10)),
+    }
+    db.session.add_all(jobs.values())
+    db.session.commit()
+    ids = {name: job.id for name, job in jobs.items()}
+
+    result = job_queue.requeue_stale(older_than=timedelta(minutes=30))
+    assert result["requeued"] >= 1 and result["timed_out"] >= 1
+    db.session.expire_all()
+    status = {name: db.session.get(BackgroundJob, job_id).status for name, job_id in ids.items()}
+    assert status == {"lost": "done", "hung": "failed", "busy": "running", "long": "running"}
+    assert calls == [{"n": 1}]
+    assert "timed out" in db.session.get(BackgroundJob, ids["hung"]).error
@@ -0,0 +1,102 @@
+# tests/integration/test_map_clusters.py
+"""Admin-Karte: Grid-Cluster in SQL mit Anzahl je Status, einzelne Punkte erst bei hohem Zoom."""
+import itertools
+import uuid
+from datetime import date
+
+import pytest
+
+from models import db, Artist, BookingRequest
+from services.map_clusters import map_clusters
+from tests.conftest import unique_email
+
+_AREAS = itertools.count()
+
+
+@pytest.fixture
+def area():
+    """Eigener, sonst leerer Kartenausschnitt (Südpazifik), damit andere Tests nicht mitzählen.
+    Am Zoom-5-Raster ausgerichtet, damit dicht beieinander liegende Punkte nicht auf zwei Zellen fallen."""
+    size = map_clusters.cell_size(5)
+    # je Test eine andere Zelle, mit Abstand für den Ausreißer (+3°) und die ±5°-Box
+    lon = -180 + (int(20 / size) + 5 * next(_AREAS) + 0.2) * size
+    return -90 + (int(30 / size) + 0.2) * size, lon
+
+
+def _request(lat, lon, status="angefragt"):
+    req = BookingRequest(
+        client_name="Kunde", client_email=unique_email("map"), event_type="Firmenfeier",
+        show_type="Bühnenshow", show_discipline="Zauberer", team_size="1", event_date=date(2030, 1, 1),
+        duration_minutes=20, event_lat=lat, event_lon=lon, status=status,
+    )
+    db.session.add(req)
+    return req
+
+
+def _artist(lat, lon, status="approved"):
+    artist = Artist(name="Karte", email=unique_email("map"), lat=lat, lon=lon, approval_status=status,
+                    supabase_user_id="map-" + uuid.uuid4().hex[:10])
+    db.session.add(artist)
+    return artist
+
+
+def _bbox(lat, lon, d):
+    return f"{lon - d},{lat - d},{lon + d},{lat + d}"
+
+
+def test_low_zoom_returns_clusters_with_status_counts(client, admin_headers, user_headers, area, count_queries):
+    lat, lon = area
+    for i in range(30):
+        _request(lat + i * 0.001, lon + i * 0.001, status="akzeptiert" if i % 3 == 0 else "angefragt")
+    _request(lat + 3.0, lon + 3.0)  # weit weg -> eigener Cluster
+    _artist(lat, lon)
+    _artist(lat + 0.01, lon, status="pending")
+    db.session.commit()
+
+    with count_queries() as qc:
+        resp = client.get(f"/admin/map/clusters?bbox={_bbox(lat, lon, 5)}&zoom=5", headers=admin_headers)
+    assert resp.status_code == 200, resp.get_json()
+    # eine GROUP-BY-Query je Ebene
+    assert sum("GROUP BY" in s for s in qc.statements) == 2
+    layers = resp.get_json()["layers"]
+
+    requests = layers["requests"]
+    assert requests["total"] == 31 and requests["points"] == []
+    big, small = requests["clusters"]
+    assert big["count"] == 30 and big["by_status"] == {"akzeptiert": 10, "angefragt": 20}
+    assert small["count"] == 1
+    assert big["bounds"][0] == pytest.approx(lon) and big["bounds"][3] == pytest.approx(lat + 0.029)
+    assert lat < big["lat"] < lat + 0.029
+
+    artists = layers["artists"]
+    assert [c["by_status"] for c in artists["clusters"]] == [{"approved": 1, "pending": 1}]
+
+    only = client.get(f"/admin/map/clusters?bbox={_bbox(lat, lon, 5)}&zoom=5&layers=artists",
+                      headers=admin_headers).get_json()
+    assert list(only["layers"]) == ["artists"]
+    assert client.get(f"/admin/map/clusters?bbox={_bbox(lat, lon, 5)}&zoom=5", headers=user_headers).status_code == 403
+
+
+def test_high_zoom_returns_points_unless_too_many(client, admin_headers, area, monkeypatch):
+    lat, lon = area
+    reqs = [_request(lat + i * 0.0001, lon) for i in range(3)]
+    _request(lat + 1.0, lon)  # außerhalb des Ausschnitts
+    db.session.commit()
+    url = f"/admin/map/clusters?bbox={_bbox(lat, lon, 0.01)}&zoom=16&layers=requests"
+
+    layer = client.get(url, headers=admin_headers).get_json()["layers"]["requests"]
+    assert layer["clusters"] == []
+    assert [p["id"] for p in layer["points"]] == [r.id for r in reqs]
+    assert layer["points"][0] == {"id": reqs[0].id, "lat": lat, "lon": lon, "status": "angefragt", "label": "Firmenfeier"}
+
+    monkeypatch.setattr(map_clusters, "max_points", 2)
+    layer = client.get(url, headers=admin_headers).get_json()["layers"]["requests"]
+    assert layer["points"] == [] and sum(c["count"] for c in layer["clusters"]) == 3
+
+
+@pytest.mark.parametrize("query", [
+    "zoom=5", "bbox=1,2,3&zoom=5", "bbox=10,0,5,1&zoom=5", "bbox=0,0,1,1", "bbox=0,0,1,1&zoom=30",
+    "bbox=0,0,1,1&zoom=5&layers=invoices",
+])
+def test_validation(client, admin_headers, query):
+    assert client.get(f"/admin/map/clusters?{query}", headers=admin_headers).status_code == 400
@@ -0,0 +1,254 @@
+# tests/integration/test_price_quote.py
+"""Preis-Quote: gleiche Preise wie die echte Anlage, aber ohne Seiteneffekte und mit Memo."""
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+from managers.artist_manager import ArtistManager
+from models import db, Artist, Availability, BookingRequest, Discipline
+from routes import request_routes
+from services import geo
+from services.geo import clear_geocode_cache
+from services.quotes import quote_cache
+from tests.conftest import unique_email
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    quote_cache.clear()
+    clear_geocode_cache()
+    monkeypatch.setattr(request_routes, "_rate_limit_hits", {})
+    monkeypatch.setattr(request_routes, "_quote_buckets", {})
+    monkeypatch.setattr("managers.booking_requests_manager.geocode_address", lambda addr: None)
+    sent = []
+    monkeypatch.setattr(request_routes, "send_email", lambda *a, **kw: sent.append(a) or True)
+    yield sent
+    quote_cache.clear()
+
+
+def _seed(event_date):
+    disc = Discipline.query.filter_by(name="Zauberer").first() or Discipline(name="Zauberer")
+    artist = Artist(
+        name="Quote Artist",
+        email=unique_email("quote"),
+        supabase_user_id="quote-" + uuid.uuid4().hex[:10],
+        approval_status="approved",
+        address="Musterstr. 2, 80331 München",
+        price_min=600,
+        price_max=900,
+    )
+    artist.disciplines = [disc]
+    db.session.add(artist)
+    db.session.flush()
+    db.session.add(Availability(artist_id=artist.id, date=event_date))
+    db.session.commit()
+
+
+def _form(event_date, **overrides):
+    data = {
+        "event_date": event_date.isoformat(),
+        "event_type": "Firmenfeier",
+        "number_of_guests": 120,
+        "duration_minutes": 20,
+        "event_address": "Marienplatz 1, München",
+        "team_size": "solo",
+        "disciplines": ["Zauberer"],
+    }
+    data.update(overrides)
+    return data
+
+
+def _event_date(slot):
+    """Fester Termin je Test: 100 Tage Abstand > Alternativ-Fenster (±30) + Seed-Offsets, keine Überschneidungen."""
+    return date.today() + timedelta(days=400 + 100 * slot)
+
+
+def test_quote_matches_created_request_without_side_effects(client, _isolated):
+    event_date = _event_date(1)
+    _seed(event_date)
+    before = BookingRequest.query.count()
+
+    quote = client.post("/api/requests/quote", json=_form(event_date))
+    assert quote.status_code == 200
+    body = quote.get_json()
+    assert body["num_available_artists"] == 1
+    assert body["price_min"] and body["price_max"]
+    assert BookingRequest.query.count() == before
+    assert _isolated == []
+
+    created = client.post(
+        "/api/requests/requests",
+        json=dict(_form(event_date), client_name="Q", client_email=unique_email("q"),
+                  event_time="19:00", show_type="Bühnen Show"),
+        headers={"X-Forwarded-For": f"10.37.{uuid.uuid4().int % 250}.1"},
+    )
+    assert created.status_code == 201
+    assert (created.get_json()["price_min"], created.get_json()["price_max"]) == (body["price_min"], body["price_max"])
+
+
+def test_repeated_quote_is_served_from_memo_without_queries(client, count_queries):
+    event_date = _event_date(2)
+    _seed(event_date)
+    first = client.post("/api/requests/quote", json=_form(event_date))
+    assert first.headers["X-Quote-Cache"] == "miss"
+
+    # gleiche preisrelevante Eingaben, nur anders geschrieben
+    same = _form(event_date, event_address="  marienplatz 1,   MÜNCHEN ", disciplines=["zauberer "],
+                 client_name="ignoriert")
+    with count_queries(limit=0):
+        second = client.post("/api/requests/quote", json=same)
+    assert second.headers["X-Quote-Cache"] == "hit"
+    assert second.get_json()["cached"] is True
+    assert second.get_json()["price_min"] == first.get_json()["price_min"]
+
+    changed = client.post("/api/requests/quote", json=_form(event_date, number_of_guests=600))
+    assert changed.headers["X-Quote-Cache"] == "miss"
+
+
+def test_quote_validation(client):
+    assert client.post("/api/requests/quote", json={"event_type": "Firmenfeier"}).status_code == 400
+    bad_type = _form(_event_date(3), event_type="Hochzeit")
+    assert client.post("/api/requests/quote", json=bad_type).status_code == 400
+
+
+def test_group_quote_returns_optimized_priced_team(client):
+    event_date = _event_date(4)
+    disciplines = {}
+    for name in ("Zauberer", "Jonglage"):
+        disciplines[name] = Discipline.query.filter_by(name=name).first() or Discipline(name=name)
+    # (Disziplin, Gage): die günstigste Kombination mit beiden Disziplinen ist 500 + 700 + 800
+    for disc, gage in (("Zauberer", 500), ("Zauberer", 800), ("Zauberer", 1500), ("Jonglage", 700), ("Jonglage", 2500)):
+        artist = Artist(
+            name=f"Group {disc} {gage}",
+            email=unique_email("group"),
+            approval_status="approved",
+            address="Musterstr. 2, 80331 München",
+            price_min=gage,
+            price_max=gage,
+        )
+        artist.disciplines = [disciplines[disc]]
+        db.session.add(artist)
+        db.session.flush()
+        db.session.add(Availability(artist_id=artist.id, date=event_date))
+    db.session.commit()
+
+    resp = client.post("/api/requests/quote", json=_form(
+        event_date, team_size=3, disciplines=["Zauberer", "Jonglage"], event_type="Incentive", number_of_guests=300,
+        duration_minutes=5, is_indoor=True,
+    ))
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    body = resp.get_json()
+    assert "group_pricing_pending" not in body
+    assert sorted(m["price_min"] for m in body["team"]) == [500, 700, 800]
+    assert body["team_missing_disciplines"] == []
+    # feste Gagen: Event/Gäste ×1.0, Agenturgebühr 20 % auf die Summe, keine Fahrtkosten, München-Rabatt
+    weekend_min, weekend_max = (1.05, 1.15) if event_date.weekday() >= 5 else (1.0, 1.0)
+    assert (body["price_min"], body["price_max"]) == (
+        int(2000 * weekend_min * 1.2 - 100), int(2000 * weekend_max * 1.2 - 100)
+    )
+
+
+def test_quote_without_free_artists_suggests_nearest_dates(client):
+    event_date = _event_date(5)
+    disc = Discipline.query.filter_by(name="Jonglage").first() or Discipline(name="Jonglage")
+    # zwei Artists frei am Tag +3, einer an -1 und -2 (zu wenig für ein Duo), zwei an -6
+    free_days = {0: [3, -1, -6, 40], 1: [3, -2, -6]}
+    for idx, offsets in free_days.items():
+        artist = Artist(name=f"Alt {idx}", email=unique_email("alt"), approval_status="approved", price_min=500, price_max=700)
+        artist.disciplines = [disc]
+        db.session.add(artist)
+        db.session.flush()
+        db.session.add_all(Availability(artist_id=artist.id, date=event_date + timedelta(days=d)) for d in offsets)
+    db.session.commit()
+
+    body = client.post("/api/requests/quote", json=_form(event_date, team_size="duo", disciplines=["Jonglage"])).get_json()
+    assert body["num_available_artists"] == 0 and body["price_min"] is None
+    suggested = [(a["days_from_requested"], a["available_artists"]) for a in body["alternative_dates"]]
+    assert suggested == [(3, 2), (-6, 2)]
+
+    solo = client.post("/api/requests/quote", json=_form(event_date, disciplines=["Jonglage"])).get_json()
+    assert [a["days_from_requested"] for a in solo["alternative_dates"]] == [-1, -2, 3]
+
+
+def test_travel_distance_prefers_stored_artist_coordinates(monkeypatch):
+    from managers.booking_requests_manager import BookingRequestManager
+    looked_up = []
+
+    def fake_geocode(address):
+        looked_up.append(address)
+        return {"Event": (48.137, 11.575), "Augsburg": (48.371, 10.898)}.get(address)
+
+    monkeypatch.setattr("managers.booking_requests_manager.geocode_address", fake_geocode)
+    stored = Artist(name="Stored", address="Nicht geocodieren", lat=48.137, lon=11.575)
+    without = Artist(name="Ohne Koordinaten", address="Augsburg")
+    km = BookingRequestManager._travel_distance("Event", [stored, without])
+    assert looked_up == ["Event", "Augsburg"]
+    assert 25 < km < 35  # Mittel aus 0 km und ~57 km
+
+
+def test_quote_never_geocodes_and_flags_unknown_event_address(client, monkeypatch):
+    event_date = _event_date(6)
+    _seed(event_date)
+    monkeypatch.setattr(geo.requests, "get", lambda *a, **kw: pytest.fail("quote must not call Nominatim"))
+    monkeypatch.setattr("managers.booking_requests_manager.geocode_address",
+                        lambda addr: pytest.fail("quote must not geocode"))
+
+    body = client.post("/api/requests/quote", json=_form(event_date)).get_json()
+    assert body["distance_estimated"] is True and body["distance_km"] == 0.0
+
+    # Adresse schon einmal geocodiert (z. B. durch eine echte Anfrage): Distanz aus dem Memo
+    with client.application.test_request_context():
+        geo._store_geocode(geo._cache_key("Augsburg, Rathausplatz 1"), (48.369, 10.898))
+        geo._store_geocode(geo._cache_key("Musterstr. 2, 80331 München"), (48.137, 11.575))
+    body = client.post("/api/requests/quote", json=_form(event_date, event_address="Augsburg, Rathausplatz 1")).get_json()
+    assert body["distance_estimated"] is False and body["distance_km"] > 40
+
+
+def test_quote_misses_use_own_token_bucket_per_ip(app, client, monkeypatch):
+    event_date = _event_date(7)
+    _seed(event_date)
+    monkeypatch.setitem(app.config, "QUOTE_RATE_LIMIT_BURST", 8)
+    monkeypatch.setitem(app.config, "QUOTE_RATE_LIMIT_PER_MINUTE", 60)
+    clock = [1_000_000.0]
+    monkeypatch.setattr(request_routes.time, "time", lambda: clock[0])
+    limited = {"X-Forwarded-For": "10.37.250.9"}
+
+    def quote(guests, headers=limited):
+        return client.post("/api/requests/quote", json=_form(event_date, number_of_guests=guests), headers=headers)
+
+    # deutlich mehr Live-Änderungen als das Anlage-Limit (5/Stunde), erst der leere Bucket bremst
+    statuses = [quote(100 + i).status_code for i in range(9)]
+    assert request_routes._RATE_LIMIT_MAX_REQUESTS < 8
+    assert statuses == [200] * 8 + [429]
+    # Memo-Treffer zählen nicht, andere IPs sind nicht betroffen
+    again = quote(100)
+    assert again.status_code == 200 and again.headers["X-Quote-Cache"] == "hit"
+    assert quote(999, {"X-Forwarded-For": "10.37.250.10"}).status_code == 200
+    # 60/min: nach zwei Sekunden sind zwei Tokens nachgefüllt
+    clock[0] += 2
+    assert [quote(200 + i).status_code for i in range(3)] == [200, 200, 429]
+    # das Anlage-Budget bleibt unberührt
+    assert request_routes._rate_limit_hits == {}
+
+
+def test_quote_ignores_unapproved_artists_like_alternative_dates(client):
+    event_date = _event_date(8)
+    disc = Discipline.query.filter_by(name="Jonglage").first() or Discipline(name="Jonglage")
+    # nicht freigegebener Artist am Wunschtag, freigegebener erst zwei Tage später
+    for status, offset in (("pending", 0), ("approved", 2)):
+        artist = Artist(name=f"Freigabe {status}", email=unique_email("approval"), approval_status=status,
+                        price_min=500, price_max=700)
+        artist.disciplines = [disc]
+        db.session.add(artist)
+        db.session.flush()
+        db.session.add(Availability(artist_id=artist.id, date=event_date + timedelta(days=offset)))
+    db.session.commit()
+
+    assert ArtistManager().get_artists_by_discipline(["Jonglage"], event_date) == []
+    assert ArtistManager().available_artist_counts(["Jonglage"], event_date, event_date) == {}
+
+    body = client.post("/api/requests/quote", json=_form(event_date, disciplines=["Jonglage"])).get_json()
+    # Matching und Alternativtermine zählen dieselben (freigegebenen) Artists
+    assert body["num_available_artists"] == 0 and body["price_min"] is None
+    assert [a["days_from_requested"] for a in body["alternative_dates"]] == [2]
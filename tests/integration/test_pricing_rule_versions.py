@@ -0,0 +1,85 @@
+# tests/integration/test_pricing_rule_versions.py
+"""Versionierte Preisregeln: Veröffentlichen, Hot-Swap in anderen Workern, Anfragen behalten ihre Version."""
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from models import db, Artist, PricingRuleSet
+from routes.request_routes import _price_request
+from services.pricing_rules import PricingRuleRegistry, pricing_rules
+from tests.conftest import unique_email
+
+
+@pytest.fixture(autouse=True)
+def _clean_rules():
+    pricing_rules.reset()
+    yield
+    db.session.query(PricingRuleSet).delete()
+    db.session.commit()
+    pricing_rules.reset()
+
+
+def _draft(**overrides):
+    artist = Artist(name="Rules Artist", email=unique_email("rules"), price_min=1000, price_max=1000)
+    values = dict(
+        artists=[artist], event_date=date(2031, 3, 5), event_type="Firmenfeier", event_address="A, 10115 Berlin",
+        number_of_guests=100, duration_minutes=5, show_discipline="Zauberer", is_indoor=True,
+        needs_light=True, needs_sound=False, newsletter_opt_in=False, distance_km=0.0,
+        price_min=None, price_max=None, pricing_version=None,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values), [artist]
+
+
+def test_publish_switches_new_requests_but_keeps_old_versions(app):
+    old_req, artists = _draft()
+    _price_request(old_req, artists, 1)
+    assert old_req.pricing_version == 0
+
+    pricing_rules.publish({"tech_fees": {"light": 1000, "sound": 450}}, note="Licht teurer")
+    new_req, artists = _draft()
+    _price_request(new_req, artists, 1)
+    assert new_req.pricing_version == 1
+    assert new_req.price_min == old_req.price_min + 550
+
+    # erneutes Bepreisen der alten Anfrage nutzt weiterhin Version 0
+    old_min = old_req.price_min
+    _price_request(old_req, artists, 1)
+    assert (old_req.pricing_version, old_req.price_min) == (0, old_min)
+
+
+def test_other_worker_picks_up_new_version(app):
+    other_worker = PricingRuleRegistry(refresh_seconds=0)
+    assert other_worker.current().version == 0
+
+    pricing_rules.publish({"rate_per_km": 0.75})
+    assert other_worker.current().version == 1
+    assert other_worker.current().rate_per_km == 0.75
+
+    lazy_worker = PricingRuleRegistry(refresh_seconds=3600)
+    assert lazy_worker.current().version == 1      # erster Check nach Start
+    pricing_rules.publish({"rate_per_km": 0.8})
+    assert lazy_worker.current().version == 1      # erst nach refresh_seconds
+    assert lazy_worker.refresh() == 2
+    assert lazy_worker.current().rate_per_km == 0.8
+
+
+def test_admin_publish_and_list(client, admin_headers, user_headers):
+    resp = client.post("/admin/pricing/rules", headers=admin_headers,
+                       json={"rules": {"outdoor_factor": 1.3}, "note": "Outdoor"})
+    assert resp.status_code == 201, resp.get_data(as_text=True)
+    assert resp.get_json()["version"] == 1
+
+    resp = client.post("/admin/pricing/rules", headers=admin_headers, json={"rules": {"outdoor_factor": "hoch"}})
+    assert resp.status_code == 400
+
+    body = client.get("/admin/pricing/rules", headers=admin_headers).get_json()
+    assert body["active_version"] == 1 and body["rules"]["outdoor_factor"] == 1.3
+    assert [v["version"] for v in body["versions"]] == [1]
+
+    rollback = client.post("/admin/pricing/rules", headers=admin_headers, json={"base_version": 0, "note": "Rollback"})
+    assert rollback.get_json()["rules"]["outdoor_factor"] == 1.2
+
+    assert client.get("/admin/pricing/rules?version=42", headers=admin_headers).status_code == 404
+    assert client.get("/admin/pricing/rules", headers=user_headers).status_code in (401, 403)
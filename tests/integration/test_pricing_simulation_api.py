@@ -0,0 +1,77 @@
+# tests/integration/test_pricing_simulation_api.py
+from datetime import date
+
+from models import db, Artist, BookingRequest
+from tests.conftest import unique_email
+
+
+def _artist(app, price_min=800, price_max=1200):
+    with app.app_context():
+        a = Artist(name="Sim Artist", email=unique_email("sim"), approval_status="approved",
+                   price_min=price_min, price_max=price_max)
+        db.session.add(a)
+        db.session.commit()
+        return a.id
+
+
+def test_simulation_matrix_for_artist(app, client, admin_headers):
+    artist_id = _artist(app)
+    resp = client.post("/admin/pricing/simulate", headers=admin_headers, json={
+        "artist_id": artist_id,
+        "base": {"num_guests": 300},
+        "x": {"param": "fee_pct", "values": [10, 20, 30]},
+        "y": {"param": "distance_km", "start": 0, "stop": 600, "step": 300},
+    })
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    data = resp.get_json()
+    assert data["cells"] == 9
+    assert len(data["price_min"]) == 3 and len(data["price_min"][0]) == 3
+    # 800 * 0.6 (Private Feier) * 1.1 (Gäste) * 1.1 (Fee)
+    assert data["price_min"][0][0] == int(800 * 0.6 * 1.1 * 1.1)
+    assert data["price_max"][2][2] > data["price_max"][0][0]
+
+
+def test_simulation_rejects_large_grid_and_non_admin(app, client, admin_headers, user_headers):
+    artist_id = _artist(app)
+    app.config["PRICING_SIMULATION_MAX_CELLS"] = 100
+    try:
+        resp = client.post("/admin/pricing/simulate", headers=admin_headers, json={
+            "artist_id": artist_id,
+            "x": {"param": "fee_pct", "start": 0, "stop": 19, "step": 1},
+            "y": {"param": "duration", "start": 0, "stop": 19, "step": 1},
+        })
+        assert resp.status_code == 400
+    finally:
+        app.config["PRICING_SIMULATION_MAX_CELLS"] = 250000
+
+    resp = client.post("/admin/pricing/simulate", headers=user_headers,
+                       json={"artist_id": artist_id, "x": {"param": "fee_pct", "values": [20]}})
+    assert resp.status_code in (401, 403)
+
+    resp = client.post("/admin/pricing/simulate", headers=admin_headers,
+                       json={"artist_id": 987_654_321, "x": {"param": "fee_pct", "values": [20]}})
+    assert resp.status_code == 404
+
+
+def test_simulation_request_without_priced_artist(app, client, admin_headers):
+    artist_id = _artist(app)
+    with app.app_context():
+        artist = db.session.get(Artist, artist_id)
+        artist.price_min = artist.price_max = None  # Spalten-Defaults greifen nur beim INSERT
+        req = BookingRequest(
+            client_name="Sim", client_email=unique_email("sim"), event_type="Firmenfeier", show_type="Bühnenshow",
+            show_discipline="Zauberer", team_size="solo", event_date=date(2031, 5, 3), duration_minutes=20,
+        )
+        req.artists.append(artist)
+        db.session.add(req)
+        db.session.commit()
+        request_id = req.id
+
+    body = {"request_id": request_id, "x": {"param": "fee_pct", "values": [10, 20]}}
+    resp = client.post("/admin/pricing/simulate", headers=admin_headers, json=body)
+    assert resp.status_code == 404
+    assert "No matching artist" in resp.get_json()["message"]
+
+    # explizite Basis im Body ersetzt die fehlende Artist-Spanne
+    body["base"] = {"base_min": 500, "base_max": 900}
+    assert client.post("/admin/pricing/simulate", headers=admin_headers, json=body).status_code == 200
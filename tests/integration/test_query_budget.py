@@ -0,0 +1,108 @@
+# tests/integration/test_query_budget.py
+"""Query-Budgets für Listen-Endpunkte: Anzahl SQL-Statements darf nicht mit der Zeilenzahl wachsen."""
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from models import db, Artist, BookingRequest, Discipline, booking_artists
+from tests.conftest import unique_email
+
+
+def _discipline(name):
+    disc = Discipline.query.filter_by(name=name).first()
+    if not disc:
+        disc = Discipline(name=name)
+        db.session.add(disc)
+        db.session.flush()
+    return disc
+
+
+def _seed_artists(n, status="approved"):
+    discs = [_discipline("Zauberer"), _discipline("Jonglage")]
+    artists = []
+    for i in range(n):
+        a = Artist(
+            name=f"Budget {status} {i}",
+            email=unique_email("budget"),
+            supabase_user_id="budget-" + uuid.uuid4().hex[:10],
+            approval_status=status,
+        )
+        a.disciplines = list(discs)
+        db.session.add(a)
+        artists.append(a)
+    db.session.commit()
+    return artists
+
+
+def _seed_requests(n, artists):
+    requests = []
+    for i in range(n):
+        r = BookingRequest(
+            client_name=f"Client {i}",
+            client_email=unique_email("client"),
+            event_type="Firmenfeier",
+            show_type="Bühnen Show",
+            show_discipline="Zauberer",
+            team_size="1",
+            number_of_guests=100,
+            event_address="Musterstr. 1, 80331 München",
+            event_date=date.today() + timedelta(days=10 + i),
+            duration_minutes=15,
+        )
+        r.artists = list(artists)
+        db.session.add(r)
+        requests.append(r)
+    db.session.commit()
+    return requests
+
+
+@pytest.mark.parametrize("n", [2, 12])
+def test_public_artist_list_query_budget(client, count_queries, n):
+    _seed_artists(n)
+    with count_queries(limit=3):
+        resp = client.get("/api/artists")
+    assert resp.status_code == 200
+
+
+@pytest.mark.parametrize("n", [2, 12])
+def test_admin_artists_by_status_query_budget(client, admin_headers, count_queries, n):
+    _seed_artists(n, status="pending")
+    with count_queries(limit=3):
+        resp = client.get("/admin/artists?status=pending", headers=admin_headers)
+    assert resp.status_code == 200
+
+
+@pytest.mark.parametrize("n", [2, 12])
+def test_admin_all_requests_query_budget(client, admin_headers, count_queries, n):
+    artists = _seed_artists(2)
+    _seed_requests(n, artists)
+    with count_queries(limit=3):
+        resp = client.get("/admin/requests/all", headers=admin_headers)
+    assert resp.status_code == 200
+    assert all(isinstance(r["artist_ids"], list) for r in resp.get_json())
+
+
+@pytest.mark.parametrize("n", [2, 12])
+def test_artist_inbox_query_budget(app, client, count_queries, n):
+    artists = _seed_artists(2)
+    me = artists[0]
+    _seed_requests(n, artists)
+    with app.app_context():
+        token = create_access_token(identity=me.supabase_user_id)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with count_queries(limit=5):
+        resp = client.get("/api/requests/requests", headers=headers)
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert len(data) >= n
+    assert all(me.id in r["artist_ids"] for r in data)
+    assert all(r["artist_status"] == "angefragt" for r in data)
+
+
+def test_query_counter_reports_overrun(count_queries):
+    with pytest.raises(AssertionError, match="Query-Budget"):
+        with count_queries(limit=0):
+            db.session.execute(booking_artists.select()).fetchall()
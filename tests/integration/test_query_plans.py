@@ -0,0 +1,58 @@
+# tests/integration/test_query_plans.py
+"""Prüft per EXPLAIN, dass der Planner die Indizes für die heißen Lookups verwendet."""
+from datetime import date
+
+import pytest
+
+from models import db, Artist, Availability, BookingRequest, booking_artists
+from managers.booking_requests_manager import ALLOWED_STATUSES
+
+
+@pytest.fixture(autouse=True)
+def _sqlite_only(app):
+    # Postgres wählt bei leeren Test-Tabellen ohnehin Seq-Scans; die Plan-Checks laufen auf SQLite.
+    if db.session.connection().dialect.name != "sqlite":
+        pytest.skip("Plan-Assertions sind auf SQLite kalibriert")
+
+
+def _plan(query) -> str:
+    """EXPLAIN QUERY PLAN für ein SQLAlchemy-Statement/Query als ein String."""
+    stmt = getattr(query, "statement", query)
+    conn = db.session.connection()
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled)).fetchall()
+    return "\n".join(" | ".join(str(c) for c in row) for row in rows)
+
+
+def test_artist_inbox_uses_pivot_artist_index(app):
+    query = (
+        BookingRequest.query
+        .join(booking_artists, booking_artists.c.booking_id == BookingRequest.id)
+        .filter(booking_artists.c.artist_id == 1)
+        .filter(BookingRequest.status.in_(ALLOWED_STATUSES))
+    )
+    assert "ix_booking_artists_artist_status" in _plan(query)
+
+
+def test_availability_by_date_uses_date_index(app):
+    query = (
+        Availability.query
+        .filter(Availability.date == date.today())
+        .with_entities(Availability.artist_id)
+    )
+    plan = _plan(query)
+    assert "ix_availabilities_date_artist" in plan
+    # covering: artist_id steckt im Index, kein Tabellenzugriff nötig
+    assert "COVERING INDEX" in plan
+
+
+def test_artists_by_approval_status_uses_index(app):
+    query = Artist.query.filter(Artist.approval_status == "approved")
+    assert "ix_artists_approval_status" in _plan(query)
+
+
+def test_artist_by_supabase_user_id_uses_unique_index(app):
+    query = Artist.query.filter_by(supabase_user_id="abc")
+    plan = _plan(query)
+    assert "INDEX" in plan.upper()
+    assert "SCAN artists" not in plan
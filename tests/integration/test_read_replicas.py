@@ -0,0 +1,112 @@
+# tests/integration/test_read_replicas.py
+"""Read-Replica-Routing mit zwei SQLite-Dateien (Primary = Test-DB, Replica = tmp-Datei)."""
+import uuid
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from helpers.db_routing import ReplicaRouter, RoutingSession, replica_router
+from models import db, Artist
+from tests.conftest import unique_email
+
+
+def _seed_replica(url):
+    engine = create_engine(url)
+    db.Model.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Artist), [{
+            "id": 900_000, "name": "Replica Only", "email": unique_email("replica"), "approval_status": "approved",
+        }])
+    engine.dispose()
+
+
+@pytest.fixture
+def replica_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    _seed_replica(url)
+    return url
+
+
+@pytest.fixture
+def routing_session(app):
+    """db.session als RoutingSession auf der Test-Connection (= Primary)."""
+    previous = db.session
+    Session = scoped_session(sessionmaker(
+        class_=RoutingSession, db=db, bind=app.config['TEST_DB_CONN'],
+        join_transaction_mode="create_savepoint",
+    ))
+    db.session = Session
+    try:
+        yield Session
+    finally:
+        Session.remove()
+        db.session = previous
+        replica_router.dispose()
+        replica_router._recent_writers.clear()
+
+
+def _names(resp):
+    assert resp.status_code == 200
+    return {a["name"] for a in resp.get_json()}
+
+
+def test_public_artist_list_is_served_by_replica(client, routing_session, replica_url):
+    db.session.add(Artist(name="Primary Only", email=unique_email("primary"), approval_status="approved"))
+    db.session.commit()
+    routing_session.remove()
+
+    assert "Primary Only" in _names(client.get("/api/artists"))
+
+    replica_router.configure([replica_url])
+    names = _names(client.get("/api/artists"))
+    assert "Replica Only" in names and "Primary Only" not in names
+
+
+def test_unhealthy_replica_falls_back_to_primary(client, routing_session, tmp_path):
+    db.session.add(Artist(name="Primary Fallback", email=unique_email("fallback"), approval_status="approved"))
+    db.session.commit()
+    routing_session.remove()
+
+    replica_router.configure([f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+    assert "Primary Fallback" in _names(client.get("/api/artists"))
+
+
+def test_read_after_write_stays_on_primary(app, client, routing_session, replica_url):
+    uid = "replica-" + uuid.uuid4().hex[:10]
+    writer = dict(name="Writer", email=unique_email("writer"), supabase_user_id=uid, approval_status="approved")
+    artist = Artist(**writer)
+    db.session.add(artist)
+    db.session.commit()
+    # derselbe Artist ist bereits repliziert, seine neuen Slots noch nicht
+    engine = create_engine(replica_url)
+    with engine.begin() as conn:
+        conn.execute(insert(Artist), [dict(writer, id=artist.id)])
+    engine.dispose()
+    routing_session.remove()
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {create_access_token(identity=uid)}"}
+
+    replica_router.configure([replica_url], sticky_seconds=60)
+    # Replica kennt keine Slots dieses Artists
+    assert client.get("/api/availability", headers=headers).get_json() == []
+
+    resp = client.post("/api/availability", json={"ranges": [{"from": "2031-05-01", "to": "2031-05-01"}]}, headers=headers)
+    assert resp.status_code in (200, 201)
+    days = client.get("/api/availability", headers=headers).get_json()
+    assert [d["date"] for d in days] == ["2031-05-01"]
+
+    # ohne Sticky-Fenster liest derselbe Client wieder vom (noch veralteten) Replica
+    replica_router._recent_writers.clear()
+    assert client.get("/api/availability", headers=headers).get_json() == []
+
+
+def test_round_robin_across_replicas(tmp_path):
+    urls = [f"sqlite:///{tmp_path / f'r{i}.db'}" for i in range(2)]
+    router = ReplicaRouter().configure(urls)
+    try:
+        picked = [str(router.pick().url) for _ in range(4)]
+        assert picked == urls + urls
+    finally:
+        router.dispose()
@@ -0,0 +1,81 @@
+# tests/integration/test_request_disciplines.py
+"""Normalisierte Anfrage-Disziplinen: Filter und Auswertung per Index-Join statt LIKE auf show_discipline."""
+import random
+from datetime import date
+from types import SimpleNamespace
+
+from managers.booking_requests_manager import BookingRequestManager, split_disciplines
+from routes.request_routes import build_artist_new_request_email
+from tests.conftest import unique_email
+
+
+def _request(disciplines, event_date, status=None):
+    mgr = BookingRequestManager()
+    req = mgr.create_request(
+        client_name="Kunde", client_email=unique_email("disc"), event_date=event_date.isoformat(),
+        duration_minutes=20, event_type="Firmenfeier", show_type="Bühnenshow",
+        show_discipline=disciplines, team_size="1", number_of_guests=50, event_address=None,
+        is_indoor=True, special_requests=None, needs_light=False, needs_sound=False, artists=[],
+    )
+    if status:
+        mgr.change_status(req.id, status)
+    return req
+
+
+def test_create_links_known_disciplines_and_filters_via_join(client, user_headers, count_queries):
+    day = date(random.randint(2100, 2900), 6, 1)
+    both = _request(["zauberer", "Jonglage", "Unbekannt", "Zauberer"], day)
+    juggling = _request("Jonglage", day)
+    hoop = _request(["Hula Hoop"], day)
+
+    assert [d.name for d in both.disciplines] == ["Zauberer", "Jonglage"]
+    # Anzeige-Text bleibt unverändert
+    assert both.show_discipline == "zauberer,Jonglage,Unbekannt,Zauberer"
+
+    with count_queries() as qc:
+        resp = client.get("/api/requests/requests/list?discipline=JONGLAGE&limit=1000", headers=user_headers)
+    assert resp.status_code == 200
+    ids = {item["id"] for item in resp.get_json()["items"]}
+    assert {both.id, juggling.id} <= ids and hoop.id not in ids
+    assert not any("LIKE" in s.upper() for s in qc.statements)
+    assert any("booking_request_disciplines" in s for s in qc.statements)
+
+    resp = client.get("/api/requests/requests/list?discipline=Zauberer,Hula%20Hoop&limit=1000", headers=user_headers)
+    ids = {item["id"] for item in resp.get_json()["items"]}
+    assert {both.id, hoop.id} <= ids and juggling.id not in ids
+
+    body = client.get("/api/requests/requests/list?discipline=Unbekannt", headers=user_headers).get_json()
+    assert body["items"] == [] and body["total"] == 0
+
+
+def test_discipline_stats_endpoint(client, admin_headers, user_headers):
+    day = date(random.randint(2100, 2900), 9, 15)
+    _request(["Zauberer", "Jonglage"], day)
+    _request(["Zauberer"], day, status="akzeptiert")
+    _request(["Pantomime"], date(day.year, 9, 16))
+
+    params = f"date_from={day.isoformat()}&date_to={day.isoformat()}"
+    resp = client.get(f"/admin/requests/discipline-stats?{params}", headers=admin_headers)
+    assert resp.status_code == 200, resp.get_json()
+    assert resp.get_json()["items"] == [
+        {"discipline": "Zauberer", "total": 2, "by_status": {"angefragt": 1, "akzeptiert": 1}},
+        {"discipline": "Jonglage", "total": 1, "by_status": {"angefragt": 1}},
+    ]
+    accepted = client.get(f"/admin/requests/discipline-stats?{params}&status=accepted", headers=admin_headers)
+    assert accepted.get_json()["items"] == [{"discipline": "Zauberer", "total": 1, "by_status": {"akzeptiert": 1}}]
+
+    assert client.get("/admin/requests/discipline-stats?status=foo", headers=admin_headers).status_code == 400
+    assert client.get("/admin/requests/discipline-stats?date_from=morgen", headers=admin_headers).status_code == 400
+    assert client.get("/admin/requests/discipline-stats", headers=user_headers).status_code == 403
+
+
+def test_email_lists_disciplines_not_characters(app):
+    assert split_disciplines(" Zauberer , ,Jonglage") == ["Zauberer", "Jonglage"]
+    req = SimpleNamespace(
+        event_date=date(2030, 1, 1), event_address="Hauptstr. 1, Berlin", event_type="Firmenfeier",
+        show_discipline="Zauberer,Jonglage", team_size="2", duration_minutes=20, price_min=None, price_max=None,
+    )
+    with app.test_request_context():
+        html = build_artist_new_request_email(SimpleNamespace(name="Kim"), req)
+    assert "Zauberer, Jonglage" in html
+    assert "Z, a, u" not in html
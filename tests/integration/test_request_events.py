@@ -0,0 +1,173 @@
+# tests/integration/test_request_events.py
+"""SSE-Stream: Änderungen an Anfragen erreichen nur die betroffenen Artists."""
+import json
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from models import db, Artist, BookingRequest, RequestEvent
+from services.request_events import request_events
+from tests.conftest import unique_email
+
+
+@pytest.fixture(autouse=True)
+def _short_streams(app, monkeypatch):
+    # Stream liefert nur den Backlog und endet sofort
+    monkeypatch.setitem(app.config, "REQUEST_EVENTS_STREAM_SECONDS", 0)
+
+
+def _artist(status="approved"):
+    a = Artist(
+        name="SSE Artist",
+        email=unique_email("sse"),
+        supabase_user_id="sse-" + uuid.uuid4().hex[:10],
+        approval_status=status,
+    )
+    db.session.add(a)
+    db.session.commit()
+    return a
+
+
+def _request_for(artists):
+    r = BookingRequest(
+        client_name="SSE Client",
+        client_email=unique_email("sse-client"),
+        event_type="Firmenfeier",
+        show_type="Bühnen Show",
+        show_discipline="Zauberer",
+        team_size="2",
+        number_of_guests=50,
+        event_address="Musterstr. 1, 80331 München",
+        event_date=date.today() + timedelta(days=20),
+        duration_minutes=15,
+    )
+    r.artists = list(artists)
+    db.session.add(r)
+    db.session.commit()
+    return r
+
+
+def _stream(app, client, supabase_user_id, last_event_id=0):
+    with app.app_context():
+        token = create_access_token(identity=supabase_user_id)
+    resp = client.get(f"/api/requests/requests/stream?last_event_id={last_event_id}",
+                      headers={"Authorization": f"Bearer {token}"})
+    return resp
+
+
+def _events(body):
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_admin_status_change_is_streamed_to_affected_artist_only(app, client, admin_headers):
+    me, other = _artist(), _artist()
+    req_id = _request_for([me, other]).id
+    me_uid, other_uid = me.supabase_user_id, other.supabase_user_id
+    start = request_events.latest_event_id(me.id)
+
+    resp = client.put(f"/admin/requests/{req_id}/artist_status/{me.id}",
+                      json={"status": "abgelehnt"}, headers=admin_headers)
+    assert resp.status_code == 200
+
+    stream = _stream(app, client, me_uid, last_event_id=start)
+    assert stream.status_code == 200
+    assert stream.mimetype == "text/event-stream"
+    events = _events(stream.get_data(as_text=True))
+    assert [(e[1], e[2]["request_id"], e[2]["artist_status"]) for e in events] == [
+        ("request.artist_status", req_id, "abgelehnt")
+    ]
+
+    other_events = _events(_stream(app, client, other_uid, last_event_id=start).get_data(as_text=True))
+    assert all(e[1] != "request.artist_status" for e in other_events)
+
+
+def test_resume_after_last_event_id_skips_delivered_events(app, client, booking_request_manager):
+    me = _artist()
+    req = _request_for([me])
+    booking_request_manager.set_offer(req.id, me.id, 500)
+    booking_request_manager.change_status(req.id, "akzeptiert")
+
+    req_id, me_uid = req.id, me.supabase_user_id
+
+    events = _events(_stream(app, client, me_uid).get_data(as_text=True))
+    own = [e for e in events if e[2]["request_id"] == req_id]
+    assert [e[1] for e in own] == ["request.artist_status", "request.status"]
+
+    resumed = _events(_stream(app, client, me_uid, last_event_id=own[0][0]).get_data(as_text=True))
+    assert [e[0] for e in resumed if e[2]["request_id"] == req_id] == [own[1][0]]
+
+
+def test_local_subscribers_are_woken_only_after_commit(app):
+    me = _artist()
+    waiter = request_events.subscribe(me.id)
+    try:
+        request_events.publish([me.id], 1, "request.status", status="storniert")
+        db.session.rollback()
+        assert not waiter.is_set()
+
+        request_events.publish([me.id], 1, "request.status", status="storniert")
+        db.session.commit()
+        assert waiter.is_set()
+    finally:
+        request_events.unsubscribe(me.id, waiter)
+
+
+def test_stream_requires_approved_artist(app, client):
+    pending = _artist(status="pending")
+    assert _stream(app, client, pending.supabase_user_id).status_code == 403
+
+
+def test_eventsource_uses_short_lived_stream_token_not_the_access_jwt(app, client, monkeypatch):
+    me = _artist()
+    with app.app_context():
+        jwt = create_access_token(identity=me.supabase_user_id)
+
+    # Access-JWT in der URL wird nicht mehr angenommen
+    assert client.get(f"/api/requests/requests/stream?jwt={jwt}").status_code == 401
+
+    issued = client.post("/api/requests/requests/stream/token", headers={"Authorization": f"Bearer {jwt}"})
+    assert issued.status_code == 200
+    stream_token = issued.get_json()["stream_token"]
+    assert issued.get_json()["expires_in"] == app.config["REQUEST_EVENTS_STREAM_TOKEN_SECONDS"]
+
+    stream = client.get(f"/api/requests/requests/stream?stream_token={stream_token}")
+    assert stream.status_code == 200 and stream.mimetype == "text/event-stream"
+
+    # nur für den Stream: als Bearer-Token an anderen Endpoints wertlos
+    other = client.get("/api/requests/requests", headers={"Authorization": f"Bearer {stream_token}"})
+    assert other.status_code in (401, 422)
+
+    assert client.get(f"/api/requests/requests/stream?stream_token={stream_token}x").status_code == 401
+    monkeypatch.setitem(app.config, "REQUEST_EVENTS_STREAM_TOKEN_SECONDS", -1)
+    assert client.get(f"/api/requests/requests/stream?stream_token={stream_token}").status_code == 401
+
+
+def test_stream_token_requires_approved_artist(app, client):
+    pending = _artist(status="pending")
+    with app.app_context():
+        jwt = create_access_token(identity=pending.supabase_user_id)
+    resp = client.post("/api/requests/requests/stream/token", headers={"Authorization": f"Bearer {jwt}"})
+    assert resp.status_code == 403
+
+
+def test_scheduled_prune_deletes_only_old_events(app, monkeypatch):
+    from cron_jobs.tasks import prune_request_events
+    monkeypatch.setitem(app.config, "REQUEST_EVENTS_RETENTION_HOURS", 48)
+    now = datetime.utcnow()
+    old = RequestEvent(artist_id=0, booking_id=0, event_type="request.status", created_at=now - timedelta(hours=49))
+    fresh = RequestEvent(artist_id=0, booking_id=0, event_type="request.status", created_at=now - timedelta(hours=47))
+    db.session.add_all([old, fresh])
+    db.session.commit()
+    old_id, fresh_id = old.id, fresh.id
+
+    assert prune_request_events({})["deleted"] >= 1
+    db.session.expire_all()
+    assert db.session.get(RequestEvent, old_id) is None
+    assert db.session.get(RequestEvent, fresh_id) is not None
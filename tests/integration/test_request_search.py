@@ -0,0 +1,112 @@
+# tests/integration/test_request_search.py
+"""Admin-Anfragesuche: Filter, Keyset-Paginierung, gecachte Gesamtzahl und Umkreis mit Bounding-Box."""
+import random
+from datetime import date, timedelta
+
+from managers.booking_requests_manager import BookingRequestManager
+from models import db
+from services.request_search import bounding_box, request_search
+from tests.conftest import unique_email
+
+MUNICH = (48.137, 11.575)
+
+
+def _request(day, disciplines=("Zauberer",), team_size="1", address="Marienplatz 1, München",
+             coord=MUNICH, status=None):
+    mgr = BookingRequestManager()
+    req = mgr.create_request(
+        client_name="Kunde", client_email=unique_email("search"), event_date=day.isoformat(),
+        duration_minutes=20, event_type="Firmenfeier", show_type="Bühnenshow",
+        show_discipline=list(disciplines), team_size=team_size, number_of_guests=50, event_address=None,
+        is_indoor=True, special_requests=None, needs_light=False, needs_sound=False, artists=[],
+    )
+    req.event_address = address
+    req.event_lat, req.event_lon = coord if coord else (None, None)
+    if status:
+        req.status = status
+    db.session.commit()
+    return req.id
+
+
+def _window():
+    start = date(random.randint(2100, 2900), 3, 1)
+    return start, f"date_from={start.isoformat()}&date_to={(start + timedelta(days=30)).isoformat()}"
+
+
+def test_keyset_pages_and_cached_total(client, admin_headers, user_headers, count_queries):
+    start, window = _window()
+    ids = [_request(start + timedelta(days=i)) for i in range(5)]
+
+    seen, cursor, totals = [], None, []
+    while True:
+        url = f"/admin/requests/search?{window}&sort=event_date_asc&limit=2" + (f"&cursor={cursor}" if cursor else "")
+        with count_queries() as qc:
+            resp = client.get(url, headers=admin_headers)
+        assert resp.status_code == 200, resp.get_json()
+        body = resp.get_json()
+        # Folgeseiten per Keyset-Bedingung statt OFFSET
+        assert any("booking_requests.id) >" in s for s in qc.statements) == bool(cursor)
+        seen += [item["id"] for item in body["items"]]
+        totals.append((body["total"], body["total_cached"]))
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert seen == ids
+    # COUNT nur auf der ersten Seite, danach aus dem Cache
+    assert totals == [(5, False), (5, True), (5, True)]
+
+    newest = client.get(f"/admin/requests/search?{window}&sort=event_date_desc&limit=1", headers=admin_headers)
+    assert [i["id"] for i in newest.get_json()["items"]] == [ids[-1]]
+    # Standard: created_at absteigend, Cursor über (created_at, id)
+    first = client.get(f"/admin/requests/search?{window}&limit=3", headers=admin_headers).get_json()
+    rest = client.get(f"/admin/requests/search?{window}&limit=3&cursor={first['next_cursor']}",
+                      headers=admin_headers).get_json()
+    assert [i["id"] for i in first["items"] + rest["items"]] == ids[::-1]
+
+    assert client.get(f"/admin/requests/search?{window}", headers=user_headers).status_code == 403
+    for bad in ("cursor=kaputt", "sort=name", "status=foo", "lat=48", "lat=48&lon=11&radius_km=0",
+                "date_from=gestern", "team_size=zwei"):
+        assert client.get(f"/admin/requests/search?{bad}", headers=admin_headers).status_code == 400, bad
+
+
+def test_filters_combine(client, admin_headers):
+    start, window = _window()
+    day = start + timedelta(days=1)
+    juggling = _request(day, disciplines=("Jonglage",), team_size="2", address="Hauptstr. 5, Augsburg")
+    magic_done = _request(day, status="akzeptiert")
+    magic_open = _request(day)
+    request_search.clear()
+
+    def ids(query):
+        resp = client.get(f"/admin/requests/search?{window}&{query}", headers=admin_headers)
+        assert resp.status_code == 200, resp.get_json()
+        return {item["id"] for item in resp.get_json()["items"]}
+
+    assert ids("") == {juggling, magic_done, magic_open}
+    assert ids("discipline=jonglage") == {juggling}
+    assert ids("discipline=Zauberer&status=accepted") == {magic_done}
+    assert ids("status=angefragt,akzeptiert&team_size=1") == {magic_done, magic_open}
+    assert ids("city=augsburg") == {juggling}
+    assert ids("event_type=Incentive") == set()
+    assert ids("discipline=Pantomime") == set()
+
+
+def test_radius_uses_bounding_box_then_exact_distance(client, admin_headers, count_queries):
+    start, window = _window()
+    day = start + timedelta(days=2)
+    min_lat, max_lat, min_lon, max_lon = bounding_box(*MUNICH, 30)
+    center = _request(day)
+    # in der Box, aber außerhalb des Kreises (Ecke)
+    corner = _request(day, coord=(max_lat - 0.02, max_lon - 0.02))
+    far = _request(day, coord=(52.52, 13.405))
+    no_coord = _request(day, coord=None)
+
+    with count_queries() as qc:
+        resp = client.get(f"/admin/requests/search?{window}&lat={MUNICH[0]}&lon={MUNICH[1]}&radius_km=30",
+                          headers=admin_headers)
+    body = resp.get_json()
+    assert [item["id"] for item in body["items"]] == [center]
+    assert body["items"][0]["distance_to_center_km"] == 0.0
+    assert body["total"] == 2 and body["total_is_estimate"] is True
+    assert any("event_lat BETWEEN" in s for s in qc.statements)
+    assert {far, no_coord, corner}.isdisjoint({item["id"] for item in body["items"]})
@@ -0,0 +1,66 @@
+# tests/integration/test_response_compression.py
+"""Kompression der Admin-Listen: gzip, 304 per ETag und NDJSON-Stream."""
+import gzip
+import json
+import zlib
+
+from datetime import date, timedelta
+
+import pytest
+
+from helpers.compression import response_compressor
+from models import db, BookingRequest
+from tests.conftest import unique_email
+
+
+@pytest.fixture(autouse=True)
+def _requests(app):
+    # genug ähnliche Anfragen, damit gzip tatsächlich kleiner ist
+    for i in range(5):
+        db.session.add(BookingRequest(
+            client_name=f"Gzip Client {i}",
+            client_email=unique_email("gzip"),
+            event_type="Firmenfeier",
+            show_type="Bühnen Show",
+            show_discipline="Zauberer",
+            team_size="1",
+            number_of_guests=80,
+            event_address="Musterstr. 1, 80331 München",
+            event_date=date.today() + timedelta(days=30 + i),
+            duration_minutes=20,
+        ))
+    db.session.commit()
+
+
+@pytest.fixture(autouse=True)
+def _low_threshold():
+    old = response_compressor.min_size
+    response_compressor.min_size = 1
+    yield
+    response_compressor.min_size = old
+
+
+def test_admin_requests_all_gzip_and_etag(client, admin_headers):
+    plain = client.get("/admin/requests/all", headers=admin_headers)
+    assert plain.status_code == 200
+    assert "Content-Encoding" not in plain.headers
+
+    resp = client.get("/admin/requests/all", headers={**admin_headers, "Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(resp.get_data())) == plain.get_json()
+
+    not_modified = client.get("/admin/requests/all",
+                              headers={**admin_headers, "If-None-Match": resp.headers["ETag"]})
+    assert not_modified.status_code == 304
+
+
+def test_admin_requests_all_ndjson_stream(client, admin_headers):
+    expected = client.get("/admin/requests/all", headers=admin_headers).get_json()
+    resp = client.get("/admin/requests/all?format=ndjson",
+                      headers={**admin_headers, "Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    assert resp.headers["Content-Encoding"] == "gzip"
+    lines = zlib.decompress(resp.get_data(), 31).decode().splitlines()
+    assert [json.loads(line) for line in lines] == expected
@@ -0,0 +1,163 @@
+# tests/integration/test_retention.py
+"""Aufbewahrung: vergangene Verfügbarkeiten blockweise löschen, abgeschlossene Anfragen samt Zuordnungen archivieren."""
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from models import (
+    db, AdminOffer, Artist, Availability, BookingRequest, Discipline,
+    booking_artists, booking_request_disciplines,
+)
+from services.retention import retention
+from tests.conftest import unique_email
+
+# Stichtag weit in der Vergangenheit: andere Tests legen keine Anfragen davor an
+TODAY = date(1985, 1, 1)
+
+
+@pytest.fixture
+def throttled(monkeypatch):
+    for key, value in (("request_batch", 2), ("availability_batch", 3), ("pause_seconds", 0),
+                       ("max_batches", 100), ("closed_after_days", 90), ("accepted_after_days", 365)):
+        monkeypatch.setattr(retention, key, value)
+    return retention
+
+
+def _artist():
+    artist = Artist(name="Archiv", email=unique_email("archive"), approval_status="approved",
+                    supabase_user_id="archive-" + uuid.uuid4().hex[:10])
+    db.session.add(artist)
+    db.session.commit()
+    return artist
+
+
+def _request(status, event_date, artist, discipline=None):
+    req = BookingRequest(
+        client_name="Alt", client_email=unique_email("archive"), event_type="Firmenfeier", show_type="Bühnenshow",
+        show_discipline="Zauberer", team_size="1", event_date=event_date, duration_minutes=20, status=status,
+        price_offered=900,
+    )
+    db.session.add(req)
+    db.session.flush()
+    db.session.execute(booking_artists.insert().values(
+        booking_id=req.id, artist_id=artist.id, status=status, requested_gage=500, comment="gern",
+    ))
+    if discipline is not None:
+        db.session.execute(booking_request_disciplines.insert().values(booking_id=req.id, discipline_id=discipline.id))
+    return req.id
+
+
+@pytest.fixture
+def history():
+    artist, admin = _artist(), _artist()
+    discipline = db.session.execute(select(Discipline).limit(1)).scalar()
+    if discipline is None:
+        discipline = Discipline(name="Archiv-" + uuid.uuid4().hex[:6])
+        db.session.add(discipline)
+        db.session.flush()
+    ids = {
+        "storniert": _request("storniert", date(1984, 6, 1), artist, discipline),
+        "abgelehnt": _request("abgelehnt", date(1984, 7, 1), artist),
+        "akzeptiert_alt": _request("akzeptiert", date(1983, 6, 1), artist),
+        "abgelehnt_neu": _request("abgelehnt", date(1984, 12, 20), artist),    # < 90 Tage
+        "akzeptiert_neu": _request("akzeptiert", date(1984, 6, 1), artist),    # < 365 Tage
+        "angefragt": _request("angefragt", date(1980, 1, 1), artist),          # nicht abgeschlossen
+    }
+    db.session.add(AdminOffer(request_id=ids["akzeptiert_alt"], admin_id=admin.id, override_price=1200, notes="Rabatt"))
+    db.session.flush()
+    # jüngstes Angebot an einer offenen Anfrage: die Hochwassermarke hält keine archivierbare Anfrage fest
+    db.session.add(AdminOffer(request_id=ids["angefragt"], admin_id=admin.id, override_price=800))
+    db.session.commit()
+    return artist, ids
+
+
+def test_archive_moves_requests_links_and_offers(app, throttled, history, count_queries):
+    artist, ids = history
+    archived = {ids["storniert"], ids["abgelehnt"], ids["akzeptiert_alt"]}
+
+    with count_queries() as qc:
+        moved = retention.archive_requests(TODAY)
+    assert moved == {"requests": 3, "artist_links": 3, "admin_offers": 1}
+    # ein INSERT ... SELECT je Archivtabelle und Block (request_batch=2 -> 2 Blöcke)
+    assert sum(s.lstrip().upper().startswith("INSERT") for s in qc.statements) == 6
+
+    live = set(db.session.execute(select(BookingRequest.id).where(BookingRequest.id.in_(ids.values()))).scalars())
+    assert live == set(ids.values()) - archived
+    assert db.session.execute(
+        select(booking_artists.c.booking_id).where(booking_artists.c.booking_id.in_(archived))
+    ).first() is None
+    assert db.session.execute(
+        select(booking_request_disciplines.c.booking_id).where(booking_request_disciplines.c.booking_id.in_(archived))
+    ).first() is None
+    assert db.session.execute(select(AdminOffer.id).where(AdminOffer.request_id.in_(archived))).first() is None
+
+    detail = retention.get_archived(ids["akzeptiert_alt"])
+    assert detail["status"] == "akzeptiert" and detail["price_offered"] == 900 and detail["archived_at"]
+    assert [(a["artist_id"], a["requested_gage"], a["comment"]) for a in detail["artists"]] == [(artist.id, 500, "gern")]
+    assert [(o["override_price"], o["notes"]) for o in detail["admin_offers"]] == [(1200, "Rabatt")]
+
+    # nichts mehr zu tun
+    assert retention.archive_requests(TODAY) == {"requests": 0, "artist_links": 0, "admin_offers": 0}
+
+
+def test_archive_is_throttled_per_run(app, throttled, history, monkeypatch):
+    monkeypatch.setattr(retention, "request_batch", 1)
+    monkeypatch.setattr(retention, "max_batches", 2)
+    assert retention.archive_requests(TODAY)["requests"] == 2
+    assert retention.archive_requests(TODAY)["requests"] == 1
+
+
+def test_archive_keeps_highest_ids_live(app, throttled):
+    artist, admin = _artist(), _artist()
+    newest = _request("storniert", date(1984, 1, 1), artist)
+    db.session.commit()
+    # höchste Anfrage-ID bleibt live, sonst vergäbe SQLite sie neu
+    assert retention.archive_requests(TODAY)["requests"] == 0
+
+    with_offer = _request("abgelehnt", date(1984, 2, 1), artist)
+    later = _request("angefragt", date(1984, 3, 1), artist)
+    db.session.add(AdminOffer(request_id=with_offer, admin_id=admin.id, override_price=700))
+    db.session.commit()
+    # jetzt archivierbar; die Anfrage mit dem jüngsten Admin-Angebot bleibt noch live
+    assert retention.archive_requests(TODAY)["requests"] == 1
+    assert retention.get_archived(newest) is not None
+    assert db.session.get(BookingRequest, with_offer) is not None
+
+    fresh = _request("angefragt", date(1984, 4, 1), artist)
+    db.session.commit()
+    assert fresh > max(newest, with_offer, later)
+    assert retention.get_archived(fresh) is None
+
+
+def test_purge_availability_is_throttled(app, throttled, monkeypatch):
+    artist = _artist()
+    db.session.add_all([Availability(artist_id=artist.id, date=date(1970, 1, 1) + timedelta(days=i)) for i in range(8)])
+    db.session.commit()
+    monkeypatch.setattr(retention, "max_batches", 2)
+
+    assert retention.purge_availability(date(1971, 1, 1)) == {"deleted": 6}
+    assert retention.purge_availability(date(1971, 1, 1)) == {"deleted": 2}
+
+
+def test_archive_api(client, admin_headers, user_headers, throttled, history):
+    artist, ids = history
+    retention.archive_requests(TODAY)
+
+    page = client.get(f"/admin/archive/requests?artist_id={artist.id}&limit=2", headers=admin_headers).get_json()
+    assert [r["id"] for r in page["items"]] == [ids["akzeptiert_alt"], ids["abgelehnt"]]
+    assert page["items"][0]["event_date"] == "1983-06-01"
+    rest = client.get(f"/admin/archive/requests?artist_id={artist.id}&limit=2&before_id={page['next_before_id']}",
+                      headers=admin_headers).get_json()
+    assert [r["id"] for r in rest["items"]] == [ids["storniert"]] and rest["next_before_id"] is None
+
+    cancelled = client.get(f"/admin/archive/requests?artist_id={artist.id}&status=storniert,abgelehnt"
+                           f"&date_from=1984-06-15", headers=admin_headers).get_json()
+    assert [r["id"] for r in cancelled["items"]] == [ids["abgelehnt"]]
+
+    detail = client.get(f"/admin/archive/requests/{ids['storniert']}", headers=admin_headers)
+    assert detail.status_code == 200 and detail.get_json()["artists"][0]["artist_id"] == artist.id
+    assert client.get(f"/admin/archive/requests/{ids['angefragt']}", headers=admin_headers).status_code == 404
+    assert client.get("/admin/archive/requests?date_from=gestern", headers=admin_headers).status_code == 400
+    assert client.get("/admin/archive/requests", headers=user_headers).status_code == 403
@@ -0,0 +1,265 @@
+# tests/integration/test_scheduler.py
+"""Wartungs-Jobs: Cron-Termin, DB-Sperre (ein Host je Lauf), Zustand zwischen Läufen, Historie und Admin-Endpunkte."""
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+import cron_jobs.tasks as tasks
+from models import db, Artist, Availability, BookingRequest, ScheduledJob, ScheduledJobRun, booking_artists
+from services.scheduler import Scheduler, scheduler
+from tests.conftest import unique_email
+
+T0 = datetime(2030, 1, 1, 2, 0)
+
+
+@pytest.fixture
+def job_name():
+    return "test." + uuid.uuid4().hex[:10]
+
+
+@pytest.fixture
+def eager_jobs(app, monkeypatch):
+    monkeypatch.setitem(app.config, "BACKGROUND_JOBS_EAGER", True)
+
+
+def _runs(name):
+    return list(db.session.execute(
+        select(ScheduledJobRun).where(ScheduledJobRun.job == name).order_by(ScheduledJobRun.id)
+    ).scalars())
+
+
+def test_due_job_runs_once_per_slot_across_hosts(app, job_name):
+    calls = []
+    host_a, host_b = Scheduler(), Scheduler()
+    for sched, host in ((host_a, "a:1"), (host_b, "b:2")):
+        sched.configure(host=host).register(job_name, "0 3 * * *", lambda state, h=host: calls.append(h) or {"n": 1})
+
+    # neu registriert: nur Termin festlegen
+    assert host_a.run_pending(T0) == []
+    row = db.session.get(ScheduledJob, job_name)
+    assert row.next_run_at == datetime(2030, 1, 1, 3, 0) and row.state == {}
+
+    due = datetime(2030, 1, 1, 3, 0, 20)
+    [run_id] = host_a.run_pending(due)
+    assert host_b.run_pending(due) == [] and host_a.run_pending(due) == []
+    assert calls == ["a:1"]
+
+    run = db.session.get(ScheduledJobRun, run_id)
+    assert (run.status, run.trigger, run.host, run.rows) == ("done", "schedule", "a:1", {"n": 1})
+    assert run.duration_ms is not None and run.finished_at is not None
+    db.session.expire_all()
+    row = db.session.get(ScheduledJob, job_name)
+    assert row.locked_by is None and row.next_run_at == datetime(2030, 1, 2, 3, 0)
+
+    assert len(host_b.run_pending(datetime(2030, 1, 2, 3, 0))) == 1
+    assert calls == ["a:1", "b:2"]
+
+
+def test_locked_job_is_skipped_until_lock_expires(app, job_name):
+    calls = []
+    sched = Scheduler().configure(host="a:1")
+    sched.register(job_name, "*/5 * * * *", lambda state: calls.append(1), timeout_seconds=600)
+    sched.run_pending(T0)
+    db.session.execute(update(ScheduledJob).where(ScheduledJob.name == job_name)
+                       .values(locked_by="crashed:9", locked_until=T0 + timedelta(minutes=30)))
+    db.session.commit()
+
+    assert sched.run_pending(T0 + timedelta(minutes=5)) == []
+    assert sched.run(job_name, now=T0 + timedelta(minutes=5)) is None
+    assert calls == []
+    # Sperre abgelaufen (Host abgestürzt) -> wieder frei
+    assert len(sched.run_pending(T0 + timedelta(minutes=31))) == 1
+    assert calls == [1]
+
+
+def test_state_is_kept_between_runs_and_failures_are_recorded(app, job_name):
+    sched = Scheduler().configure(host="a:1")
+
+    def handler(state):
+        state["cursor"] = state.get("cursor", 0) + 10
+        if state["cursor"] > 20:
+            raise RuntimeError("geocoder down")
+        return {"cursor": state["cursor"]}
+
+    sched.register(job_name, "@hourly", handler)
+    first = sched.run(job_name, now=T0)
+    second = sched.run(job_name, now=T0)
+    failed = sched.run(job_name, now=T0)
+    again = sched.run(job_name, now=T0)
+
+    runs = {r.id: r for r in _runs(job_name)}
+    assert [runs[i].rows for i in (first, second)] == [{"cursor": 10}, {"cursor": 20}]
+    assert runs[failed].status == "failed" and runs[failed].error == "geocoder down"
+    assert runs[failed].trigger == "manual" and runs[failed].rows is None
+    # Fehlschlag speichert keinen Zustand und gibt die Sperre frei
+    assert runs[again].status == "failed"
+    db.session.expire_all()
+    row = db.session.get(ScheduledJob, job_name)
+    assert row.state == {"cursor": 20} and row.locked_until is None
+
+
+def test_process_local_jobs_run_in_every_process(app, job_name):
+    calls = []
+    hosts = [Scheduler().configure(host=h) for h in ("a:1", "b:2")]
+    for sched in hosts:
+        sched.register(job_name, "*/5 * * * *", lambda state: calls.append(1), exclusive=False)
+        assert sched.run_pending(T0 + timedelta(minutes=1)) == []
+        assert len(sched.run_pending(T0 + timedelta(minutes=5))) == 1
+        assert sched.run_pending(T0 + timedelta(minutes=6)) == []
+    assert len(calls) == 2 and db.session.get(ScheduledJob, job_name) is None
+
+
+def test_one_shot_calls_run_process_local_jobs_of_the_current_minute(app, job_name):
+    calls = []
+    # System-Crontab: jeder Aufruf ist ein neuer Prozess ohne gemerkte Termine
+    for minute in (5, 6, 10):
+        sched = Scheduler().configure(host="cron:1")
+        sched.register(job_name, "*/5 * * * *", lambda state, m=minute: calls.append(m), exclusive=False)
+        sched.run_pending(T0 + timedelta(minutes=minute, seconds=40), one_shot=True)
+    assert calls == [5, 10]
+
+
+def test_lock_owner_is_unique_per_claim(app, job_name):
+    owners, nested = [], []
+    sched = Scheduler().configure(host="a:1")
+
+    def handler(state):
+        owners.append(db.session.get(ScheduledJob, job_name).locked_by)
+        # anderer Thread desselben Prozesses: darf die gehaltene Sperre nicht übernehmen oder freigeben
+        nested.append(sched.run(job_name))
+
+    sched.register(job_name, "@hourly", handler)
+    sched.run(job_name)
+    assert nested == [None]
+    sched.register(job_name, "@hourly", lambda state: owners.append(
+        db.session.get(ScheduledJob, job_name).locked_by))
+    sched.run(job_name)
+    assert owners[0].startswith("a:1:") and owners[1].startswith("a:1:") and owners[0] != owners[1]
+    db.session.expire_all()
+    assert db.session.get(ScheduledJob, job_name).locked_by is None
+
+
+def test_init_app_does_not_start_the_thread(app, monkeypatch):
+    monkeypatch.setitem(app.config, "SCHEDULER_ENABLED", True)
+    sched = Scheduler()
+    sched.init_app(app)
+    assert sched._thread is None
+
+
+def test_purge_history(app, job_name):
+    sched = Scheduler()
+    sched.register(job_name, "@daily", lambda state: None)
+    old, new = sched.run(job_name), sched.run(job_name)
+    db.session.execute(update(ScheduledJobRun).where(ScheduledJobRun.id == old)
+                       .values(started_at=datetime.utcnow() - timedelta(days=30)))
+    db.session.commit()
+    assert sched.purge_history(older_than=timedelta(days=14)) >= 1
+    assert [r.id for r in _runs(job_name)] == [new]
+
+
+@pytest.fixture
+def registered(job_name):
+    scheduler.register(job_name, "0 3 * * *", lambda state: {"touched": 1}, description="Testjob")
+    yield job_name
+    scheduler._tasks.pop(job_name, None)
+
+
+def test_admin_overview_history_and_run_now(client, admin_headers, user_headers, registered, eager_jobs):
+    jobs = client.get("/admin/scheduler/jobs", headers=admin_headers).get_json()
+    names = [j["name"] for j in jobs]
+    assert {"availability.purge_past", "requests.expire_stale", "geocode.backfill", registered} <= set(names)
+    assert names == sorted(names)
+    mine = next(j for j in jobs if j["name"] == registered)
+    assert mine["cron"] == "0 3 * * *" and mine["exclusive"] and mine["last_run"] is None
+
+    resp = client.post(f"/admin/scheduler/jobs/{registered}/run", headers=admin_headers)
+    assert resp.status_code == 202
+    job = client.get(resp.headers["Location"], headers=admin_headers).get_json()
+    assert job["status"] == "done" and job["result"]["skipped"] is False
+    run_id = job["result"]["run_id"]
+    client.post(f"/admin/scheduler/jobs/{registered}/run", headers=admin_headers)
+
+    mine = next(j for j in client.get("/admin/scheduler/jobs", headers=admin_headers).get_json()
+                if j["name"] == registered)
+    assert mine["last_run"]["status"] == "done" and mine["last_run"]["id"] > run_id
+
+    page = client.get(f"/admin/scheduler/runs?job={registered}&limit=1", headers=admin_headers).get_json()
+    assert [r["rows"] for r in page["items"]] == [{"touched": 1}] and page["items"][0]["trigger"] == "manual"
+    rest = client.get(f"/admin/scheduler/runs?job={registered}&limit=1&before_id={page['next_before_id']}",
+                      headers=admin_headers).get_json()
+    assert [r["id"] for r in rest["items"]] == [run_id]
+    done = client.get(f"/admin/scheduler/runs?job={registered}&status=done", headers=admin_headers).get_json()
+    assert len(done["items"]) == 2 and done["next_before_id"] is None
+
+    assert client.post("/admin/scheduler/jobs/nope/run", headers=admin_headers).status_code == 404
+    assert client.get("/admin/scheduler/runs?status=weird", headers=admin_headers).status_code == 400
+    assert client.get("/admin/scheduler/jobs", headers=user_headers).status_code == 403
+
+
+# --- Wartungs-Jobs aus cron_jobs/tasks.py -------------------------------------------
+
+def _artist(**kwargs):
+    artist = Artist(name="Cron", email=unique_email("cron"), approval_status="approved",
+                    supabase_user_id="cron-" + uuid.uuid4().hex[:10], **kwargs)
+    db.session.add(artist)
+    db.session.commit()
+    return artist
+
+
+def test_purge_past_deletes_in_batches(app):
+    artist = _artist()
+    db.session.add_all([Availability(artist_id=artist.id, date=date(1989, 1, 1) + timedelta(days=i)) for i in range(7)])
+    db.session.add(Availability(artist_id=artist.id, date=date(1990, 6, 1)))
+    db.session.commit()
+
+    assert tasks.AvailabilityManager().purge_past(date(1990, 1, 1), batch_size=3) == 7
+    left = db.session.execute(select(Availability.date).where(Availability.artist_id == artist.id)).scalars().all()
+    assert left == [date(1990, 6, 1)]
+
+
+def test_expire_stale_requests_cancels_open_requests_and_links(app):
+    artist = _artist()
+    reqs = {}
+    for status, day in (("angefragt", 1), ("angeboten", 2), ("akzeptiert", 3), ("angefragt", 40)):
+        req = BookingRequest(client_name="Alt", client_email=unique_email("stale"), event_type="Firmenfeier",
+                             show_type="Bühnenshow", show_discipline="Zauberer", team_size="1",
+                             event_date=date(1990, 1, 1) + timedelta(days=day), duration_minutes=20, status=status)
+        db.session.add(req)
+        db.session.flush()
+        db.session.execute(booking_artists.insert().values(booking_id=req.id, artist_id=artist.id, status=status))
+        reqs[(status, day)] = req.id
+    db.session.commit()
+
+    result = tasks.BookingRequestManager().expire_stale_requests(date(1990, 1, 10), batch_size=1)
+    # ältere offene Anfragen anderer Tests zählen mit
+    assert result["requests"] >= 2 and result["artist_links"] >= 2
+    statuses = dict(db.session.execute(
+        select(BookingRequest.id, BookingRequest.status).where(BookingRequest.id.in_(reqs.values()))
+    ).all())
+    links = dict(db.session.execute(
+        select(booking_artists.c.booking_id, booking_artists.c.status)
+        .where(booking_artists.c.booking_id.in_(reqs.values()))
+    ).all())
+    expected = {reqs[("angefragt", 1)]: "storniert", reqs[("angeboten", 2)]: "storniert",
+                reqs[("akzeptiert", 3)]: "akzeptiert", reqs[("angefragt", 40)]: "angefragt"}
+    assert statuses == expected and links == expected
+
+
+def test_geocode_backfill_fills_missing_coordinates(app, monkeypatch):
+    monkeypatch.setitem(app.config, "GEOCODE_BACKFILL_SLEEP_SECONDS", 0)
+    monkeypatch.setitem(app.config, "GEOCODE_BACKFILL_BATCH", 100000)
+    address = "Cronweg " + uuid.uuid4().hex[:8]
+    monkeypatch.setattr(tasks, "geocode_address", lambda a: (48.1, 11.5) if a == address else None)
+    artist = _artist(address=address)
+    artist_id = artist.id
+
+    state = {}
+    counts = tasks.backfill_coordinates(state)
+    assert counts["geocoded"] == 1
+    # alles in einem Block -> Cursor zurück auf Anfang
+    assert state == {"artist_id": 0, "request_id": 0}
+    db.session.expire_all()
+    assert (db.session.get(Artist, artist_id).lat, db.session.get(Artist, artist_id).lon) == (48.1, 11.5)
+
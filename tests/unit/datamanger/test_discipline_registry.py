@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+
+from managers.discipline_manager import DisciplineRegistry
+from models import db, Discipline
+
+
+@pytest.fixture
+def registry(app):
+    return DisciplineRegistry(refresh_seconds=3600)
+
+
+def _new_name():
+    return "Kunst " + uuid.uuid4().hex[:8]
+
+
+def test_resolve_normalizes_dedupes_and_creates_in_one_insert(registry, count_queries):
+    neu = _new_name()
+    registry.resolve(["Zauberer"])  # Cache laden
+
+    with count_queries() as qc:
+        discs = registry.resolve(["  zauberer ", "JONGLAGE", neu, "Zauberer", "", neu.upper()])
+    assert [d.name for d in discs] == ["Zauberer", "Jonglage", neu]
+    inserts = [s for s in qc.statements if s.lstrip().upper().startswith("INSERT")]
+    assert len(inserts) == 1
+
+    # danach komplett aus dem Cache: nur noch die eine SELECT-Query für die Zeilen
+    with count_queries() as qc:
+        again = registry.resolve([neu.lower(), "jonglage"])
+    assert qc.count == 1
+    assert [d.id for d in again] == [discs[2].id, discs[1].id]
+
+
+def test_invalid_names_raise_without_inserting(registry):
+    before = Discipline.query.count()
+    with pytest.raises(ValueError):
+        registry.resolve(["Zauberer", "Fun@ct!0n"])
+    assert Discipline.query.count() == before
+    assert registry.resolve(["Zauberer"], create=True)[0].name == "Zauberer"
+    assert registry.resolve([_new_name()], create=False) == []
+
+
+def test_known_keeps_only_allowed_names(registry):
+    assert registry.known(["hula hoop", "Unbekannt", "HULA HOOP", "cyr-wheel"]) == ["Hula Hoop", "Cyr-Wheel"]
+    assert registry.known("pantomime") == ["Pantomime"]
+
+
+def test_names_created_by_another_worker_and_stale_ids(registry):
+    other = DisciplineRegistry(refresh_seconds=3600)
+    registry.resolve(["Zauberer"])
+
+    # anderer Worker legt eine Disziplin an -> Cache-Miss lädt neu statt doppelt anzulegen
+    neu = _new_name()
+    created = other.resolve([neu])[0]
+    db.session.commit()
+    assert registry.resolve([neu.lower()])[0].id == created.id
+    assert Discipline.query.filter(Discipline.name.ilike(neu)).count() == 1
+
+    # Zeile wird gelöscht und unter anderer id neu angelegt -> veraltete id wird erkannt
+    db.session.delete(created)
+    db.session.commit()
+    recreated = Discipline(name=neu)
+    db.session.add(recreated)
+    db.session.commit()
+    assert registry.resolve([neu])[0].id == recreated.id
+
+
+def test_periodic_refresh_picks_up_new_rows(registry):
+    registry.resolve(["Zauberer"])
+    neu = _new_name()
+    db.session.add(Discipline(name=neu))
+    db.session.commit()
+    assert neu.casefold() not in registry._names
+
+    registry.refresh_seconds = 0
+    registry.resolve(["Zauberer"])
+    assert registry.canonical(neu.lower()) == neu
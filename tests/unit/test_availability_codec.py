@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+
+import pytest
+
+from helpers.availability_codec import (
+    bitmap_to_dates, dates_to_bitmap, decode_bitmap, dates_to_ranges, expand_recurrence, negotiate_format, parse_dates_payload,
+)
+
+
+def _days(start, n):
+    return {start + timedelta(days=i) for i in range(n)}
+
+
+def test_ranges_roundtrip_collapses_runs():
+    dates = _days(date(2025, 1, 1), 31) | _days(date(2025, 3, 1), 2) | {date(2025, 5, 5)}
+    ranges = dates_to_ranges(dates)
+    assert ranges == [
+        {"from": "2025-01-01", "to": "2025-01-31"},
+        {"from": "2025-03-01", "to": "2025-03-02"},
+        {"from": "2025-05-05", "to": "2025-05-05"},
+    ]
+    assert parse_dates_payload({"ranges": ranges}) == dates
+
+
+def test_bitmap_roundtrip():
+    dates = {date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 9), date(2025, 12, 31)}
+    encoded = dates_to_bitmap(dates)
+    assert encoded["start"] == "2025-01-01"
+    assert encoded["days"] == 365
+    assert bitmap_to_dates(encoded["start"], encoded["bitmap"], encoded["days"]) == dates
+    # ein Jahr Verfügbarkeit ≈ 46 Bytes Base64 statt ~365 JSON-Objekte
+    assert len(encoded["bitmap"]) <= 64
+
+
+@pytest.mark.parametrize("bitmap, days", [
+    (None, 8),          # kein String
+    (["AQ=="], 8),
+    ("AQ==", "8"),      # days als String
+    ("AQ==", 2.5),
+    ("AQ==", True),
+    ("AQ==", -1),
+    ("AQ==", 9),        # ein Byte kodiert nur 8 Tage
+])
+def test_decode_bitmap_rejects_bad_bitmap_or_days(bitmap, days):
+    with pytest.raises(ValueError):
+        decode_bitmap(bitmap, days)
+    with pytest.raises(ValueError):
+        bitmap_to_dates("2025-01-01", bitmap, days)
+
+
+def test_decode_bitmap_limits_to_days():
+    assert decode_bitmap("/w==", 3) == (b"\xff", 3)
+    assert decode_bitmap("/w==") == (b"\xff", 8)
+    assert bitmap_to_dates("2025-01-01", "/w==", 3) == _days(date(2025, 1, 1), 3)
+
+
+def test_recurrence_expands_weekdays_with_exceptions():
+    dates = expand_recurrence({"from": "2025-06-01", "to": "2025-06-30",
+                               "weekdays": ["sat", "Sonntag"], "except": ["2025-06-07"]})
+    assert all(d.weekday() in (5, 6) for d in dates)
+    assert date(2025, 6, 7) not in dates
+    assert len(dates) == 8
+
+
+@pytest.mark.parametrize("body", [
+    {"ranges": [{"from": "2025-02-01", "to": "2025-01-01"}]},
+    {"ranges": [{"from": "1900-01-01", "to": "2025-01-01"}]},
+    {"recurrence": {"from": "2025-01-01", "to": "2025-02-01", "weekdays": ["xyz"]}},
+    {"bitmap": "%%%", "start": "2025-01-01"},
+    {"unknown": 1},
+])
+def test_invalid_payloads_raise_value_error(body):
+    with pytest.raises(ValueError):
+        parse_dates_payload(body)
+
+
+def test_negotiate_format():
+    assert negotiate_format(None, None) == "days"
+    assert negotiate_format("ranges", "application/json") == "ranges"
+    assert negotiate_format(None, "application/vnd.pepe.availability.bitmap+json, */*") == "bitmap"
+    with pytest.raises(ValueError):
+        negotiate_format("csv", None)
@@ -0,0 +1,95 @@
+import gzip
+import zlib
+
+from flask import Flask, Response, jsonify
+
+from helpers.compression import ResponseCompressor, _CompressedCache, parse_accept_encoding
+
+
+def _app(**options):
+    app = Flask(__name__)
+    compressor = ResponseCompressor(**options)
+    compressor.init_app(app)
+
+    @app.get("/big")
+    def big():
+        return jsonify([{"name": "Artist", "city": "München", "i": i} for i in range(200)])
+
+    @app.get("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.get("/stream")
+    def stream():
+        return Response((f'{{"i": {i}}}\n' for i in range(50)), mimetype="application/x-ndjson")
+
+    return app, compressor
+
+
+def test_parse_accept_encoding_q_values():
+    assert parse_accept_encoding("gzip;q=0.5, br, identity;q=0") == {"gzip": 0.5, "br": 1.0, "identity": 0.0}
+    assert parse_accept_encoding(None) == {}
+
+
+def test_choose_encoding_prefers_supported_and_respects_q_zero():
+    compressor = ResponseCompressor()
+    assert compressor.choose_encoding("gzip, deflate") == "gzip"
+    assert compressor.choose_encoding("gzip;q=0") is None
+    assert compressor.choose_encoding("*") in ("br", "gzip")
+    assert compressor.choose_encoding("") is None
+
+
+def test_large_json_is_gzipped_and_cached():
+    app, compressor = _app(min_size=100)
+    client = app.test_client()
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    raw = gzip.decompress(resp.get_data())
+    assert raw == client.get("/big").get_data()
+    assert len(compressor.cache) == 1
+
+    again = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert again.get_data() == resp.get_data()
+    assert len(compressor.cache) == 1
+
+
+def test_small_bodies_stay_uncompressed_but_get_etag():
+    app, _ = _app(min_size=1024)
+    client = app.test_client()
+    resp = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
+    etag = resp.headers["ETag"]
+    assert client.get("/small", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_if_none_match_with_weak_compressed_etag_returns_304():
+    app, _ = _app(min_size=100)
+    client = app.test_client()
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["ETag"].startswith('W/"')
+    cached = client.get("/big", headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["ETag"]})
+    assert cached.status_code == 304
+    assert cached.get_data() == b""
+
+
+def test_streamed_response_is_compressed_per_chunk():
+    app, _ = _app(min_size=10_000)
+    client = app.test_client()
+    resp = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in resp.headers
+    lines = zlib.decompress(resp.get_data(), 31).decode().splitlines()
+    assert lines[0] == '{"i": 0}' and len(lines) == 50
+
+
+def test_lru_cache_is_bounded_by_bytes():
+    cache = _CompressedCache(max_bytes=10)
+    cache.put(("a", "gzip"), b"12345")
+    cache.put(("b", "gzip"), b"12345")
+    cache.get(("a", "gzip"))
+    cache.put(("c", "gzip"), b"12345")
+    assert cache.get(("b", "gzip")) is None
+    assert cache.get(("a", "gzip")) == b"12345"
+    cache.put(("huge", "gzip"), b"x" * 11)
+    assert cache.get(("huge", "gzip")) is None
@@ -0,0 +1,105 @@
+import time
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from helpers.db_pools import PoolBulkheads
+
+
+@pytest.fixture
+def bulkheads(tmp_path):
+    app = Flask(__name__)
+    app.config["DB_POOL_CLASSES"] = {
+        "public": {"statement_timeout_ms": 50},
+        "admin": {"pool_size": 1, "max_overflow": 0, "pool_timeout": 0.1},
+        "background": {"statement_timeout_ms": 0},
+    }
+    app.config["DB_TRAFFIC_CLASS_BY_BLUEPRINT"] = {"admin": "admin"}
+    default_engine = create_engine(f"sqlite:///{tmp_path / 'pools.db'}")
+    pools = PoolBulkheads()
+    pools.init_app(app, default_engine)
+    yield pools
+    pools.dispose()
+    default_engine.dispose()
+
+
+def test_admin_pool_exhaustion_does_not_block_public(bulkheads):
+    admin, public = bulkheads.engine_for("admin"), bulkheads.engine_for("public")
+    assert admin is not public and admin.pool.size() == 1
+
+    held = admin.connect()
+    try:
+        with pytest.raises(PoolTimeoutError):
+            admin.connect()
+        with public.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        held.close()
+
+    stats = bulkheads.snapshot()
+    assert stats["admin"]["timeouts"] == 1
+    assert stats["admin"]["wait_ms_max"] >= 100 * 0.9
+    assert stats["public"]["checkouts"] >= 1
+
+
+def test_sqlite_statement_timeout_interrupts_long_queries(bulkheads):
+    slow = text(
+        "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000) "
+        "SELECT count(*) FROM c"
+    )
+    with bulkheads.engine_for("public").connect() as conn:
+        with pytest.raises(OperationalError, match="interrupted"):
+            conn.execute(slow)
+        # Folgestatements bekommen eine neue Deadline
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_sqlite_timeout_does_not_count_application_time_between_fetches_or_before_commit(bulkheads):
+    rows = text("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 5000) SELECT x FROM c")
+    with bulkheads.engine_for("public").connect() as conn:
+        result = conn.execute(rows)
+        assert result.fetchone() == (1,)
+        time.sleep(0.1)  # länger als das Timeout, aber ohne laufendes Statement
+        assert len(result.fetchall()) == 4999
+
+        conn.execute(text("CREATE TABLE IF NOT EXISTS t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t SELECT x FROM (" + rows.text + ")"))
+        time.sleep(0.1)
+        conn.commit()
+
+
+def test_background_class_has_no_public_timeout(bulkheads):
+    slow = text(
+        "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 300000) "
+        "SELECT count(*) FROM c"
+    )
+    # außerhalb eines Requests (Worker, Scheduler, CLI)
+    assert bulkheads.traffic_class() == "background"
+    with bulkheads.engine_for_request().connect() as conn:
+        assert conn.execute(slow).scalar() == 300000
+    with bulkheads.engine_for("public").connect() as conn:
+        with pytest.raises(OperationalError, match="interrupted"):
+            conn.execute(slow)
+
+
+def test_requests_are_classified_by_blueprint(app):
+    from helpers.db_pools import pool_bulkheads
+
+    with app.test_request_context("/admin/dashboard"):
+        assert pool_bulkheads.traffic_class() == "admin"
+        assert pool_bulkheads.engine_for_request() is pool_bulkheads.engine_for("admin")
+    with app.test_request_context("/api/artists"):
+        assert pool_bulkheads.traffic_class() == "public"
+        assert pool_bulkheads.engine_for_request() is None
+    assert pool_bulkheads.traffic_class() == "background"
+
+
+def test_admin_db_pools_endpoint(client, admin_headers, user_headers):
+    assert client.get("/admin/db_pools", headers=user_headers).status_code in (401, 403)
+    resp = client.get("/admin/db_pools", headers=admin_headers)
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert {"public", "admin", "background"} <= set(body["classes"])
+    assert body["by_blueprint"]["admin"] == "admin"
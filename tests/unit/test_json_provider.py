@@ -0,0 +1,29 @@
+import decimal
+import json
+from datetime import date, datetime, time
+
+from flask import Flask, jsonify
+
+from helpers.json_provider import FastJSONProvider
+
+
+def _app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    return app
+
+
+def test_dates_are_iso_strings_like_isoformat():
+    app = _app()
+    payload = {"d": date(2025, 6, 1), "dt": datetime(2025, 6, 1, 19, 30), "t": time(19, 30)}
+    with app.app_context():
+        body = jsonify(payload).get_data(as_text=True)
+    assert json.loads(body) == {"d": "2025-06-01", "dt": "2025-06-01T19:30:00", "t": "19:30:00"}
+
+
+def test_keys_sorted_and_roundtrip():
+    app = _app()
+    with app.app_context():
+        text = app.json.dumps({"b": 1, "a": decimal.Decimal("1.50"), 3: "x"})
+        assert text.index('"3"') < text.index('"a"') < text.index('"b"')
+        assert app.json.loads(text) == {"3": "x", "a": "1.50", "b": 1}
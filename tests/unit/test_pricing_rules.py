@@ -0,0 +1,44 @@
+# tests/unit/test_pricing_rules.py
+"""Kompilierte Preisregeln: Standardregeln = bisherige Konstanten, eigene Regeln, Validierung."""
+import pytest
+
+from services.pricing_rules import PricingRules, default_rules, merge_rules
+
+
+def test_builtin_rules_match_documented_steps():
+    rules = PricingRules(default_rules())
+    assert [rules.guest_multiplier(n, 500, 900) for n in (0, 200, 201, 500, 501)] == [0.9, 0.9, 1.1, 1.1, 1.25]
+    assert rules.guest_multiplier(900, 900, 900) == 1.0
+    assert [rules.duration_factor(d) for d in (0, 5, 6, 10, 11, 15, 20, 45)] == [1.0, 1.0, 1.2, 1.2, 1.3, 1.3, 1.3 + 0.1, 1.3 + 6 * 0.1]
+    assert rules.duration_factor(2000) == 1.3 + (2000 - 15) // 5 * 0.1   # außerhalb der Tabelle
+    assert [rules.distance_surcharge(km, None) for km in (0, 299, 300, 599, 600, 900)] == [0, 0, 200, 200, 300, 300]
+    assert rules.distance_surcharge(700, "münchen") == 200
+    assert rules.event_weight("Private Feier", 500, 900) == 0.6
+    assert rules.event_weight("Private Feier", 900, 900) == 1.0
+    assert rules.event_weight("Unbekannt", 500, 900) == 1.0
+
+
+def test_custom_rules_change_price():
+    base = PricingRules(default_rules())
+    custom = PricingRules(merge_rules(default_rules(), {
+        "rate_per_km": 1.0,
+        "tech_fees": {"light": 100, "sound": 200},
+        "city_discounts": {"berlin": 50},
+    }), version=7)
+    args = dict(base_min=1000, base_max=1000, distance_km=100, fee_pct=0,
+                needs_light=True, needs_sound=True, event_address="A, 10115 Berlin")
+    assert base.price(**args) == (1000 + 50 + 900, 1000 + 50 + 900)
+    assert custom.price(**args) == (1000 + 100 + 300 - 50, 1000 + 100 + 300 - 50)
+    assert custom.version == 7
+
+
+@pytest.mark.parametrize("changes", [
+    {"unknown_rule": 1},
+    {"rate_per_km": "schnell"},
+    {"guest_tiers": [[200]]},
+    {"duration": {"round_to": 0, "steps": [[5, 1.0]], "extra_per_step": 0.1}},
+    {"tech_fees": {"light": 450}},
+])
+def test_invalid_rules_are_rejected(changes):
+    with pytest.raises(ValueError):
+        PricingRules(merge_rules(default_rules(), changes))
@@ -0,0 +1,83 @@
+# tests/unit/test_pricing_simulation.py
+"""Preis-Simulation: jede Zelle entspricht calculate_price, 100k Zellen in unter einer Sekunde."""
+import itertools
+import random
+import time
+
+import pytest
+
+from services.calculate_price import calculate_price
+from services.pricing_simulation import PARAM_STEPS, parse_axis, reference_params, simulate
+
+AXES = {
+    "event_type": {"param": "event_type", "values": ["Private Feier", "Firmenfeier", "Sonstiges"]},
+    "num_guests": {"param": "num_guests", "values": [50, 200, 201, 501]},
+    "is_weekend": {"param": "is_weekend"},
+    "is_indoor": {"param": "is_indoor"},
+    "newsletter": {"param": "newsletter"},
+    "duration": {"param": "duration", "start": 0, "stop": 40, "step": 7},
+    "fee_pct": {"param": "fee_pct", "start": 0, "stop": 35, "step": 2.5},
+    "distance_km": {"param": "distance_km", "start": 0, "stop": 900, "step": 77.7},
+    "team_count": {"param": "team_count", "values": [1, 3]},
+    "needs_sound": {"param": "needs_sound"},
+}
+
+
+@pytest.fixture(autouse=True)
+def _default_rate(monkeypatch):
+    monkeypatch.delenv("RATE_PER_KM", raising=False)
+
+
+@pytest.mark.parametrize("base", [(800, 1200), (1000, 1000)])
+def test_every_cell_matches_calculate_price(base):
+    ref = reference_params(
+        base_min=base[0], base_max=base[1], fee_pct=17.5, event_type="Firmenfeier", num_guests=350,
+        is_weekend=True, needs_light=True, duration=25, distance_km=420.5,
+        event_address="Marienplatz 1, 80331 München", team_size="duo",
+    )
+    for a, b in itertools.permutations(list(AXES) + [None], 2):
+        if a is None or (b and PARAM_STEPS[a] == PARAM_STEPS[b] != 8):
+            continue
+        x, y = parse_axis(AXES[a]), parse_axis(AXES[b]) if b else None
+        result = simulate(ref, x, y)
+        for j, yv in enumerate(y["values"] if y else [None]):
+            for i, xv in enumerate(x["values"]):
+                params = {k: v for k, v in ref.items() if k not in ("rate_per_km", "event_weight")}
+                params[a] = xv
+                if b:
+                    params[b] = yv
+                assert (result["price_min"][j][i], result["price_max"][j][i]) == calculate_price(**params), (a, b, xv, yv)
+
+
+def test_event_weight_and_rate_overrides():
+    ref = reference_params(base_min=500, base_max=900, distance_km=100)
+    result = simulate(ref, parse_axis({"param": "event_weight", "values": [1.0]}),
+                      parse_axis({"param": "rate_per_km", "values": [0.0, 1.0]}))
+    # 500 * 0.9 (Gäste) * 1.2 (Fee) = 540, + 100 km * 1.0
+    assert [row[0] for row in result["price_min"]] == [540, 640]
+
+
+def test_same_step_and_bad_axes_are_rejected():
+    ref = reference_params(base_min=500, base_max=900)
+    with pytest.raises(ValueError):
+        simulate(ref, parse_axis({"param": "event_type"}), parse_axis({"param": "event_weight", "values": [1]}))
+    with pytest.raises(ValueError):
+        parse_axis({"param": "price"})
+    with pytest.raises(ValueError):
+        parse_axis({"param": "fee_pct", "start": 0, "stop": 10_000, "step": 0.1})
+    with pytest.raises(ValueError):
+        simulate(reference_params(), parse_axis({"param": "fee_pct", "values": [20]}))
+
+
+def test_100k_cells_well_under_a_second():
+    ref = reference_params(base_min=800, base_max=1200, num_guests=300, is_weekend=True)
+    x = parse_axis({"param": "fee_pct", "start": 0, "stop": 49.9, "step": 0.1})
+    y = parse_axis({"param": "distance_km", "start": 0, "stop": 199, "step": 1})
+    start = time.perf_counter()
+    result = simulate(ref, x, y)
+    elapsed = time.perf_counter() - start
+    assert result["cells"] == 100_000
+    assert elapsed < 1.0, elapsed
+    j, i = random.randrange(200), random.randrange(500)
+    expected = calculate_price(800, 1200, y["values"][j], x["values"][i], num_guests=300, is_weekend=True)
+    assert (result["price_min"][j][i], result["price_max"][j][i]) == expected
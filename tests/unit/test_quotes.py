@@ -0,0 +1,62 @@
+from datetime import date
+
+import pytest
+
+from services import geo
+from services.quotes import QuoteCache, normalize_quote_input, quote_cache_key
+
+
+def _form(**overrides):
+    data = {"event_date": "2030-05-04", "event_type": "Firmenfeier", "number_of_guests": "120",
+            "duration_minutes": 20, "event_address": "Marienplatz 1,  München", "disciplines": ["Zauberer"]}
+    data.update(overrides)
+    return data
+
+
+def test_normalize_ignores_irrelevant_fields_and_spelling():
+    a = normalize_quote_input(_form(client_name="A"))
+    b = normalize_quote_input(_form(client_name="B", event_address=" marienplatz 1, MÜNCHEN",
+                                    disciplines=["zauberer", "Zauberer "]))
+    assert a["event_date"] == date(2030, 5, 4) and a["number_of_guests"] == 120
+    assert quote_cache_key(a) == quote_cache_key(b)
+    assert quote_cache_key(a) != quote_cache_key(normalize_quote_input(_form(needs_light=True)))
+
+
+@pytest.mark.parametrize("payload", [None, _form(event_date="04.05.2030"), _form(number_of_guests="viele"),
+                                     _form(disciplines="Zauberer")])
+def test_normalize_rejects_invalid_input(payload):
+    with pytest.raises(ValueError):
+        normalize_quote_input(payload)
+
+
+def test_quote_cache_expires_and_is_bounded(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("services.quotes.time.monotonic", lambda: now[0])
+    cache = QuoteCache(ttl_seconds=10, max_entries=2)
+    cache.put("a", {"p": 1})
+    assert cache.get("a") == ({"p": 1}, 10)
+    now[0] += 11
+    assert cache.get("a") is None
+
+    for key in ("x", "y", "z"):
+        cache.put(key, {})
+    assert cache.get("x") is None and len(cache) == 2
+
+
+def test_geocode_is_memoized(app, monkeypatch):
+    calls = []
+
+    class _Resp:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return [{"lat": "48.137", "lon": "11.575"}]
+
+    monkeypatch.setattr(geo.requests, "get", lambda *a, **kw: calls.append(kw["params"]["q"]) or _Resp())
+    geo.clear_geocode_cache()
+    with app.app_context():
+        assert geo.geocode_address("Marienplatz 1, München") == (48.137, 11.575)
+        assert geo.geocode_address("  marienplatz 1,  münchen") == (48.137, 11.575)
+    assert len(calls) == 1
+    geo.clear_geocode_cache()
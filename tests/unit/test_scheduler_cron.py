@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import pytest
+
+from services.scheduler import CronExpression
+
+
+@pytest.mark.parametrize("expr, after, expected", [
+    ("30 2 * * *", datetime(2030, 1, 1, 1, 0), datetime(2030, 1, 1, 2, 30)),
+    ("30 2 * * *", datetime(2030, 1, 1, 2, 30), datetime(2030, 1, 2, 2, 30)),   # strikt danach
+    ("*/10 * * * *", datetime(2030, 1, 1, 2, 31, 59), datetime(2030, 1, 1, 2, 40)),
+    ("0 4 * * 0", datetime(2030, 1, 1, 0, 0), datetime(2030, 1, 6, 4, 0)),      # Sonntag
+    ("0 4 * * 7", datetime(2030, 1, 1, 0, 0), datetime(2030, 1, 6, 4, 0)),      # 7 = Sonntag
+    ("0 0 29 2 *", datetime(2030, 3, 1), datetime(2032, 2, 29)),
+    ("0 9-17/4 * * 1-5", datetime(2030, 1, 4, 17, 0), datetime(2030, 1, 7, 9, 0)),
+    ("0 0 1,15 * 1", datetime(2030, 1, 2), datetime(2030, 1, 7)),               # Tag ODER Wochentag
+    ("@daily", datetime(2030, 12, 31, 23, 59), datetime(2031, 1, 1)),
+])
+def test_next_after(expr, after, expected):
+    cron = CronExpression(expr)
+    assert cron.next_after(after) == expected
+    assert cron.matches(expected)
+
+
+@pytest.mark.parametrize("expr", ["", "* * * *", "60 * * * *", "* 24 * * *", "*/0 * * * *", "5-1 * * * *",
+                                  "x * * * *", "@reboot"])
+def test_invalid_expressions(expr):
+    with pytest.raises(ValueError):
+        CronExpression(expr)
+
+
+def test_never_matching_expression():
+    with pytest.raises(ValueError):
+        CronExpression("0 0 31 2 *").next_after(datetime(2030, 1, 1))
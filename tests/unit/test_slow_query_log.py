@@ -0,0 +1,129 @@
+import uuid
+
+from sqlalchemy import text
+
+from helpers.slow_query_log import SlowQueryRecorder, fingerprint, parameter_shape, slow_query_recorder
+from models import db
+
+
+def test_fingerprint_groups_literals_and_in_lists():
+    a = fingerprint("SELECT * FROM availabilities WHERE date = '2025-01-01' AND artist_id IN (?, ?, ?)")
+    b = fingerprint("/* endpoint=api.get_availability */ SELECT *  FROM availabilities\nWHERE date = '2026-02-02' AND artist_id IN (?)")
+    assert a == b == "SELECT * FROM availabilities WHERE date = ? AND artist_id IN (?+)"
+    assert fingerprint("SELECT x::text FROM t WHERE id = %(id_1)s LIMIT 5") == "SELECT x::text FROM t WHERE id = ? LIMIT ?"
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape((1, "geheim")) == ["int", "str"]
+    assert parameter_shape({"email": "a@b.de"}) == {"email": "str"}
+    assert parameter_shape([(1, 2), (3, 4)]) == {"rows": 2, "row": ["int", "int"]}
+
+
+def test_recorder_tags_endpoint_and_captures_plan(app):
+    recorder = SlowQueryRecorder(threshold_ms=0)
+    recorder.install(db.engine)
+    try:
+        with app.test_request_context("/api/availability"):
+            from flask import request
+            request.url_rule = None
+            db.session.execute(text("SELECT id FROM artists WHERE approval_status = :s"), {"s": "approved"}).fetchall()
+    finally:
+        recorder.uninstall(db.engine)
+
+    items = recorder.snapshot()
+    entry = next(e for e in items if "FROM artists WHERE approval_status" in e["fingerprint"])
+    assert entry["count"] == 1
+    assert "/api/availability" in entry["endpoints"]
+    assert entry["param_shape"] in (["str"], {"s": "str"})
+    assert entry["plan"], "EXPLAIN plan should be captured for SELECTs"
+
+
+def test_admin_slow_queries_endpoint(client, admin_headers, user_headers):
+    assert client.get("/admin/slow_queries", headers=user_headers).status_code in (401, 403)
+
+    slow_query_recorder.reset()
+    old_threshold = slow_query_recorder.threshold_ms
+    slow_query_recorder.configure(threshold_ms=0)
+    slow_query_recorder.install(db.engine)
+    try:
+        assert client.get("/api/artists").status_code == 200
+    finally:
+        slow_query_recorder.uninstall(db.engine)
+        slow_query_recorder.configure(threshold_ms=old_threshold)
+
+    resp = client.get("/admin/slow_queries", headers=admin_headers)
+    assert resp.status_code == 200
+    items = resp.get_json()["items"]
+    assert any("api.list_artists" in e["endpoints"] for e in items)
+
+    assert client.delete("/admin/slow_queries", headers=admin_headers).get_json() == {"ok": True}
+    assert client.get("/admin/slow_queries", headers=admin_headers).get_json()["items"] == []
+
+
+def test_endpoint_comment_uses_flask_endpoint_only(app):
+    from types import SimpleNamespace
+    recorder = SlowQueryRecorder(threshold_ms=0)
+    conn = SimpleNamespace(info={})
+    with app.test_request_context("/api/artists?q=100%25"):
+        statement, _ = recorder._before_execute(conn, None, "SELECT 1", (), None, False)
+    assert statement == "/* endpoint=api.list_artists */ SELECT 1"
+    # ohne passende Route (404) kein Kommentar: der rohe Pfad (z. B. mit '%') landet nie im SQL
+    with app.test_request_context("/gibt/es/nicht%25s"):
+        statement, _ = recorder._before_execute(conn, None, "SELECT 1", (), None, False)
+    assert statement == "SELECT 1"
+
+
+def test_explain_runs_in_a_savepoint_of_the_callers_transaction(app):
+    recorder = SlowQueryRecorder(threshold_ms=0)
+    recorder.install(db.engine)
+    marker = "explain-savepoint-" + uuid.uuid4().hex[:8]
+    try:
+        with app.test_request_context("/api/artists"):
+            db.session.execute(text("INSERT INTO disciplines (name) VALUES (:n)"), {"n": marker})
+            rows = db.session.execute(text("SELECT name FROM disciplines WHERE name = :n"), {"n": marker}).fetchall()
+            assert rows == [(marker,)]
+            # EXPLAIN hat die offene Transaktion weder beendet noch verändert
+            db.session.rollback()
+            assert db.session.execute(text("SELECT count(*) FROM disciplines WHERE name = :n"),
+                                      {"n": marker}).scalar() == 0
+    finally:
+        recorder.uninstall(db.engine)
+    entry = next(e for e in recorder.snapshot() if "SELECT name FROM disciplines WHERE name" in e["fingerprint"])
+    assert entry["plan"]
+
+
+def test_install_all_covers_admin_bulkhead_engine(app):
+    from helpers.db_pools import pool_bulkheads
+    recorder = SlowQueryRecorder(threshold_ms=0, explain=False)
+    recorder.install_all(db.engine)
+    try:
+        with app.test_request_context("/admin/slow_queries"):
+            admin_engine = pool_bulkheads.engine_for_request()
+            assert admin_engine is not None and admin_engine is not db.engine
+            with admin_engine.connect() as conn:
+                conn.execute(text("SELECT 4711 AS admin_report"))
+    finally:
+        recorder.uninstall_all()
+
+    entry = next(e for e in recorder.snapshot() if "admin_report" in e["fingerprint"])
+    # Statement lief über den Admin-Pool, nicht über db.engine, und trägt den Admin-Endpoint
+    assert entry["endpoints"] == {"admin.admin_slow_queries": 1}
+
+
+def test_failing_statement_leaves_no_timing_state_on_the_connection(app):
+    recorder = SlowQueryRecorder(threshold_ms=0, explain=False)
+    recorder.install(db.engine)
+    try:
+        with db.engine.connect() as conn:
+            for _ in range(3):
+                try:
+                    conn.execute(text("SELECT * FROM no_such_table_slow_log"))
+                except Exception:
+                    pass
+            conn.execute(text("SELECT 815 AS after_failure"))
+            assert not any(key.startswith("slow_query") for key in conn.info)
+    finally:
+        recorder.uninstall(db.engine)
+
+    entry = next(e for e in recorder.snapshot() if "after_failure" in e["fingerprint"])
+    assert entry["count"] == 1 and entry["max_ms"] < 1000
@@ -0,0 +1,59 @@
+# tests/unit/test_team_optimizer.py
+"""Team-Optimierer: gleiches Ergebnis wie Brute Force, Disziplin-Abdeckung vor Preis, schnell bei vielen Kandidaten."""
+import itertools
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services.team_optimizer import TeamCandidate, optimize_team
+
+
+def _cand(ident, cost, *disciplines):
+    return TeamCandidate(SimpleNamespace(id=ident), cost=cost, disciplines=frozenset(disciplines))
+
+
+def test_coverage_beats_price():
+    cands = [_cand(1, 100, "zauberer"), _cand(2, 110, "zauberer"), _cand(3, 900, "jonglage")]
+    team = optimize_team(cands, 2, ["Zauberer", "Jonglage"])
+    assert [m.artist.id for m in team.members] == [1, 3]
+    assert team.missing == [] and team.cost == 1000
+
+
+def test_missing_discipline_and_too_few_candidates():
+    cands = [_cand(1, 100, "zauberer"), _cand(2, 50, "zauberer"), _cand(2, 10, "zauberer")]
+    team = optimize_team(cands, 2, ["zauberer", "akrobatik"])
+    assert sorted(m.artist.id for m in team.members) == [1, 2]
+    assert team.missing == ["akrobatik"]
+    assert optimize_team(cands, 3, ["zauberer"]) is None      # Artist 2 zählt nur einmal
+    with pytest.raises(ValueError):
+        optimize_team(cands, 0)
+
+
+def test_matches_brute_force():
+    rng = random.Random(5)
+    names = ["a", "b", "c", "d"]
+    for _ in range(200):
+        n, k = rng.randint(1, 10), rng.randint(1, 4)
+        cands = [_cand(i + 1, rng.randint(100, 2000), *rng.sample(names, rng.randint(0, 2))) for i in range(n)]
+        required = rng.sample(names, rng.randint(0, 4))
+        team = optimize_team(cands, k, required)
+        if n < k:
+            assert team is None
+            continue
+        best = min(
+            (-len(set().union(*(c.disciplines for c in combo)) & set(required)), sum(c.cost for c in combo))
+            for combo in itertools.combinations(cands, k)
+        )
+        assert (-len(team.covered), team.cost) == best
+
+
+def test_fast_for_many_candidates():
+    rng = random.Random(9)
+    names = ["zauberer", "jonglage", "akrobatik", "feuershow", "clown", "musik"]
+    cands = [_cand(i + 1, rng.uniform(300, 3000), *rng.sample(names, rng.randint(1, 3))) for i in range(150)]
+    start = time.perf_counter()
+    team = optimize_team(cands, 6, names)
+    assert time.perf_counter() - start < 0.5
+    assert len(team.members) == 6 and team.missing == []
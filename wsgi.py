@@ -0,0 +1,17 @@
+"""
+WSGI-Einstiegspunkt für den Produktivbetrieb:
+
+    gunicorn wsgi:app --worker-class gthread --threads 8
+
+Threaded (oder gevent-)Worker sind nötig: jeder offene SSE-Stream (/api/requests/requests/stream)
+belegt bis zu REQUEST_EVENTS_STREAM_SECONDS (55 s) einen Thread; Sync-Worker wären damit blockiert.
+
+Nur hier startet der Scheduler-Thread (SCHEDULER_ENABLED), nicht schon beim Import von app.py –
+sonst liefe er auch bei `flask db upgrade`, CLI-Skripten und Tests mit. Ohne --preload,
+damit jeder Worker-Prozess seinen eigenen Thread bekommt.
+"""
+from app import app
+from services.scheduler import scheduler
+
+if app.config.get("SCHEDULER_ENABLED"):
+    scheduler.start(app)